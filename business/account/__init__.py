@@ -0,0 +1,16 @@
+"""帳戶狀態模塊導出。"""
+from .ledger import BalanceLedger, Reservation
+from .pnl import PnLSnapshot, PnLTracker
+from .private_stream import UpbitPrivateStream
+from .tables import BalanceTable, OrderTable, is_final
+
+__all__ = [
+    "BalanceLedger",
+    "BalanceTable",
+    "OrderTable",
+    "PnLSnapshot",
+    "PnLTracker",
+    "Reservation",
+    "UpbitPrivateStream",
+    "is_final",
+]
@@ -0,0 +1,124 @@
+"""多幣種餘額帳本：在 BalanceTable 的交易所餘額之上疊加在途預留。
+
+風控接受信號時預留所需資金，執行結束後釋放或結算；並行執行的信號因此看到
+扣除預留後的可用餘額，不會重複花用同一筆 KRW。
+"""
+from __future__ import annotations
+
+import itertools
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+from business.account.tables import BalanceTable
+from core.datatypes import Balance
+from utils.logger import setup_logger
+
+logger = setup_logger("balance_ledger")
+
+_ZERO = Decimal("0")
+
+Key = Tuple[str, str]  # (exchange, currency)
+Requirement = Tuple[str, str, Decimal]
+
+
+@dataclass(slots=True)
+class Reservation:
+    reservation_id: int
+    items: Tuple[Requirement, ...]
+    created_at: float
+    active: bool = True
+
+
+class BalanceLedger:
+    """以 (exchange, currency) 索引，查詢與預留皆為 O(1)（按幣種數）。"""
+
+    def __init__(self, table: Optional[BalanceTable] = None) -> None:
+        self._table = table if table is not None else BalanceTable()
+        self._reserved: Dict[Key, Decimal] = {}
+        self._reservations: Dict[int, Reservation] = {}
+        self._ids = itertools.count(1)
+
+    @property
+    def table(self) -> BalanceTable:
+        return self._table
+
+    @property
+    def open_reservations(self) -> int:
+        return len(self._reservations)
+
+    def replace(self, exchange: str, balances: Iterable[Balance]) -> None:
+        self._table.replace(exchange, balances)
+
+    def balance(self, exchange: str, currency: str) -> Decimal:
+        """交易所回報的可用餘額（未扣預留）。"""
+        item = self._table.get(exchange, currency)
+        return item.available if item is not None else _ZERO
+
+    def reserved(self, exchange: str, currency: str) -> Decimal:
+        return self._reserved.get((exchange, currency.upper()), _ZERO)
+
+    def available(self, exchange: str, currency: str) -> Decimal:
+        return self.balance(exchange, currency) - self.reserved(exchange, currency)
+
+    def can_cover(self, items: Sequence[Requirement], reserve_ratio: Decimal = _ZERO) -> bool:
+        """扣除預留與本次需求後，每個幣種仍保留 reserve_ratio 比例的餘額。"""
+        for exchange, currency, amount in items:
+            balance = self.balance(exchange, currency)
+            if balance - self.reserved(exchange, currency) - amount < balance * reserve_ratio:
+                logger.debug(
+                    "餘額不足",
+                    extra={"exchange": exchange, "currency": currency, "required": str(amount)},
+                )
+                return False
+        return True
+
+    def reserve(self, items: Sequence[Requirement], reserve_ratio: Decimal = _ZERO) -> Optional[Reservation]:
+        """全部或全不預留；不足時回傳 None。"""
+        if not self.can_cover(items, reserve_ratio):
+            return None
+        normalized = tuple((exchange, currency.upper(), amount) for exchange, currency, amount in items)
+        for exchange, currency, amount in normalized:
+            key = (exchange, currency)
+            self._reserved[key] = self._reserved.get(key, _ZERO) + amount
+        reservation = Reservation(next(self._ids), normalized, time.monotonic())
+        self._reservations[reservation.reservation_id] = reservation
+        return reservation
+
+    def release(self, reservation: Reservation) -> None:
+        if not reservation.active:
+            return
+        reservation.active = False
+        self._reservations.pop(reservation.reservation_id, None)
+        for exchange, currency, amount in reservation.items:
+            key = (exchange, currency)
+            remaining = self._reserved.get(key, _ZERO) - amount
+            if remaining > 0:
+                self._reserved[key] = remaining
+            else:
+                self._reserved.pop(key, None)
+
+    def settle(
+        self,
+        reservation: Reservation,
+        deltas: Mapping[Key, Decimal],
+        sent_at: Optional[float] = None,
+    ) -> None:
+        """釋放預留並套用成交造成的餘額變動。
+
+        sent_at 為下單送出前的 time.monotonic()。之後同步過的交易所可能已含本次成交，
+        不再套用以免重複計入；由推送即時維護（is_live）的交易所一律以推送為準。
+        """
+        sent_at = time.monotonic() if sent_at is None else sent_at
+        self.release(reservation)
+        updates = []
+        for (exchange, currency), delta in deltas.items():
+            if not delta or self._table.is_live(exchange) or self._table.updated_at(exchange) >= sent_at:
+                continue
+            current = self._table.get(exchange, currency)
+            available = (current.available if current else _ZERO) + delta
+            locked = current.locked if current else _ZERO
+            updates.append(Balance(exchange, currency.upper(), available, locked, available + locked))
+        if updates:
+            self._table.update(updates)
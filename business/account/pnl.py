@@ -0,0 +1,237 @@
+"""即時損益與曝險彙總。
+
+每筆成交以平均成本法更新三層帳本：交易對（跨交易所合併）、交易所 × 交易對、
+以及交易所與全局的累計值；每筆成交 O(1)，讀取目前總額不需掃描歷史。
+套利的已實現損益體現在交易對層：一邊賣出、一邊買回即平倉。
+
+下單回應通常尚未成交，最終成交由訂單表更新或補單結果送入；同一訂單以
+(exchange, order_id) 記錄已入帳的累計量，重複或亂序的回報只記增量。
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Mapping, Optional, Tuple
+
+from business.account.tables import is_final
+from core.datatypes import OrderResult
+
+_ZERO = Decimal("0")
+
+
+@dataclass(slots=True)
+class PnLSnapshot:
+    position: Decimal = _ZERO  # 基礎幣淨部位，正為多頭
+    avg_cost: Decimal = _ZERO
+    realized: Decimal = _ZERO
+    fees: Decimal = _ZERO
+    unrealized: Decimal = _ZERO
+    exposure: Decimal = _ZERO  # |部位| × 標記價（KRW）
+    volume: Decimal = _ZERO
+    fills: int = 0
+
+    @property
+    def net(self) -> Decimal:
+        return self.realized + self.unrealized - self.fees
+
+
+class _Book:
+    __slots__ = ("position", "avg_cost", "realized", "fees", "volume", "fills")
+
+    def __init__(self) -> None:
+        self.position = _ZERO
+        self.avg_cost = _ZERO
+        self.realized = _ZERO
+        self.fees = _ZERO
+        self.volume = _ZERO
+        self.fills = 0
+
+    def apply(self, side: str, quantity: Decimal, price: Decimal, fee: Decimal) -> Decimal:
+        """回傳本筆成交實現的損益。"""
+        signed = quantity if side == "bid" else -quantity
+        position = self.position
+        realized = _ZERO
+        if position == 0 or (position > 0) == (signed > 0):
+            total = abs(position) + quantity
+            self.avg_cost = (self.avg_cost * abs(position) + price * quantity) / total
+        else:
+            closing = min(quantity, abs(position))
+            realized = (price - self.avg_cost) * closing if position > 0 else (self.avg_cost - price) * closing
+            if quantity > abs(position):
+                self.avg_cost = price  # 反手，剩餘部分以本次價格開倉
+            elif quantity == abs(position):
+                self.avg_cost = _ZERO
+        self.position = position + signed
+        self.realized += realized
+        self.fees += fee
+        self.volume += quantity
+        self.fills += 1
+        return realized
+
+    def snapshot(self, mark: Optional[Decimal]) -> PnLSnapshot:
+        unrealized = exposure = _ZERO
+        if mark is not None and self.position:
+            unrealized = (mark - self.avg_cost) * self.position
+            exposure = abs(self.position) * mark
+        return PnLSnapshot(
+            position=self.position,
+            avg_cost=self.avg_cost,
+            realized=self.realized,
+            fees=self.fees,
+            unrealized=unrealized,
+            exposure=exposure,
+            volume=self.volume,
+            fills=self.fills,
+        )
+
+
+class _OrderFill:
+    __slots__ = ("pair", "side", "filled", "cost", "fee")
+
+    def __init__(self, pair: str, side: str) -> None:
+        self.pair = pair
+        self.side = side
+        self.filled = _ZERO
+        self.cost = _ZERO
+        self.fee = _ZERO
+
+
+def _reported_fee(result: OrderResult) -> Optional[Decimal]:
+    raw = result.raw or {}
+    for key in ("fee", "paid_fee"):
+        if raw.get(key) is not None:
+            return Decimal(str(raw[key]))
+    return None
+
+
+class PnLTracker:
+    """on_fill 為唯一寫入口；pair / leg / exchange / net_realized 讀取目前狀態。"""
+
+    def __init__(self, fee_rates: Optional[Mapping[str, Decimal]] = None) -> None:
+        # 成交回報未附手續費時，以名義金額 × 費率估算
+        self._fee_rates = dict(fee_rates or {})
+        self._pairs: Dict[str, _Book] = {}
+        self._legs: Dict[Tuple[str, str], _Book] = {}
+        self._exchange_realized: Dict[str, Decimal] = {}
+        self._exchange_fees: Dict[str, Decimal] = {}
+        self._marks: Dict[str, Decimal] = {}
+        # 尚未終結的訂單：已入帳的累計成交，供後續回報計算增量
+        self._orders: Dict[Tuple[str, str], _OrderFill] = {}
+        self._realized = _ZERO
+        self._fees = _ZERO
+
+    def mark(self, pair: str, price: Decimal) -> None:
+        self._marks[pair] = price
+
+    def on_fill(
+        self,
+        exchange: str,
+        pair: str,
+        side: str,
+        quantity: Decimal,
+        price: Decimal,
+        fee: Optional[Decimal] = None,
+    ) -> None:
+        """side 為 "bid"（買入）或 "ask"（賣出）；fee 以 KRW 計。"""
+        if quantity <= 0:
+            return
+        if fee is None:
+            fee = quantity * price * self._fee_rates.get(exchange, _ZERO)
+        pair_book = self._pairs.get(pair)
+        if pair_book is None:
+            pair_book = self._pairs[pair] = _Book()
+        realized = pair_book.apply(side, quantity, price, fee)
+        leg = self._legs.get((exchange, pair))
+        if leg is None:
+            leg = self._legs[(exchange, pair)] = _Book()
+        leg_realized = leg.apply(side, quantity, price, fee)
+        self._exchange_realized[exchange] = self._exchange_realized.get(exchange, _ZERO) + leg_realized
+        self._exchange_fees[exchange] = self._exchange_fees.get(exchange, _ZERO) + fee
+        self._realized += realized
+        self._fees += fee
+        self._marks[pair] = price  # 以最新成交價標記，引擎另以盤口中價更新
+
+    def on_result(self, pair: str, side: str, result: OrderResult) -> None:
+        """由下單結果記錄成交；未終結的訂單登記後，由 on_order 補記後續成交。"""
+        key = (result.exchange, result.order_id)
+        order = self._orders.get(key) or _OrderFill(pair, side)
+        self._apply_order(order, result)
+        if not result.order_id or is_final(result.status):
+            self._orders.pop(key, None)
+        else:
+            self._orders[key] = order
+
+    def on_order(self, result: OrderResult) -> None:
+        """訂單表的狀態更新；只處理經 on_result 登記過的訂單。"""
+        key = (result.exchange, result.order_id)
+        order = self._orders.get(key)
+        if order is None:
+            return
+        self._apply_order(order, result)
+        if is_final(result.status):
+            del self._orders[key]
+
+    def _apply_order(self, order: _OrderFill, result: OrderResult) -> None:
+        """累計成交扣除已入帳部分後記錄；缺成交價或無新增成交時略過。"""
+        filled = result.filled_quantity
+        if result.average_price is None or filled <= order.filled:
+            return
+        cost = filled * result.average_price
+        quantity = filled - order.filled
+        price = (cost - order.cost) / quantity
+        total_fee = _reported_fee(result)
+        fee = None if total_fee is None else total_fee - order.fee
+        order.filled, order.cost = filled, cost
+        if total_fee is not None:
+            order.fee = total_fee
+        self.on_fill(result.exchange, order.pair, order.side, quantity, price, fee)
+
+    def pair(self, pair: str) -> PnLSnapshot:
+        book = self._pairs.get(pair)
+        return book.snapshot(self._marks.get(pair)) if book is not None else PnLSnapshot()
+
+    def leg(self, exchange: str, pair: str) -> PnLSnapshot:
+        book = self._legs.get((exchange, pair))
+        return book.snapshot(self._marks.get(pair)) if book is not None else PnLSnapshot()
+
+    def exchange(self, exchange: str) -> PnLSnapshot:
+        """交易所層的已實現損益與手續費為累計值；曝險按該交易所的交易對加總。"""
+        total = PnLSnapshot(
+            realized=self._exchange_realized.get(exchange, _ZERO),
+            fees=self._exchange_fees.get(exchange, _ZERO),
+        )
+        for (name, pair), book in self._legs.items():
+            if name != exchange:
+                continue
+            snap = book.snapshot(self._marks.get(pair))
+            total.unrealized += snap.unrealized
+            total.exposure += snap.exposure
+            total.volume += snap.volume
+            total.fills += snap.fills
+        return total
+
+    @property
+    def realized(self) -> Decimal:
+        return self._realized
+
+    @property
+    def fees(self) -> Decimal:
+        return self._fees
+
+    @property
+    def net_realized(self) -> Decimal:
+        """已實現損益扣除手續費，O(1)；供風控限額使用。"""
+        return self._realized - self._fees
+
+    def summary(self) -> Dict[str, Dict[str, str]]:
+        summary: Dict[str, Dict[str, str]] = {}
+        for pair in self._pairs:
+            snap = self.pair(pair)
+            summary[pair] = {
+                "position": str(snap.position),
+                "realized": str(snap.realized),
+                "fees": str(snap.fees),
+                "unrealized": str(snap.unrealized),
+                "exposure": str(snap.exposure),
+            }
+        return summary
@@ -0,0 +1,101 @@
+"""Upbit 私有 WebSocket（myOrder/myAsset）訂閱器。"""
+from __future__ import annotations
+
+import asyncio
+from typing import List, Optional
+
+from business.account.tables import BalanceTable, OrderTable
+from core.datatypes import Balance, OrderResult
+from core.wrapper.upbit import UpbitWrapper
+from utils.backoff import ExponentialBackoff
+from utils.logger import setup_logger
+
+logger = setup_logger("private_stream")
+
+
+class UpbitPrivateStream:
+    """以私有推送維護訂單表與餘額表；REST 僅用於（重）連線後的對帳。"""
+
+    def __init__(
+        self,
+        wrapper: UpbitWrapper,
+        orders: OrderTable,
+        balances: BalanceTable,
+        *,
+        backoff_base: float = 0.2,
+        backoff_cap: float = 10.0,
+    ) -> None:
+        self._wrapper = wrapper
+        self._orders = orders
+        self._balances = balances
+        self._backoff = ExponentialBackoff(backoff_base, backoff_cap)
+        self._task: Optional[asyncio.Task[None]] = None
+        self._stopping = asyncio.Event()
+        self._connected = False
+        self._events = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    @property
+    def orders(self) -> OrderTable:
+        return self._orders
+
+    @property
+    def balances(self) -> BalanceTable:
+        return self._balances
+
+    async def start(self) -> None:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run(), name="upbit-private-stream")
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._connected = False
+        self._balances.set_live("upbit", False)
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._events = 0
+            try:
+                await self._wrapper.subscribe_private(
+                    self._on_order,
+                    self._on_asset,
+                    on_connected=self._reconcile,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pragma: no cover - 需實際連線才會觸發
+                logger.warning("私有推送中斷", extra={"error": str(exc)})
+            self._connected = False
+            self._balances.set_live("upbit", False)
+            if self._events:
+                self._backoff.reset()
+            await asyncio.sleep(self._backoff.next_delay())
+
+    async def _reconcile(self) -> None:
+        """連線建立後以 REST 補齊斷線期間可能遺漏的變動。"""
+        balances = await self._wrapper.get_balance()
+        self._balances.replace("upbit", balances)
+        pending = [order for order in self._orders.open_orders() if order.exchange == "upbit"]
+        for order in pending:
+            self._orders.update(await self._wrapper.get_order_status(order.order_id))
+        self._connected = True
+        self._balances.set_live("upbit", True)
+        logger.info("私有推送已連線並完成對帳", extra={"open_orders": len(pending)})
+
+    async def _on_order(self, result: OrderResult) -> None:
+        self._events += 1
+        self._orders.update(result)
+
+    async def _on_asset(self, balances: List[Balance]) -> None:
+        self._events += 1
+        self._balances.update(balances)
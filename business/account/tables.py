@@ -0,0 +1,113 @@
+"""記憶體中的訂單表與餘額表，由私有推送或 REST 對帳維護。"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from core.datatypes import Balance, OrderResult
+
+# Upbit: done/cancel；Bithumb order_detail: Completed/Cancel
+FINAL_STATES = frozenset({"done", "cancel", "completed"})
+
+
+def is_final(status: str) -> bool:
+    return status.lower() in FINAL_STATES
+
+
+class OrderTable:
+    """以 order_id 索引的最新訂單狀態，可等待訂單進入終態。"""
+
+    def __init__(self) -> None:
+        self._orders: Dict[str, OrderResult] = {}
+        self._waiters: Dict[str, List[asyncio.Future[OrderResult]]] = {}
+        self._listeners: List[Callable[[OrderResult], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def get(self, order_id: str) -> Optional[OrderResult]:
+        return self._orders.get(order_id)
+
+    def add_listener(self, listener: Callable[[OrderResult], None]) -> None:
+        """每次接受的狀態更新都會通知（例如 PnLTracker.on_order 記錄最終成交）。"""
+        self._listeners.append(listener)
+
+    def update(self, result: OrderResult) -> None:
+        current = self._orders.get(result.order_id)
+        if current is not None and is_final(current.status) and not is_final(result.status):
+            return  # 終態不可被較舊的中間狀態覆蓋（對帳結果可能晚於推送）
+        self._orders[result.order_id] = result
+        for listener in self._listeners:
+            listener(result)
+        if is_final(result.status):
+            for waiter in self._waiters.pop(result.order_id, []):
+                if not waiter.done():
+                    waiter.set_result(result)
+
+    def open_orders(self) -> List[OrderResult]:
+        return [order for order in self._orders.values() if not is_final(order.status)]
+
+    def discard_final(self) -> None:
+        for order_id in [oid for oid, order in self._orders.items() if is_final(order.status)]:
+            del self._orders[order_id]
+
+    async def wait_final(self, order_id: str, timeout: Optional[float] = None) -> OrderResult:
+        current = self._orders.get(order_id)
+        if current is not None and is_final(current.status):
+            return current
+        waiter: asyncio.Future[OrderResult] = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(order_id, []).append(waiter)
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        finally:
+            waiters = self._waiters.get(order_id)
+            if waiters and waiter in waiters:
+                waiters.remove(waiter)
+                if not waiters:
+                    del self._waiters[order_id]
+
+
+class BalanceTable:
+    """以 (exchange, currency) 索引的餘額，O(1) 查詢。"""
+
+    def __init__(self) -> None:
+        self._balances: Dict[Tuple[str, str], Balance] = {}
+        self._updated_at: Dict[str, float] = {}
+        self._live: Set[str] = set()
+
+    def has(self, exchange: str) -> bool:
+        return exchange in self._updated_at
+
+    def is_live(self, exchange: str) -> bool:
+        """該交易所的餘額是否由連線中的推送即時維護；斷線後應改以 REST 同步。"""
+        return exchange in self._live
+
+    def set_live(self, exchange: str, live: bool) -> None:
+        if live:
+            self._live.add(exchange)
+        else:
+            self._live.discard(exchange)
+
+    def updated_at(self, exchange: str) -> float:
+        return self._updated_at.get(exchange, 0.0)
+
+    def get(self, exchange: str, currency: str) -> Optional[Balance]:
+        return self._balances.get((exchange, currency.upper()))
+
+    def update(self, balances: Iterable[Balance]) -> None:
+        """增量更新（私有推送僅包含變動的幣種）。"""
+        for balance in balances:
+            self._balances[(balance.exchange, balance.currency.upper())] = balance
+            self._updated_at[balance.exchange] = time.monotonic()
+
+    def replace(self, exchange: str, balances: Iterable[Balance]) -> None:
+        """以完整快照覆蓋某交易所的所有餘額（REST 對帳）。"""
+        for key in [key for key in self._balances if key[0] == exchange]:
+            del self._balances[key]
+        for balance in balances:
+            self._balances[(exchange, balance.currency.upper())] = balance
+        self._updated_at[exchange] = time.monotonic()
+
+    def balances(self, exchange: str) -> List[Balance]:
+        return [balance for (name, _), balance in self._balances.items() if name == exchange]
@@ -1,4 +1,6 @@
 """引擎模塊導出。"""
+from .control import ControlServer, install_kill_signals
 from .dryrun import DryRunEngine
+from .kill_switch import FlattenReport, KillSwitch
 
-__all__ = ["DryRunEngine"]
+__all__ = ["DryRunEngine", "KillSwitch", "FlattenReport", "ControlServer", "install_kill_signals"]
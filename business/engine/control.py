@@ -0,0 +1,89 @@
+"""引擎的本地控制入口：POSIX 信號與 Unix domain socket。
+
+    kill -USR1 <pid>                                   # 觸發平倉
+    echo kill | nc -U .cache/karb.sock                 # 觸發平倉並回傳 JSON 報告
+    echo status | nc -U .cache/karb.sock
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import signal
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional, Set
+
+from utils.logger import setup_logger
+
+if TYPE_CHECKING:
+    from business.engine.dryrun import DryRunEngine
+
+logger = setup_logger("engine_control")
+
+_background: Set[asyncio.Task[object]] = set()
+
+
+def install_kill_signals(engine: "DryRunEngine", signals: Iterable[signal.Signals] = (signal.SIGUSR1,)) -> None:
+    """收到信號時立即同步暫停交易，撤單在事件迴圈中背景執行。"""
+    loop = asyncio.get_running_loop()
+    for sig in signals:
+        loop.add_signal_handler(sig, _on_signal, engine, sig)
+
+
+def _on_signal(engine: "DryRunEngine", sig: signal.Signals) -> None:
+    reason = f"signal:{sig.name}"
+    engine.halt(reason)
+    task = asyncio.ensure_future(engine.kill(reason))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+class ControlServer:
+    """逐行文字指令：kill [原因] / status；每個指令回傳一行 JSON。"""
+
+    def __init__(self, engine: "DryRunEngine", path: Path) -> None:
+        self._engine = engine
+        self._path = path
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        if self._path.exists():
+            self._path.unlink()  # 上次異常退出留下的 socket 檔
+        self._server = await asyncio.start_unix_server(self._handle, path=str(self._path))
+        os.chmod(self._path, 0o600)
+        logger.info("控制 socket 已啟動", extra={"path": str(self._path)})
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._path.exists():
+            self._path.unlink()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                command, _, arg = line.decode(errors="replace").strip().partition(" ")
+                response = await self._dispatch(command.lower(), arg.strip())
+                writer.write(json.dumps(response, ensure_ascii=False).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def _dispatch(self, command: str, arg: str) -> dict:
+        engine = self._engine
+        if command == "kill":
+            report = await engine.kill(f"control:{arg or 'manual'}")
+            return {"ok": report.flat, **asdict(report)}
+        if command == "status":
+            pipeline = engine.pipeline
+            return {
+                "ok": True,
+                "halted": engine.halted,
+                "pending": pipeline.pending if pipeline else 0,
+                "running": pipeline.running if pipeline else 0,
+            }
+        return {"ok": False, "error": f"未知指令: {command}"}
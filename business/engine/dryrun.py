@@ -2,21 +2,33 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from dataclasses import dataclass
-from decimal import Decimal
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
-from business.execution.executor import OrderExecutor
+from business.account.ledger import BalanceLedger
+from business.engine.kill_switch import FlattenReport, KillSwitch
+from business.execution.executor import ExecutionResult, OrderExecutor
+from business.execution.pipeline import ExecutionPipeline, PipelineConfig
 from business.orderbook.feed import OrderBookFeed
+from business.orderbook.freshness import FreshnessMonitor
 from business.orderbook.manager import OrderBookManager
 from business.orderbook.snapshot import OrderBookSnapshot
-from business.risk.balance_checker import BalanceState
+from business.risk.balance_checker import BalanceChecker
 from business.risk.manager import RiskManager
 from business.strategy.base import BaseStrategy
-from core.datatypes import Balance, OrderBook
+from business.strategy.dedup import SignalDeduplicator
+from business.strategy.signal import ArbitrageDirection, StrategySignal
+from core.datatypes import OrderBook, OrderResult
 from core.wrapper.base import BaseExchangeWrapper
 from utils.logger import setup_logger
 
+if TYPE_CHECKING:
+    from business.account.pnl import PnLTracker
+    from business.account.tables import BalanceTable
+    from utils.event_bus import EventBus
+    from utils.tracing import Tracer
+
 logger = setup_logger("dryrun_engine")
 
 
@@ -42,6 +54,14 @@ class DryRunEngine:
         executor: OrderExecutor,
         pairs: Optional[List[PairContext]] = None,
         poll_interval: float = 0.5,
+        balance_table: Optional["BalanceTable"] = None,
+        execution: Optional[PipelineConfig] = None,
+        tracer: Optional["Tracer"] = None,
+        kill_switch: Optional[KillSwitch] = None,
+        pnl: Optional["PnLTracker"] = None,
+        dedup: Optional[SignalDeduplicator] = None,
+        freshness: Optional[FreshnessMonitor] = None,
+        bus: Optional["EventBus"] = None,
     ) -> None:
         self._upbit_wrapper = upbit_wrapper
         self._bithumb_wrapper = bithumb_wrapper
@@ -50,11 +70,60 @@ class DryRunEngine:
         self._executor = executor
         self._pairs = pairs or []
         self._poll_interval = poll_interval
+        # balance_table 可與私有推送共用：推送連線中時 Upbit 直接讀表，斷線即退回 REST
+        self._ledger = BalanceLedger(balance_table)
+        # 未配置時沿用逐筆 await 執行（單測與簡易場景）
+        self._pipeline = (
+            ExecutionPipeline(self._execute_signal, execution, on_drop=self._release)
+            if execution
+            else None
+        )
+        self._tracer = tracer
+        self._pnl = pnl
+        self._dedup = dedup
+        self._freshness = freshness
+        self._bus = bus
+        self._kill_switch = kill_switch or KillSwitch(upbit_wrapper, bithumb_wrapper)
+        self._halted = False
+        self._dropped_on_halt = 0
         self._stopping = asyncio.Event()
 
+    @property
+    def pipeline(self) -> Optional[ExecutionPipeline]:
+        return self._pipeline
+
+    @property
+    def ledger(self) -> BalanceLedger:
+        return self._ledger
+
+    @property
+    def halted(self) -> bool:
+        return self._halted
+
     def attach_pair(self, pair: PairContext) -> None:
         self._pairs.append(pair)
 
+    def halt(self, reason: str) -> None:
+        """同步停止產生與執行新信號（可在 signal handler 中直接呼叫）。"""
+        if self._halted:
+            return
+        self._halted = True
+        if self._pipeline:
+            self._dropped_on_halt = self._pipeline.halt()
+        logger.warning("交易已暫停", extra={"reason": reason, "dropped": self._dropped_on_halt})
+
+    async def kill(self, reason: str = "manual") -> FlattenReport:
+        """暫停交易並並行撤銷兩家交易所的全部掛單，回報 time-to-flat。"""
+        started = time.perf_counter()
+        self.halt(reason)
+        symbols = {
+            "upbit": [pair.upbit_symbol for pair in self._pairs],
+            "bithumb": [pair.bithumb_symbol for pair in self._pairs],
+        }
+        report = await self._kill_switch.flatten(symbols, reason=reason, started=started)
+        report.dropped_signals = self._dropped_on_halt
+        return report
+
     async def start(self) -> None:
         logger.info("啟動行情 Feed", extra={"pairs": len(self._pairs), "feeds": len(self._pairs) * 2})
         for pair in self._pairs:
@@ -70,31 +139,66 @@ class DryRunEngine:
 
     async def stop(self) -> None:
         self._stopping.set()
+        if self._pipeline:
+            await self._pipeline.close()
         for pair in self._pairs:
             await pair.upbit_feed.stop()
             await pair.bithumb_feed.stop()
 
     async def run_once(self) -> None:
+        if self._halted:
+            return
         if not self._pairs:
             await asyncio.sleep(self._poll_interval)
             return
-        balances = await self._fetch_balances()
+        await self._refresh_balances()
         for pair in self._pairs:
             try:
-                upbit_ob = self._orderbook_from_snapshot(pair.upbit_manager.snapshot)
-                bithumb_ob = self._orderbook_from_snapshot(pair.bithumb_manager.snapshot)
+                upbit_snapshot = pair.upbit_manager.snapshot
+                bithumb_snapshot = pair.bithumb_manager.snapshot
             except RuntimeError:
                 logger.debug("尚未取得訂單簿快照，等待下一輪", extra={"pair": pair.name})
                 continue
+            freshness = self._freshness
+            if freshness is not None and not (
+                freshness.is_fresh(pair.upbit_manager) and freshness.is_fresh(pair.bithumb_manager)
+            ):
+                logger.debug("訂單簿已過期，略過評估", extra={"pair": pair.name})
+                continue
+            upbit_ob = self._orderbook_from_snapshot(upbit_snapshot)
+            bithumb_ob = self._orderbook_from_snapshot(bithumb_snapshot)
+            if self._pnl is not None and upbit_ob.bids and upbit_ob.asks:
+                self._pnl.mark(pair.name, (upbit_ob.bids[0].price + upbit_ob.asks[0].price) / 2)
             signal = self._strategy.calculate(upbit_ob, bithumb_ob)
             if not signal:
                 logger.debug("策略無有效信號", extra={"pair": pair.name})
                 continue
+            signal.pair = pair.name
+            signal.upbit_symbol = pair.upbit_symbol
+            signal.bithumb_symbol = pair.bithumb_symbol
+            if self._dedup is not None and not self._dedup.admit(signal):
+                logger.debug("重複信號，冷卻中略過", extra={"pair": pair.name, "direction": signal.direction})
+                continue
+            if self._tracer is not None:
+                # 以較新的一邊訂單簿作為觸發幀
+                latest = max(upbit_snapshot, bithumb_snapshot, key=lambda snap: snap.received_ns)
+                signal.trace = self._tracer.start(
+                    pair.name,
+                    received_ns=latest.received_ns,
+                    parsed_ns=latest.parsed_ns,
+                    applied_ns=latest.applied_ns,
+                )
+                signal.trace.mark("strategy")
             logger.debug(
                 "策略輸出信號",
                 extra={"pair": pair.name, "direction": signal.direction, "spread": str(signal.spread)},
             )
-            if not await self._risk_manager.evaluate(signal, balances):
+            approved = self._risk_manager.check(signal, self._ledger)
+            if signal.trace is not None:
+                signal.trace.mark("risk")
+            if not approved:
+                if signal.trace is not None:
+                    signal.trace.finish()
                 logger.info(
                     "風控拒絕信號",
                     extra={
@@ -105,24 +209,84 @@ class DryRunEngine:
                     },
                 )
                 continue
-            try:
-                await self._executor.execute(signal)
-                await self._risk_manager.record_success()
-                logger.info(
-                    "DryRun 交易完成",
-                    extra={
-                        "pair": pair.name,
-                        "direction": signal.direction,
-                        "volume": str(signal.volume),
-                        "spread": str(signal.spread),
-                    },
-                )
-            except Exception as exc:  # pragma: no cover
-                await self._risk_manager.record_failure()
-                logger.warning(
-                    "DryRun 執行失敗",
-                    extra={"pair": pair.name, "error": str(exc)},
-                )
+            if self._dedup is not None:
+                self._dedup.record(signal)
+            if self._bus is not None:
+                self._bus.publish(StrategySignal, pair.name, signal)
+            if self._pipeline:
+                self._pipeline.submit(pair.name, signal)
+            else:
+                await self._execute_signal(pair.name, signal)
+
+    async def _execute_signal(self, pair_name: str, signal: StrategySignal) -> None:
+        result: Optional[ExecutionResult] = None
+        # 下單前記錄：執行期間（含對帳等待）到達的餘額同步可能已含本次成交
+        sent_at = time.monotonic()
+        try:
+            if self._halted:
+                return
+            result = await self._executor.execute(signal)
+            if self._pnl is not None:
+                self._record_fills(pair_name, signal, result)
+            if self._bus is not None:
+                self._bus.publish(OrderResult, pair_name, result.upbit_result)
+                self._bus.publish(OrderResult, pair_name, result.bithumb_result)
+            self._risk_manager.on_success(
+                pair_name, (result.upbit_result.exchange, result.bithumb_result.exchange)
+            )
+            logger.info(
+                "DryRun 交易完成",
+                extra={
+                    "pair": pair_name,
+                    "direction": signal.direction,
+                    "volume": str(signal.volume),
+                    "spread": str(signal.spread),
+                },
+            )
+        except Exception as exc:  # pragma: no cover
+            self._risk_manager.on_failure(pair_name, getattr(exc, "exchanges", ()))
+            if self._dedup is not None:
+                self._dedup.invalidate(pair_name)
+            logger.warning(
+                "DryRun 執行失敗",
+                extra={"pair": pair_name, "error": str(exc)},
+            )
+        finally:
+            self._settle(signal, result, sent_at)
+
+    def _record_fills(self, pair_name: str, signal: StrategySignal, result: ExecutionResult) -> None:
+        upbit_side, bithumb_side = (
+            ("ask", "bid") if signal.direction == ArbitrageDirection.UPBIT_SELL else ("bid", "ask")
+        )
+        self._pnl.on_result(pair_name, upbit_side, result.upbit_result)
+        self._pnl.on_result(pair_name, bithumb_side, result.bithumb_result)
+
+    def _settle(
+        self,
+        signal: StrategySignal,
+        result: Optional[ExecutionResult],
+        sent_at: Optional[float] = None,
+    ) -> None:
+        """有成交價時依成交量結算預留，否則直接釋放（下一輪同步會帶回實際餘額）。
+
+        DryRun 的模擬成交不寫入交易所餘額表，只釋放預留。
+        """
+        reservation = signal.reservation
+        if reservation is None:
+            return
+        signal.reservation = None
+        deltas = (
+            BalanceChecker.fill_deltas(signal, result.upbit_result, result.bithumb_result)
+            if result is not None and not self._executor.dry_run
+            else None
+        )
+        if deltas is None:
+            self._ledger.release(reservation)
+        else:
+            self._ledger.settle(reservation, deltas, sent_at)
+
+    def _release(self, pair_name: str, signal: StrategySignal) -> None:
+        self._settle(signal, None)
 
     def _orderbook_from_snapshot(self, snapshot: OrderBookSnapshot) -> OrderBook:
         return OrderBook(
@@ -132,32 +296,22 @@ class DryRunEngine:
             asks=list(snapshot.asks),
             sequence=snapshot.sequence,
             timestamp=snapshot.timestamp,
+            received_at=snapshot.received_at,
+            age_ms=snapshot.age_ms,
+            received_ns=snapshot.received_ns,
+            parsed_ns=snapshot.parsed_ns,
         )
 
-    async def _fetch_balances(self) -> BalanceState:
-        # 假設所有 pair 共用同一帳戶，取第一個 pair 的 wrapper 作查詢
-        upbit_balances = await self._upbit_wrapper.get_balance()
-        bithumb_balances = await self._bithumb_wrapper.get_balance()
-        state = BalanceState(
-            upbit_btc=self._find_balance(upbit_balances, "BTC"),
-            upbit_krw=self._find_balance(upbit_balances, "KRW"),
-            bithumb_btc=self._find_balance(bithumb_balances, "BTC"),
-            bithumb_krw=self._find_balance(bithumb_balances, "KRW"),
-        )
+    async def _refresh_balances(self) -> None:
+        # 假設所有 pair 共用同一帳戶；Upbit 餘額由私有推送維護時直接讀表，省去每輪 REST 查詢
+        if not self._ledger.table.is_live("upbit"):
+            self._ledger.replace("upbit", await self._upbit_wrapper.get_balance())
+        self._ledger.replace("bithumb", await self._bithumb_wrapper.get_balance())
         logger.debug(
             "帳戶餘額",
             extra={
-                "upbit_btc": str(state.upbit_btc),
-                "upbit_krw": str(state.upbit_krw),
-                "bithumb_btc": str(state.bithumb_btc),
-                "bithumb_krw": str(state.bithumb_krw),
+                "upbit_krw": str(self._ledger.available("upbit", "KRW")),
+                "bithumb_krw": str(self._ledger.available("bithumb", "KRW")),
+                "reservations": self._ledger.open_reservations,
             },
         )
-        return state
-
-    @staticmethod
-    def _find_balance(balances: List[Balance], currency: str) -> Decimal:
-        for item in balances:
-            if item.currency.upper() == currency.upper():
-                return item.available
-        return Decimal("0")
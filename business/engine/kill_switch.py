@@ -0,0 +1,134 @@
+"""一鍵平倉開關：並行撤銷兩家交易所的全部未完成訂單並回報耗時。
+
+撤單請求走限流器的優先通道；未完成訂單取自訂單表（私有推送）與各交易對的
+REST 查詢兩者的聯集，撤單後再查一次確認已清空。
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from core.datatypes import OrderResult
+from core.wrapper.base import BaseExchangeWrapper
+from utils.logger import setup_logger
+
+if TYPE_CHECKING:
+    from business.account.tables import OrderTable
+
+logger = setup_logger("kill_switch")
+
+
+@dataclass(slots=True)
+class FlattenReport:
+    reason: str
+    cancelled: int = 0
+    failed: int = 0
+    dropped_signals: int = 0
+    remaining: List[str] = field(default_factory=list)  # 複查後仍未完成的訂單
+    time_to_flat_ms: float = 0.0
+
+    @property
+    def flat(self) -> bool:
+        return not self.remaining and not self.failed
+
+
+class KillSwitch:
+    """撤銷指定交易對上的全部掛單；同一時間只執行一次。"""
+
+    def __init__(
+        self,
+        upbit: BaseExchangeWrapper,
+        bithumb: BaseExchangeWrapper,
+        *,
+        order_table: Optional["OrderTable"] = None,
+        timeout: float = 5.0,
+    ) -> None:
+        self._wrappers = {"upbit": upbit, "bithumb": bithumb}
+        self._order_table = order_table
+        self._timeout = timeout
+        self._running: Optional[asyncio.Task[FlattenReport]] = None
+
+    async def flatten(
+        self,
+        symbols: Dict[str, Iterable[str]],
+        *,
+        reason: str,
+        started: Optional[float] = None,
+    ) -> FlattenReport:
+        """symbols 為 {exchange: [原生符號]}；已在執行時等待同一輪結果。"""
+        if self._running is None or self._running.done():
+            self._running = asyncio.create_task(self._flatten(symbols, reason, started or time.perf_counter()))
+        return await asyncio.shield(self._running)
+
+    async def _flatten(self, symbols: Dict[str, Iterable[str]], reason: str, started: float) -> FlattenReport:
+        report = FlattenReport(reason=reason)
+        targets = {exchange: list(items) for exchange, items in symbols.items()}
+        open_orders = await self._collect(targets)
+        results = await asyncio.gather(
+            *(self._cancel(exchange, order_id) for exchange, order_id in open_orders),
+            return_exceptions=True,
+        )
+        acknowledged = set()
+        for (exchange, order_id), result in zip(open_orders, results):
+            if isinstance(result, BaseException):
+                report.failed += 1
+                logger.warning(
+                    "撤單失敗", extra={"exchange": exchange, "order_id": order_id, "error": str(result)}
+                )
+            else:
+                report.cancelled += 1
+                acknowledged.add((exchange, order_id))
+                if self._order_table is not None:
+                    self._order_table.update(result)
+        # 撤單已受理者可能仍短暫出現在未完成清單中，不計入殘留
+        report.remaining = [
+            f"{exchange}:{order_id}"
+            for exchange, order_id in await self._collect(targets, use_table=False)
+            if (exchange, order_id) not in acknowledged
+        ]
+        report.time_to_flat_ms = round((time.perf_counter() - started) * 1000, 3)
+        log = logger.info if report.flat else logger.error
+        log(
+            "平倉完成" if report.flat else "平倉後仍有掛單",
+            extra={
+                "reason": reason,
+                "cancelled": report.cancelled,
+                "failed": report.failed,
+                "remaining": len(report.remaining),
+                "time_to_flat_ms": report.time_to_flat_ms,
+            },
+        )
+        return report
+
+    async def _collect(self, targets: Dict[str, List[str]], *, use_table: bool = True) -> List[Tuple[str, str]]:
+        """回傳 [(exchange, order_id)]，去重後保持順序。"""
+        found: Dict[Tuple[str, str], None] = {}
+        if use_table and self._order_table is not None:
+            for order in self._order_table.open_orders():
+                if order.exchange in targets:
+                    found[(order.exchange, order.order_id)] = None
+        queries = [(exchange, symbol) for exchange, items in targets.items() for symbol in items]
+        responses = await asyncio.gather(
+            *(self._query(exchange, symbol) for exchange, symbol in queries),
+            return_exceptions=True,
+        )
+        for (exchange, symbol), response in zip(queries, responses):
+            if isinstance(response, BaseException):
+                logger.warning(
+                    "查詢掛單失敗", extra={"exchange": exchange, "symbol": symbol, "error": str(response)}
+                )
+                continue
+            for order in response:
+                found[(exchange, order.order_id)] = None
+        return list(found)
+
+    async def _query(self, exchange: str, symbol: str) -> List[OrderResult]:
+        # 掛單查詢是撤單的前置步驟，與撤單同走限流優先通道
+        return await asyncio.wait_for(
+            self._wrappers[exchange].get_open_orders(symbol, priority=True), self._timeout
+        )
+
+    async def _cancel(self, exchange: str, order_id: str) -> OrderResult:
+        return await asyncio.wait_for(self._wrappers[exchange].cancel_order(order_id), self._timeout)
@@ -0,0 +1,123 @@
+"""多進程分片：行情 Feed 與解析分散到 worker 進程，風控與執行留在主進程。
+
+worker 將每本訂單簿的前檔寫入 SharedBookRegion；主進程以 SharedBookView 代替
+OrderBookManager 組成 PairContext，DryRunEngine 本身不需知道是否分片。
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from dataclasses import dataclass
+from multiprocessing.process import BaseProcess
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from utils.logger import setup_logger
+
+logger = setup_logger("sharded_engine")
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class ShardingConfig:
+    workers: int = 0  # 0 或 1 表示單進程
+    depth: int = 5  # 共享記憶體保留的檔數
+    check_interval: float = 1.0  # worker 存活檢查間隔（秒）
+    stop_timeout: float = 5.0
+
+
+def partition(items: Sequence[T], workers: int) -> List[List[T]]:
+    """輪流分配，各分片數量最多相差 1；不產生空分片。"""
+    count = max(1, min(workers, len(items)))
+    shards: List[List[T]] = [[] for _ in range(count)]
+    for index, item in enumerate(items):
+        shards[index % count].append(item)
+    return [shard for shard in shards if shard]
+
+
+class RemoteFeed:
+    """主進程的佔位 Feed：連線由 worker 持有，start/stop 不做事。"""
+
+    def __init__(self, symbol: str) -> None:
+        self.symbol = symbol
+
+    async def start(self) -> None:
+        return
+
+    async def stop(self) -> None:
+        return
+
+
+class ShardSupervisor:
+    """以 spawn 啟動 worker，定期檢查存活並重啟意外退出的進程。"""
+
+    def __init__(
+        self,
+        target: Callable[..., None],
+        shard_args: Sequence[Tuple[Any, ...]],
+        config: ShardingConfig,
+    ) -> None:
+        self._target = target
+        self._shard_args = list(shard_args)
+        self._config = config
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: Dict[int, BaseProcess] = {}
+        self._restarts = 0
+        self._monitor: Optional[asyncio.Task[None]] = None
+
+    @property
+    def restarts(self) -> int:
+        return self._restarts
+
+    @property
+    def alive(self) -> int:
+        return sum(1 for process in self._processes.values() if process.is_alive())
+
+    async def start(self) -> None:
+        for shard_id in range(len(self._shard_args)):
+            self._spawn(shard_id)
+        logger.info("分片 worker 已啟動", extra={"workers": len(self._processes)})
+        self._monitor = asyncio.create_task(self._watch(), name="shard-supervisor")
+
+    async def stop(self) -> None:
+        if self._monitor is not None:
+            self._monitor.cancel()
+            try:
+                await self._monitor
+            except asyncio.CancelledError:
+                pass
+            self._monitor = None
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+        loop = asyncio.get_running_loop()
+        for shard_id, process in self._processes.items():
+            await loop.run_in_executor(None, process.join, self._config.stop_timeout)
+            if process.is_alive():
+                logger.warning("worker 未在時限內退出，強制結束", extra={"shard": shard_id})
+                process.kill()
+                await loop.run_in_executor(None, process.join)
+        self._processes.clear()
+
+    def _spawn(self, shard_id: int) -> None:
+        process = self._context.Process(
+            target=self._target,
+            args=(shard_id, *self._shard_args[shard_id]),
+            name=f"shard-{shard_id}",
+            daemon=True,
+        )
+        process.start()
+        self._processes[shard_id] = process
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self._config.check_interval)
+            for shard_id, process in list(self._processes.items()):
+                if process.is_alive():
+                    continue
+                logger.error(
+                    "分片 worker 意外退出，重新啟動",
+                    extra={"shard": shard_id, "exitcode": process.exitcode},
+                )
+                self._restarts += 1
+                self._spawn(shard_id)
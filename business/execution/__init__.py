@@ -1,4 +1,21 @@
 """執行模塊導出。"""
 from .executor import OrderExecutor, ExecutionResult
+from .fill_simulator import BookHistory, FillConfig, FillSimulator
+from .order_tracker import OrderTracker, TrackerConfig
+from .pipeline import ExecutionPipeline, PipelineConfig
+from .reconciler import ArbState, LegReconciler, ReconcilerConfig
 
-__all__ = ["OrderExecutor", "ExecutionResult"]
+__all__ = [
+    "OrderExecutor",
+    "ExecutionResult",
+    "BookHistory",
+    "FillConfig",
+    "FillSimulator",
+    "OrderTracker",
+    "TrackerConfig",
+    "ExecutionPipeline",
+    "PipelineConfig",
+    "ArbState",
+    "LegReconciler",
+    "ReconcilerConfig",
+]
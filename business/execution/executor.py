@@ -3,16 +3,33 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass
-from decimal import Decimal
-from typing import Optional
+from decimal import ROUND_DOWN, Decimal
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
+from business.execution.reconciler import Leg, LegReconciler
 from business.strategy.signal import StrategySignal, ArbitrageDirection
 from core.datatypes import OrderResult
+from core.exceptions import OrderExecutionError
 from core.wrapper.base import BaseExchangeWrapper
 from utils.logger import setup_logger
 
+if TYPE_CHECKING:
+    from business.account.tables import OrderTable
+    from business.execution.fill_simulator import FillSimulator
+    from business.market.registry import MarketInfo, MarketRegistry
+
 logger = setup_logger("executor")
 
+# 僅供未帶交易對與符號的舊版單交易對信號使用
+DEFAULT_ROUTE = ("KRW-BTC", "BTC_KRW")
+
+
+@dataclass(frozen=True, slots=True)
+class _Route:
+    upbit_symbol: str
+    bithumb_symbol: str
+    market: Optional["MarketInfo"] = None
+
 
 @dataclass(slots=True)
 class ExecutionResult:
@@ -23,56 +40,181 @@ class ExecutionResult:
 class OrderExecutor:
     """負責並行執行套利指令，可選 DryRun。"""
 
-    def __init__(self, upbit: BaseExchangeWrapper, bithumb: BaseExchangeWrapper, *, dry_run: bool = True) -> None:
+    def __init__(
+        self,
+        upbit: BaseExchangeWrapper,
+        bithumb: BaseExchangeWrapper,
+        *,
+        dry_run: bool = True,
+        order_table: Optional["OrderTable"] = None,
+        registry: Optional["MarketRegistry"] = None,
+        fill_simulator: Optional["FillSimulator"] = None,
+        reconciler: Optional[LegReconciler] = None,
+    ) -> None:
         self._upbit = upbit
         self._bithumb = bithumb
         self._dry_run = dry_run
+        self._order_table = order_table
+        self._registry = registry
+        self._fill_simulator = fill_simulator
+        self._reconciler = reconciler
+        self._routes: Dict[Tuple[str, str, str], _Route] = {}
+
+    @property
+    def dry_run(self) -> bool:
+        return self._dry_run
 
     async def execute(self, signal: StrategySignal) -> ExecutionResult:
+        trace = signal.trace
+        if trace is not None:
+            trace.mark("dispatch")
+        try:
+            return await self._execute(signal)
+        finally:
+            if trace is not None:
+                trace.finish()
+
+    async def _execute(self, signal: StrategySignal) -> ExecutionResult:
+        route = self._route(signal)
         logger.info(
             "執行信號",
             extra={
+                "pair": signal.pair,
+                "upbit_symbol": route.upbit_symbol,
                 "direction": signal.direction,
                 "volume": str(signal.volume),
                 "dry_run": self._dry_run,
             },
         )
         if self._dry_run:
-            return await self._simulate(signal)
+            result = await self._simulate(signal, route)
+            if signal.trace is not None:
+                signal.trace.mark("ack")
+            return result
+        volume, upbit_total = self._sizes(signal, route)
         if signal.direction == ArbitrageDirection.UPBIT_SELL:
-            upbit_task = self._upbit.sell_market_order("KRW-BTC", signal.volume)
-            bithumb_task = self._bithumb.buy_market_order("BTC_KRW", signal.volume)
+            upbit_task = self._upbit.sell_market_order(route.upbit_symbol, volume)
+            bithumb_task = self._bithumb.buy_market_order(route.bithumb_symbol, volume)
         else:
-            upbit_total = signal.volume * signal.upbit_price
-            upbit_task = self._upbit.buy_market_order("KRW-BTC", upbit_total)
-            bithumb_task = self._bithumb.sell_market_order("BTC_KRW", signal.volume)
+            upbit_task = self._upbit.buy_market_order(route.upbit_symbol, upbit_total)
+            bithumb_task = self._bithumb.sell_market_order(route.bithumb_symbol, volume)
         results = await asyncio.gather(upbit_task, bithumb_task, return_exceptions=True)
+        if signal.trace is not None:
+            signal.trace.mark("ack")
+        if self._order_table is not None:
+            # 後續狀態由私有推送更新，此處僅登記下單回應
+            for result in results:
+                if isinstance(result, OrderResult):
+                    self._order_table.update(result)
+        if self._reconciler is not None:
+            # 先確認兩腿成交並處理單腿風險，再向上拋出下單錯誤
+            await self._reconcile(signal, route, volume, results)
+            if signal.trace is not None:
+                signal.trace.mark("reconcile")
         upbit_result, bithumb_result = self._handle_results(results)
         return ExecutionResult(upbit_result=upbit_result, bithumb_result=bithumb_result)
 
-    async def _simulate(self, signal: StrategySignal) -> ExecutionResult:
+    async def _reconcile(
+        self, signal: StrategySignal, route: _Route, volume: Decimal, results: list[object]
+    ) -> None:
+        if signal.direction == ArbitrageDirection.UPBIT_SELL:
+            upbit_side, bithumb_side = "ask", "bid"
+        else:
+            upbit_side, bithumb_side = "bid", "ask"
+        legs = (
+            Leg("upbit", route.upbit_symbol, upbit_side, volume, signal.upbit_price),
+            Leg("bithumb", route.bithumb_symbol, bithumb_side, volume, signal.bithumb_price),
+        )
+        await self._reconciler.reconcile(
+            signal.pair or route.upbit_symbol, legs, (results[0], results[1]), route.market
+        )
+
+    def _route(self, signal: StrategySignal) -> _Route:
+        """依信號的交易對決定兩邊的下單符號，結果按交易對快取；無法解析時拋出例外。"""
+        key = (signal.pair, signal.upbit_symbol, signal.bithumb_symbol)
+        route = self._routes.get(key)
+        if route is not None:
+            return route
+        market = None
+        if self._registry is not None:
+            market = self._registry.get(signal.pair) if signal.pair else None
+            if market is None and signal.upbit_symbol:
+                market = self._registry.by_symbol(signal.upbit_symbol)
+        if market is not None:
+            route = _Route(market.upbit_symbol, market.bithumb_symbol, market)
+        elif signal.upbit_symbol and signal.bithumb_symbol:
+            route = _Route(signal.upbit_symbol, signal.bithumb_symbol)
+        elif not (signal.pair or signal.upbit_symbol or signal.bithumb_symbol):
+            route = _Route(*DEFAULT_ROUTE)
+        else:
+            logger.error(
+                "無法解析下單路由，拒絕信號",
+                extra={
+                    "pair": signal.pair,
+                    "upbit_symbol": signal.upbit_symbol,
+                    "bithumb_symbol": signal.bithumb_symbol,
+                },
+            )
+            raise OrderExecutionError(f"無法解析交易對路由: {signal.pair or signal.upbit_symbol}")
+        self._routes[key] = route
+        return route
+
+    @staticmethod
+    def _sizes(signal: StrategySignal, route: _Route) -> Tuple[Decimal, Decimal]:
+        """回傳（雙邊數量, Upbit 市價買金額）；有市場元數據時按兩邊較嚴的精度截斷。"""
+        volume = signal.volume
+        if route.market is None:
+            return volume, volume * signal.upbit_price
+        volume = route.market.round_quantity("bithumb", route.market.round_quantity("upbit", volume))
+        return volume, (volume * signal.upbit_price).quantize(Decimal("1"), rounding=ROUND_DOWN)
+
+    async def _simulate(self, signal: StrategySignal, route: _Route) -> ExecutionResult:
+        if self._fill_simulator is None:
+            # 未配置成交模擬時僅記錄信號，假定全部成交
+            logger.info(
+                "DryRun 訂單",
+                extra={
+                    "direction": signal.direction,
+                    "volume": str(signal.volume),
+                    "upbit_price": str(signal.upbit_price),
+                    "bithumb_price": str(signal.bithumb_price),
+                },
+            )
+            dummy = OrderResult(
+                order_id="dryrun",
+                exchange="dryrun",
+                symbol=route.upbit_symbol,
+                status="filled",
+                filled_quantity=signal.volume,
+                average_price=None,
+                raw=None,
+            )
+            return ExecutionResult(upbit_result=dummy, bithumb_result=dummy)
+        sim = self._fill_simulator
+        volume, upbit_total = self._sizes(signal, route)
+        if signal.direction == ArbitrageDirection.UPBIT_SELL:
+            upbit_task = sim.market_order("upbit", route.upbit_symbol, "ask", volume=volume)
+            bithumb_task = sim.market_order("bithumb", route.bithumb_symbol, "bid", volume=volume)
+        else:
+            upbit_task = sim.market_order("upbit", route.upbit_symbol, "bid", notional=upbit_total)
+            bithumb_task = sim.market_order("bithumb", route.bithumb_symbol, "ask", volume=volume)
+        upbit_result, bithumb_result = await asyncio.gather(upbit_task, bithumb_task)
         logger.info(
-            "DryRun 訂單",
+            "DryRun 模擬成交",
             extra={
+                "pair": signal.pair,
                 "direction": signal.direction,
-                "volume": str(signal.volume),
-                "upbit_price": str(signal.upbit_price),
-                "bithumb_price": str(signal.bithumb_price),
+                "upbit_filled": str(upbit_result.filled_quantity),
+                "upbit_avg": str(upbit_result.average_price),
+                "bithumb_filled": str(bithumb_result.filled_quantity),
+                "bithumb_avg": str(bithumb_result.average_price),
             },
         )
-        dummy = OrderResult(
-            order_id="dryrun",
-            exchange="dryrun",
-            symbol="KRW-BTC",
-            status="filled",
-            filled_quantity=signal.volume,
-            average_price=None,
-            raw=None,
-        )
-        return ExecutionResult(upbit_result=dummy, bithumb_result=dummy)
+        return ExecutionResult(upbit_result=upbit_result, bithumb_result=bithumb_result)
 
     def _handle_results(self, results: list[object]) -> tuple[OrderResult, OrderResult]:
-        errors = [res for res in results if isinstance(res, Exception)]
-        if errors:
-            raise errors[0]
+        failed = tuple(name for name, res in zip(("upbit", "bithumb"), results) if isinstance(res, Exception))
+        if failed:
+            error = next(res for res in results if isinstance(res, Exception))
+            raise OrderExecutionError(str(error) or type(error).__name__, failed) from error
         return results[0], results[1]
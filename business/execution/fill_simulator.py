@@ -0,0 +1,231 @@
+"""DryRun 成交模擬：以下單時刻（加上延遲）的訂單簿逐檔吃單。
+
+- 延遲：實盤 DryRun 中先等待 latency 再讀取行情管理器的最新快照，即「N ms 後的
+  訂單簿」；配置 BookHistory 時改取錄製串流中目標時刻之後的第一個快照，
+  回放（指定 at_ms）時不實際等待；
+- 手續費以報價幣（KRW）計，寫入 OrderResult.raw；
+- 簿上深度不足（或超過 depth_share 可取比例）時部分成交，剩餘視為取消，與交易所
+  市價單行為一致。
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from business.orderbook.manager import OrderBookManager
+from business.orderbook.snapshot import OrderBookSnapshot
+from core.datatypes import OrderBook, OrderResult, PriceLevel
+from utils.logger import setup_logger
+
+logger = setup_logger("fill_simulator")
+
+_ZERO = Decimal("0")
+
+
+@dataclass(slots=True)
+class FillConfig:
+    latency_ms: Dict[str, float] = field(default_factory=lambda: {"upbit": 0.0, "bithumb": 0.0})
+    fee_rates: Dict[str, Decimal] = field(
+        default_factory=lambda: {"upbit": Decimal("0.0005"), "bithumb": Decimal("0.0025")}
+    )
+    depth_share: Decimal = Decimal("1")  # 每檔顯示量中可被我方吃到的比例（排隊競爭）
+    max_levels: int = 30
+
+
+class _Ring:
+    """固定容量的環形緩衝：O(1) 追加與隨機存取，時間戳單調遞增時可二分搜尋。"""
+
+    __slots__ = ("_times", "_books", "_start", "_size")
+
+    def __init__(self, capacity: int) -> None:
+        self._times: List[float] = [0.0] * capacity
+        self._books: List[Optional[OrderBookSnapshot]] = [None] * capacity
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, ts: float, book: OrderBookSnapshot) -> None:
+        capacity = len(self._times)
+        if self._size < capacity:
+            index = (self._start + self._size) % capacity
+            self._size += 1
+        else:
+            index = self._start  # 已滿：覆蓋最舊的一筆
+            self._start = (self._start + 1) % capacity
+        self._times[index] = ts
+        self._books[index] = book
+
+    def first_at_or_after(self, ts: float) -> Optional[OrderBookSnapshot]:
+        """第一個時間戳 >= ts 的快照；全部早於 ts 時取最後一個。"""
+        if not self._size:
+            return None
+        capacity = len(self._times)
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._times[(self._start + mid) % capacity] < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return self._books[(self._start + min(lo, self._size - 1)) % capacity]
+
+
+class BookHistory:
+    """錄製的訂單簿序列，供取「某時刻之後第一個」快照；以 mirror 掛上事件匯流排錄製。"""
+
+    def __init__(self, maxlen: int = 2048, depth: int = 30) -> None:
+        self._maxlen = maxlen
+        self._depth = depth
+        self._rings: Dict[Tuple[str, str], _Ring] = {}
+
+    def record(self, snapshot: OrderBookSnapshot) -> None:
+        """複製前 depth 檔保存；快照會被增量原地修改，不能直接持有引用。"""
+        key = (snapshot.exchange, snapshot.symbol)
+        ring = self._rings.get(key)
+        if ring is None:
+            ring = self._rings[key] = _Ring(self._maxlen)
+        ring.append(
+            snapshot.received_at,
+            OrderBookSnapshot(
+                symbol=snapshot.symbol,
+                exchange=snapshot.exchange,
+                bids=snapshot.bids[: self._depth],
+                asks=snapshot.asks[: self._depth],
+                sequence=snapshot.sequence,
+                timestamp=snapshot.timestamp,
+                received_at=snapshot.received_at,
+            )
+        )
+
+    def at(self, exchange: str, symbol: str, ts_ms: float) -> Optional[OrderBookSnapshot]:
+        """回傳 received_at >= ts_ms 的第一個快照；晚於錄製範圍時取最後一個。"""
+        ring = self._rings.get((exchange, symbol))
+        if not ring:
+            return None
+        return ring.first_at_or_after(ts_ms)
+
+    def mirror(self, get_snapshot: Callable[[], OrderBookSnapshot]) -> Callable[[OrderBook], None]:
+        """產生事件匯流排的 OrderBook 訂閱者：每次套用後錄製排序好的快照。"""
+
+        def handler(_: OrderBook) -> None:
+            self.record(get_snapshot())
+
+        return handler
+
+
+class FillSimulator:
+    """以註冊的 OrderBookManager（或 BookHistory）模擬市價單成交。"""
+
+    def __init__(self, config: Optional[FillConfig] = None, *, history: Optional[BookHistory] = None) -> None:
+        self._config = config or FillConfig()
+        self._history = history
+        self._books: Dict[Tuple[str, str], OrderBookManager] = {}
+
+    def register(self, exchange: str, symbol: str, manager: OrderBookManager) -> None:
+        self._books[(exchange, symbol)] = manager
+
+    async def market_order(
+        self,
+        exchange: str,
+        symbol: str,
+        side: str,
+        *,
+        volume: Optional[Decimal] = None,
+        notional: Optional[Decimal] = None,
+        at_ms: Optional[float] = None,
+    ) -> OrderResult:
+        """side 為 bid/ask；市價買可用 notional（KRW 金額，Upbit 語義）或 volume 指定。"""
+        latency = self._config.latency_ms.get(exchange, 0.0)
+        if self._history is not None:
+            if at_ms is None:
+                # 實盤：等到目標時刻，再取錄製串流中該時刻之後的第一個快照
+                decided = time.time() * 1000
+                if latency > 0:
+                    await asyncio.sleep(latency / 1000)
+            else:
+                decided = at_ms
+            snapshot = self._history.at(exchange, symbol, decided + latency)
+        else:
+            if latency > 0:
+                await asyncio.sleep(latency / 1000)
+            manager = self._books.get((exchange, symbol))
+            try:
+                snapshot = manager.snapshot if manager else None
+            except RuntimeError:
+                snapshot = None
+        levels: Sequence[PriceLevel] = ()
+        if snapshot is not None:
+            levels = snapshot.asks if side == "bid" else snapshot.bids
+        return self._walk(exchange, symbol, side, levels, volume, notional, latency)
+
+    def _walk(
+        self,
+        exchange: str,
+        symbol: str,
+        side: str,
+        levels: Sequence[PriceLevel],
+        volume: Optional[Decimal],
+        notional: Optional[Decimal],
+        latency: float,
+    ) -> OrderResult:
+        share = self._config.depth_share
+        remaining_qty = volume
+        remaining_krw = notional
+        filled = _ZERO
+        cost = _ZERO
+        consumed = 0
+        complete = False
+        for level in levels[: self._config.max_levels]:
+            available = level.quantity if share == 1 else level.quantity * share
+            if available <= 0:
+                continue
+            if remaining_qty is not None:
+                take = min(available, remaining_qty)
+                remaining_qty -= take
+                complete = remaining_qty <= 0
+            else:
+                wanted = remaining_krw / level.price
+                take = min(available, wanted)
+                # 以金額下單時最後一檔直接清零，避免 Decimal 除法殘差拖到下一檔
+                remaining_krw = _ZERO if take == wanted else remaining_krw - take * level.price
+                complete = remaining_krw <= 0
+            filled += take
+            cost += take * level.price
+            consumed += 1
+            if complete:
+                break
+        requested = volume if volume is not None else notional
+        fee = cost * self._config.fee_rates.get(exchange, _ZERO)
+        if not complete:
+            logger.info(
+                "模擬部分成交",
+                extra={
+                    "exchange": exchange,
+                    "symbol": symbol,
+                    "side": side,
+                    "requested": str(requested),
+                    "filled": str(filled),
+                    "levels": consumed,
+                },
+            )
+        return OrderResult(
+            order_id="dryrun",
+            exchange=exchange,
+            symbol=symbol,
+            status="done" if complete else "cancel",
+            filled_quantity=filled,
+            average_price=cost / filled if filled else None,
+            raw={
+                "side": side,
+                "notional": cost,
+                "fee": fee,
+                "levels": consumed,
+                "latency_ms": latency,
+            },
+        )
+
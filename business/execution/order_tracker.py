@@ -0,0 +1,213 @@
+"""批次訂單狀態輪詢。
+
+在途訂單依交易所合併查詢：Upbit 以 /v1/orders/uuids 一次查多筆，Bithumb 以
+/info/orders 取得整個交易對的未完成清單，僅對「已從清單消失」的訂單查詢明細。
+每輪私有請求數與在途訂單數無關。
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from business.account.tables import is_final
+from core.datatypes import OrderResult
+from utils.logger import setup_logger
+
+if TYPE_CHECKING:
+    from business.account.tables import OrderTable
+    from core.wrapper.bithumb import BithumbWrapper
+    from core.wrapper.upbit import UpbitWrapper
+
+logger = setup_logger("order_tracker")
+
+
+@dataclass(slots=True)
+class TrackerConfig:
+    """輪詢間隔 = 訂單年齡 × age_factor，夾在 [min_interval, max_interval]。"""
+
+    min_interval: float = 0.1
+    max_interval: float = 2.0
+    age_factor: float = 0.5
+    batch_size: int = 100  # Upbit uuids[] 單次上限
+
+
+@dataclass(slots=True)
+class TrackerStats:
+    polls: int = 0
+    requests: int = 0
+    resolved: int = 0
+
+
+@dataclass(slots=True)
+class _Tracked:
+    exchange: str
+    order_id: str
+    symbol: str
+    placed_at: float
+    next_poll: float
+    future: asyncio.Future[OrderResult]
+    last: Optional[OrderResult] = None
+
+
+@dataclass(slots=True)
+class _Batch:
+    upbit: List[_Tracked] = field(default_factory=list)
+    bithumb: Dict[str, List[_Tracked]] = field(default_factory=dict)
+
+
+class OrderTracker:
+    """追蹤在途訂單直至終態，每筆訂單對應一個 Future。"""
+
+    def __init__(
+        self,
+        upbit: "UpbitWrapper",
+        bithumb: "BithumbWrapper",
+        *,
+        config: Optional[TrackerConfig] = None,
+        order_table: Optional["OrderTable"] = None,
+    ) -> None:
+        self._upbit = upbit
+        self._bithumb = bithumb
+        self._config = config or TrackerConfig()
+        self._order_table = order_table
+        self._tracked: Dict[str, _Tracked] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+        self.stats = TrackerStats()
+
+    def __len__(self) -> int:
+        return len(self._tracked)
+
+    def track(self, exchange: str, order_id: str, symbol: str) -> asyncio.Future[OrderResult]:
+        """開始追蹤；symbol 為交易所原生格式（KRW-BTC / BTC_KRW）。"""
+        existing = self._tracked.get(order_id)
+        if existing is not None:
+            return existing.future
+        now = time.monotonic()
+        future: asyncio.Future[OrderResult] = asyncio.get_running_loop().create_future()
+        self._tracked[order_id] = _Tracked(
+            exchange, order_id, symbol, now, now + self._config.min_interval, future
+        )
+        self._wakeup.set()
+        return future
+
+    async def wait(self, order_id: str, timeout: Optional[float] = None) -> OrderResult:
+        """等待仍在追蹤中的訂單；已終結者請直接使用 track() 回傳的 Future。"""
+        tracked = self._tracked.get(order_id)
+        if tracked is None:
+            raise KeyError(order_id)
+        return await asyncio.wait_for(asyncio.shield(tracked.future), timeout)
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="order-tracker")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for tracked in self._tracked.values():
+            tracked.future.cancel()
+        self._tracked.clear()
+
+    async def _run(self) -> None:
+        while True:
+            if not self._tracked:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            delay = min(t.next_poll for t in self._tracked.values()) - time.monotonic()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self.poll_once()
+            except Exception as exc:  # pragma: no cover - 單輪失敗時下一輪重試
+                logger.warning("訂單輪詢失敗", extra={"error": str(exc)})
+                self._reschedule_all()
+
+    async def poll_once(self, now: Optional[float] = None) -> None:
+        """查詢所有到期的訂單。"""
+        now = time.monotonic() if now is None else now
+        batch = _Batch()
+        for tracked in list(self._tracked.values()):
+            if tracked.next_poll > now:
+                continue
+            pushed = self._order_table.get(tracked.order_id) if self._order_table else None
+            if pushed is not None and is_final(pushed.status):
+                self._resolve(tracked, pushed)  # 私有推送已給出終態，無需查詢
+            elif tracked.exchange == "upbit":
+                batch.upbit.append(tracked)
+            else:
+                batch.bithumb.setdefault(tracked.symbol, []).append(tracked)
+        if not batch.upbit and not batch.bithumb:
+            return
+        self.stats.polls += 1
+        size = self._config.batch_size
+        jobs = [self._poll_upbit(batch.upbit[i : i + size]) for i in range(0, len(batch.upbit), size)]
+        jobs.extend(self._poll_bithumb(symbol, group) for symbol, group in batch.bithumb.items())
+        await asyncio.gather(*jobs)
+
+    async def _poll_upbit(self, group: List[_Tracked]) -> None:
+        self.stats.requests += 1
+        results = await self._upbit.get_orders_status([t.order_id for t in group])
+        by_id = {result.order_id: result for result in results}
+        for tracked in group:
+            self._apply(tracked, by_id.get(tracked.order_id))
+
+    async def _poll_bithumb(self, symbol: str, group: List[_Tracked]) -> None:
+        self.stats.requests += 1
+        open_orders = {result.order_id: result for result in await self._bithumb.get_open_orders(symbol)}
+        gone = [tracked for tracked in group if tracked.order_id not in open_orders]
+        for tracked in group:
+            if tracked.order_id in open_orders:
+                self._apply(tracked, open_orders[tracked.order_id])
+        if not gone:
+            return
+        self.stats.requests += len(gone)
+        details = await asyncio.gather(
+            *(self._bithumb.get_order_status(tracked.order_id) for tracked in gone),
+            return_exceptions=True,
+        )
+        for tracked, detail in zip(gone, details):
+            self._apply(tracked, None if isinstance(detail, Exception) else detail)
+
+    def _apply(self, tracked: _Tracked, result: Optional[OrderResult]) -> None:
+        if result is not None:
+            if self._order_table is not None:
+                self._order_table.update(result)
+            if is_final(result.status):
+                self._resolve(tracked, result)
+                return
+            tracked.last = result
+        tracked.next_poll = time.monotonic() + self._interval(tracked)
+
+    def _interval(self, tracked: _Tracked) -> float:
+        cfg = self._config
+        if tracked.last is not None and tracked.last.filled_quantity > 0:
+            return cfg.min_interval  # 部分成交：很可能即將完成
+        age = time.monotonic() - tracked.placed_at
+        return min(cfg.max_interval, max(cfg.min_interval, age * cfg.age_factor))
+
+    def _reschedule_all(self) -> None:
+        for tracked in self._tracked.values():
+            tracked.next_poll = time.monotonic() + self._interval(tracked)
+
+    def _resolve(self, tracked: _Tracked, result: OrderResult) -> None:
+        self._tracked.pop(tracked.order_id, None)
+        if not tracked.future.done():
+            tracked.future.set_result(result)
+        self.stats.resolved += 1
+        logger.debug(
+            "訂單已終結",
+            extra={"exchange": tracked.exchange, "order_id": tracked.order_id, "status": result.status},
+        )
@@ -0,0 +1,154 @@
+"""非阻塞執行管線：評估迴圈只負責投遞信號，下單在背景進行。
+
+- 每個交易對同一時間最多一筆執行（single-flight），執行期間的新信號只保留最新一筆；
+- 全局並發上限；
+- 待執行佇列有界，滿時丟棄最舊的信號，等待過久的信號在出隊時丟棄；
+- 未執行即丟棄的信號會交給 on_drop（例如釋放預留資金）。
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from business.strategy.signal import StrategySignal
+from utils.logger import setup_logger
+
+logger = setup_logger("execution_pipeline")
+
+ExecuteFn = Callable[[str, StrategySignal], Awaitable[None]]
+DropFn = Callable[[str, StrategySignal], None]
+
+
+@dataclass(slots=True)
+class PipelineConfig:
+    max_concurrency: int = 4
+    max_pending: int = 64
+    max_signal_age: float = 1.0  # 秒；出隊時超過即視為過期
+
+
+@dataclass(slots=True)
+class PipelineStats:
+    submitted: int = 0
+    executed: int = 0
+    failed: int = 0
+    superseded: int = 0  # 同一交易對被更新信號取代
+    dropped_overflow: int = 0
+    dropped_stale: int = 0
+
+
+class ExecutionPipeline:
+    """以交易對為 key 的執行佇列。"""
+
+    def __init__(
+        self,
+        execute: ExecuteFn,
+        config: Optional[PipelineConfig] = None,
+        *,
+        on_drop: Optional[DropFn] = None,
+    ) -> None:
+        self._execute = execute
+        self._on_drop = on_drop
+        self._config = config or PipelineConfig()
+        self._pending: "OrderedDict[str, Tuple[StrategySignal, float]]" = OrderedDict()
+        self._running: Dict[str, asyncio.Task[None]] = {}
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._closed = False
+        self.stats = PipelineStats()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._running
+
+    def submit(self, key: str, signal: StrategySignal) -> bool:
+        """投遞信號，立即返回；管線已關閉時回傳 False。"""
+        if self._closed:
+            return False
+        self.stats.submitted += 1
+        if key in self._pending:
+            self.stats.superseded += 1
+            self._drop(key, self._pending.pop(key)[0])
+        elif len(self._pending) >= self._config.max_pending:
+            dropped, (old, _) = self._pending.popitem(last=False)
+            self.stats.dropped_overflow += 1
+            logger.warning("執行佇列已滿，丟棄最舊信號", extra={"pair": dropped})
+            self._drop(dropped, old)
+        self._pending[key] = (signal, time.monotonic())
+        self._dispatch()
+        return True
+
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+        for key in list(self._pending):
+            if len(self._running) >= self._config.max_concurrency:
+                break
+            if key in self._running:
+                continue
+            signal, enqueued_at = self._pending.pop(key)
+            if now - enqueued_at > self._config.max_signal_age:
+                self.stats.dropped_stale += 1
+                logger.debug("信號等待過久，已丟棄", extra={"pair": key})
+                self._drop(key, signal)
+                continue
+            self._running[key] = asyncio.create_task(self._run(key, signal), name=f"execute-{key}")
+        if self._running or self._pending:
+            self._idle.clear()
+        else:
+            self._idle.set()
+
+    async def _run(self, key: str, signal: StrategySignal) -> None:
+        try:
+            await self._execute(key, signal)
+            self.stats.executed += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self.stats.failed += 1
+            logger.warning("執行失敗", extra={"pair": key, "error": str(exc)})
+        finally:
+            self._running.pop(key, None)
+            self._dispatch()
+
+    def _drop(self, key: str, signal: StrategySignal) -> None:
+        if self._on_drop is None:
+            return
+        try:
+            self._on_drop(key, signal)
+        except Exception as exc:  # pragma: no cover
+            logger.warning("丟棄回呼失敗", extra={"pair": key, "error": str(exc)})
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """等待佇列與執行中的訂單全部完成。"""
+        await asyncio.wait_for(self._idle.wait(), timeout)
+
+    def halt(self) -> int:
+        """同步停止接收並丟棄待執行信號，回傳丟棄筆數；執行中的訂單不受影響。"""
+        self._closed = True
+        dropped = len(self._pending)
+        while self._pending:
+            key, (signal, _) = self._pending.popitem(last=False)
+            self._drop(key, signal)
+        if not self._running:
+            self._idle.set()
+        return dropped
+
+    async def close(self, timeout: Optional[float] = 10.0) -> None:
+        """停止接收新信號、丟棄待執行信號，並等待執行中的訂單完成（不中途取消）。"""
+        self.halt()
+        if not self._running:
+            return
+        _, still_running = await asyncio.wait(list(self._running.values()), timeout=timeout)
+        for task in still_running:
+            task.cancel()
+        if still_running:
+            logger.warning("關閉時仍有訂單未完成，已取消", extra={"count": len(still_running)})
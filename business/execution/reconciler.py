@@ -0,0 +1,285 @@
+"""雙腿成交對帳：一腿成交、另一腿失敗或部分成交時，在延遲預算內補單。
+
+狀態機：OPEN →（等待兩腿終態）→ BALANCED
+                             └→ HEDGING →（補單/平倉成交）→ BALANCED
+                                        └→（預算耗盡或補單失敗）→ EXPOSED
+
+補單優先 hedge（在缺量的那一邊補齊，保留套利），失敗時改為 unwind（在多成交
+的那一邊反向平掉差額）。未能消除的淨部位按交易對累計於 exposure。
+
+提供 MarketInfo 時，補單數量按交易所精度截斷；淨部位在補單交易所不足一個最小
+單位或低於最低下單金額時視為已平衡（例如 Upbit 以金額市價買造成的正常滑價）。
+
+只有交易所明確拒絕（ExchangeRejectedError）才視為零成交；逾時或連線錯誤時
+訂單可能已被受理，該腿記為結果不明（UNKNOWN），不自動補單以免放大部位。
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from enum import Enum
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Union
+
+from business.account.tables import is_final
+from core.datatypes import OrderResult
+from core.exceptions import ExchangeRejectedError
+from core.wrapper.base import BaseExchangeWrapper
+from utils.logger import setup_logger
+
+if TYPE_CHECKING:
+    from business.account.tables import OrderTable
+    from business.execution.order_tracker import OrderTracker
+    from business.market.registry import MarketInfo
+
+logger = setup_logger("reconciler")
+
+_ZERO = Decimal("0")
+
+
+class ArbState(str, Enum):
+    OPEN = "open"
+    HEDGING = "hedging"
+    BALANCED = "balanced"
+    EXPOSED = "exposed"
+    UNKNOWN = "unknown"  # 有腿的下單結果不明，需人工或下一輪對帳確認
+
+
+@dataclass(slots=True)
+class ReconcilerConfig:
+    latency_budget: float = 2.0  # 秒；從收到下單回應到補單完成的上限
+    dust: Decimal = Decimal("0.0001")  # 無市場元數據時，低於此數量的淨部位視為已平衡
+    buy_buffer: Decimal = Decimal("0.01")  # Upbit 以金額市價買時多給的滑價緩衝
+
+
+@dataclass(slots=True)
+class Leg:
+    exchange: str
+    symbol: str
+    side: str  # bid / ask
+    requested: Decimal
+    ref_price: Decimal
+    order_id: str = ""
+    filled: Decimal = _ZERO
+    confirmed: bool = False  # 成交量是否來自終態
+    unknown: bool = False  # 下單失敗但無法確定是否已被受理
+    error: Optional[str] = None
+
+    @property
+    def signed_fill(self) -> Decimal:
+        return self.filled if self.side == "bid" else -self.filled
+
+
+@dataclass(slots=True)
+class Reconciliation:
+    pair: str
+    legs: Tuple[Leg, Leg]
+    state: ArbState = ArbState.OPEN
+    residual: Decimal = _ZERO  # 正為多出的多頭部位，負為空頭
+    corrections: List[OrderResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+LegOutcome = Union[OrderResult, BaseException]
+# (pair, side, result)：回報兩腿與補單的最終成交，例如 PnLTracker.on_result
+FillCallback = Callable[[str, str, OrderResult], None]
+
+
+class LegReconciler:
+    """以訂單追蹤器/訂單表確認兩腿最終成交量，必要時補單。"""
+
+    def __init__(
+        self,
+        upbit: BaseExchangeWrapper,
+        bithumb: BaseExchangeWrapper,
+        *,
+        config: Optional[ReconcilerConfig] = None,
+        tracker: Optional["OrderTracker"] = None,
+        order_table: Optional["OrderTable"] = None,
+        on_fill: Optional[FillCallback] = None,
+    ) -> None:
+        self._wrappers = {"upbit": upbit, "bithumb": bithumb}
+        self._config = config or ReconcilerConfig()
+        self._tracker = tracker
+        self._order_table = order_table
+        self._on_fill = on_fill
+        self._exposure: Dict[str, Decimal] = {}
+
+    @property
+    def exposure(self) -> Dict[str, Decimal]:
+        """各交易對未平的淨部位（base 數量）。"""
+        return dict(self._exposure)
+
+    async def reconcile(
+        self,
+        pair: str,
+        legs: Tuple[Leg, Leg],
+        outcomes: Tuple[LegOutcome, LegOutcome],
+        market: Optional["MarketInfo"] = None,
+    ) -> Reconciliation:
+        started = time.monotonic()
+        deadline = started + self._config.latency_budget
+        rec = Reconciliation(pair=pair, legs=legs)
+        finals = await asyncio.gather(
+            *(self._settle(leg, outcome, deadline) for leg, outcome in zip(legs, outcomes))
+        )
+        for leg, final in zip(legs, finals):
+            self._report(pair, leg.side, final)
+        if any(leg.unknown for leg in legs):
+            rec.state = ArbState.UNKNOWN
+            rec.elapsed = time.monotonic() - started
+            logger.error(
+                "下單結果不明，不自動補單",
+                extra={"pair": pair, "legs": [self._describe(leg) for leg in legs]},
+            )
+            return rec
+        net = legs[0].signed_fill + legs[1].signed_fill
+        if not self._negligible(legs, net, market):
+            rec.state = ArbState.HEDGING
+            logger.warning(
+                "雙腿成交不平衡，開始補單",
+                extra={"pair": pair, "net": str(net), "legs": [self._describe(leg) for leg in legs]},
+            )
+            net = await self._correct(rec, net, deadline, market)
+        rec.residual = _ZERO if self._negligible(legs, net, market) else net
+        if rec.state is not ArbState.UNKNOWN:
+            rec.state = ArbState.EXPOSED if rec.residual else ArbState.BALANCED
+        rec.elapsed = time.monotonic() - started
+        if rec.residual:
+            self._exposure[pair] = self._exposure.get(pair, _ZERO) + rec.residual
+            logger.error(
+                "補單後仍有淨部位",
+                extra={"pair": pair, "residual": str(rec.residual), "total": str(self._exposure[pair])},
+            )
+        elif rec.corrections:
+            logger.info("補單完成", extra={"pair": pair, "elapsed_ms": round(rec.elapsed * 1000, 1)})
+        return rec
+
+    async def _settle(self, leg: Leg, outcome: LegOutcome, deadline: float) -> Optional[OrderResult]:
+        """等待單腿進入終態並寫回成交量，回傳終態結果（未能確認時為 None）。
+
+        交易所明確拒絕視為零成交；其他下單錯誤（逾時、連線中斷、5xx）沒有訂單編號
+        可查，記為結果不明。已受理但無法確認終態時假定市價單全數成交，
+        避免對未知狀態盲目補單而放大部位。
+        """
+        if isinstance(outcome, BaseException):
+            leg.error = str(outcome) or type(outcome).__name__
+            if isinstance(outcome, ExchangeRejectedError):
+                leg.confirmed = True
+            else:
+                leg.unknown = True
+            return None
+        leg.order_id = outcome.order_id
+        final = outcome if is_final(outcome.status) else await self._wait_final(leg, deadline)
+        if final is not None:
+            leg.filled = final.filled_quantity
+            leg.confirmed = True
+        else:
+            leg.filled = leg.requested
+        return final
+
+    async def _wait_final(self, leg: Leg, deadline: float) -> Optional[OrderResult]:
+        timeout = max(0.0, deadline - time.monotonic())
+        try:
+            if self._tracker is not None:
+                future = self._tracker.track(leg.exchange, leg.order_id, leg.symbol)
+                return await asyncio.wait_for(asyncio.shield(future), timeout)
+            if self._order_table is not None:
+                return await self._order_table.wait_final(leg.order_id, timeout)
+        except asyncio.TimeoutError:
+            logger.warning("等待成交逾時", extra={"exchange": leg.exchange, "order_id": leg.order_id})
+        return None
+
+    @staticmethod
+    def _plan(legs: Tuple[Leg, Leg], net: Decimal) -> Tuple[Tuple[Leg, str], Tuple[Leg, str]]:
+        buy_leg, sell_leg = legs if legs[0].side == "bid" else (legs[1], legs[0])
+        # net > 0：買多了 → 在賣腿交易所補賣（hedge），否則在買腿交易所賣回（unwind）
+        # net < 0：賣多了 → 在買腿交易所補買（hedge），否則在賣腿交易所買回（unwind）
+        if net > 0:
+            return (sell_leg, "ask"), (buy_leg, "ask")
+        return (buy_leg, "bid"), (sell_leg, "bid")
+
+    @staticmethod
+    def _order_quantity(market: Optional["MarketInfo"], leg: Leg, quantity: Decimal) -> Decimal:
+        """按交易所精度截斷；不足一個最小單位或低於最低下單金額時回傳 0。"""
+        if market is None:
+            return quantity
+        quantity = market.round_quantity(leg.exchange, quantity)
+        if not quantity or not market.meets_minimum(leg.exchange, quantity, leg.ref_price):
+            return _ZERO
+        return quantity
+
+    def _negligible(self, legs: Tuple[Leg, Leg], net: Decimal, market: Optional["MarketInfo"]) -> bool:
+        if abs(net) < self._config.dust:
+            return True
+        if market is None:
+            return False
+        hedge_leg, _ = self._plan(legs, net)[0]
+        return not self._order_quantity(market, hedge_leg, abs(net))
+
+    async def _correct(
+        self, rec: Reconciliation, net: Decimal, deadline: float, market: Optional["MarketInfo"] = None
+    ) -> Decimal:
+        for leg, side in self._plan(rec.legs, net):
+            if time.monotonic() >= deadline:
+                break
+            quantity = self._order_quantity(market, leg, abs(net))
+            if not quantity:
+                logger.info(
+                    "補單數量低於交易所下限，略過",
+                    extra={"pair": rec.pair, "exchange": leg.exchange, "side": side, "net": str(net)},
+                )
+                continue
+            try:
+                result = await asyncio.wait_for(
+                    self._place(leg, side, quantity), max(0.0, deadline - time.monotonic())
+                )
+            except ExchangeRejectedError as exc:
+                logger.warning(
+                    "補單被拒",
+                    extra={"pair": rec.pair, "exchange": leg.exchange, "side": side, "error": str(exc)},
+                )
+                continue
+            except Exception as exc:
+                # 補單可能已被受理：不再改以反向平倉，避免重複
+                rec.state = ArbState.UNKNOWN
+                logger.error(
+                    "補單結果不明，停止補單",
+                    extra={"pair": rec.pair, "exchange": leg.exchange, "side": side, "error": repr(exc)},
+                )
+                break
+            rec.corrections.append(result)
+            self._report(rec.pair, side, result)  # 先登記，終態未及確認時仍可由訂單表補記
+            correction = Leg(leg.exchange, leg.symbol, side, quantity, leg.ref_price, result.order_id)
+            self._report(rec.pair, side, await self._settle(correction, result, deadline))
+            filled = correction.filled
+            net += filled if side == "bid" else -filled
+            if self._negligible(rec.legs, net, market):
+                break
+        return net
+
+    async def _place(self, leg: Leg, side: str, quantity: Decimal) -> OrderResult:
+        # 補單在延遲預算內降低單腿風險，走限流優先通道
+        wrapper = self._wrappers[leg.exchange]
+        if side == "ask":
+            return await wrapper.sell_market_order(leg.symbol, quantity, priority=True)
+        if leg.exchange == "upbit":
+            # Upbit 市價買以 KRW 金額下單
+            amount = (quantity * leg.ref_price * (1 + self._config.buy_buffer)).quantize(Decimal("1"))
+            return await wrapper.buy_market_order(leg.symbol, amount, priority=True)
+        return await wrapper.buy_market_order(leg.symbol, quantity, priority=True)
+
+    def _report(self, pair: str, side: str, result: Optional[OrderResult]) -> None:
+        if self._on_fill is not None and result is not None:
+            self._on_fill(pair, side, result)
+
+    @staticmethod
+    def _describe(leg: Leg) -> Dict[str, str]:
+        return {
+            "exchange": leg.exchange,
+            "side": leg.side,
+            "requested": str(leg.requested),
+            "filled": str(leg.filled),
+            "error": leg.error or "",
+        }
@@ -0,0 +1,13 @@
+"""市場元數據模塊導出。"""
+from .precision import krw_tick_size, round_price, round_quantity
+from .registry import EXCHANGE_RULES, ExchangeRules, MarketInfo, MarketRegistry
+
+__all__ = [
+    "EXCHANGE_RULES",
+    "ExchangeRules",
+    "MarketInfo",
+    "MarketRegistry",
+    "krw_tick_size",
+    "round_price",
+    "round_quantity",
+]
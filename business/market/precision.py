@@ -0,0 +1,37 @@
+"""KRW 市場的價格檔位與數量精度。"""
+from __future__ import annotations
+
+from decimal import ROUND_CEILING, ROUND_DOWN, ROUND_FLOOR, Decimal
+
+# (價格下限, 檔位)，由高到低；兩家交易所 KRW 市場共用此表
+_KRW_TICKS = (
+    (Decimal("2000000"), Decimal("1000")),
+    (Decimal("1000000"), Decimal("500")),
+    (Decimal("500000"), Decimal("100")),
+    (Decimal("100000"), Decimal("50")),
+    (Decimal("10000"), Decimal("10")),
+    (Decimal("1000"), Decimal("1")),
+    (Decimal("100"), Decimal("0.1")),
+    (Decimal("10"), Decimal("0.01")),
+    (Decimal("1"), Decimal("0.001")),
+)
+_MIN_TICK = Decimal("0.0001")
+
+
+def krw_tick_size(price: Decimal) -> Decimal:
+    for threshold, tick in _KRW_TICKS:
+        if price >= threshold:
+            return tick
+    return _MIN_TICK
+
+
+def round_price(price: Decimal, side: str) -> Decimal:
+    """按檔位取整：買單向下、賣單向上，避免比預期價格更差。"""
+    tick = krw_tick_size(price)
+    rounding = ROUND_FLOOR if side in ("bid", "buy") else ROUND_CEILING
+    return ((price / tick).to_integral_value(rounding=rounding) * tick).quantize(tick)
+
+
+def round_quantity(quantity: Decimal, decimals: int) -> Decimal:
+    """數量一律向下截斷至交易所允許的小數位。"""
+    return quantity.quantize(Decimal(1).scaleb(-decimals), rounding=ROUND_DOWN)
@@ -0,0 +1,195 @@
+"""兩家交易所共同上架市場的元數據註冊表。
+
+啟動時載入一次 Upbit 市場清單與 Bithumb ticker 清單並寫入磁碟快取，
+在 TTL 內重啟無需再打 API；交易對驗證、符號映射與下單模板皆由此取得。
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from business.market.precision import krw_tick_size, round_price, round_quantity
+from utils.logger import setup_logger
+
+if TYPE_CHECKING:
+    from core.wrapper.bithumb import BithumbWrapper
+    from core.wrapper.upbit import UpbitWrapper
+
+logger = setup_logger("market_registry")
+
+
+@dataclass(frozen=True, slots=True)
+class ExchangeRules:
+    """單一交易所 KRW 市場的下單規則。"""
+
+    quantity_decimals: int
+    min_notional: Decimal
+
+
+EXCHANGE_RULES: Dict[str, ExchangeRules] = {
+    "upbit": ExchangeRules(quantity_decimals=8, min_notional=Decimal("5000")),
+    "bithumb": ExchangeRules(quantity_decimals=4, min_notional=Decimal("500")),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class MarketInfo:
+    """單一交易對（兩家皆上架）的符號映射與下單模板。"""
+
+    base: str
+    quote: str
+    upbit_symbol: str
+    bithumb_symbol: str
+    upbit_template: Mapping[str, str] = field(default_factory=dict)
+    bithumb_template: Mapping[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, base: str, quote: str = "KRW") -> "MarketInfo":
+        return cls(
+            base=base,
+            quote=quote,
+            upbit_symbol=f"{quote}-{base}",
+            bithumb_symbol=f"{base}_{quote}",
+            upbit_template={"market": f"{quote}-{base}"},
+            bithumb_template={"order_currency": base, "payment_currency": quote},
+        )
+
+    def symbol(self, exchange: str) -> str:
+        return self.upbit_symbol if exchange == "upbit" else self.bithumb_symbol
+
+    def template(self, exchange: str) -> Mapping[str, str]:
+        return self.upbit_template if exchange == "upbit" else self.bithumb_template
+
+    def tick_size(self, price: Decimal) -> Decimal:
+        return krw_tick_size(price)
+
+    def round_price(self, price: Decimal, side: str) -> Decimal:
+        return round_price(price, side)
+
+    def round_quantity(self, exchange: str, quantity: Decimal) -> Decimal:
+        return round_quantity(quantity, EXCHANGE_RULES[exchange].quantity_decimals)
+
+    def meets_minimum(self, exchange: str, quantity: Decimal, price: Decimal) -> bool:
+        return quantity * price >= EXCHANGE_RULES[exchange].min_notional
+
+
+class MarketRegistry:
+    """以 base 幣種索引的共同市場；另保留單邊上架的幣種供診斷。"""
+
+    def __init__(
+        self,
+        upbit_markets: Iterable[str],
+        bithumb_markets: Iterable[str],
+        *,
+        fetched_at: Optional[float] = None,
+    ) -> None:
+        self._upbit_raw = sorted(set(upbit_markets))
+        self._bithumb_raw = sorted(set(bithumb_markets))
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        upbit_bases = {m.split("-", 1)[1] for m in self._upbit_raw if m.startswith("KRW-")}
+        bithumb_bases = {m.split("_", 1)[0] for m in self._bithumb_raw if m.endswith("_KRW")}
+        self._markets: Dict[str, MarketInfo] = {
+            base: MarketInfo.build(base) for base in sorted(upbit_bases & bithumb_bases)
+        }
+        self._by_symbol: Dict[str, MarketInfo] = {}
+        for info in self._markets.values():
+            self._by_symbol[info.upbit_symbol] = info
+            self._by_symbol[info.bithumb_symbol] = info
+        self.upbit_only = sorted(upbit_bases - bithumb_bases)
+        self.bithumb_only = sorted(bithumb_bases - upbit_bases)
+
+    def __len__(self) -> int:
+        return len(self._markets)
+
+    def __contains__(self, base: str) -> bool:
+        return base.upper() in self._markets
+
+    def get(self, base: str) -> Optional[MarketInfo]:
+        return self._markets.get(base.upper())
+
+    def by_symbol(self, symbol: str) -> Optional[MarketInfo]:
+        """以任一交易所的原生符號（KRW-BTC / BTC_KRW）查詢。"""
+        return self._by_symbol.get(symbol)
+
+    @property
+    def bases(self) -> List[str]:
+        return list(self._markets)
+
+    def resolve(self, entries: Sequence[str]) -> Tuple[List[MarketInfo], List[str]]:
+        """解析 pairs.yaml 條目（如 "XRP/KRW"），回傳（可交易市場, 無法交易的條目）。"""
+        resolved: List[MarketInfo] = []
+        missing: List[str] = []
+        seen = set()
+        for entry in entries:
+            base, _, quote = str(entry).partition("/")
+            base = base.strip().upper()
+            if not base or base in seen:
+                continue
+            seen.add(base)
+            info = self._markets.get(base)
+            if info is None or (quote and quote.strip().upper() != info.quote):
+                missing.append(str(entry))
+            else:
+                resolved.append(info)
+        return resolved, missing
+
+    # ---- 載入與快取 ----
+    @classmethod
+    async def fetch(cls, upbit: "UpbitWrapper", bithumb: "BithumbWrapper") -> "MarketRegistry":
+        upbit_markets, bithumb_markets = await asyncio.gather(upbit.get_markets(), bithumb.get_markets())
+        registry = cls(upbit_markets, bithumb_markets)
+        logger.info(
+            "市場清單已更新",
+            extra={
+                "common": len(registry),
+                "upbit_only": len(registry.upbit_only),
+                "bithumb_only": len(registry.bithumb_only),
+            },
+        )
+        return registry
+
+    @classmethod
+    async def load(
+        cls,
+        upbit: "UpbitWrapper",
+        bithumb: "BithumbWrapper",
+        *,
+        cache_path: Optional[Path] = None,
+        ttl: float = 86_400.0,
+    ) -> "MarketRegistry":
+        """優先讀取未過期的磁碟快取，否則向交易所拉取並寫回快取。"""
+        if cache_path is not None:
+            cached = cls.from_cache(cache_path, ttl=ttl)
+            if cached is not None:
+                return cached
+        registry = await cls.fetch(upbit, bithumb)
+        if cache_path is not None:
+            registry.save(cache_path)
+        return registry
+
+    @classmethod
+    def from_cache(cls, path: Path, *, ttl: float) -> Optional["MarketRegistry"]:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            fetched_at = float(data["fetched_at"])
+            upbit_markets, bithumb_markets = data["upbit"], data["bithumb"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if time.time() - fetched_at > ttl:
+            return None
+        logger.debug("使用市場快取", extra={"path": str(path), "age_s": round(time.time() - fetched_at)})
+        return cls(upbit_markets, bithumb_markets, fetched_at=fetched_at)
+
+    def save(self, path: Path) -> None:
+        """以臨時檔 + rename 原子寫入，避免並行啟動讀到半截檔案。"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"fetched_at": self.fetched_at, "upbit": self._upbit_raw, "bithumb": self._bithumb_raw}
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp, path)
@@ -2,51 +2,262 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Awaitable, Callable, Optional
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Deque, Dict, Hashable, Optional
 
 from core.datatypes import OrderBook
 from core.wrapper.base import BaseExchangeWrapper
+from business.orderbook.mailbox import BookMailbox, MailboxStats
 from business.orderbook.manager import OrderBookManager
+from utils.backoff import ExponentialBackoff
 from utils.logger import setup_logger
 
+if TYPE_CHECKING:
+    from business.orderbook.freshness import FreshnessMonitor
+    from utils.event_bus import EventBus
+
 logger = setup_logger("orderbook_feed")
 
+PRIMARY = "primary"
+STANDBY = "standby"
+
+
+@dataclass(slots=True)
+class FeedConfig:
+    """行情連線配置。"""
+
+    hot_standby: bool = False
+    silence_timeout: float = 3.0  # 主連線靜默超過此秒數即由熱備接手
+    backoff_base: float = 0.2
+    backoff_cap: float = 10.0
+    # True：推送為完整快照，只處理最新一筆；False：增量流，依序排隊
+    conflate: bool = True
+    max_queue: int = 256
+
+
+@dataclass(slots=True)
+class FeedStats:
+    """切換與去重統計，gap 為最後一筆有效幀到切換後首筆有效幀的間隔。"""
+
+    failovers: int = 0
+    reconnects: int = 0
+    duplicates: int = 0
+    last_gap_ms: float = 0.0
+    max_gap_ms: float = 0.0
+    recent_gaps_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=64))
+
 
 class OrderBookFeed:
-    """維護單一交易對的行情訂閱與 OrderBookManager。"""
+    """維護單一交易對的行情訂閱與 OrderBookManager，可選熱備連線。"""
 
-    def __init__(self, wrapper: BaseExchangeWrapper, symbol: str, manager: OrderBookManager) -> None:
+    def __init__(
+        self,
+        wrapper: BaseExchangeWrapper,
+        symbol: str,
+        manager: OrderBookManager,
+        *,
+        config: Optional[FeedConfig] = None,
+        freshness: Optional["FreshnessMonitor"] = None,
+        bus: Optional["EventBus"] = None,
+    ) -> None:
         self._wrapper = wrapper
+        # 以 manager 作為新鮮度 key，引擎可直接以 PairContext 上的 manager 查詢
+        self._freshness = freshness
         self._symbol = symbol
         self._manager = manager
-        self._task: Optional[asyncio.Task[None]] = None
+        self._config = config or FeedConfig()
+        self._roles = (PRIMARY, STANDBY) if self._config.hot_standby else (PRIMARY,)
+        self._tasks: Dict[str, asyncio.Task[None]] = {}
         self._stopping = asyncio.Event()
+        self._stats = FeedStats()
+        self._active = PRIMARY
+        self._up: Dict[str, bool] = {role: False for role in self._roles}
+        self._frames: Dict[str, int] = {role: 0 for role in self._roles}
+        self._seen: set[str] = set()
+        self._last_active_frame = time.monotonic()
+        self._last_sequence = 0
+        self._gap_since: Optional[float] = None
+        self._mailbox = BookMailbox(conflate=self._config.conflate, maxsize=self._config.max_queue, name=symbol)
+        self._consumer: Optional[asyncio.Task[None]] = None
+        # 寫入 manager 後以 (OrderBook, symbol) 主題廣播，供記錄器 / 其他策略訂閱
+        self._channel = bus.channel(OrderBook, symbol) if bus is not None else None
+
+    @property
+    def stats(self) -> FeedStats:
+        return self._stats
+
+    @property
+    def mailbox_stats(self) -> MailboxStats:
+        return self._mailbox.stats
+
+    @property
+    def queue_depth(self) -> int:
+        return self._mailbox.depth
+
+    @property
+    def active_role(self) -> str:
+        return self._active
 
     async def start(self) -> None:
         """初始化快照並啟動訂閱。"""
-        await self._manager.initialize(self._wrapper, self._symbol)
+        snapshot = await self._manager.initialize(self._wrapper, self._symbol)
+        self._last_sequence = snapshot.sequence
+        self._last_active_frame = time.monotonic()
         self._stopping.clear()
-        self._task = asyncio.create_task(self._run(), name=f"orderbook-feed-{self._symbol}")
+        if self._freshness is not None:
+            self._freshness.watch(self._manager, self._on_stale, name=self._symbol)
+        self._consumer = asyncio.create_task(self._consume(), name=f"orderbook-apply-{self._symbol}")
+        for role in self._roles:
+            self._spawn(role)
 
     async def stop(self) -> None:
         self._stopping.set()
-        if self._task:
-            self._task.cancel()
+        if self._freshness is not None:
+            self._freshness.unwatch(self._manager)
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        if self._consumer is not None:
+            tasks.append(self._consumer)
+            self._consumer = None
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
             try:
-                await self._task
+                await task
             except asyncio.CancelledError:
                 pass
-            self._task = None
 
-    async def _run(self) -> None:
+    def _spawn(self, role: str) -> None:
+        self._tasks[role] = asyncio.create_task(
+            self._run(role),
+            name=f"orderbook-feed-{self._symbol}-{role}",
+        )
+
+    def _restart(self, role: str) -> None:
+        """強制重建靜默但未斷線的連線。"""
+        task = self._tasks.get(role)
+        if task and not task.done():
+            task.cancel()
+        self._mark_down(role)
+        if not self._stopping.is_set():
+            self._spawn(role)
+
+    def _on_stale(self, _key: Hashable) -> None:
+        """訂單簿過期時重建目前使用中的連線（靜默未斷線的情況不會自行重連）。"""
+        self._restart(self._active)
+
+    async def _run(self, role: str) -> None:
+        backoff = ExponentialBackoff(self._config.backoff_base, self._config.backoff_cap)
+        callback = partial(self._on_update, role)
         while not self._stopping.is_set():
+            self._frames[role] = 0
             try:
-                await self._wrapper.subscribe_orderbook(self._symbol, self._on_update)
+                await self._wrapper.subscribe_orderbook(self._symbol, callback)
             except asyncio.CancelledError:
                 raise
             except Exception as exc:  # pragma: no cover - 需實際連線才會觸發
-                logger.warning("訂閱失敗，5 秒後重試", extra={"symbol": self._symbol, "error": str(exc)})
-                await asyncio.sleep(5)
+                logger.warning(
+                    "訂閱失敗",
+                    extra={"symbol": self._symbol, "role": role, "error": str(exc)},
+                )
+            self._mark_down(role)
+            if self._frames[role]:
+                backoff.reset()  # 上一條連線曾正常收幀，從最短延遲重新開始
+            delay = backoff.next_delay()
+            self._stats.reconnects += 1
+            logger.info(
+                "行情連線中斷，退避後重連",
+                extra={"symbol": self._symbol, "role": role, "delay": round(delay, 3)},
+            )
+            await asyncio.sleep(delay)
+
+    def _mark_down(self, role: str) -> None:
+        self._up[role] = False
+        if role != self._active:
+            return
+        if self._gap_since is None:
+            self._gap_since = self._last_active_frame
+        for other in self._roles:
+            if other != role and self._up[other]:
+                self._switch(other, reason="disconnect")
+                break
+
+    def _switch(self, role: str, *, reason: str) -> None:
+        previous = self._active
+        self._active = role
+        self._stats.failovers += 1
+        if self._gap_since is None:
+            self._gap_since = self._last_active_frame
+        logger.warning(
+            "行情切換至熱備連線",
+            extra={"symbol": self._symbol, "from": previous, "to": role, "reason": reason},
+        )
 
-    async def _on_update(self, orderbook: OrderBook) -> None:
-        await self._manager.handle_orderbook_event(orderbook)
+    async def _on_update(self, role: str, orderbook: OrderBook) -> None:
+        now = time.monotonic()
+        self._frames[role] += 1
+        self._up[role] = True
+        self._seen.add(role)
+        if role != self._active:
+            active_alive = self._up[self._active] and now - self._last_active_frame < self._config.silence_timeout
+            if active_alive:
+                return  # 熱備只保持訂閱，不重複處理
+            if self._active not in self._seen:
+                self._active = role  # 啟動時主連線尚未收幀，直接採用先到者
+            else:
+                silent = self._active if self._up[self._active] else None
+                self._switch(role, reason="silence" if silent else "disconnect")
+                if silent:
+                    self._restart(silent)
+        self._last_active_frame = now
+        if orderbook.sequence and orderbook.sequence <= self._last_sequence:
+            self._stats.duplicates += 1
+            return
+        self._last_sequence = orderbook.sequence
+        if self._gap_since is not None:
+            gap_ms = (now - self._gap_since) * 1000
+            self._gap_since = None
+            self._stats.last_gap_ms = gap_ms
+            self._stats.max_gap_ms = max(self._stats.max_gap_ms, gap_ms)
+            self._stats.recent_gaps_ms.append(gap_ms)
+            logger.info("行情恢復", extra={"symbol": self._symbol, "role": role, "gap_ms": round(gap_ms, 3)})
+        self._mailbox.put(orderbook)
+
+    async def _consume(self) -> None:
+        """把信箱中的訂單簿寫入 manager；與 WS 讀取解耦。
+
+        新鮮度在成功套用後才更新：消費端持續失敗時訂單簿會如實轉為過期。
+        """
+        mailbox = self._mailbox
+        floor = 0
+        while True:
+            orderbook = await mailbox.get()
+            try:
+                if mailbox.take_resync():
+                    try:
+                        snapshot = await self._manager.initialize(self._wrapper, self._symbol)
+                        floor = snapshot.sequence
+                    except Exception as exc:
+                        # 不在舊基底上套用增量，下一筆再重建
+                        logger.warning("快照重建失敗", extra={"symbol": self._symbol, "error": str(exc)})
+                        mailbox.request_resync()
+                        continue
+                if floor and orderbook.sequence and orderbook.sequence <= floor:
+                    continue  # 已包含在重建快照中
+                await self._manager.handle_orderbook_event(orderbook)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(
+                    "套用訂單簿失敗，改以快照重建",
+                    extra={"symbol": self._symbol, "sequence": orderbook.sequence, "error": str(exc)},
+                )
+                mailbox.request_resync()
+                continue
+            if self._freshness is not None:
+                self._freshness.touch(self._manager)
+            if self._channel is not None:
+                self._channel.publish(orderbook)
@@ -0,0 +1,133 @@
+"""訂單簿新鮮度監控。
+
+行情連線可能停止推送卻不報錯，策略若繼續使用舊快照就會對著過期價格下單。
+每本訂單簿在時間輪上只掛一個檢查點：收幀時只更新 last_seen（O(1)，不動時間輪），
+檢查點到期時若期間有收幀就順延，否則標記為過期並通知持有者（通常是重新訂閱）；
+之後每隔 stale_after 再通知一次，直到恢復收幀。
+檢查點帶有 watch 的世代編號；unwatch 或重新 watch 後，舊世代的檢查點到期即丟棄。
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from utils.logger import setup_logger
+from utils.timer_wheel import TimerWheel
+
+logger = setup_logger("orderbook_freshness")
+
+StaleCallback = Callable[[Hashable], None]
+
+
+@dataclass(slots=True)
+class _Watch:
+    name: str
+    last_seen: float
+    on_stale: Optional[StaleCallback]
+    generation: int
+    stale: bool = False
+
+
+class FreshnessMonitor:
+    def __init__(
+        self,
+        stale_after: float = 5.0,
+        tick: float = 0.1,
+        slots: int = 256,
+        *,
+        start: Optional[float] = None,
+    ) -> None:
+        self._stale_after = stale_after
+        self._wheel: TimerWheel[Tuple[Hashable, int]] = TimerWheel(
+            tick, slots, start=time.monotonic() if start is None else start
+        )
+        self._watches: Dict[Hashable, _Watch] = {}
+        self._generations = itertools.count(1)
+        self._stale: Set[Hashable] = set()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def stale_count(self) -> int:
+        return len(self._stale)
+
+    def watch(
+        self,
+        key: Hashable,
+        on_stale: Optional[StaleCallback] = None,
+        *,
+        name: str = "",
+        now: Optional[float] = None,
+    ) -> None:
+        now = time.monotonic() if now is None else now
+        generation = next(self._generations)
+        self._watches[key] = _Watch(name or str(key), now, on_stale, generation)
+        self._stale.discard(key)
+        self._wheel.schedule((key, generation), now + self._stale_after)
+
+    def unwatch(self, key: Hashable) -> None:
+        # 時間輪上的檢查點到期時會因世代不符而丟棄
+        self._watches.pop(key, None)
+        self._stale.discard(key)
+
+    def touch(self, key: Hashable, now: Optional[float] = None) -> None:
+        watch = self._watches.get(key)
+        if watch is None:
+            return
+        watch.last_seen = time.monotonic() if now is None else now
+        if watch.stale:
+            watch.stale = False
+            self._stale.discard(key)
+            logger.info("訂單簿恢復更新", extra={"book": watch.name})
+
+    def is_fresh(self, key: Hashable) -> bool:
+        """未監控的 key 視為新鮮。"""
+        return key not in self._stale
+
+    def advance(self, now: Optional[float] = None) -> List[Hashable]:
+        """處理到期的檢查點，回傳本次新判定為過期的 key。"""
+        now = time.monotonic() if now is None else now
+        newly_stale: List[Hashable] = []
+        for entry in self._wheel.advance(now):
+            key, generation = entry
+            watch = self._watches.get(key)
+            if watch is None or watch.generation != generation:
+                continue
+            deadline = watch.last_seen + self._stale_after
+            if deadline > now:
+                self._wheel.schedule(entry, deadline)
+                continue
+            if not watch.stale:
+                watch.stale = True
+                self._stale.add(key)
+                newly_stale.append(key)
+                logger.warning(
+                    "訂單簿過期",
+                    extra={"book": watch.name, "silent_s": round(now - watch.last_seen, 3)},
+                )
+            self._wheel.schedule(entry, now + self._stale_after)
+            if watch.on_stale is not None:
+                try:
+                    watch.on_stale(key)
+                except Exception as exc:  # pragma: no cover
+                    logger.warning("過期回呼失敗", extra={"book": watch.name, "error": str(exc)})
+        return newly_stale
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="orderbook-freshness")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._wheel.tick)
+            self.advance()
@@ -0,0 +1,91 @@
+"""WS 讀取端與 OrderBookManager 之間的信箱。
+
+讀取端只做同步的 put，不再等待下游處理，慢速消費者不會塞住 socket：
+- conflate 模式（完整快照，如 Upbit）：只保留最新一筆，未被取走的舊快照直接覆蓋；
+- queue 模式（增量流）：依序排隊、有上限；溢出時清空並要求消費者以 REST 快照重建，
+  避免丟失中間增量後套出錯誤的訂單簿。
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional
+
+from core.datatypes import OrderBook
+from utils.logger import setup_logger
+
+logger = setup_logger("orderbook_mailbox")
+
+
+@dataclass(slots=True)
+class MailboxStats:
+    received: int = 0
+    delivered: int = 0
+    conflated: int = 0  # 被較新快照覆蓋而未處理的筆數
+    overflows: int = 0  # queue 模式溢出（觸發重建）次數
+    max_depth: int = 0
+
+
+class BookMailbox:
+    def __init__(self, *, conflate: bool = True, maxsize: int = 256, name: str = "") -> None:
+        self._conflate = conflate
+        self._maxsize = maxsize
+        self._name = name
+        self._latest: Optional[OrderBook] = None
+        self._queue: Deque[OrderBook] = deque()
+        self._ready = asyncio.Event()
+        self._resync = False
+        self.stats = MailboxStats()
+
+    @property
+    def depth(self) -> int:
+        if self._conflate:
+            return 1 if self._latest is not None else 0
+        return len(self._queue)
+
+    def put(self, orderbook: OrderBook) -> None:
+        stats = self.stats
+        stats.received += 1
+        if self._conflate:
+            if self._latest is not None:
+                stats.conflated += 1
+            self._latest = orderbook
+            stats.max_depth = max(stats.max_depth, 1)
+        else:
+            queue = self._queue
+            if len(queue) >= self._maxsize:
+                stats.overflows += 1
+                queue.clear()
+                self._resync = True
+                logger.warning("增量佇列溢出，改以快照重建", extra={"book": self._name, "maxsize": self._maxsize})
+            queue.append(orderbook)
+            if len(queue) > stats.max_depth:
+                stats.max_depth = len(queue)
+        self._ready.set()
+
+    async def get(self) -> OrderBook:
+        """取出下一筆；take_resync() 應在每次取出前檢查。"""
+        while True:
+            if self._conflate:
+                if self._latest is not None:
+                    orderbook, self._latest = self._latest, None
+                    break
+            elif self._queue:
+                orderbook = self._queue.popleft()
+                break
+            self._ready.clear()
+            await self._ready.wait()
+        if not self.depth:
+            self._ready.clear()
+        self.stats.delivered += 1
+        return orderbook
+
+    def request_resync(self) -> None:
+        """套用或重建失敗時由消費端呼叫，下一筆取出前再以快照重建。"""
+        self._resync = True
+
+    def take_resync(self) -> bool:
+        """溢出後回傳一次 True；佇列中剩下的增量接在重建後的快照之後。"""
+        resync, self._resync = self._resync, False
+        return resync
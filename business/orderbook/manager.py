@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from typing import Optional
 
 from core.datatypes import OrderBook
@@ -35,6 +36,7 @@ class OrderBookManager:
     async def update_full(self, orderbook: OrderBook) -> OrderBookSnapshot:
         async with self._lock:
             self._snapshot = OrderBookSnapshot.from_orderbook(orderbook)
+            self._snapshot.applied_ns = time.perf_counter_ns()
             logger.debug(
                 "更新完整訂單簿",
                 extra={"symbol": orderbook.symbol, "sequence": orderbook.sequence},
@@ -46,6 +48,7 @@ class OrderBookManager:
             if not self._snapshot:
                 raise RuntimeError("尚未初始化，無法套用增量")
             delta.apply(self._snapshot)
+            self._snapshot.applied_ns = time.perf_counter_ns()
             logger.debug(
                 "套用增量",
                 extra={"symbol": self._snapshot.symbol, "sequence": self._snapshot.sequence},
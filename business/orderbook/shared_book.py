@@ -0,0 +1,204 @@
+"""跨進程共享的訂單簿前檔：每個 (exchange, symbol) 佔一個固定大小的槽位。
+
+- 價格與數量以 int64 定點（×1e8）儲存，保留前 depth 檔；8 位小數內無誤差。
+- 每個槽位以 seqlock 保護：寫入端先將序號設為奇數、寫入內容、再設為偶數；
+  讀取端在序號為奇數或前後不一致時重讀。每個槽位只允許單一寫入進程。
+- 讀寫順序依賴 x86 的 TSO 記憶體模型（store 不會彼此重排），其他架構未驗證。
+- received_ns / parsed_ns / applied_ns 為 perf_counter_ns（CLOCK_MONOTONIC），
+  同一主機的進程間可直接比較。
+"""
+from __future__ import annotations
+
+import struct
+import time
+from decimal import Decimal
+from multiprocessing import shared_memory
+from typing import Callable, List, Optional, Tuple
+
+from business.orderbook.snapshot import OrderBookSnapshot
+from core.datatypes import OrderBook, PriceLevel
+
+SCALE_EXP = 8
+_SEQ = struct.Struct("<Q")
+# sequence, timestamp, received_ns, parsed_ns, applied_ns, received_at, n_bids, n_asks
+_HEADER = "5qd2I"
+_READ_RETRIES = 64
+
+# (region 名稱, 槽位數, 檔數)；可序列化後交給子進程 attach
+RegionSpec = Tuple[str, int, int]
+
+
+def _body(depth: int) -> struct.Struct:
+    # 表頭後接 depth 檔買盤、depth 檔賣盤，每檔 (price, quantity)
+    return struct.Struct(f"<{_HEADER}{4 * depth}q")
+
+
+def _to_fixed(value: Decimal) -> int:
+    return int(value.scaleb(SCALE_EXP))
+
+
+def _from_fixed(value: int) -> Decimal:
+    return Decimal(value).scaleb(-SCALE_EXP)
+
+
+class SharedBookRegion:
+    def __init__(self, shm: shared_memory.SharedMemory, slots: int, depth: int, owner: bool) -> None:
+        self._shm = shm
+        self._slots = slots
+        self._depth = depth
+        self._owner = owner
+        self._body = _body(depth)
+        self.slot_size = _SEQ.size + self._body.size
+
+    @classmethod
+    def create(cls, slots: int, depth: int = 5) -> "SharedBookRegion":
+        size = slots * (_SEQ.size + _body(depth).size)
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        shm.buf[:size] = bytes(size)
+        return cls(shm, slots, depth, owner=True)
+
+    @classmethod
+    def attach(cls, spec: RegionSpec) -> "SharedBookRegion":
+        name, slots, depth = spec
+        # spawn 的子進程沿用父進程的 resource_tracker，重複登記無害；由建立者 unlink
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, slots, depth, owner=False)
+
+    @property
+    def spec(self) -> RegionSpec:
+        return (self._shm.name, self._slots, self._depth)
+
+    @property
+    def slots(self) -> int:
+        return self._slots
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    def writer(self, slot: int) -> "SharedBookWriter":
+        return SharedBookWriter(self, self._offset(slot))
+
+    def view(self, slot: int, exchange: str, symbol: str, stale_after: Optional[float] = None) -> "SharedBookView":
+        return SharedBookView(self, self._offset(slot), exchange, symbol, stale_after)
+
+    def close(self) -> None:
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def _offset(self, slot: int) -> int:
+        if not 0 <= slot < self._slots:
+            raise IndexError(f"槽位超出範圍: {slot}")
+        return slot * self.slot_size
+
+
+class SharedBookWriter:
+    __slots__ = ("_buf", "_offset", "_body", "_depth", "_seq")
+
+    def __init__(self, region: SharedBookRegion, offset: int) -> None:
+        self._buf = region._shm.buf
+        self._offset = offset
+        self._body = region._body
+        self._depth = region._depth
+        self._seq = _SEQ.unpack_from(self._buf, offset)[0] & ~1
+
+    def write(self, snapshot: OrderBookSnapshot) -> None:
+        depth = self._depth
+        bids = snapshot.bids[:depth]
+        asks = snapshot.asks[:depth]
+        levels: List[int] = []
+        for side in (bids, asks):
+            for level in side:
+                levels.append(_to_fixed(level.price))
+                levels.append(_to_fixed(level.quantity))
+            levels.extend((0, 0) * (depth - len(side)))
+        seq = self._seq + 1
+        _SEQ.pack_into(self._buf, self._offset, seq)
+        self._body.pack_into(
+            self._buf,
+            self._offset + _SEQ.size,
+            snapshot.sequence,
+            snapshot.timestamp,
+            snapshot.received_ns,
+            snapshot.parsed_ns,
+            snapshot.applied_ns,
+            snapshot.received_at,
+            len(bids),
+            len(asks),
+            *levels,
+        )
+        self._seq = seq + 1
+        _SEQ.pack_into(self._buf, self._offset, self._seq)
+
+    def mirror(self, get_snapshot: Callable[[], OrderBookSnapshot]) -> Callable[[OrderBook], None]:
+        """產生事件匯流排的 OrderBook 訂閱者：每次套用後寫入排序好的快照。"""
+
+        def handler(_: OrderBook) -> None:
+            self.write(get_snapshot())
+
+        return handler
+
+
+class SharedBookView:
+    """唯讀視圖，介面與 OrderBookManager.snapshot 相同，可直接放入 PairContext。"""
+
+    __slots__ = ("exchange", "symbol", "_buf", "_offset", "_body", "_depth", "_stale_ns")
+
+    def __init__(
+        self,
+        region: SharedBookRegion,
+        offset: int,
+        exchange: str,
+        symbol: str,
+        stale_after: Optional[float] = None,
+    ) -> None:
+        self.exchange = exchange
+        self.symbol = symbol
+        self._buf = region._shm.buf
+        self._offset = offset
+        self._body = region._body
+        self._depth = region._depth
+        self._stale_ns = int(stale_after * 1e9) if stale_after else 0
+
+    @property
+    def snapshot(self) -> OrderBookSnapshot:
+        values = self._read()
+        sequence, timestamp, received_ns, parsed_ns, applied_ns, received_at, n_bids, n_asks = values[:8]
+        if self._stale_ns and time.perf_counter_ns() - applied_ns > self._stale_ns:
+            raise RuntimeError("共享訂單簿已過期")
+        depth = self._depth
+        bids = [
+            PriceLevel(_from_fixed(values[8 + 2 * i]), _from_fixed(values[9 + 2 * i]), timestamp)
+            for i in range(n_bids)
+        ]
+        base = 8 + 2 * depth
+        asks = [
+            PriceLevel(_from_fixed(values[base + 2 * i]), _from_fixed(values[base + 1 + 2 * i]), timestamp)
+            for i in range(n_asks)
+        ]
+        return OrderBookSnapshot(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            bids=bids,
+            asks=asks,
+            sequence=sequence,
+            timestamp=timestamp,
+            received_at=received_at,
+            received_ns=received_ns,
+            parsed_ns=parsed_ns,
+            applied_ns=applied_ns,
+        )
+
+    def _read(self) -> Tuple:
+        buf, offset = self._buf, self._offset
+        for _ in range(_READ_RETRIES):
+            before = _SEQ.unpack_from(buf, offset)[0]
+            if before & 1:
+                continue
+            if before == 0:
+                raise RuntimeError("OrderBook 尚未初始化")
+            values = self._body.unpack_from(buf, offset + _SEQ.size)
+            if _SEQ.unpack_from(buf, offset)[0] == before:
+                return values
+        raise RuntimeError("共享訂單簿讀取競爭，稍後重試")
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Optional
 
 from core.datatypes import OrderBook, PriceLevel
 
@@ -17,6 +17,11 @@ class OrderBookSnapshot:
     asks: List[PriceLevel] = field(default_factory=list)
     sequence: int = 0
     timestamp: int = 0
+    received_at: float = 0.0
+    age_ms: Optional[float] = None
+    received_ns: int = 0
+    parsed_ns: int = 0
+    applied_ns: int = 0  # perf_counter_ns：寫入 OrderBookManager
 
     @classmethod
     def from_orderbook(cls, orderbook: OrderBook) -> "OrderBookSnapshot":
@@ -30,4 +35,8 @@ class OrderBookSnapshot:
             asks=asks,
             sequence=orderbook.sequence,
             timestamp=orderbook.timestamp,
+            received_at=orderbook.received_at,
+            age_ms=orderbook.age_ms,
+            received_ns=orderbook.received_ns,
+            parsed_ns=orderbook.parsed_ns,
         )
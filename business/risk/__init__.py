@@ -1,5 +1,6 @@
 """風控模塊導出。"""
 from .manager import RiskManager, RiskConfig
 from .balance_checker import BalanceState
+from .rate_limiter import TradeRateLimiter, WindowLimit
 
-__all__ = ["RiskManager", "RiskConfig", "BalanceState"]
+__all__ = ["RiskManager", "RiskConfig", "BalanceState", "TradeRateLimiter", "WindowLimit"]
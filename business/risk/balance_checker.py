@@ -3,27 +3,80 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Dict
+from typing import Dict, Optional, Tuple, Union
 
+from business.account.ledger import BalanceLedger, Key, Requirement
 from business.strategy.signal import ArbitrageDirection, StrategySignal
+from core.datatypes import OrderResult
 from utils.logger import setup_logger
 
 logger = setup_logger("balance_checker")
 
+DEFAULT_BASE = "BTC"
+
 
 @dataclass
 class BalanceState:
+    """僅含 BTC/KRW 的舊版餘額快照；多交易對請改用 BalanceLedger。"""
+
     upbit_btc: Decimal
     upbit_krw: Decimal
     bithumb_btc: Decimal
     bithumb_krw: Decimal
 
 
+def base_currency(signal: StrategySignal) -> str:
+    """由 Upbit 市場代碼（KRW-XRP）推出基礎幣種；未填時退回 BTC。"""
+    if signal.upbit_symbol:
+        return signal.upbit_symbol.rpartition("-")[2].upper()
+    return signal.pair.upper() or DEFAULT_BASE
+
+
 class BalanceChecker:
     def __init__(self, reserve_ratio: Decimal) -> None:
         self._reserve_ratio = reserve_ratio
 
-    def validate(self, signal: StrategySignal, balances: BalanceState) -> bool:
+    @property
+    def reserve_ratio(self) -> Decimal:
+        return self._reserve_ratio
+
+    @staticmethod
+    def requirements(signal: StrategySignal) -> Tuple[Requirement, ...]:
+        """信號兩條腿各自需要占用的 (exchange, currency, amount)。"""
+        base = base_currency(signal)
+        if signal.direction == ArbitrageDirection.UPBIT_SELL:
+            return (
+                ("upbit", base, signal.volume),
+                ("bithumb", "KRW", signal.volume * signal.bithumb_price),
+            )
+        return (
+            ("upbit", "KRW", signal.volume * signal.upbit_price),
+            ("bithumb", base, signal.volume),
+        )
+
+    @staticmethod
+    def fill_deltas(
+        signal: StrategySignal, upbit_result: OrderResult, bithumb_result: OrderResult
+    ) -> Optional[Dict[Key, Decimal]]:
+        """由兩腿成交結果推算餘額變動（未計手續費）；缺成交價時回傳 None。"""
+        if upbit_result.average_price is None or bithumb_result.average_price is None:
+            return None
+        base = base_currency(signal)
+        sell, buy = (
+            (upbit_result, bithumb_result)
+            if signal.direction == ArbitrageDirection.UPBIT_SELL
+            else (bithumb_result, upbit_result)
+        )
+        return {
+            (sell.exchange, base): -sell.filled_quantity,
+            (sell.exchange, "KRW"): sell.filled_quantity * sell.average_price,
+            (buy.exchange, base): buy.filled_quantity,
+            (buy.exchange, "KRW"): -buy.filled_quantity * buy.average_price,
+        }
+
+    def validate(self, signal: StrategySignal, balances: Union[BalanceState, BalanceLedger]) -> bool:
+        if isinstance(balances, BalanceLedger):
+            return balances.can_cover(self.requirements(signal), self._reserve_ratio)
         if signal.direction == ArbitrageDirection.UPBIT_SELL:
             if balances.upbit_btc - signal.volume < balances.upbit_btc * self._reserve_ratio:
                 logger.debug("Upbit BTC 餘額不足")
@@ -1,43 +1,92 @@
-"""熔斷機制。"""
+"""熔斷機制。
+
+純同步狀態機，僅在事件迴圈單執行緒中使用，不需要鎖：
+
+    CLOSED --連續失敗達門檻--> OPEN --冷卻結束--> HALF_OPEN
+    HALF_OPEN --探測成功--> CLOSED
+    HALF_OPEN --探測失敗--> OPEN
+
+OPEN 期間的成功回報（熔斷前送出、之後才完成的單）一律忽略，不縮短冷卻。
+
+HALF_OPEN 期間只放行 half_open_probes 筆探測；探測若遲遲沒有結果（例如信號
+被執行佇列丟棄），超過 cool_down 後允許下一筆探測。
+"""
 from __future__ import annotations
 
-import asyncio
 import time
 from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+from utils.logger import setup_logger
+
+logger = setup_logger("circuit_breaker")
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
 
 
 @dataclass
 class CircuitBreakerConfig:
     failure_threshold: int
     cool_down: float  # seconds
+    half_open_probes: int = 1
 
 
 class CircuitBreaker:
-    def __init__(self, config: CircuitBreakerConfig) -> None:
+    __slots__ = ("name", "_config", "_state", "_failures", "_open_until", "_probes", "_probe_started")
+
+    def __init__(self, config: CircuitBreakerConfig, name: str = "") -> None:
+        self.name = name
         self._config = config
+        self._state = BreakerState.CLOSED
         self._failures = 0
-        self._open_until: float = 0.0
-        self._lock = asyncio.Lock()
+        self._open_until = 0.0
+        self._probes = 0
+        self._probe_started = 0.0
 
-    async def allow(self) -> bool:
-        async with self._lock:
-            if self._failures >= self._config.failure_threshold and time.time() < self._open_until:
-                logger.debug("熔斷中")
-                return False
-            if time.time() >= self._open_until:
-                self._failures = 0
-            return True
+    @property
+    def state(self) -> BreakerState:
+        return self._state
 
-    async def record_success(self) -> None:
-        async with self._lock:
-            self._failures = 0
+    def allow(self, now: Optional[float] = None) -> bool:
+        state = self._state
+        if state is BreakerState.CLOSED:
+            return True
+        now = time.monotonic() if now is None else now
+        if state is BreakerState.OPEN:
+            if now < self._open_until:
+                return False
+            self._state = BreakerState.HALF_OPEN
+            self._probes = 0
+            logger.info("熔斷冷卻結束，開始探測", extra={"breaker": self.name})
+        elif self._probes >= self._config.half_open_probes:
+            if now - self._probe_started < self._config.cool_down:
+                return False
+            self._probes = 0  # 上一輪探測沒有回報結果
+        self._probes += 1
+        self._probe_started = now
+        return True
 
-    async def record_failure(self) -> None:
-        async with self._lock:
-            self._failures += 1
-            if self._failures >= self._config.failure_threshold:
-                self._open_until = time.time() + self._config.cool_down
-                logger.warning("熔斷觸發", extra={"cool_down": self._config.cool_down})
-from utils.logger import setup_logger
+    def record_success(self) -> None:
+        state = self._state
+        if state is BreakerState.OPEN:
+            return
+        if state is BreakerState.HALF_OPEN:
+            logger.info("探測成功，熔斷解除", extra={"breaker": self.name})
+            self._state = BreakerState.CLOSED
+        self._failures = 0
 
-logger = setup_logger("circuit_breaker")
+    def record_failure(self, now: Optional[float] = None) -> None:
+        self._failures += 1
+        if self._state is BreakerState.HALF_OPEN or self._failures >= self._config.failure_threshold:
+            now = time.monotonic() if now is None else now
+            self._state = BreakerState.OPEN
+            self._open_until = now + self._config.cool_down
+            logger.warning(
+                "熔斷觸發",
+                extra={"breaker": self.name, "failures": self._failures, "cool_down": self._config.cool_down},
+            )
@@ -1,52 +1,129 @@
 """整體風控管理。"""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Union
 
+from business.account.ledger import BalanceLedger
 from business.risk.balance_checker import BalanceChecker, BalanceState
-from business.risk.circuit_breaker import CircuitBreaker, CircuitBreakerConfig
+from business.risk.circuit_breaker import BreakerState, CircuitBreaker, CircuitBreakerConfig
 from business.risk.position_limiter import PositionLimit, PositionLimiter
+from business.risk.rate_limiter import TradeRateLimiter, WindowLimit
 from business.strategy.signal import StrategySignal
 from utils.logger import setup_logger
 
+if TYPE_CHECKING:
+    from business.account.pnl import PnLTracker
+
 logger = setup_logger("risk_manager")
 
+EXCHANGES = ("upbit", "bithumb")
+
 
 @dataclass
 class RiskConfig:
     reserve_ratio: Decimal
     position_limit: PositionLimit
     circuit_breaker: CircuitBreakerConfig
+    # 滾動視窗限額（每秒 / 每分鐘、分交易對或全局）；空表示不限制
+    rate_limits: List[WindowLimit] = field(default_factory=list)
+    # 已實現淨虧損（含手續費，KRW）達此值即拒絕新信號；需搭配 PnLTracker
+    max_realized_loss: Optional[Decimal] = None
 
 
 class RiskManager:
-    def __init__(self, config: RiskConfig) -> None:
+    """每個交易對與每家交易所各自一個熔斷器；單一交易對異常不影響其他交易對。"""
+
+    def __init__(self, config: RiskConfig, pnl: Optional["PnLTracker"] = None) -> None:
+        self._pnl = pnl
+        self._max_loss = config.max_realized_loss
         self._balance_checker = BalanceChecker(config.reserve_ratio)
         self._position_limiter = PositionLimiter(config.position_limit)
-        self._breaker = CircuitBreaker(config.circuit_breaker)
+        self._rate_limiter = TradeRateLimiter(config.rate_limits) if config.rate_limits else None
+        self._breaker_config = config.circuit_breaker
+        self._pair_breakers: Dict[str, CircuitBreaker] = {}
+        self._exchange_breakers = {
+            name: CircuitBreaker(config.circuit_breaker, name=name) for name in EXCHANGES
+        }
+
+    def check(self, signal: StrategySignal, balances: Union[BalanceState, BalanceLedger]) -> bool:
+        """同步的逐信號檢查；熔斷器放在最後，避免被其他規則拒絕的信號佔用探測名額。
 
-    async def evaluate(self, signal: StrategySignal, balances: BalanceState) -> bool:
-        if not await self._breaker.allow():
-            logger.info("熔斷器阻擋信號")
+        傳入 BalanceLedger 時，通過後即預留所需資金並掛在 signal.reservation 上。
+        """
+        if self._max_loss is not None and self._pnl is not None and -self._pnl.net_realized >= self._max_loss:
+            logger.info("已實現虧損達上限，拒絕信號", extra={"pair": signal.pair, "pnl": str(self._pnl.net_realized)})
             return False
         if not self._position_limiter.validate(signal):
             logger.info(
                 "倉位限制拒絕",
-                extra={"volume": str(signal.volume), "spread": str(signal.spread)},
+                extra={"pair": signal.pair, "volume": str(signal.volume), "spread": str(signal.spread)},
             )
             return False
+        notional = max(signal.upbit_price, signal.bithumb_price) * signal.volume
+        if self._rate_limiter is not None and not self._rate_limiter.allow(signal.pair, notional):
+            logger.info("超出視窗交易限額，拒絕信號", extra={"pair": signal.pair, "notional": str(notional)})
+            return False
         if not self._balance_checker.validate(signal, balances):
-            logger.info("餘額不足，拒絕信號")
+            logger.info("餘額不足，拒絕信號", extra={"pair": signal.pair})
+            return False
+        for breaker in self._exchange_breakers.values():
+            if not breaker.allow():
+                logger.info("交易所熔斷中，阻擋信號", extra={"pair": signal.pair, "exchange": breaker.name})
+                return False
+        if not self._pair_breaker(signal.pair).allow():
+            logger.info("交易對熔斷中，阻擋信號", extra={"pair": signal.pair})
             return False
+        if isinstance(balances, BalanceLedger):
+            # 與 validate 之間沒有 await，可用餘額不會改變
+            signal.reservation = balances.reserve(
+                self._balance_checker.requirements(signal), self._balance_checker.reserve_ratio
+            )
+        if self._rate_limiter is not None:
+            self._rate_limiter.record(signal.pair, notional)
         logger.debug("風控通過")
         return True
 
-    async def record_success(self) -> None:
-        await self._breaker.record_success()
+    def on_success(self, pair: str = "", exchanges: Iterable[str] = ()) -> None:
+        """exchanges 為實際參與並成功的交易所；其餘交易所的熔斷器不受影響。"""
+        self._pair_breaker(pair).record_success()
+        for name in exchanges:
+            breaker = self._exchange_breakers.get(name)
+            if breaker is not None:
+                breaker.record_success()
+
+    def on_failure(self, pair: str = "", exchanges: Iterable[str] = ()) -> None:
+        """exchanges 為出錯的交易所；未知時只計入交易對熔斷器。"""
+        self._pair_breaker(pair).record_failure()
+        for name in exchanges:
+            breaker = self._exchange_breakers.get(name)
+            if breaker is not None:
+                breaker.record_failure()
+
+    def breaker_states(self) -> Dict[str, BreakerState]:
+        states = {f"exchange:{name}": b.state for name, b in self._exchange_breakers.items()}
+        states.update({f"pair:{name}": b.state for name, b in self._pair_breakers.items()})
+        return states
+
+    def rate_usage(self, pair: str = "") -> List[Tuple[float, int, float]]:
+        """各視窗目前的 (window, count, notional)。"""
+        return self._rate_limiter.usage(pair) if self._rate_limiter is not None else []
+
+    def _pair_breaker(self, pair: str) -> CircuitBreaker:
+        breaker = self._pair_breakers.get(pair)
+        if breaker is None:
+            breaker = self._pair_breakers[pair] = CircuitBreaker(self._breaker_config, name=pair or "default")
+        return breaker
+
+    # ---- 舊版異步介面 ----
+    async def evaluate(self, signal: StrategySignal, balances: Union[BalanceState, BalanceLedger]) -> bool:
+        return self.check(signal, balances)
+
+    async def record_success(self, pair: str = "") -> None:
+        self.on_success(pair)
         logger.debug("風控記錄成功事件")
 
-    async def record_failure(self) -> None:
-        await self._breaker.record_failure()
-        logger.warning("風控記錄失敗事件")
+    async def record_failure(self, pair: str = "", exchanges: Iterable[str] = ()) -> None:
+        self.on_failure(pair, exchanges)
+        logger.warning("風控記錄失敗事件", extra={"pair": pair, "exchanges": list(exchanges)})
@@ -0,0 +1,127 @@
+"""滾動視窗交易限額：每秒 / 每分鐘的成交筆數與名義金額，分交易對與全局。
+
+每個視窗是固定大小的環形緩衝區，視窗切成 buckets 格並維護累計值：
+更新與查詢只需推進過期的格子（攤銷 O(1)），不保留逐筆紀錄。
+視窗邊界的解析度為 window / buckets。
+"""
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.logger import setup_logger
+
+logger = setup_logger("rate_limiter")
+
+
+@dataclass(slots=True)
+class WindowLimit:
+    window: float  # 秒
+    max_count: Optional[int] = None
+    max_notional: Optional[Decimal] = None
+    per_pair: bool = False  # True 時每個交易對各自計算
+    buckets: int = 20
+
+
+class RollingWindow:
+    __slots__ = ("_scale", "_size", "_counts", "_sums", "_epoch", "count", "notional")
+
+    def __init__(self, window: float, buckets: int = 20) -> None:
+        self._scale = buckets / window  # 每秒格數
+        self._size = buckets
+        self._counts = [0] * buckets
+        self._sums = [0.0] * buckets
+        self._epoch: Optional[int] = None
+        self.count = 0
+        self.notional = 0.0
+
+    def advance(self, now: float) -> None:
+        """清掉已滑出視窗的格子；最多走過 buckets 格。"""
+        epoch = int(now * self._scale)
+        last = self._epoch
+        if last is None or epoch - last >= self._size:
+            if self.count:
+                self._counts = [0] * self._size
+                self._sums = [0.0] * self._size
+                self.count = 0
+                self.notional = 0.0
+            self._epoch = epoch
+            return
+        if epoch <= last:
+            return
+        counts, sums, size = self._counts, self._sums, self._size
+        for step in range(last + 1, epoch + 1):
+            index = step % size
+            if counts[index]:
+                self.count -= counts[index]
+                self.notional -= sums[index]
+                counts[index] = 0
+                sums[index] = 0.0
+        if not self.count:
+            self.notional = 0.0  # 消除浮點累積誤差
+        self._epoch = epoch
+
+    def add(self, now: float, notional: float) -> None:
+        self.advance(now)
+        index = int(now * self._scale) % self._size
+        self._counts[index] += 1
+        self._sums[index] += notional
+        self.count += 1
+        self.notional += notional
+
+
+# (限額, 視窗, 筆數上限, 金額上限)；上限預先轉成 int/float，熱路徑不做 Decimal 比較
+_Slot = Tuple[WindowLimit, RollingWindow, float, float]
+
+
+def _slot(limit: WindowLimit) -> _Slot:
+    return (
+        limit,
+        RollingWindow(limit.window, limit.buckets),
+        math.inf if limit.max_count is None else limit.max_count,
+        math.inf if limit.max_notional is None else float(limit.max_notional),
+    )
+
+
+class TradeRateLimiter:
+    """檢查（allow）與記錄（record）分開：只有最終被接受的信號才計入視窗。"""
+
+    def __init__(self, limits: Sequence[WindowLimit]) -> None:
+        self._global: List[_Slot] = [_slot(limit) for limit in limits if not limit.per_pair]
+        self._pair_limits = [limit for limit in limits if limit.per_pair]
+        self._pairs: Dict[str, List[_Slot]] = {}
+
+    def allow(self, pair: str, notional: Decimal, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        value = float(notional)
+        for limit, window, max_count, max_notional in self._windows(pair):
+            window.advance(now)
+            if window.count >= max_count:
+                logger.debug("超出交易筆數限額", extra={"pair": pair, "window": limit.window})
+                return False
+            if window.notional + value > max_notional:
+                logger.debug("超出視窗名義金額", extra={"pair": pair, "window": limit.window})
+                return False
+        return True
+
+    def record(self, pair: str, notional: Decimal, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        value = float(notional)
+        for _, window, _, _ in self._windows(pair):
+            window.add(now, value)
+
+    def usage(self, pair: str = "") -> List[Tuple[float, int, float]]:
+        """(window, count, notional)；pair 為空時只回傳全局視窗。"""
+        windows = self._windows(pair) if pair else self._global
+        return [(limit.window, window.count, window.notional) for limit, window, _, _ in windows]
+
+    def _windows(self, pair: str) -> List[_Slot]:
+        if not self._pair_limits:
+            return self._global
+        windows = self._pairs.get(pair)
+        if windows is None:
+            windows = self._pairs[pair] = self._global + [_slot(limit) for limit in self._pair_limits]
+        return windows
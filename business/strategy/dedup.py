@@ -0,0 +1,56 @@
+"""信號去重：同一交易對、同方向、吃同樣價位的信號在冷卻期內只放行一次。
+
+引擎每輪都會重新評估未變動的訂單簿；盤口沒動時策略會輸出完全相同的信號，
+若每次都送進風控與執行就會重複下單。指紋包含兩邊成交價與數量，盤口一變動
+指紋即不同，新機會立即放行。
+
+admit 只做檢查；風控核准後才以 record 記錄指紋，被拒的信號不佔冷卻期。
+執行失敗時由引擎 invalidate，讓同一機會可立即重試。
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+from business.strategy.signal import ArbitrageDirection, StrategySignal
+
+Fingerprint = Tuple[Decimal, Decimal, Decimal]
+
+
+@dataclass(slots=True)
+class DedupStats:
+    admitted: int = 0
+    suppressed: int = 0
+
+
+def _fingerprint(signal: StrategySignal) -> Fingerprint:
+    return (signal.upbit_price, signal.bithumb_price, signal.volume)
+
+
+class SignalDeduplicator:
+    def __init__(self, cooldown: float = 2.0) -> None:
+        self._cooldown = cooldown
+        self._last: Dict[Tuple[str, ArbitrageDirection], Tuple[Fingerprint, float]] = {}
+        self.stats = DedupStats()
+
+    def admit(self, signal: StrategySignal, now: Optional[float] = None) -> bool:
+        """首次出現、盤口已變動或冷卻已過時回傳 True；不記錄。"""
+        now = time.monotonic() if now is None else now
+        last = self._last.get((signal.pair, signal.direction))
+        if last is not None and last[0] == _fingerprint(signal) and now - last[1] < self._cooldown:
+            self.stats.suppressed += 1
+            return False
+        return True
+
+    def record(self, signal: StrategySignal, now: Optional[float] = None) -> None:
+        """信號通過風控、即將執行時記錄指紋。"""
+        now = time.monotonic() if now is None else now
+        self._last[(signal.pair, signal.direction)] = (_fingerprint(signal), now)
+        self.stats.admitted += 1
+
+    def invalidate(self, pair: str) -> None:
+        """清除交易對的紀錄（例如執行失敗後允許立即重試）。"""
+        for key in [key for key in self._last if key[0] == pair]:
+            del self._last[key]
@@ -4,6 +4,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from decimal import Decimal
 from enum import Enum
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from business.account.ledger import Reservation
+    from utils.tracing import TraceContext
 
 
 class ArbitrageDirection(str, Enum):
@@ -21,3 +26,10 @@ class StrategySignal:
     upbit_price: Decimal
     bithumb_price: Decimal
     spread: Decimal
+    # 來源交易對；未填時 Executor 退回預設的 BTC 市場
+    pair: str = ""
+    upbit_symbol: str = ""
+    bithumb_symbol: str = ""
+    trace: Optional["TraceContext"] = None
+    # 風控通過時預留的資金，執行結束後由引擎結算或釋放
+    reservation: Optional["Reservation"] = None
@@ -49,6 +49,8 @@ class SpreadArbitrageStrategy(BaseStrategy):
             logger.debug("Spread 不足，無信號")
             return None
         best = max(valid_signals, key=lambda sig: sig.expected_profit)
+        best.upbit_symbol = upbit_ob.symbol
+        best.bithumb_symbol = bithumb_ob.symbol
         logger.debug(
             "產生策略信號",
             extra={
@@ -33,6 +33,10 @@ class OrderBook:
     asks: List[PriceLevel] = field(default_factory=list)
     sequence: int = 0
     timestamp: int = 0
+    received_at: float = 0.0  # 本地收到時間（epoch ms）
+    age_ms: Optional[float] = None  # 收到時已扣除時鐘偏差的真實延遲
+    received_ns: int = 0  # perf_counter_ns：WS 幀到達
+    parsed_ns: int = 0  # perf_counter_ns：解析完成
 
 
 @dataclass(slots=True)
@@ -9,6 +9,14 @@ class GatewayError(KArbError):
     """網關通信異常。"""
 
 
+class ExchangeRejectedError(GatewayError):
+    """交易所明確拒絕請求（HTTP 4xx 或業務錯誤碼），請求確定未被受理。"""
+
+    def __init__(self, message: str, status: str = "") -> None:
+        super().__init__(message)
+        self.status = status
+
+
 class ParserError(KArbError):
     """數據解析異常。"""
 
@@ -17,5 +25,13 @@ class WrapperError(KArbError):
     """封裝層異常。"""
 
 
+class OrderExecutionError(KArbError):
+    """套利下單失敗，exchanges 為出錯的交易所。"""
+
+    def __init__(self, message: str, exchanges: tuple[str, ...] = ()) -> None:
+        super().__init__(message)
+        self.exchanges = exchanges
+
+
 class ConfigError(KArbError):
     """配置讀取與驗證異常。"""
@@ -5,25 +5,39 @@ import base64
 import hashlib
 import hmac
 import time
-from typing import Mapping
+from typing import Mapping, Optional
 from urllib.parse import urlencode
 
 
+class BithumbHmacSigner:
+    """單一憑證的 HMAC 簽名器，重用已加鑰的 HMAC 狀態並以 copy() 派生。"""
+
+    __slots__ = ("_access_key", "_mac")
+
+    def __init__(self, access_key: str, secret_key: str) -> None:
+        self._access_key = access_key
+        self._mac = hmac.new(secret_key.encode(), digestmod=hashlib.sha512)
+
+    def sign(self, endpoint: str, query: str, nonce: Optional[str] = None) -> dict[str, str]:
+        """以已編碼的 body（與實際送出的內容相同）生成簽名 Header。"""
+        if nonce is None:
+            nonce = str(int(time.time() * 1000))
+        mac = self._mac.copy()
+        mac.update(f"{endpoint}\0{query}\0{nonce}".encode())
+        signature = base64.b64encode(mac.hexdigest().encode()).decode()
+        return {
+            "Api-Key": self._access_key,
+            "Api-Sign": signature,
+            "Api-Nonce": nonce,
+            "Content-Type": "application/x-www-form-urlencoded",
+        }
+
+
 def sign_bithumb_request(
     endpoint: str,
     params: Mapping[str, object],
     access_key: str,
     secret_key: str,
 ) -> dict[str, str]:
-    """生成 Bithumb 所需的簽名 Header。"""
-    nonce = str(int(time.time() * 1000))
-    query = urlencode(params)
-    signing_str = f"{endpoint}\0{query}\0{nonce}".encode()
-    digest = hmac.new(secret_key.encode(), signing_str, hashlib.sha512).hexdigest()
-    signature = base64.b64encode(digest.encode()).decode()
-    return {
-        "Api-Key": access_key,
-        "Api-Sign": signature,
-        "Api-Nonce": nonce,
-        "Content-Type": "application/x-www-form-urlencoded",
-    }
+    """生成 Bithumb 所需的簽名 Header（一次性用途；高頻路徑請重用 BithumbHmacSigner）。"""
+    return BithumbHmacSigner(access_key, secret_key).sign(endpoint, urlencode(params))
@@ -7,17 +7,48 @@ import hmac
 import json
 import uuid
 from typing import Mapping, Optional
-from urllib.parse import urlencode
+from urllib.parse import unquote, urlencode
+
+# Header 恆定不變，模塊載入時即編碼完成
+_HEADER_SEGMENT = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').decode().rstrip("=")
 
 
 def _b64encode(data: bytes) -> str:
     return base64.urlsafe_b64encode(data).decode().rstrip("=")
 
 
-def _build_query_hash(params: Mapping[str, object]) -> str:
-    # Upbit 需要按字母排序後進行 sha512
-    encoded = urlencode(sorted(params.items()), doseq=True).encode()
-    return hashlib.sha512(encoded).hexdigest()
+def encode_upbit_query(params: Mapping[str, object]) -> str:
+    """Upbit 需要按字母排序後的 query string，簽名與請求共用此結果。"""
+    return urlencode(sorted(params.items()), doseq=True)
+
+
+class UpbitJwtSigner:
+    """單一憑證的 JWT 簽名器，預先編碼 Header 並重用已加鑰的 HMAC 狀態。"""
+
+    __slots__ = ("_payload_prefix", "_mac")
+
+    def __init__(self, access_key: str, secret_key: str) -> None:
+        self._payload_prefix = '{"access_key":' + json.dumps(access_key) + ',"nonce":"'
+        self._mac = hmac.new(secret_key.encode(), f"{_HEADER_SEGMENT}.".encode(), hashlib.sha256)
+
+    def sign(self, query: str = "") -> str:
+        """以已編碼的 query string 生成 Bearer token。"""
+        payload = self._payload_prefix + str(uuid.uuid4())
+        if query:
+            # query_hash 以未跳脫的字串計算（如 uuids[]=...），與 Upbit 官方範例一致
+            if "%" in query:
+                query = unquote(query)
+            query_hash = hashlib.sha512(query.encode()).hexdigest()
+            payload += f'","query_hash":"{query_hash}","query_hash_alg":"SHA512"}}'
+        else:
+            payload += '"}'
+        payload_segment = _b64encode(payload.encode())
+        mac = self._mac.copy()
+        mac.update(payload_segment.encode())
+        return f"Bearer {_HEADER_SEGMENT}.{payload_segment}.{_b64encode(mac.digest())}"
+
+    def sign_params(self, params: Optional[Mapping[str, object]] = None) -> str:
+        return self.sign(encode_upbit_query(params) if params else "")
 
 
 def generate_upbit_jwt(
@@ -25,16 +56,5 @@ def generate_upbit_jwt(
     secret_key: str,
     params: Optional[Mapping[str, object]] = None,
 ) -> str:
-    """生成 Upbit JWT Bearer token。"""
-    header = {"alg": "HS256", "typ": "JWT"}
-    payload = {"access_key": access_key, "nonce": str(uuid.uuid4())}
-    if params:
-        payload["query_hash"] = _build_query_hash(params)
-        payload["query_hash_alg"] = "SHA512"
-
-    signing_input = f"{_b64encode(json.dumps(header, separators=(',', ':')).encode())}."
-    signing_input += _b64encode(json.dumps(payload, separators=(",", ":")).encode())
-
-    signature = hmac.new(secret_key.encode(), signing_input.encode(), hashlib.sha256).digest()
-    token = f"{signing_input}.{_b64encode(signature)}"
-    return f"Bearer {token}"
+    """生成 Upbit JWT Bearer token（一次性用途；高頻路徑請重用 UpbitJwtSigner）。"""
+    return UpbitJwtSigner(access_key, secret_key).sign_params(params)
@@ -2,19 +2,27 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from dataclasses import dataclass
-from typing import Any, Mapping, Optional
-from urllib.parse import urljoin
+from typing import Any, Dict, Mapping, Optional, Sequence, Union
+from urllib.parse import urlencode, urljoin
 
 import aiohttp
+import msgspec
+from yarl import URL
 
-from core.exceptions import GatewayError
+from core.exceptions import ExchangeRejectedError, GatewayError
+from core.gateway.clock import ClockOffsetEstimator, wall_ms
+from core.gateway.latency import LatencyRecorder, RequestTiming
+from core.gateway.prepared import CompiledTemplate, OrderTemplate, slot_placeholder, to_format
 from core.gateway.ratelimit.token_bucket import TokenBucket
 from core.interface import BaseGateway
 from utils.logger import setup_logger
 
 logger = setup_logger("gateway")
 
+_QUERY_METHODS = frozenset({"GET", "DELETE"})
+
 
 @dataclass(slots=True)
 class GatewaySettings:
@@ -26,6 +34,8 @@ class GatewaySettings:
     access_key: Optional[str] = None
     secret_key: Optional[str] = None
     request_timeout: float = 10.0
+    latency_tracing: bool = True
+    private_websocket_url: Optional[str] = None
 
 
 class BaseExchangeGateway(BaseGateway):
@@ -44,6 +54,23 @@ class BaseExchangeGateway(BaseGateway):
         self._session_lock = asyncio.Lock()
         self._public_limiter = public_limiter
         self._private_limiter = private_limiter
+        self._latency: Optional[LatencyRecorder] = (
+            LatencyRecorder(settings.name) if settings.latency_tracing else None
+        )
+        self._clock = ClockOffsetEstimator()
+        self._templates: Dict[OrderTemplate, CompiledTemplate] = {}
+
+    @property
+    def clock(self) -> ClockOffsetEstimator:
+        return self._clock
+
+    @property
+    def latency(self) -> Optional[LatencyRecorder]:
+        return self._latency
+
+    def latency_stats(self) -> dict[str, dict[str, dict[str, float]]]:
+        """運行時查詢各 endpoint 的分段延遲摘要（微秒）。"""
+        return self._latency.snapshot() if self._latency else {}
 
     async def _ensure_session(self) -> aiohttp.ClientSession:
         if self._session and not self._session.closed:
@@ -52,13 +79,23 @@ class BaseExchangeGateway(BaseGateway):
             if self._session and not self._session.closed:
                 return self._session
             timeout = aiohttp.ClientTimeout(total=self._settings.request_timeout)
-            self._session = aiohttp.ClientSession(timeout=timeout)
+            trace_configs = [self._latency.trace_config()] if self._latency else None
+            self._session = aiohttp.ClientSession(timeout=timeout, trace_configs=trace_configs)
             return self._session
 
-    def _build_url(self, endpoint: str) -> str:
+    def _build_url(self, endpoint: str, query: str = "") -> Union[str, URL]:
         if endpoint.startswith("http"):
-            return endpoint
-        return urljoin(self._settings.rest_base.rstrip("/" ) + "/", endpoint.lstrip("/"))
+            url = endpoint
+        else:
+            url = urljoin(self._settings.rest_base.rstrip("/" ) + "/", endpoint.lstrip("/"))
+        if query:
+            # query 已由 _encode_query 編碼，避免 aiohttp 再次轉義
+            return URL(f"{url}?{query}", encoded=True)
+        return url
+
+    def _encode_query(self, params: Optional[Mapping[str, Any]]) -> str:
+        """將參數編碼一次，簽名與請求內容共用同一份結果。"""
+        return urlencode(params, doseq=True) if params else ""
 
     def _default_headers(self) -> dict[str, str]:
         return {"User-Agent": "K-Arb/0.1"}
@@ -74,20 +111,32 @@ class BaseExchangeGateway(BaseGateway):
         params: Optional[Mapping[str, Any]] = None,
         signed: bool = False,
         headers: Optional[Mapping[str, str]] = None,
+        priority: bool = False,
     ) -> bytes:
+        recorder = self._latency
         session = await self._ensure_session()
+        # 在建立連線池之後才開始計時，limiter_wait 只涵蓋限流等待
+        timing = RequestTiming(endpoint) if recorder else None
         limiter = self._choose_limiter(signed)
         if limiter:
-            await limiter.acquire()
+            await limiter.acquire(priority=priority)
+            if timing:
+                recorder.record(endpoint, "limiter_wait", time.perf_counter_ns() - timing.start)
 
-        url = self._build_url(endpoint)
+        method = method.upper()
+        params = self._normalize_params(method, endpoint, params, signed)
+        query = self._encode_query(params)
+        url = self._build_url(endpoint, query if method in _QUERY_METHODS else "")
         req_headers = self._default_headers()
         if headers:
             req_headers.update(headers)
         if signed:
-            req_headers.update(self._signed_headers(method, endpoint, params))
+            sign_start = time.perf_counter_ns()
+            req_headers.update(self._signed_headers(method, endpoint, query))
+            if timing:
+                recorder.record(endpoint, "sign", time.perf_counter_ns() - sign_start)
 
-        request_kwargs = self._prepare_request_kwargs(method, params)
+        request_kwargs = self._prepare_request_kwargs(method, params, query)
         logger.debug(
             "發送 API 請求",
             extra={
@@ -97,10 +146,96 @@ class BaseExchangeGateway(BaseGateway):
                 "signed": signed,
             },
         )
+        return await self._send(session, method, endpoint, url, req_headers, timing, request_kwargs)
+
+    def prepare_order(self, template: OrderTemplate) -> None:
+        if template not in self._templates:
+            self._templates[template] = self._compile_template(template)
+
+    async def send_order(
+        self, template: OrderTemplate, values: Sequence[str], *, priority: bool = False
+    ) -> bytes:
+        """下單快速路徑：固定欄位已預先編碼，只填入可變欄位並簽名；priority 走限流優先通道。"""
+        recorder = self._latency
+        endpoint = template.endpoint
+        session = await self._ensure_session()
+        timing = RequestTiming(endpoint) if recorder else None
+        if self._private_limiter:
+            await self._private_limiter.acquire(priority=priority)
+            if timing:
+                recorder.record(endpoint, "limiter_wait", time.perf_counter_ns() - timing.start)
+        compiled = self._templates.get(template)
+        if compiled is None:
+            compiled = self._templates[template] = self._compile_template(template)
+        sign_start = time.perf_counter_ns()
+        query, body = compiled.render(values)
+        req_headers = compiled.headers.copy()
+        req_headers.update(self._signed_headers(compiled.method, endpoint, query))
+        if timing:
+            recorder.record(endpoint, "sign", time.perf_counter_ns() - sign_start)
+        return await self._send(
+            session, compiled.method, endpoint, compiled.url, req_headers, timing, {"data": body}
+        )
+
+    def _compile_template(self, template: OrderTemplate) -> CompiledTemplate:
+        method = template.method.upper()
+        slots = len(template.fields)
+        params = template.params([slot_placeholder(i) for i in range(slots)])
+        params = self._normalize_params(method, template.endpoint, params, True)
+        query = self._encode_query(params)
+        body, content_type = self._template_body(params, query)
+        headers = self._default_headers()
+        headers["Content-Type"] = content_type
+        return CompiledTemplate(
+            method,
+            template.endpoint,
+            URL(self._build_url(template.endpoint)),
+            headers,
+            to_format(query, slots),
+            None if body is None else to_format(body, slots),
+        )
+
+    def _template_body(self, params: Mapping[str, Any], query: str) -> tuple[Optional[str], str]:
+        """模板的 body 格式；回傳 None 表示 body 即簽名用的 query。"""
+        return msgspec.json.encode(params).decode(), "application/json"
+
+    async def _send(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        endpoint: str,
+        url: Union[str, URL],
+        req_headers: Mapping[str, str],
+        timing: Optional[RequestTiming],
+        request_kwargs: Mapping[str, Any],
+    ) -> bytes:
+        recorder = self._latency
         try:
-            async with session.request(method.upper(), url, headers=req_headers, **request_kwargs) as resp:
+            sent_ms = wall_ms()
+            async with session.request(
+                method,
+                url,
+                headers=req_headers,
+                trace_request_ctx=timing,
+                **request_kwargs,
+            ) as resp:
+                date_header = resp.headers.get("Date")
+                if date_header:
+                    # 秒級粒度，僅在沒有毫秒樣本時主導估計
+                    self._clock.add_http_date(sent_ms, wall_ms(), date_header)
                 body = await resp.read()
-                if resp.status >= 400:
+                if timing:
+                    now = time.perf_counter_ns()
+                    if timing.response_start:
+                        recorder.record(endpoint, "body_read", now - timing.response_start)
+                    recorder.record(endpoint, "total", now - timing.start)
+                if 400 <= resp.status < 500:
+                    raise ExchangeRejectedError(
+                        f"{self._settings.name} API {resp.status}: {body.decode(errors='ignore')}",
+                        str(resp.status),
+                    )
+                if resp.status >= 500:
+                    # 5xx 時請求可能已被受理，呼叫端不可視為拒絕
                     raise GatewayError(
                         f"{self._settings.name} API {resp.status}: {body.decode(errors='ignore')}"
                     )
@@ -126,20 +261,30 @@ class BaseExchangeGateway(BaseGateway):
             )
             raise GatewayError(f"{self._settings.name} request failed: {exc}") from exc
 
+    def _normalize_params(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Mapping[str, Any]],
+        signed: bool,
+    ) -> Optional[Mapping[str, Any]]:
+        return params
+
     def _prepare_request_kwargs(
         self,
         method: str,
         params: Optional[Mapping[str, Any]],
+        query: str,
     ) -> dict[str, Any]:
-        if method.upper() in {"GET", "DELETE"}:
-            return {"params": params}
+        if method in _QUERY_METHODS:
+            return {}  # query 已併入 URL
         return {"json": params}
 
     def _signed_headers(
         self,
         method: str,
         endpoint: str,
-        params: Optional[Mapping[str, Any]],
+        query: str,
     ) -> Mapping[str, str]:
         raise NotImplementedError
 
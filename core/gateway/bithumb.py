@@ -5,7 +5,7 @@ from typing import Mapping, Optional
 from urllib.parse import urlencode
 
 from core.exceptions import GatewayError
-from core.gateway.auth.hmac_signer import sign_bithumb_request
+from core.gateway.auth.hmac_signer import BithumbHmacSigner
 from core.gateway.base import BaseExchangeGateway, GatewaySettings
 from core.gateway.ratelimit.token_bucket import TokenBucket
 
@@ -25,48 +25,54 @@ class BithumbGateway(BaseExchangeGateway):
             public_limiter=public_limiter,
             private_limiter=private_limiter,
         )
+        self._signer: Optional[BithumbHmacSigner] = None
+        self._last_nonce = 0
+        if settings.access_key and settings.secret_key:
+            self._signer = BithumbHmacSigner(settings.access_key, settings.secret_key)
 
-    async def request(
+    def _normalize_params(
         self,
         method: str,
         endpoint: str,
-        *,
-        params: Optional[Mapping[str, object]] = None,
-        signed: bool = False,
-        headers: Optional[Mapping[str, str]] = None,
-    ) -> bytes:
+        params: Optional[Mapping[str, object]],
+        signed: bool,
+    ) -> Optional[Mapping[str, object]]:
         normalized = dict(params or {})
-        if signed and method.upper() != "GET":
+        if signed and method != "GET":
             normalized.setdefault("endpoint", endpoint)
-        return await super().request(
-            method,
-            endpoint,
-            params=normalized,
-            signed=signed,
-            headers=headers,
-        )
+        return normalized
+
+    def _encode_query(self, params: Optional[Mapping[str, object]]) -> str:
+        # 保持插入順序：簽名字串與 form body 必須逐字節一致
+        return urlencode(params) if params else ""
 
     def _prepare_request_kwargs(
         self,
         method: str,
         params: Optional[Mapping[str, object]],
+        query: str,
     ) -> dict[str, object]:
-        if method.upper() == "GET":
-            return {"params": params}
-        encoded = urlencode(params or {})
-        return {"data": encoded}
+        if method in {"GET", "DELETE"}:
+            return {}  # query 已併入 URL
+        return {"data": query}
+
+    def _template_body(self, params: Mapping[str, object], query: str) -> tuple[Optional[str], str]:
+        return None, "application/x-www-form-urlencoded"
 
     def _signed_headers(
         self,
         method: str,
         endpoint: str,
-        params: Optional[Mapping[str, object]],
+        query: str,
     ) -> Mapping[str, str]:
-        if not self._settings.access_key or not self._settings.secret_key:
+        if self._signer is None:
             raise GatewayError("Bithumb 簽名請求需要 access_key/secret_key")
-        return sign_bithumb_request(
-            endpoint=endpoint,
-            params=params or {},
-            access_key=self._settings.access_key,
-            secret_key=self._settings.secret_key,
-        )
+        return self._signer.sign(endpoint, query, self._next_nonce())
+
+    def _next_nonce(self) -> Optional[str]:
+        # 時鐘已同步時以交易所時間產生 nonce，並保證單調遞增（估計值更新時可能回退）
+        if not self._clock.synced:
+            return None
+        nonce = max(int(self._clock.server_now_ms()), self._last_nonce + 1)
+        self._last_nonce = nonce
+        return str(nonce)
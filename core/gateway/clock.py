@@ -0,0 +1,159 @@
+"""交易所時鐘偏移估計。
+
+以 NTP 式樣本（本地送出時間、本地收到時間、伺服器時間）估計 offset 與 RTT，
+在滑動視窗內選取有效 RTT 最小的樣本作為估計值（clock filter）。
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from utils.logger import setup_logger
+
+logger = setup_logger("clock_sync")
+
+
+def wall_ms() -> float:
+    return time.time() * 1000
+
+
+@dataclass(slots=True)
+class ClockSample:
+    offset_ms: float  # 伺服器時間 - 本地時間
+    rtt_ms: float
+    uncertainty_ms: float  # rtt + 伺服器時間解析度，作為濾波排序依據
+    taken_at: float  # time.monotonic()
+
+
+class ClockOffsetEstimator:
+    """單一交易所的時鐘偏移估計器（非協程安全，僅在事件循環中使用）。"""
+
+    def __init__(self, window: int = 32, max_age: float = 600.0) -> None:
+        self._samples: Deque[ClockSample] = deque(maxlen=window)
+        self._max_age = max_age
+        self._best: Optional[ClockSample] = None
+
+    @property
+    def synced(self) -> bool:
+        return self._best is not None
+
+    @property
+    def offset_ms(self) -> float:
+        return self._best.offset_ms if self._best else 0.0
+
+    @property
+    def rtt_ms(self) -> float:
+        return self._best.rtt_ms if self._best else 0.0
+
+    @property
+    def uncertainty_ms(self) -> float:
+        return self._best.uncertainty_ms if self._best else float("inf")
+
+    def add_sample(
+        self,
+        sent_ms: float,
+        received_ms: float,
+        server_ms: float,
+        *,
+        resolution_ms: float = 0.0,
+    ) -> None:
+        """server_ms 若經截斷（如 HTTP Date 僅到秒），以 resolution_ms 表示其粒度。"""
+        rtt = max(received_ms - sent_ms, 0.0)
+        midpoint = (sent_ms + received_ms) / 2
+        offset = server_ms + resolution_ms / 2 - midpoint
+        sample = ClockSample(offset, rtt, rtt + resolution_ms, time.monotonic())
+        self._samples.append(sample)
+        self._refresh(sample.taken_at)
+
+    def add_http_date(self, sent_ms: float, received_ms: float, date_header: str) -> None:
+        try:
+            server_ms = parsedate_to_datetime(date_header).timestamp() * 1000
+        except (TypeError, ValueError):
+            return
+        self.add_sample(sent_ms, received_ms, server_ms, resolution_ms=1000.0)
+
+    def _refresh(self, now: float) -> None:
+        while self._samples and now - self._samples[0].taken_at > self._max_age:
+            self._samples.popleft()
+        self._best = min(self._samples, key=lambda s: s.uncertainty_ms) if self._samples else None
+
+    def to_local_ms(self, server_ms: float) -> float:
+        """將交易所時間戳換算為本地時鐘。"""
+        return server_ms - self.offset_ms
+
+    def server_now_ms(self) -> float:
+        return wall_ms() + self.offset_ms
+
+    def age_ms(self, server_ms: float, now_ms: Optional[float] = None) -> float:
+        """交易所時間戳距今的真實經過時間（已扣除時鐘偏差）。"""
+        local_now = wall_ms() if now_ms is None else now_ms
+        return local_now - self.to_local_ms(server_ms)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "synced": self.synced,
+            "offset_ms": round(self.offset_ms, 3),
+            "rtt_ms": round(self.rtt_ms, 3),
+            "uncertainty_ms": round(self.uncertainty_ms, 3) if self.synced else -1,
+            "samples": len(self._samples),
+        }
+
+
+@dataclass(slots=True)
+class ServerTime:
+    """探測到的伺服器時間；真實時間落在 [server_ms, server_ms + resolution_ms]。"""
+
+    server_ms: int
+    resolution_ms: float = 0.0  # 截斷粒度或資料可能落後的上限
+
+
+ServerTimeProbe = Callable[[], Awaitable[ServerTime]]
+
+
+class ClockSync:
+    """背景定期探測各交易所的伺服器時間，連同其不確定度餵入對應估計器。"""
+
+    def __init__(self, interval: float = 30.0) -> None:
+        self._interval = interval
+        self._probes: List[Tuple[str, ClockOffsetEstimator, ServerTimeProbe]] = []
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def register(self, name: str, estimator: ClockOffsetEstimator, probe: ServerTimeProbe) -> None:
+        self._probes.append((name, estimator, probe))
+
+    async def start(self) -> None:
+        await self.sync_once()
+        self._task = asyncio.create_task(self._run(), name="clock-sync")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def sync_once(self) -> None:
+        for name, estimator, probe in self._probes:
+            sent = wall_ms()
+            try:
+                server_time = await probe()
+            except Exception as exc:  # pragma: no cover - 探測失敗不影響主流程
+                logger.warning("時鐘探測失敗", extra={"exchange": name, "error": str(exc)})
+                continue
+            received = wall_ms()
+            if server_time.server_ms:
+                estimator.add_sample(
+                    sent, received, float(server_time.server_ms), resolution_ms=server_time.resolution_ms
+                )
+            logger.debug("時鐘同步", extra={"exchange": name, **estimator.summary()})
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            await self.sync_once()
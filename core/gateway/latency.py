@@ -0,0 +1,133 @@
+"""Gateway 請求分段延遲量測（基於 aiohttp TraceConfig）。"""
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from utils.histogram import LatencyHistogram
+
+# connect 涵蓋 TCP 與 TLS 握手：aiohttp 未提供 TLS 獨立的 trace 事件
+PHASES = (
+    "limiter_wait",
+    "sign",
+    "dns",
+    "connect",
+    "request_sent",
+    "first_byte",
+    "body_read",
+    "total",
+)
+
+
+class RequestTiming:
+    """單次請求的時間戳（perf_counter_ns），作為 trace_request_ctx 傳入 aiohttp。"""
+
+    __slots__ = (
+        "endpoint",
+        "start",
+        "request_start",
+        "dns_start",
+        "connect_start",
+        "headers_sent",
+        "response_start",
+    )
+
+    def __init__(self, endpoint: str) -> None:
+        self.endpoint = endpoint
+        self.start = time.perf_counter_ns()
+        self.request_start = 0
+        self.dns_start = 0
+        self.connect_start = 0
+        self.headers_sent = 0
+        self.response_start = 0
+
+
+class LatencyRecorder:
+    """按 endpoint 與階段聚合延遲直方圖（微秒），可於運行時查詢。"""
+
+    def __init__(self, exchange: str) -> None:
+        self._exchange = exchange
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+
+    @property
+    def exchange(self) -> str:
+        return self._exchange
+
+    def record(self, endpoint: str, phase: str, elapsed_ns: int) -> None:
+        phases = self._histograms.get(endpoint)
+        if phases is None:
+            phases = self._histograms[endpoint] = {}
+        histogram = phases.get(phase)
+        if histogram is None:
+            histogram = phases[phase] = LatencyHistogram()
+        histogram.record(elapsed_ns // 1000)
+
+    def histogram(self, endpoint: str, phase: str) -> Optional[LatencyHistogram]:
+        return self._histograms.get(endpoint, {}).get(phase)
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """回傳 {endpoint: {phase: 統計摘要}}，單位微秒。"""
+        return {
+            endpoint: {phase: hist.summary() for phase, hist in phases.items()}
+            for endpoint, phases in self._histograms.items()
+        }
+
+    def reset(self) -> None:
+        self._histograms.clear()
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        config = aiohttp.TraceConfig()
+        config.on_request_start.append(self._on_request_start)
+        config.on_dns_resolvehost_start.append(self._on_dns_start)
+        config.on_dns_resolvehost_end.append(self._on_dns_end)
+        config.on_connection_create_start.append(self._on_connect_start)
+        config.on_connection_create_end.append(self._on_connect_end)
+        config.on_request_headers_sent.append(self._on_headers_sent)
+        config.on_request_end.append(self._on_request_end)
+        return config
+
+    @staticmethod
+    def _timing(ctx: SimpleNamespace) -> Optional[RequestTiming]:
+        timing = ctx.trace_request_ctx
+        return timing if isinstance(timing, RequestTiming) else None
+
+    async def _on_request_start(self, _session: Any, ctx: SimpleNamespace, _params: Any) -> None:
+        timing = self._timing(ctx)
+        if timing:
+            timing.request_start = time.perf_counter_ns()
+
+    async def _on_dns_start(self, _session: Any, ctx: SimpleNamespace, _params: Any) -> None:
+        timing = self._timing(ctx)
+        if timing:
+            timing.dns_start = time.perf_counter_ns()
+
+    async def _on_dns_end(self, _session: Any, ctx: SimpleNamespace, _params: Any) -> None:
+        timing = self._timing(ctx)
+        if timing and timing.dns_start:
+            self.record(timing.endpoint, "dns", time.perf_counter_ns() - timing.dns_start)
+
+    async def _on_connect_start(self, _session: Any, ctx: SimpleNamespace, _params: Any) -> None:
+        timing = self._timing(ctx)
+        if timing:
+            timing.connect_start = time.perf_counter_ns()
+
+    async def _on_connect_end(self, _session: Any, ctx: SimpleNamespace, _params: Any) -> None:
+        timing = self._timing(ctx)
+        if timing and timing.connect_start:
+            self.record(timing.endpoint, "connect", time.perf_counter_ns() - timing.connect_start)
+
+    async def _on_headers_sent(self, _session: Any, ctx: SimpleNamespace, _params: Any) -> None:
+        timing = self._timing(ctx)
+        if timing and timing.request_start:
+            timing.headers_sent = time.perf_counter_ns()
+            # 自發起請求到送出 header，包含取得連線（新建或複用）
+            self.record(timing.endpoint, "request_sent", timing.headers_sent - timing.request_start)
+
+    async def _on_request_end(self, _session: Any, ctx: SimpleNamespace, _params: Any) -> None:
+        timing = self._timing(ctx)
+        if timing and timing.headers_sent:
+            timing.response_start = time.perf_counter_ns()
+            self.record(timing.endpoint, "first_byte", timing.response_start - timing.headers_sent)
@@ -0,0 +1,71 @@
+"""預先編譯的下單請求模板。
+
+OrderTemplate 描述與交易所無關的固定欄位與可變欄位；Gateway 首次使用時將其
+編譯為 CompiledTemplate（query/body 的格式字串、URL 與靜態 Header），
+之後每次下單僅需以 str.format 填入數量/價格再簽名。
+
+填入的值不再轉義，Wrapper 須以 decimal_param 傳入定點小數字串（不含 "+"、"&"）。
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Mapping, Sequence, Tuple, Union
+
+from yarl import URL
+
+
+@dataclass(frozen=True, slots=True)
+class OrderTemplate:
+    """固定欄位依插入順序排在可變欄位之前，與 Wrapper 原本組裝的 dict 一致。"""
+
+    method: str
+    endpoint: str
+    fixed: Tuple[Tuple[str, str], ...]
+    fields: Tuple[str, ...]
+
+    def params(self, values: Sequence[str]) -> Dict[str, str]:
+        params = dict(self.fixed)
+        params.update(zip(self.fields, values))
+        return params
+
+
+def slot_placeholder(index: int) -> str:
+    """編譯時佔位符：僅含 urlencode/JSON 皆不轉義的字元。"""
+    return f"__karb_slot_{index}__"
+
+
+def to_format(text: str, slots: int) -> str:
+    """將含佔位符的已編碼字串轉為 str.format 格式字串。"""
+    text = text.replace("{", "{{").replace("}", "}}")
+    for index in range(slots):
+        text = text.replace(slot_placeholder(index), "{%d}" % index)
+    return text
+
+
+class CompiledTemplate:
+    """單一 Gateway 上已編譯的模板。"""
+
+    __slots__ = ("method", "endpoint", "url", "headers", "_query_fmt", "_body_fmt")
+
+    def __init__(
+        self,
+        method: str,
+        endpoint: str,
+        url: Union[str, URL],
+        headers: Mapping[str, str],
+        query_fmt: str,
+        body_fmt: str | None,
+    ) -> None:
+        self.method = method
+        self.endpoint = endpoint
+        self.url = url
+        self.headers = dict(headers)
+        self._query_fmt = query_fmt
+        self._body_fmt = body_fmt  # None 表示 body 與簽名字串相同（form 編碼）
+
+    def render(self, values: Sequence[str]) -> Tuple[str, bytes]:
+        """回傳（簽名用 query 字串, 實際送出的 body）。"""
+        query = self._query_fmt.format(*values)
+        if self._body_fmt is None:
+            return query, query.encode()
+        return query, self._body_fmt.format(*values).encode()
@@ -15,7 +15,7 @@ class RateLimitConfig:
 
 
 class TokenBucket:
-    """簡易令牌桶，支援異步等待。"""
+    """簡易令牌桶，支援異步等待；priority 請求（撤單）等待時普通請求讓行。"""
 
     def __init__(self, capacity: int, refill_rate: float) -> None:
         if capacity <= 0 or refill_rate <= 0:
@@ -24,6 +24,7 @@ class TokenBucket:
         self._tokens = float(capacity)
         self._lock = asyncio.Lock()
         self._last_refill = time.monotonic()
+        self._priority_waiting = 0
 
     def _refill(self) -> None:
         now = time.monotonic()
@@ -33,15 +34,21 @@ class TokenBucket:
         if refill_amount > 0:
             self._tokens = min(self._config.capacity, self._tokens + refill_amount)
 
-    async def acquire(self, tokens: float = 1.0) -> None:
+    async def acquire(self, tokens: float = 1.0, *, priority: bool = False) -> None:
         if tokens <= 0:
             return
-        while True:
-            async with self._lock:
-                self._refill()
-                if self._tokens >= tokens:
-                    self._tokens -= tokens
-                    return
-                deficit = tokens - self._tokens
-                wait_time = deficit / self._config.refill_rate
-            await asyncio.sleep(max(wait_time, 0.001))
+        if priority:
+            self._priority_waiting += 1
+        try:
+            while True:
+                async with self._lock:
+                    self._refill()
+                    if (priority or not self._priority_waiting) and self._tokens >= tokens:
+                        self._tokens -= tokens
+                        return
+                    deficit = max(tokens - self._tokens, 0.0)
+                    wait_time = deficit / self._config.refill_rate
+                await asyncio.sleep(max(wait_time, 0.001))
+        finally:
+            if priority:
+                self._priority_waiting -= 1
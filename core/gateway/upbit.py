@@ -4,7 +4,7 @@ from __future__ import annotations
 from typing import Mapping, Optional
 
 from core.exceptions import GatewayError
-from core.gateway.auth.jwt_native import generate_upbit_jwt
+from core.gateway.auth.jwt_native import UpbitJwtSigner, encode_upbit_query
 from core.gateway.base import BaseExchangeGateway, GatewaySettings
 from core.gateway.ratelimit.token_bucket import TokenBucket
 
@@ -24,14 +24,29 @@ class UpbitGateway(BaseExchangeGateway):
             public_limiter=public_limiter,
             private_limiter=private_limiter,
         )
+        self._signer: Optional[UpbitJwtSigner] = None
+        if settings.access_key and settings.secret_key:
+            self._signer = UpbitJwtSigner(settings.access_key, settings.secret_key)
+
+    @property
+    def private_websocket_url(self) -> str:
+        return self._settings.private_websocket_url or self._settings.websocket_url.rstrip("/") + "/private"
+
+    def private_ws_headers(self) -> Mapping[str, str]:
+        """私有 WebSocket 連線所需的 JWT Header（無 query）。"""
+        if self._signer is None:
+            raise GatewayError("Upbit 私有 WebSocket 需要 access_key/secret_key")
+        return {"Authorization": self._signer.sign()}
+
+    def _encode_query(self, params: Optional[Mapping[str, object]]) -> str:
+        return encode_upbit_query(params) if params else ""
 
     def _signed_headers(
         self,
         method: str,
         endpoint: str,
-        params: Optional[Mapping[str, object]],
+        query: str,
     ) -> Mapping[str, str]:
-        if not self._settings.access_key or not self._settings.secret_key:
+        if self._signer is None:
             raise GatewayError("Upbit 簽名請求需要 access_key/secret_key")
-        token = generate_upbit_jwt(self._settings.access_key, self._settings.secret_key, params)
-        return {"Authorization": token}
+        return {"Authorization": self._signer.sign(query)}
@@ -2,16 +2,25 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Awaitable, Callable, Mapping, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Mapping, Optional, Sequence
 
 import aiohttp
 
 from core.datatypes import Balance, OrderBook, OrderRequest, OrderResult
 
+if TYPE_CHECKING:
+    from core.gateway.clock import ClockOffsetEstimator
+    from core.gateway.prepared import OrderTemplate
+
 
 class BaseGateway(ABC):
     """網關層抽象基類，負責網絡通信與鑑權。"""
 
+    @property
+    def clock(self) -> Optional["ClockOffsetEstimator"]:
+        """交易所時鐘偏移估計器；不支援時為 None。"""
+        return None
+
     @abstractmethod
     async def request(
         self,
@@ -21,8 +30,24 @@ class BaseGateway(ABC):
         params: Optional[Mapping[str, Any]] = None,
         signed: bool = False,
         headers: Optional[Mapping[str, str]] = None,
+        priority: bool = False,
+    ) -> bytes:
+        """發送 HTTP 請求並返回原始二進制響應；priority 走限流器的優先通道。"""
+
+    def prepare_order(self, template: "OrderTemplate") -> None:
+        """預先編譯下單模板；不支援時為空操作。"""
+
+    async def send_order(
+        self, template: "OrderTemplate", values: Sequence[str], *, priority: bool = False
     ) -> bytes:
-        """發送 HTTP 請求並返回原始二進制響應。"""
+        """以模板發送已簽名的下單請求；預設退回一般 request。"""
+        return await self.request(
+            template.method,
+            template.endpoint,
+            params=template.params(values),
+            signed=True,
+            priority=priority,
+        )
 
     @abstractmethod
     async def ws_connect(
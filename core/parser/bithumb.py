@@ -5,6 +5,7 @@ from decimal import Decimal
 from typing import Any, Dict, List, Sequence
 
 from core.datatypes import Balance, OrderBook, OrderResult, PriceLevel
+from core.exceptions import ExchangeRejectedError
 from core.parser.base import JsonParser
 
 
@@ -13,7 +14,8 @@ class BithumbParser(JsonParser):
 
     def _assert_success(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         if payload.get("status") != "0000":
-            raise ValueError(f"Bithumb API error: {payload.get('status')}")
+            status = str(payload.get("status"))
+            raise ExchangeRejectedError(f"Bithumb API error: {status}", status)
         return payload["data"]
 
     def parse_orderbook(self, raw: bytes) -> OrderBook:
@@ -68,6 +70,11 @@ class BithumbParser(JsonParser):
             )
         return balances
 
+    def parse_markets(self, raw: bytes, quote: str = "KRW") -> List[str]:
+        """解析 /public/ticker/ALL_{quote}，回傳交易對（如 BTC_KRW）。"""
+        data = self._assert_success(self._decode(raw))
+        return [f"{base}_{quote}" for base, item in data.items() if isinstance(item, dict)]
+
     def parse_order_result(self, raw: bytes) -> OrderResult:
         payload = self._decode(raw)
         data = self._assert_success(payload)
@@ -81,6 +88,29 @@ class BithumbParser(JsonParser):
             raw=data,
         )
 
+    def parse_open_orders(self, raw: bytes) -> List[OrderResult]:
+        """解析 /info/orders（僅含未完成訂單，無 status 欄位）。"""
+        payload = self._decode(raw)
+        if payload.get("status") == "5600" and "존재하지" in str(payload.get("message", "")):
+            return []  # Bithumb 以 5600 表示「無未完成訂單」
+        data = self._assert_success(payload)
+        results: List[OrderResult] = []
+        for item in data or []:
+            units = self._to_decimal(item.get("units", "0"))
+            remaining = self._to_decimal(item.get("units_remaining", "0"))
+            results.append(
+                OrderResult(
+                    order_id=str(item.get("order_id", "")),
+                    exchange="bithumb",
+                    symbol=item.get("order_currency", ""),
+                    status="Pending",
+                    filled_quantity=units - remaining,
+                    average_price=None,
+                    raw=item,
+                )
+            )
+        return results
+
     def _optional_decimal(self, value: Any) -> Decimal | None:
         if value in (None, "", 0):
             return None
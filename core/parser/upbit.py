@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import Any, Dict, List, Sequence
+from typing import Any, Dict, List, Mapping, Sequence
 
 from core.datatypes import Balance, OrderBook, OrderRequest, OrderResult, PriceLevel
 from core.parser.base import JsonParser
@@ -56,8 +56,18 @@ class UpbitParser(JsonParser):
             )
         return balances
 
+    def parse_markets(self, raw: bytes) -> List[str]:
+        """解析 /v1/market/all，回傳市場代碼（如 KRW-BTC）。"""
+        return [item["market"] for item in self._decode(raw)]
+
     def parse_order_result(self, raw: bytes) -> OrderResult:
-        payload = self._decode(raw)
+        return self._order_from_payload(self._decode(raw))
+
+    def parse_order_results(self, raw: bytes) -> List[OrderResult]:
+        """解析 /v1/orders/uuids 的批次回應。"""
+        return [self._order_from_payload(item) for item in self._decode(raw)]
+
+    def _order_from_payload(self, payload: Dict[str, Any]) -> OrderResult:
         return OrderResult(
             order_id=payload.get("uuid", ""),
             exchange="upbit",
@@ -68,6 +78,35 @@ class UpbitParser(JsonParser):
             raw=payload,
         )
 
+    def parse_my_order(self, payload: Mapping[str, Any]) -> OrderResult:
+        """解析私有 WS myOrder 事件（已解碼）。"""
+        return OrderResult(
+            order_id=payload.get("uuid", ""),
+            exchange="upbit",
+            symbol=payload.get("code", ""),
+            status=payload.get("state", ""),
+            filled_quantity=self._to_decimal(payload.get("executed_volume") or "0"),
+            average_price=self._optional_decimal(payload.get("avg_price")),
+            raw=dict(payload),
+        )
+
+    def parse_my_asset(self, payload: Mapping[str, Any]) -> List[Balance]:
+        """解析私有 WS myAsset 事件（已解碼）。"""
+        balances: List[Balance] = []
+        for item in payload.get("assets", []):
+            available = self._to_decimal(item.get("balance", "0"))
+            locked = self._to_decimal(item.get("locked", "0"))
+            balances.append(
+                Balance(
+                    exchange="upbit",
+                    currency=item["currency"],
+                    available=available,
+                    locked=locked,
+                    total=available + locked,
+                )
+            )
+        return balances
+
     def _optional_decimal(self, value: Any) -> Decimal | None:
         if value in (None, "", 0):
             return None
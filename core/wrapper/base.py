@@ -2,17 +2,46 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Awaitable, Callable, Mapping, Optional, Sequence
+import time
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, ClassVar, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 from core.datatypes import Balance, OrderBook, OrderRequest, OrderResult
+from core.gateway.clock import ServerTime, wall_ms
+from core.gateway.prepared import OrderTemplate
 from core.interface import BaseGateway, BaseParser, BaseWrapper
 
 
+def decimal_param(value: Decimal) -> str:
+    """定點小數字串；str(Decimal) 可能輸出 1E+3 這類科學記號。"""
+    return format(value, "f")
+
+
 class BaseExchangeWrapper(BaseWrapper):
     """面向特定交易所的通用封裝。"""
 
+    _ORDER_KINDS: ClassVar[Tuple[str, ...]] = ()
+
     def __init__(self, gateway: BaseGateway, parser: BaseParser) -> None:
         super().__init__(gateway, parser)
+        self._order_templates: Dict[Tuple[str, str], OrderTemplate] = {}
+
+    def prepare_orders(self, symbols: Iterable[str]) -> None:
+        """啟動時預先建立並編譯各交易對的下單模板，首筆訂單不再付編譯成本。"""
+        for symbol in symbols:
+            for kind in self._ORDER_KINDS:
+                self._order_template(symbol, kind)
+
+    def _order_template(self, symbol: str, kind: str) -> OrderTemplate:
+        key = (symbol, kind)
+        template = self._order_templates.get(key)
+        if template is None:
+            template = self._order_templates[key] = self._build_order_template(symbol, kind)
+            self._gateway.prepare_order(template)
+        return template
+
+    def _build_order_template(self, symbol: str, kind: str) -> OrderTemplate:
+        raise NotImplementedError
 
     async def close(self) -> None:  # noqa: D401 - 文檔在父類
         await self._gateway.close()
@@ -24,13 +53,28 @@ class BaseExchangeWrapper(BaseWrapper):
         *,
         params: Optional[Mapping[str, Any]] = None,
         signed: bool = False,
+        priority: bool = False,
     ) -> bytes:
-        return await self._gateway.request(
-            method=method,
-            endpoint=endpoint,
-            params=params,
-            signed=signed,
-        )
+        return await self._gateway.request(method, endpoint, params=params, signed=signed, priority=priority)
+
+    def _stamp(self, orderbook: OrderBook, received_ns: int = 0) -> OrderBook:
+        """標記本地收到時間與經時鐘校正後的訂單簿延遲；received_ns 為幀到達時刻。"""
+        orderbook.parsed_ns = time.perf_counter_ns()
+        orderbook.received_ns = received_ns or orderbook.parsed_ns
+        now = wall_ms()
+        orderbook.received_at = now
+        if orderbook.timestamp:
+            clock = self._gateway.clock
+            orderbook.age_ms = clock.age_ms(orderbook.timestamp, now) if clock else now - orderbook.timestamp
+        return orderbook
+
+    async def get_open_orders(self, symbol: str, *, priority: bool = False) -> List[OrderResult]:
+        """查詢某交易對的未完成訂單；priority 走限流優先通道。"""
+        raise NotImplementedError
+
+    async def fetch_server_time(self) -> ServerTime:
+        """取得交易所伺服器時間（毫秒）與其不確定度，供時鐘同步使用。"""
+        raise NotImplementedError
 
     async def subscribe_orderbook(
         self,
@@ -1,26 +1,48 @@
 """Bithumb Wrapper。"""
 from __future__ import annotations
 
+import time
 from decimal import Decimal
-from typing import Any, Awaitable, Callable, Mapping, Optional, Sequence
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, List, Mapping, Optional, Sequence
 
 import msgspec
 from aiohttp import WSMsgType
 
 from core.datatypes import Balance, OrderBook, OrderRequest, OrderResult
-from core.wrapper.base import BaseExchangeWrapper
+from core.gateway.clock import ServerTime
+from core.gateway.prepared import OrderTemplate
+from core.wrapper.base import BaseExchangeWrapper, decimal_param
 from utils.logger import setup_logger
 
 logger = setup_logger("bithumb_wrapper")
 
 
+@lru_cache(maxsize=512)
+def _currency_params(symbol: str) -> Mapping[str, str]:
+    """BTC_KRW -> {order_currency, payment_currency}，每個交易對只拆一次。"""
+    base, _, quote = symbol.partition("_")
+    return {"order_currency": base, "payment_currency": quote or "KRW"}
+
+
 class BithumbWrapper(BaseExchangeWrapper):
     """提供 Bithumb API 封裝。"""
 
+    _ORDER_KINDS = ("buy_market", "sell_market")
+
     async def get_orderbook(self, symbol: str) -> OrderBook:
         logger.debug("取得 Bithumb 訂單簿", extra={"symbol": symbol})
         raw = await self._fetch_json("GET", f"/public/orderbook/{symbol}")
-        return self._parser.parse_orderbook(raw)
+        return self._stamp(self._parser.parse_orderbook(raw))
+
+    async def fetch_server_time(self) -> ServerTime:
+        # Bithumb 公開 API 的 timestamp 為伺服器產生回應的時間，毫秒精度
+        raw = await self._fetch_json("GET", "/public/orderbook/BTC_KRW")
+        return ServerTime(self._parser.parse_orderbook(raw).timestamp)
+
+    async def get_markets(self, quote: str = "KRW") -> List[str]:
+        raw = await self._fetch_json("GET", f"/public/ticker/ALL_{quote}")
+        return self._parser.parse_markets(raw, quote)
 
     async def get_balance(self) -> Sequence[Balance]:
         logger.debug("查詢 Bithumb 餘額")
@@ -29,10 +51,9 @@ class BithumbWrapper(BaseExchangeWrapper):
 
     async def place_order(self, order: OrderRequest) -> OrderResult:
         payload = {
-            "order_currency": order.symbol.split("_")[0],
-            "payment_currency": order.symbol.split("_")[-1],
-            "units": str(order.quantity),
-            "price": str(order.price or 0),
+            **_currency_params(order.symbol),
+            "units": decimal_param(order.quantity),
+            "price": decimal_param(order.price or Decimal("0")),
             "type": order.side,
         }
         logger.info("Bithumb 下單", extra={"symbol": order.symbol, "side": order.side, "ord_type": order.order_type})
@@ -40,33 +61,47 @@ class BithumbWrapper(BaseExchangeWrapper):
         return self._parser.parse_order_result(raw)
 
     async def cancel_order(self, order_id: str) -> OrderResult:
-        raw = await self._fetch_json("POST", "/trade/cancel", params={"order_id": order_id}, signed=True)
+        # 撤單只會降低風險，一律走限流優先通道
+        raw = await self._fetch_json(
+            "POST", "/trade/cancel", params={"order_id": order_id}, signed=True, priority=True
+        )
         return self._parser.parse_order_result(raw)
 
     async def get_order_status(self, order_id: str) -> OrderResult:
         raw = await self._fetch_json("POST", "/info/order_detail", params={"order_id": order_id}, signed=True)
         return self._parser.parse_order_result(raw)
 
-    async def buy_market_order(self, symbol: str, volume: Decimal) -> OrderResult:
+    async def get_open_orders(self, symbol: str, *, priority: bool = False) -> List[OrderResult]:
+        """查詢某交易對的所有未完成訂單（一次請求）。"""
         payload = {
-            "order_currency": symbol.split("_")[0],
-            "payment_currency": symbol.split("_")[-1],
-            "units": str(volume),
+            **_currency_params(symbol),
+            "count": "1000",
         }
-        logger.info("Bithumb 市價買", extra={"symbol": symbol, "volume": str(volume)})
-        raw = await self._fetch_json("POST", "/trade/market_buy", params=payload, signed=True)
+        raw = await self._fetch_json("POST", "/info/orders", params=payload, signed=True, priority=priority)
+        return self._parser.parse_open_orders(raw)
+
+    async def buy_market_order(self, symbol: str, volume: Decimal, *, priority: bool = False) -> OrderResult:
+        units = decimal_param(volume)
+        logger.info("Bithumb 市價買", extra={"symbol": symbol, "volume": units})
+        raw = await self._gateway.send_order(
+            self._order_template(symbol, "buy_market"), (units,), priority=priority
+        )
         return self._parser.parse_order_result(raw)
 
-    async def sell_market_order(self, symbol: str, volume: Decimal) -> OrderResult:
-        payload = {
-            "order_currency": symbol.split("_")[0],
-            "payment_currency": symbol.split("_")[-1],
-            "units": str(volume),
-        }
-        logger.info("Bithumb 市價賣", extra={"symbol": symbol, "volume": str(volume)})
-        raw = await self._fetch_json("POST", "/trade/market_sell", params=payload, signed=True)
+    async def sell_market_order(self, symbol: str, volume: Decimal, *, priority: bool = False) -> OrderResult:
+        units = decimal_param(volume)
+        logger.info("Bithumb 市價賣", extra={"symbol": symbol, "volume": units})
+        raw = await self._gateway.send_order(
+            self._order_template(symbol, "sell_market"), (units,), priority=priority
+        )
         return self._parser.parse_order_result(raw)
 
+    def _build_order_template(self, symbol: str, kind: str) -> OrderTemplate:
+        endpoints = {"buy_market": "/trade/market_buy", "sell_market": "/trade/market_sell"}
+        if kind not in endpoints:
+            raise ValueError(f"未知的模板類型: {kind}")
+        return OrderTemplate("POST", endpoints[kind], tuple(_currency_params(symbol).items()), ("units",))
+
     async def subscribe_orderbook(
         self,
         symbol: str,
@@ -87,11 +122,12 @@ class BithumbWrapper(BaseExchangeWrapper):
             await ws.close()
 
     async def _handle_ws_payload(self, data: bytes, callback: Callable[[OrderBook], Awaitable[None]]) -> None:
+        received_ns = time.perf_counter_ns()
         payload = msgspec.json.decode(data)
         if isinstance(payload, dict) and "content" in payload:
             # Bithumb WS 將 orderbook 放在 content 中
             normalized = msgspec.json.encode({"status": "0000", "data": payload["content"]})
         else:
             normalized = msgspec.json.encode({"status": "0000", "data": payload})
-        orderbook = self._parser.parse_orderbook(normalized)
+        orderbook = self._stamp(self._parser.parse_orderbook(normalized), received_ns)
         await callback(orderbook)
@@ -2,14 +2,17 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from decimal import Decimal
-from typing import Any, Awaitable, Callable, Mapping, Optional, Sequence
+from typing import Any, Awaitable, Callable, List, Mapping, Optional, Sequence
 
 import msgspec
 from aiohttp import WSMsgType
 
 from core.datatypes import Balance, OrderBook, OrderRequest, OrderResult
-from core.wrapper.base import BaseExchangeWrapper
+from core.gateway.clock import ServerTime
+from core.gateway.prepared import OrderTemplate
+from core.wrapper.base import BaseExchangeWrapper, decimal_param
 from utils.logger import setup_logger
 
 logger = setup_logger("upbit_wrapper")
@@ -18,10 +21,23 @@ logger = setup_logger("upbit_wrapper")
 class UpbitWrapper(BaseExchangeWrapper):
     """提供 Upbit 高階接口。"""
 
+    _ORDER_KINDS = ("buy_market", "sell_market")
+    BOOK_STALENESS_MS = 1000.0  # KRW-BTC 訂單簿 timestamp 落後當下時間的保守上限
+
     async def get_orderbook(self, symbol: str) -> OrderBook:
         logger.debug("取得 Upbit 訂單簿", extra={"symbol": symbol})
         raw = await self._fetch_json("GET", "/v1/orderbook", params={"markets": symbol})
-        return self._parser.parse_orderbook(raw)
+        return self._stamp(self._parser.parse_orderbook(raw))
+
+    async def fetch_server_time(self) -> ServerTime:
+        # Upbit 沒有伺服器時間端點；訂單簿 timestamp 是最後變動時間，只是下界，
+        # 以可能的落後量作為不確定度，避免被當成精確樣本而低估 offset
+        raw = await self._fetch_json("GET", "/v1/orderbook", params={"markets": "KRW-BTC"})
+        return ServerTime(self._parser.parse_orderbook(raw).timestamp, self.BOOK_STALENESS_MS)
+
+    async def get_markets(self) -> List[str]:
+        raw = await self._fetch_json("GET", "/v1/market/all")
+        return self._parser.parse_markets(raw)
 
     async def get_balance(self) -> Sequence[Balance]:
         logger.debug("查詢 Upbit 餘額")
@@ -33,44 +49,67 @@ class UpbitWrapper(BaseExchangeWrapper):
             "market": order.symbol,
             "side": order.side,
             "ord_type": order.order_type,
-            "volume": str(order.quantity),
+            "volume": decimal_param(order.quantity),
         }
         if order.price is not None:
-            payload = {**payload, "price": str(order.price)}
+            payload = {**payload, "price": decimal_param(order.price)}
         logger.info("Upbit 下單", extra={"symbol": order.symbol, "side": order.side, "ord_type": order.order_type})
         raw = await self._fetch_json("POST", "/v1/orders", params=payload, signed=True)
         return self._parser.parse_order_result(raw)
 
     async def cancel_order(self, order_id: str) -> OrderResult:
-        raw = await self._fetch_json("DELETE", "/v1/order", params={"uuid": order_id}, signed=True)
+        # 撤單只會降低風險，一律走限流優先通道
+        raw = await self._fetch_json("DELETE", "/v1/order", params={"uuid": order_id}, signed=True, priority=True)
         return self._parser.parse_order_result(raw)
 
     async def get_order_status(self, order_id: str) -> OrderResult:
         raw = await self._fetch_json("GET", "/v1/order", params={"uuid": order_id}, signed=True)
         return self._parser.parse_order_result(raw)
 
-    async def buy_market_order(self, symbol: str, amount: Decimal) -> OrderResult:
-        payload: Mapping[str, Any] = {
-            "market": symbol,
-            "side": "bid",
-            "price": str(amount),
-            "ord_type": "price",
-        }
-        logger.info("Upbit 市價買", extra={"symbol": symbol, "amount": str(amount)})
-        raw = await self._fetch_json("POST", "/v1/orders", params=payload, signed=True)
+    async def get_orders_status(self, order_ids: Sequence[str]) -> List[OrderResult]:
+        """以 /v1/orders/uuids 一次查詢多筆訂單（單次上限 100 筆）。"""
+        if not order_ids:
+            return []
+        raw = await self._fetch_json("GET", "/v1/orders/uuids", params={"uuids[]": list(order_ids)}, signed=True)
+        return self._parser.parse_order_results(raw)
+
+    async def get_open_orders(self, symbol: str, *, priority: bool = False) -> List[OrderResult]:
+        """查詢某交易對的所有未完成訂單（一次請求）。"""
+        raw = await self._fetch_json(
+            "GET",
+            "/v1/orders/open",
+            params={"market": symbol, "states[]": ["wait", "watch"]},
+            signed=True,
+            priority=priority,
+        )
+        return self._parser.parse_order_results(raw)
+
+    async def buy_market_order(self, symbol: str, amount: Decimal, *, priority: bool = False) -> OrderResult:
+        amount_str = decimal_param(amount)
+        logger.info("Upbit 市價買", extra={"symbol": symbol, "amount": amount_str})
+        raw = await self._gateway.send_order(
+            self._order_template(symbol, "buy_market"), (amount_str,), priority=priority
+        )
         return self._parser.parse_order_result(raw)
 
-    async def sell_market_order(self, symbol: str, volume: Decimal) -> OrderResult:
-        payload: Mapping[str, Any] = {
-            "market": symbol,
-            "side": "ask",
-            "volume": str(volume),
-            "ord_type": "market",
-        }
-        logger.info("Upbit 市價賣", extra={"symbol": symbol, "volume": str(volume)})
-        raw = await self._fetch_json("POST", "/v1/orders", params=payload, signed=True)
+    async def sell_market_order(self, symbol: str, volume: Decimal, *, priority: bool = False) -> OrderResult:
+        volume_str = decimal_param(volume)
+        logger.info("Upbit 市價賣", extra={"symbol": symbol, "volume": volume_str})
+        raw = await self._gateway.send_order(
+            self._order_template(symbol, "sell_market"), (volume_str,), priority=priority
+        )
         return self._parser.parse_order_result(raw)
 
+    def _build_order_template(self, symbol: str, kind: str) -> OrderTemplate:
+        # 市價買以金額（price）下單，市價賣以數量（volume）下單
+        if kind == "buy_market":
+            fixed = (("market", symbol), ("side", "bid"), ("ord_type", "price"))
+            return OrderTemplate("POST", "/v1/orders", fixed, ("price",))
+        if kind == "sell_market":
+            fixed = (("market", symbol), ("side", "ask"), ("ord_type", "market"))
+            return OrderTemplate("POST", "/v1/orders", fixed, ("volume",))
+        raise ValueError(f"未知的模板類型: {kind}")
+
     async def subscribe_orderbook(
         self,
         symbol: str,
@@ -93,16 +132,58 @@ class UpbitWrapper(BaseExchangeWrapper):
         finally:
             await ws.close()
 
+    async def subscribe_private(
+        self,
+        on_order: Callable[[OrderResult], Awaitable[None]],
+        on_asset: Callable[[List[Balance]], Awaitable[None]],
+        *,
+        on_connected: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> None:
+        """訂閱私有 myOrder/myAsset 推送，連線關閉或出錯時返回。"""
+        gateway = self._gateway
+        ws = await gateway.ws_connect(gateway.private_websocket_url, headers=gateway.private_ws_headers())
+        payload = [{"ticket": "k-arb-private"}, {"type": "myOrder"}, {"type": "myAsset"}]
+        await ws.send_str(msgspec.json.encode(payload).decode())
+        try:
+            if on_connected:
+                await on_connected()
+            async for msg in ws:
+                if msg.type == WSMsgType.TEXT:
+                    await self._handle_private_message(msg.data.encode(), on_order, on_asset)
+                elif msg.type == WSMsgType.BINARY:
+                    await self._handle_private_message(msg.data, on_order, on_asset)
+                elif msg.type == WSMsgType.ERROR:
+                    break
+        finally:
+            await ws.close()
+
+    async def _handle_private_message(
+        self,
+        data: bytes,
+        on_order: Callable[[OrderResult], Awaitable[None]],
+        on_asset: Callable[[List[Balance]], Awaitable[None]],
+    ) -> None:
+        payload = msgspec.json.decode(data)
+        if not isinstance(payload, dict):
+            return
+        kind = payload.get("type") or payload.get("ty")
+        if kind == "myOrder":
+            await on_order(self._parser.parse_my_order(payload))
+        elif kind == "myAsset":
+            await on_asset(self._parser.parse_my_asset(payload))
+
     async def _handle_ws_message(self, data: str, callback: Callable[[OrderBook], Awaitable[None]]) -> None:
+        received_ns = time.perf_counter_ns()
         payload = msgspec.json.decode(data.encode())
         normalized = self._normalize_ws_payload(payload)
-        orderbook = self._parser.parse_orderbook(normalized)
+        orderbook = self._stamp(self._parser.parse_orderbook(normalized), received_ns)
         await callback(orderbook)
 
     async def _handle_ws_message_bytes(self, data: bytes, callback: Callable[[OrderBook], Awaitable[None]]) -> None:
+        received_ns = time.perf_counter_ns()
         payload = msgspec.json.decode(data)
         normalized = self._normalize_ws_payload(payload)
-        orderbook = self._parser.parse_orderbook(normalized)
+        orderbook = self._stamp(self._parser.parse_orderbook(normalized), received_ns)
         await callback(orderbook)
 
     def _normalize_ws_payload(self, payload: Any) -> bytes:
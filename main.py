@@ -1,8 +1,7 @@
 """項目入口，暫用於驗證 Phase 0 骨架。"""
 from __future__ import annotations
 
-import asyncio
-
+from utils import event_loop
 from utils.config import get_config
 from utils.logger import setup_logger
 
@@ -15,4 +14,4 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    event_loop.run(main(), event_loop.configured_loop(get_config()))
@@ -0,0 +1,106 @@
+"""事件匯流排微基準：同步扇出的發佈成本、每事件記憶體配置，以及非同步訂閱者的派送延遲。
+
+    python -m scripts.bench_event_bus
+    python -m scripts.bench_event_bus --events 200000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+import timeit
+from typing import Callable
+
+from utils.event_bus import EventBus
+from utils.histogram import LatencyHistogram
+
+
+class Tick:
+    __slots__ = ("sent_ns",)
+
+    def __init__(self, sent_ns: int = 0) -> None:
+        self.sent_ns = sent_ns
+
+
+def _noop(_event: Tick) -> None:
+    return None
+
+
+def _bench(name: str, func: Callable[[], object], number: int, repeat: int) -> float:
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    print(f"{name:<36} {best * 1e9:8.1f} ns/次")
+    return best
+
+
+def _sync_fanout(number: int, repeat: int) -> None:
+    event = Tick()
+    print("=== 同步發佈（不含事件建立）===")
+    _bench("直接呼叫 handler（基準）", lambda: _noop(event), number, repeat)
+    for count in (0, 1, 4):
+        bus = EventBus()
+        for _ in range(count):
+            bus.subscribe(Tick, _noop, symbol="KRW-BTC")
+        channel = bus.channel(Tick, "KRW-BTC")
+        _bench(f"channel.publish × {count} 訂閱者", lambda: channel.publish(event), number, repeat)
+        _bench(f"bus.publish × {count} 訂閱者", lambda: bus.publish(Tick, "KRW-BTC", event), number, repeat)
+
+
+def _allocations(count: int) -> None:
+    bus = EventBus()
+    for _ in range(4):
+        bus.subscribe(Tick, _noop)
+    channel = bus.channel(Tick, "KRW-BTC")
+    event = Tick()
+    channel.publish(event)
+    before = sys.getallocatedblocks()
+    for _ in range(count):
+        channel.publish(event)
+    after = sys.getallocatedblocks()
+    print(f"=== 記憶體配置 ===\n{count} 次發佈後存活區塊增減: {after - before}")
+
+
+async def _async_dispatch(count: int, maxsize: int) -> None:
+    bus = EventBus()
+    histogram = LatencyHistogram()
+
+    async def handler(event: Tick) -> None:
+        histogram.record((time.perf_counter_ns() - event.sent_ns) // 1000)
+
+    subscription = bus.subscribe_async(Tick, handler, maxsize=maxsize)
+    channel = bus.channel(Tick, "KRW-BTC")
+    # 逐筆發佈並讓出事件迴圈：量測單筆派送延遲
+    for _ in range(count):
+        channel.publish(Tick(time.perf_counter_ns()))
+        await asyncio.sleep(0)
+    await bus.drain()
+    paced = histogram.summary()
+    # 連續發佈不讓出：佇列有界，超出部分丟棄最舊事件
+    histogram.reset()
+    start = time.perf_counter()
+    for _ in range(count):
+        channel.publish(Tick(time.perf_counter_ns()))
+    publish_ns = (time.perf_counter() - start) / count * 1e9
+    await bus.drain()
+    burst = histogram.summary()
+    await bus.close()
+    print("=== 非同步訂閱者（µs，發佈至 handler 開始）===")
+    print(f"逐筆: {paced}")
+    print(f"突發: {burst}")
+    print(f"突發發佈 {publish_ns:.1f} ns/筆，丟棄 {subscription.dropped} 筆（maxsize={maxsize}）")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="事件匯流排微基準")
+    parser.add_argument("--number", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--events", type=int, default=50000, help="非同步派送量測的事件數")
+    parser.add_argument("--maxsize", type=int, default=1024)
+    args = parser.parse_args()
+    _sync_fanout(args.number, args.repeat)
+    _allocations(args.number)
+    asyncio.run(_async_dispatch(args.events, args.maxsize))
+
+
+if __name__ == "__main__":
+    main()
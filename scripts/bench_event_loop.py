@@ -0,0 +1,157 @@
+"""事件迴圈基準：在本地模擬器上比較 asyncio 與 uvloop 的 WS 幀吞吐與 REST 請求延遲。
+
+模擬器在獨立進程以 asyncio 執行並持續推送（ws_interval_ms=0）；每種迴圈各在新的
+子進程中量測客戶端（Wrapper 解析 + 回呼），互不影響。模擬器可能先成為瓶頸，
+因此同時列出客戶端每幀 CPU 時間。未安裝 uvloop 時只量測 asyncio。
+
+    python -m scripts.bench_event_loop
+    python -m scripts.bench_event_loop --markets 8 --duration 10 --requests 5000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+from typing import Dict, List, Tuple
+
+from core.datatypes import OrderBook
+from core.gateway.base import GatewaySettings
+from core.gateway.upbit import UpbitGateway
+from core.parser.upbit import UpbitParser
+from core.wrapper.upbit import UpbitWrapper
+from utils import event_loop
+from utils.histogram import LatencyHistogram
+
+ACCESS_KEY = "sim-access"
+SECRET_KEY = "sim-secret"
+
+
+def _markets(count: int) -> Dict[str, float]:
+    markets = {"BTC": 95_000_000.0}
+    for index in range(1, count):
+        markets[f"M{index:02d}"] = 1_000.0 * index
+    return markets
+
+
+def _serve(markets: int, ws_interval_ms: float, urls: "multiprocessing.Queue[Tuple[str, str]]") -> None:
+    from simulator import SimulatorConfig, UpbitSimulator
+
+    async def serve() -> None:
+        sim = UpbitSimulator(
+            SimulatorConfig(
+                markets=_markets(markets),
+                credentials={ACCESS_KEY: SECRET_KEY},
+                ws_interval_ms=ws_interval_ms,
+                seed=1,
+            )
+        )
+        await sim.start()
+        urls.put((sim.rest_base, sim.websocket_url))
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await sim.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+async def _measure(rest_base: str, websocket_url: str, args: argparse.Namespace) -> Dict[str, object]:
+    gateway = UpbitGateway(
+        GatewaySettings(
+            name="upbit",
+            rest_base=rest_base,
+            websocket_url=websocket_url,
+            access_key=ACCESS_KEY,
+            secret_key=SECRET_KEY,
+            latency_tracing=False,
+        )
+    )
+    wrapper = UpbitWrapper(gateway, UpbitParser())
+    symbols = [f"KRW-{base}" for base in _markets(args.markets)]
+    frames = 0
+
+    async def on_book(_book: OrderBook) -> None:
+        nonlocal frames
+        frames += 1
+
+    tasks = [asyncio.create_task(wrapper.subscribe_orderbook(symbol, on_book)) for symbol in symbols]
+    try:
+        await asyncio.sleep(args.warmup)
+        frames = 0
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        await asyncio.sleep(args.duration)
+        counted = frames
+        cpu = time.process_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    histogram = LatencyHistogram()
+    await wrapper.get_orderbook("KRW-BTC")  # 暖機連線
+    for index in range(args.requests):
+        start = time.perf_counter_ns()
+        await wrapper.get_orderbook(symbols[index % len(symbols)])
+        histogram.record((time.perf_counter_ns() - start) // 1000)
+    await wrapper.close()
+    return {
+        "frames_per_sec": counted / wall,
+        "cpu_us_per_frame": cpu / counted * 1e6 if counted else float("nan"),
+        "rest": histogram.summary(),
+    }
+
+
+def _client(name: str, urls: Tuple[str, str], args: argparse.Namespace, results: "multiprocessing.Queue") -> None:
+    loop = event_loop.resolve_loop(name)
+    results.put((loop, event_loop.run(_measure(*urls, args), name)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="asyncio / uvloop 事件迴圈比較")
+    parser.add_argument("--markets", type=int, default=4, help="訂閱的市場數（每個市場一條 WS）")
+    parser.add_argument("--duration", type=float, default=5.0, help="WS 吞吐量測秒數")
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--requests", type=int, default=2000, help="逐筆 REST 請求數")
+    parser.add_argument("--ws-interval-ms", type=float, default=0.0, help="模擬器推送間隔；0 為不間斷推送")
+    args = parser.parse_args()
+
+    # 由參數決定迴圈，不受外部 KARB_EVENT_LOOP 影響
+    os.environ.pop(event_loop.LOOP_ENV, None)
+    loops: List[str] = ["asyncio"]
+    if event_loop.resolve_loop("auto") == "uvloop":
+        loops.append("uvloop")
+    else:
+        print("未安裝 uvloop，只量測 asyncio（pip install uvloop 後重跑即可比較）")
+
+    context = multiprocessing.get_context("spawn")
+    urls: "multiprocessing.Queue[Tuple[str, str]]" = context.Queue()
+    server = context.Process(target=_serve, args=(args.markets, args.ws_interval_ms, urls), daemon=True)
+    server.start()
+    try:
+        endpoints = urls.get(timeout=30)
+        results = context.Queue()
+        for name in loops:
+            client = context.Process(target=_client, args=(name, endpoints, args, results))
+            client.start()
+            loop, result = results.get()
+            client.join()
+            rest = result["rest"]
+            print(f"=== {loop} ===")
+            print(f"WS 幀吞吐 {result['frames_per_sec']:10.0f} 幀/秒  客戶端 CPU {result['cpu_us_per_frame']:6.1f} µs/幀")
+            print(
+                f"REST 延遲（µs）p50={rest['p50']} p90={rest['p90']} p99={rest['p99']} "
+                f"max={rest['max']} mean={rest['mean']}"
+            )
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""下單發送路徑微基準：比較逐次組裝 dict 與預編譯模板從信號到 body/簽名的成本。
+
+    python -m scripts.bench_order_send
+    python -m scripts.bench_order_send --roundtrip 2000   # 另對本地模擬器量測完整往返
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import timeit
+from decimal import Decimal
+from typing import Callable
+
+from core.gateway.base import GatewaySettings
+from core.gateway.bithumb import BithumbGateway
+from core.gateway.upbit import UpbitGateway
+from core.parser.bithumb import BithumbParser
+from core.parser.upbit import UpbitParser
+from core.wrapper.bithumb import BithumbWrapper
+from core.wrapper.upbit import UpbitWrapper
+
+ACCESS_KEY = "sim-access"
+SECRET_KEY = "sim-secret"
+VOLUME = Decimal("0.0123")
+
+
+def _settings(name: str, rest_base: str = "http://127.0.0.1:1") -> GatewaySettings:
+    return GatewaySettings(
+        name=name,
+        rest_base=rest_base,
+        websocket_url="",
+        access_key=ACCESS_KEY,
+        secret_key=SECRET_KEY,
+        latency_tracing=False,
+    )
+
+
+def _bench(name: str, func: Callable[[], object], number: int, repeat: int) -> float:
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    print(f"{name:<34} {best * 1e6:8.2f} µs/次")
+    return best
+
+
+def _encode_paths(number: int, repeat: int) -> None:
+    upbit = UpbitGateway(_settings("upbit"))
+    bithumb = BithumbGateway(_settings("bithumb"))
+    upbit_wrapper = UpbitWrapper(upbit, UpbitParser())
+    bithumb_wrapper = BithumbWrapper(bithumb, BithumbParser())
+    upbit_wrapper.prepare_orders(["KRW-BTC"])
+    bithumb_wrapper.prepare_orders(["BTC_KRW"])
+    upbit_compiled = upbit._templates[upbit_wrapper._order_template("KRW-BTC", "sell_market")]
+    bithumb_compiled = bithumb._templates[bithumb_wrapper._order_template("BTC_KRW", "sell_market")]
+
+    def upbit_legacy() -> object:
+        # 模板化之前：每筆新建 dict、排序 urlencode、簽名，並由 aiohttp json.dumps body
+        params = {"market": "KRW-BTC", "side": "ask", "volume": str(VOLUME), "ord_type": "market"}
+        query = upbit._encode_query(params)
+        headers = upbit._default_headers()
+        headers.update(upbit._signed_headers("POST", "/v1/orders", query))
+        return headers, json.dumps(params).encode(), upbit._build_url("/v1/orders")
+
+    def upbit_template() -> object:
+        query, body = upbit_compiled.render((str(VOLUME),))
+        headers = upbit_compiled.headers.copy()
+        headers.update(upbit._signed_headers("POST", "/v1/orders", query))
+        return headers, body, upbit_compiled.url
+
+    def bithumb_legacy() -> object:
+        symbol = "BTC_KRW"
+        params = {
+            "order_currency": symbol.split("_")[0],
+            "payment_currency": symbol.split("_")[-1],
+            "units": str(VOLUME),
+        }
+        params = bithumb._normalize_params("POST", "/trade/market_sell", params, True)
+        query = bithumb._encode_query(params)
+        headers = bithumb._default_headers()
+        headers.update(bithumb._signed_headers("POST", "/trade/market_sell", query))
+        return headers, query, bithumb._build_url("/trade/market_sell")
+
+    def bithumb_template() -> object:
+        query, body = bithumb_compiled.render((str(VOLUME),))
+        headers = bithumb_compiled.headers.copy()
+        headers.update(bithumb._signed_headers("POST", "/trade/market_sell", query))
+        return headers, body, bithumb_compiled.url
+
+    print("=== Upbit 市價賣（組裝 + 簽名）===")
+    legacy = _bench("dict + urlencode + json.dumps", upbit_legacy, number, repeat)
+    current = _bench("OrderTemplate.render", upbit_template, number, repeat)
+    print(f"加速比: {legacy / current:.2f}x")
+    print("=== Bithumb 市價賣（組裝 + 簽名）===")
+    legacy = _bench("dict + urlencode", bithumb_legacy, number, repeat)
+    current = _bench("OrderTemplate.render", bithumb_template, number, repeat)
+    print(f"加速比: {legacy / current:.2f}x")
+
+
+async def _roundtrip(count: int) -> None:
+    from simulator import SimulatorConfig, UpbitSimulator
+
+    sim = UpbitSimulator(
+        SimulatorConfig(
+            markets={"BTC": 95_000_000.0},
+            credentials={ACCESS_KEY: SECRET_KEY},
+            balances={"KRW": 1e15, "BTC": 1e9},
+            seed=1,
+        )
+    )
+    await sim.start()
+    gateway = UpbitGateway(_settings("upbit", sim.rest_base))
+    wrapper = UpbitWrapper(gateway, UpbitParser())
+    wrapper.prepare_orders(["KRW-BTC"])
+    try:
+        params = {"market": "KRW-BTC", "side": "ask", "volume": str(VOLUME), "ord_type": "market"}
+        await gateway.request("POST", "/v1/orders", params=params, signed=True)  # 暖機連線
+        start = time.perf_counter()
+        for _ in range(count):
+            await gateway.request("POST", "/v1/orders", params=params, signed=True)
+        legacy = (time.perf_counter() - start) / count
+        template = wrapper._order_template("KRW-BTC", "sell_market")
+        start = time.perf_counter()
+        for _ in range(count):
+            await gateway.send_order(template, (str(VOLUME),))
+        current = (time.perf_counter() - start) / count
+    finally:
+        await wrapper.close()
+        await sim.close()
+    print(f"=== 本地模擬器往返（{count} 筆）===")
+    print(f"{'gateway.request(params=...)':<34} {legacy * 1e6:8.1f} µs/筆")
+    print(f"{'gateway.send_order(template)':<34} {current * 1e6:8.1f} µs/筆")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="下單發送路徑微基準")
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--roundtrip", type=int, default=0, help="對本地模擬器實際發送的筆數（0 為略過）")
+    args = parser.parse_args()
+    _encode_paths(args.number, args.repeat)
+    if args.roundtrip:
+        asyncio.run(_roundtrip(args.roundtrip))
+
+
+if __name__ == "__main__":
+    main()
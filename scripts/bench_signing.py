@@ -0,0 +1,94 @@
+"""簽名路徑微基準：比較舊版逐次簽名與預計算簽名器的單次成本。"""
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import time
+import timeit
+import uuid
+from typing import Callable
+from urllib.parse import urlencode
+
+from core.gateway.auth.hmac_signer import BithumbHmacSigner
+from core.gateway.auth.jwt_native import UpbitJwtSigner, encode_upbit_query
+
+ACCESS_KEY = "bench-access-key"
+SECRET_KEY = "bench-secret-key-0123456789abcdef"
+UPBIT_PARAMS = {"market": "KRW-BTC", "side": "ask", "volume": "0.0123", "ord_type": "market"}
+BITHUMB_PARAMS = {
+    "order_currency": "BTC",
+    "payment_currency": "KRW",
+    "units": "0.0123",
+    "endpoint": "/trade/market_sell",
+}
+
+
+def _legacy_b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _legacy_upbit_jwt() -> str:
+    # 重構前的實作：每次重新序列化 Header、json.dumps payload、建立新的 HMAC
+    header = {"alg": "HS256", "typ": "JWT"}
+    payload = {"access_key": ACCESS_KEY, "nonce": str(uuid.uuid4())}
+    encoded = urlencode(sorted(UPBIT_PARAMS.items()), doseq=True).encode()
+    payload["query_hash"] = hashlib.sha512(encoded).hexdigest()
+    payload["query_hash_alg"] = "SHA512"
+    signing_input = f"{_legacy_b64(json.dumps(header, separators=(',', ':')).encode())}."
+    signing_input += _legacy_b64(json.dumps(payload, separators=(",", ":")).encode())
+    signature = hmac.new(SECRET_KEY.encode(), signing_input.encode(), hashlib.sha256).digest()
+    return f"Bearer {signing_input}.{_legacy_b64(signature)}"
+
+
+def _legacy_bithumb() -> tuple[dict[str, str], str]:
+    # 重構前：簽名與 body 各自 urlencode 一次
+    nonce = str(int(time.time() * 1000))
+    query = urlencode(BITHUMB_PARAMS)
+    signing_str = f"/trade/market_sell\0{query}\0{nonce}".encode()
+    digest = hmac.new(SECRET_KEY.encode(), signing_str, hashlib.sha512).hexdigest()
+    headers = {
+        "Api-Key": ACCESS_KEY,
+        "Api-Sign": base64.b64encode(digest.encode()).decode(),
+        "Api-Nonce": nonce,
+        "Content-Type": "application/x-www-form-urlencoded",
+    }
+    return headers, urlencode(BITHUMB_PARAMS)
+
+
+def _bench(name: str, func: Callable[[], object], number: int, repeat: int) -> float:
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    print(f"{name:<28} {best * 1e6:8.2f} µs/次")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="簽名路徑微基準")
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    upbit_signer = UpbitJwtSigner(ACCESS_KEY, SECRET_KEY)
+    bithumb_signer = BithumbHmacSigner(ACCESS_KEY, SECRET_KEY)
+
+    def upbit_signer_path() -> str:
+        return upbit_signer.sign(encode_upbit_query(UPBIT_PARAMS))
+
+    def bithumb_signer_path() -> tuple[dict[str, str], str]:
+        query = urlencode(BITHUMB_PARAMS)
+        return bithumb_signer.sign("/trade/market_sell", query), query
+
+    print("=== Upbit JWT ===")
+    legacy = _bench("legacy generate_upbit_jwt", _legacy_upbit_jwt, args.number, args.repeat)
+    current = _bench("UpbitJwtSigner.sign", upbit_signer_path, args.number, args.repeat)
+    print(f"加速比: {legacy / current:.2f}x")
+    print("=== Bithumb HMAC ===")
+    legacy = _bench("legacy sign + body encode", _legacy_bithumb, args.number, args.repeat)
+    current = _bench("BithumbHmacSigner.sign", bithumb_signer_path, args.number, args.repeat)
+    print(f"加速比: {legacy / current:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
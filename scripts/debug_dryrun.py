@@ -1,7 +1,6 @@
 """DryRun 調試腳本：單次拉資料並逐步輸出狀態。"""
 from __future__ import annotations
 
-import asyncio
 from decimal import Decimal
 
 from business.execution.executor import OrderExecutor
@@ -21,6 +20,7 @@ from core.parser.upbit import UpbitParser
 from core.parser.bithumb import BithumbParser
 from core.wrapper.upbit import UpbitWrapper
 from core.wrapper.bithumb import BithumbWrapper
+from utils import event_loop
 from utils.config import get_config
 
 
@@ -150,6 +150,6 @@ def _find_balance(balances, currency: str) -> Decimal:
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        event_loop.run(main(), event_loop.configured_loop(get_config()))
     except KeyboardInterrupt:
         pass
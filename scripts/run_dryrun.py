@@ -2,23 +2,38 @@
 from __future__ import annotations
 
 import asyncio
+import dataclasses
 import os
+import signal
 from decimal import Decimal
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
 import yaml
 
+from business.account import BalanceTable, OrderTable, PnLTracker, UpbitPrivateStream
+from business.engine.control import ControlServer, install_kill_signals
 from business.engine.dryrun import DryRunEngine, PairContext
+from business.engine.sharded import RemoteFeed, ShardingConfig, ShardSupervisor, partition
+from business.engine.kill_switch import KillSwitch
 from business.execution.executor import OrderExecutor
-from business.orderbook.feed import OrderBookFeed
+from business.execution.fill_simulator import BookHistory, FillConfig, FillSimulator
+from business.execution.pipeline import PipelineConfig
+from business.market import MarketRegistry
+from business.orderbook.feed import FeedConfig, OrderBookFeed
+from business.orderbook.freshness import FreshnessMonitor
 from business.orderbook.manager import OrderBookManager
+from business.orderbook.shared_book import RegionSpec, SharedBookRegion
 from business.risk.circuit_breaker import CircuitBreakerConfig
 from business.risk.manager import RiskConfig, RiskManager
 from business.risk.position_limiter import PositionLimit
+from business.risk.rate_limiter import WindowLimit
 from business.strategy.base import StrategyConfig
+from business.strategy.dedup import SignalDeduplicator
 from business.strategy.spread_arbitrage import SpreadArbitrageStrategy
+from core.datatypes import OrderBook
 from core.gateway.base import GatewaySettings
+from core.gateway.clock import ClockSync
 from core.gateway.ratelimit.exchange_limits import DEFAULT_LIMITS
 from core.gateway.ratelimit.token_bucket import TokenBucket
 from core.gateway.upbit import UpbitGateway
@@ -27,52 +42,40 @@ from core.parser.upbit import UpbitParser
 from core.parser.bithumb import BithumbParser
 from core.wrapper.upbit import UpbitWrapper
 from core.wrapper.bithumb import BithumbWrapper
+from utils import event_loop
 from utils.config import get_config
+from utils.event_bus import EventBus
+from utils.logger import setup_logger
+from utils.tracing import Tracer
+
+logger = setup_logger("run_dryrun")
 
 
 async def main() -> None:
     config = get_config()
-    exchanges = config["exchanges"]
+    upbit_gateway, bithumb_gateway, upbit_wrapper, bithumb_wrapper = _build_wrappers(config)
 
-    upbit_settings = GatewaySettings(
-        name="upbit",
-        rest_base=exchanges["upbit"]["rest_base"],
-        websocket_url=exchanges["upbit"]["websocket_url"],
-        access_key=exchanges["upbit"].get("access_key"),
-        secret_key=exchanges["upbit"].get("secret_key"),
-    )
-    bithumb_settings = GatewaySettings(
-        name="bithumb",
-        rest_base=exchanges["bithumb"]["rest_base"],
-        websocket_url=exchanges["bithumb"]["websocket_url"],
-        access_key=exchanges["bithumb"].get("access_key"),
-        secret_key=exchanges["bithumb"].get("secret_key"),
-    )
-
-    upbit_limits = DEFAULT_LIMITS["upbit"]
-    bithumb_limits = DEFAULT_LIMITS["bithumb"]
-    upbit_gateway = UpbitGateway(
-        upbit_settings,
-        public_limiter=TokenBucket(upbit_limits.public_capacity, upbit_limits.public_rate),
-        private_limiter=TokenBucket(upbit_limits.private_capacity, upbit_limits.private_rate),
-    )
-    bithumb_gateway = BithumbGateway(
-        bithumb_settings,
-        public_limiter=TokenBucket(bithumb_limits.public_capacity, bithumb_limits.public_rate),
-        private_limiter=TokenBucket(bithumb_limits.private_capacity, bithumb_limits.private_rate),
+    market_cfg = config.get("markets", {}) or {}
+    registry = await MarketRegistry.load(
+        upbit_wrapper,
+        bithumb_wrapper,
+        cache_path=Path(market_cfg.get("cache_path", ".cache/markets.json")),
+        ttl=float(market_cfg.get("cache_ttl", 86_400)),
     )
-
-    upbit_wrapper = UpbitWrapper(upbit_gateway, UpbitParser())
-    bithumb_wrapper = BithumbWrapper(bithumb_gateway, BithumbParser())
-
-    pairs = _load_pairs(config)
+    markets, missing = registry.resolve(_load_pair_entries(config))
+    if missing:
+        logger.warning("以下交易對未同時在兩家交易所上架，已略過", extra={"pairs": missing})
     max_pairs_env = os.getenv("MAX_DRYRUN_PAIRS")
     if max_pairs_env:
         try:
             max_pairs = int(max_pairs_env)
-            pairs = pairs[:max_pairs]
+            markets = markets[:max_pairs]
         except ValueError:
             pass
+    pairs = [
+        {"name": info.base, "upbit_symbol": info.upbit_symbol, "bithumb_symbol": info.bithumb_symbol}
+        for info in markets
+    ]
     if not pairs:
         # 回退到單一配置
         default_upbit = config["trading"]["symbol_upbit"]
@@ -85,15 +88,83 @@ async def main() -> None:
             }
         ]
 
+    upbit_wrapper.prepare_orders(entry["upbit_symbol"] for entry in pairs)
+    bithumb_wrapper.prepare_orders(entry["bithumb_symbol"] for entry in pairs)
+
+    feed_cfg = config.get("feeds", {}) or {}
+    stale_after = float(feed_cfg.get("stale_after", 5.0))
+    feed_config, bithumb_feed_config = _feed_configs(config)
+    freshness = FreshnessMonitor(stale_after=stale_after)
+    bus = EventBus()
+
+    sharding = _load_sharding(config)
+    fill_cfg = config.get("fill_simulation", {}) or {}
+    fee_rates = {
+        "upbit": Decimal(str(fill_cfg.get("upbit_fee", "0.0005"))),
+        "bithumb": Decimal(str(fill_cfg.get("bithumb_fee", "0.0025"))),
+    }
+    # 錄製每次套用後的訂單簿，成交取「延遲後第一個」快照；分片時主進程收不到行情事件
+    history: Optional[BookHistory] = None
+    if fill_cfg.get("record_history", False) and sharding.workers <= 1:
+        history = BookHistory(maxlen=int(fill_cfg.get("history_size", 2048)))
+    fill_simulator = FillSimulator(
+        FillConfig(
+            latency_ms={
+                "upbit": float(fill_cfg.get("upbit_latency_ms", 0.0)),
+                "bithumb": float(fill_cfg.get("bithumb_latency_ms", 0.0)),
+            },
+            fee_rates=fee_rates,
+            depth_share=Decimal(str(fill_cfg.get("depth_share", "1"))),
+        ),
+        history=history,
+    )
+
+    region: Optional[SharedBookRegion] = None
+    supervisor: Optional[ShardSupervisor] = None
+    if sharding.workers > 1:
+        # 每個交易對佔兩個槽位：2i 為 Upbit、2i+1 為 Bithumb
+        region = SharedBookRegion.create(slots=2 * len(pairs), depth=sharding.depth)
+        shards = partition(list(enumerate(pairs)), sharding.workers)
+        supervisor = ShardSupervisor(
+            _shard_main,
+            [(shard, region.spec, len(shards)) for shard in shards],
+            sharding,
+        )
+
     pair_contexts: List[PairContext] = []
-    for entry in pairs:
+    for index, entry in enumerate(pairs):
         base = entry["name"]
         upbit_symbol = entry["upbit_symbol"]
         bithumb_symbol = entry["bithumb_symbol"]
-        upbit_manager = OrderBookManager()
-        bithumb_manager = OrderBookManager()
-        upbit_feed = OrderBookFeed(upbit_wrapper, upbit_symbol, upbit_manager)
-        bithumb_feed = OrderBookFeed(bithumb_wrapper, bithumb_symbol, bithumb_manager)
+        if region is not None:
+            upbit_manager = region.view(2 * index, "upbit", upbit_symbol, stale_after=stale_after)
+            bithumb_manager = region.view(2 * index + 1, "bithumb", bithumb_symbol, stale_after=stale_after)
+            upbit_feed = RemoteFeed(upbit_symbol)
+            bithumb_feed = RemoteFeed(bithumb_symbol)
+        else:
+            upbit_manager = OrderBookManager()
+            bithumb_manager = OrderBookManager()
+            upbit_feed = OrderBookFeed(
+                upbit_wrapper,
+                upbit_symbol,
+                upbit_manager,
+                config=feed_config,
+                freshness=freshness,
+                bus=bus,
+            )
+            bithumb_feed = OrderBookFeed(
+                bithumb_wrapper,
+                bithumb_symbol,
+                bithumb_manager,
+                config=bithumb_feed_config,
+                freshness=freshness,
+                bus=bus,
+            )
+        fill_simulator.register("upbit", upbit_symbol, upbit_manager)
+        fill_simulator.register("bithumb", bithumb_symbol, bithumb_manager)
+        if history is not None:
+            bus.subscribe(OrderBook, history.mirror(lambda m=upbit_manager: m.snapshot), symbol=upbit_symbol)
+            bus.subscribe(OrderBook, history.mirror(lambda m=bithumb_manager: m.snapshot), symbol=bithumb_symbol)
         pair_contexts.append(
             PairContext(
                 name=base,
@@ -115,16 +186,43 @@ async def main() -> None:
         )
     )
 
+    pnl = PnLTracker(fee_rates=fee_rates)
+    risk_cfg = config.get("risk", {}) or {}
+    max_loss = risk_cfg.get("max_realized_loss")
     risk_manager = RiskManager(
         RiskConfig(
             reserve_ratio=Decimal("0.1"),
             position_limit=PositionLimit(max_volume=Decimal("0.5"), max_notional=Decimal("100000000")),
             circuit_breaker=CircuitBreakerConfig(failure_threshold=3, cool_down=5),
-        )
+            rate_limits=_load_rate_limits(config),
+            max_realized_loss=Decimal(str(max_loss)) if max_loss is not None else None,
+        ),
+        pnl=pnl,
+    )
+
+    order_table = OrderTable()
+    # 下單回應多半尚未成交，最終成交由訂單表更新補記
+    order_table.add_listener(pnl.on_order)
+    balance_table = BalanceTable()
+    private_stream: Optional[UpbitPrivateStream] = None
+    if (config.get("account", {}) or {}).get("private_stream", False):
+        private_stream = UpbitPrivateStream(upbit_wrapper, order_table, balance_table)
+
+    executor = OrderExecutor(
+        upbit_wrapper,
+        bithumb_wrapper,
+        dry_run=True,
+        order_table=order_table,
+        registry=registry,
+        fill_simulator=fill_simulator,
     )
 
-    executor = OrderExecutor(upbit_wrapper, bithumb_wrapper, dry_run=True)
+    trace_cfg = config.get("tracing", {}) or {}
+    tracer: Optional[Tracer] = None
+    if trace_cfg.get("enabled", False):
+        tracer = Tracer(sample_every=int(trace_cfg.get("sample_every", 100)))
 
+    exec_cfg = config.get("execution", {}) or {}
     engine = DryRunEngine(
         upbit_wrapper=upbit_wrapper,
         bithumb_wrapper=bithumb_wrapper,
@@ -133,12 +231,170 @@ async def main() -> None:
         executor=executor,
         pairs=pair_contexts,
         poll_interval=float(config.get("trading", {}).get("poll_interval", 0.5)),
+        balance_table=balance_table if private_stream is not None else None,
+        execution=PipelineConfig(
+            max_concurrency=int(exec_cfg.get("max_concurrency", 4)),
+            max_pending=int(exec_cfg.get("max_pending", 64)),
+            max_signal_age=float(exec_cfg.get("max_signal_age", 1.0)),
+        ),
+        tracer=tracer,
+        kill_switch=KillSwitch(upbit_wrapper, bithumb_wrapper, order_table=order_table),
+        pnl=pnl,
+        # 分片時過期判斷由 SharedBookView 依寫入時間處理
+        freshness=freshness if region is None else None,
+        bus=bus,
+        dedup=SignalDeduplicator(cooldown=float(config.get("trading", {}).get("signal_cooldown", 2.0))),
     )
+    control_cfg = config.get("control", {}) or {}
+    control: Optional[ControlServer] = None
+    if control_cfg.get("socket_path"):
+        control = ControlServer(engine, Path(control_cfg["socket_path"]))
+
+    clock_sync = ClockSync(interval=float(config.get("clock_sync", {}).get("interval", 30.0)))
+    clock_sync.register("upbit", upbit_gateway.clock, upbit_wrapper.fetch_server_time)
+    clock_sync.register("bithumb", bithumb_gateway.clock, bithumb_wrapper.fetch_server_time)
+    await clock_sync.start()
+    await freshness.start()
+    if private_stream:
+        await private_stream.start()
+    install_kill_signals(engine)
+    if control:
+        await control.start()
+    if supervisor:
+        await supervisor.start()
+    try:
+        await engine.start()
+    finally:
+        if supervisor:
+            await supervisor.stop()
+        if region:
+            region.close()
+        if control:
+            await control.stop()
+        if private_stream:
+            await private_stream.stop()
+        await clock_sync.stop()
+        await freshness.stop()
+        await bus.close()
+        logger.info(
+            "損益彙總",
+            extra={"net_realized": str(pnl.net_realized), "fees": str(pnl.fees), "pairs": pnl.summary()},
+        )
+        if tracer is not None:
+            logger.info("信號路徑延遲（µs）", extra={"stages": tracer.snapshot()})
+            export_path = trace_cfg.get("export_path")
+            if export_path:
+                count = tracer.dump_chrome(Path(export_path))
+                logger.info("已匯出抽樣 trace", extra={"path": export_path, "count": count})
 
-    await engine.start()
 
+def _build_wrappers(config: dict, share: int = 1) -> Tuple[UpbitGateway, BithumbGateway, UpbitWrapper, BithumbWrapper]:
+    """share > 1 時按進程數平分公開端點限額（分片 worker 共用同一出口 IP）。"""
+    exchanges = config["exchanges"]
 
-def _load_pairs(config: dict) -> List[dict]:
+    upbit_settings = GatewaySettings(
+        name="upbit",
+        rest_base=exchanges["upbit"]["rest_base"],
+        websocket_url=exchanges["upbit"]["websocket_url"],
+        access_key=exchanges["upbit"].get("access_key"),
+        secret_key=exchanges["upbit"].get("secret_key"),
+        private_websocket_url=exchanges["upbit"].get("private_websocket_url"),
+    )
+    bithumb_settings = GatewaySettings(
+        name="bithumb",
+        rest_base=exchanges["bithumb"]["rest_base"],
+        websocket_url=exchanges["bithumb"]["websocket_url"],
+        access_key=exchanges["bithumb"].get("access_key"),
+        secret_key=exchanges["bithumb"].get("secret_key"),
+    )
+
+    upbit_limits = DEFAULT_LIMITS["upbit"]
+    bithumb_limits = DEFAULT_LIMITS["bithumb"]
+    upbit_gateway = UpbitGateway(
+        upbit_settings,
+        public_limiter=TokenBucket(max(1, upbit_limits.public_capacity // share), upbit_limits.public_rate / share),
+        private_limiter=TokenBucket(upbit_limits.private_capacity, upbit_limits.private_rate),
+    )
+    bithumb_gateway = BithumbGateway(
+        bithumb_settings,
+        public_limiter=TokenBucket(max(1, bithumb_limits.public_capacity // share), bithumb_limits.public_rate / share),
+        private_limiter=TokenBucket(bithumb_limits.private_capacity, bithumb_limits.private_rate),
+    )
+
+    upbit_wrapper = UpbitWrapper(upbit_gateway, UpbitParser())
+    bithumb_wrapper = BithumbWrapper(bithumb_gateway, BithumbParser())
+    return upbit_gateway, bithumb_gateway, upbit_wrapper, bithumb_wrapper
+
+
+def _feed_configs(config: dict) -> Tuple[FeedConfig, FeedConfig]:
+    feed_cfg = config.get("feeds", {}) or {}
+    feed_config = FeedConfig(
+        hot_standby=bool(feed_cfg.get("hot_standby", False)),
+        silence_timeout=float(feed_cfg.get("silence_timeout", 3.0)),
+        max_queue=int(feed_cfg.get("max_queue", 256)),
+    )
+    # Upbit 推送完整快照可合併；Bithumb orderbookdepth 為增量，需依序處理
+    return feed_config, dataclasses.replace(feed_config, conflate=False)
+
+
+def _shard_main(shard_id: int, entries: List[Tuple[int, dict]], spec: RegionSpec, workers: int) -> None:
+    """分片 worker 進程入口（spawn 以模組路徑匯入，須為頂層函式）。"""
+    try:
+        event_loop.run(_run_shard(shard_id, entries, spec, workers), event_loop.configured_loop(get_config()))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _run_shard(shard_id: int, entries: List[Tuple[int, dict]], spec: RegionSpec, workers: int) -> None:
+    config = get_config()
+    upbit_gateway, bithumb_gateway, upbit_wrapper, bithumb_wrapper = _build_wrappers(config, share=workers)
+    feed_config, bithumb_feed_config = _feed_configs(config)
+    freshness = FreshnessMonitor(stale_after=float((config.get("feeds", {}) or {}).get("stale_after", 5.0)))
+    bus = EventBus()
+    region = SharedBookRegion.attach(spec)
+
+    feeds: List[OrderBookFeed] = []
+    for index, entry in entries:
+        legs = (
+            (2 * index, upbit_wrapper, entry["upbit_symbol"], feed_config),
+            (2 * index + 1, bithumb_wrapper, entry["bithumb_symbol"], bithumb_feed_config),
+        )
+        for slot, wrapper, symbol, feed_cfg in legs:
+            manager = OrderBookManager()
+            bus.subscribe(OrderBook, region.writer(slot).mirror(lambda m=manager: m.snapshot), symbol=symbol)
+            feeds.append(OrderBookFeed(wrapper, symbol, manager, config=feed_cfg, freshness=freshness, bus=bus))
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stopping.set)
+
+    await freshness.start()
+    for feed in feeds:
+        await feed.start()
+    logger.info("分片 worker 已就緒", extra={"shard": shard_id, "pairs": len(entries), "feeds": len(feeds)})
+    try:
+        await stopping.wait()
+    finally:
+        for feed in feeds:
+            await feed.stop()
+        await freshness.stop()
+        await bus.close()
+        await upbit_gateway.close()
+        await bithumb_gateway.close()
+        region.close()
+
+
+def _load_sharding(config: dict) -> ShardingConfig:
+    shard_cfg = config.get("sharding", {}) or {}
+    return ShardingConfig(
+        workers=int(shard_cfg.get("workers", 0)),
+        depth=int(shard_cfg.get("depth", 5)),
+    )
+
+
+def _load_pair_entries(config: dict) -> List[str]:
+    """讀取 pairs.yaml（或配置內 trading.pairs）的原始條目，如 "XRP/KRW"。"""
     pairs: List[str] = []
     pairs_file = Path("config/pairs.yaml")
     if pairs_file.exists():
@@ -148,25 +404,27 @@ def _load_pairs(config: dict) -> List[dict]:
             pairs = file_pairs
     if not pairs:
         pairs = config.get("trading", {}).get("pairs", []) or []
-    normalized: List[dict] = []
-    for entry in pairs:
-        if not isinstance(entry, str):
-            continue
-        base = entry.split("/")[0].strip()
-        if not base:
-            continue
-        upbit_symbol = f"KRW-{base}"
-        bithumb_symbol = f"{base}_KRW"
-        normalized.append({
-            "name": base,
-            "upbit_symbol": upbit_symbol,
-            "bithumb_symbol": bithumb_symbol,
-        })
-    return normalized
+    return [entry for entry in pairs if isinstance(entry, str)]
+
+
+def _load_rate_limits(config: dict) -> List[WindowLimit]:
+    limits: List[WindowLimit] = []
+    for item in (config.get("risk", {}) or {}).get("rate_limits", []) or []:
+        max_count = item.get("max_count")
+        max_notional = item.get("max_notional")
+        limits.append(
+            WindowLimit(
+                window=float(item["window"]),
+                max_count=int(max_count) if max_count is not None else None,
+                max_notional=Decimal(str(max_notional)) if max_notional is not None else None,
+                per_pair=bool(item.get("per_pair", False)),
+            )
+        )
+    return limits
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        event_loop.run(main(), event_loop.configured_loop(get_config()))
     except KeyboardInterrupt:
         pass
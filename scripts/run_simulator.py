@@ -0,0 +1,110 @@
+"""啟動本地 Upbit/Bithumb 模擬交易所，供離線壓測。
+
+搭配 config/simulator.yaml：
+    KARB_CONFIG=config/simulator.yaml python scripts/run_dryrun.py
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+from typing import Dict
+
+import yaml
+
+from simulator import BithumbSimulator, BookDynamicsConfig, SimulatorConfig, UpbitSimulator
+
+# 未指定價格的幣種以此作為初始價
+_DEFAULT_PRICES = {"BTC": 95_000_000.0, "ETH": 4_500_000.0, "XRP": 800.0, "SOL": 250_000.0}
+
+
+def _load_markets(pairs_file: Path) -> Dict[str, float]:
+    data = yaml.safe_load(pairs_file.read_text(encoding="utf-8")) or {}
+    markets = {"BTC": _DEFAULT_PRICES["BTC"]}
+    for entry in data.get("pairs", []):
+        base = str(entry).split("/")[0].strip().upper()
+        if base:
+            markets[base] = _DEFAULT_PRICES.get(base, 1_000.0)
+    return markets
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    markets = _load_markets(Path(args.pairs))
+    credentials = {args.access_key: args.secret_key}
+    book = BookDynamicsConfig(depth=args.depth, volatility_bps=args.volatility_bps)
+    common = dict(
+        markets=markets,
+        credentials=credentials,
+        balances={"KRW": 1_000_000_000.0, **{base: 1_000.0 for base in markets}},
+        rest_latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        ws_interval_ms=args.ws_interval_ms,
+        book=book,
+    )
+    upbit = UpbitSimulator(
+        SimulatorConfig(
+            **common,
+            public_capacity=10 if args.rate_limit else None,
+            public_rate=10,
+            private_capacity=8 if args.rate_limit else None,
+            private_rate=8,
+            seed=args.seed,
+        )
+    )
+    bithumb = BithumbSimulator(
+        SimulatorConfig(
+            **common,
+            public_capacity=20 if args.rate_limit else None,
+            public_rate=20,
+            private_capacity=15 if args.rate_limit else None,
+            private_rate=15,
+            bias_bps=args.bias_bps,
+            seed=None if args.seed is None else args.seed + 1,
+        )
+    )
+    await upbit.start(args.host, args.upbit_port)
+    await bithumb.start(args.host, args.bithumb_port)
+    print(f"Upbit   REST {upbit.rest_base}  WS {upbit.websocket_url}")
+    print(f"Bithumb REST {bithumb.rest_base}  WS {bithumb.websocket_url}")
+    print(f"市場數 {len(markets)}，推送間隔 {args.ws_interval_ms} ms")
+    try:
+        while True:
+            await asyncio.sleep(args.stats_interval)
+            for sim in (upbit, bithumb):
+                stats = sim.stats
+                print(
+                    f"[{sim.name}] requests={stats.requests} 429={stats.rejected_429} "
+                    f"auth_fail={stats.auth_failures} orders={stats.orders} "
+                    f"ws={stats.ws_connections} msgs={stats.ws_messages}"
+                )
+    finally:
+        await upbit.close()
+        await bithumb.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="本地交易所模擬器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--upbit-port", type=int, default=18081)
+    parser.add_argument("--bithumb-port", type=int, default=18082)
+    parser.add_argument("--pairs", default="config/pairs.yaml")
+    parser.add_argument("--access-key", default="sim-access")
+    parser.add_argument("--secret-key", default="sim-secret")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--ws-interval-ms", type=float, default=100.0)
+    parser.add_argument("--depth", type=int, default=15)
+    parser.add_argument("--volatility-bps", type=float, default=3.0)
+    parser.add_argument("--bias-bps", type=float, default=0.0, help="Bithumb 相對 Upbit 的價格偏移")
+    parser.add_argument("--rate-limit", action="store_true", help="啟用與真實交易所相同的限流")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--stats-interval", type=float, default=10.0)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
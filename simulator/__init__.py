@@ -0,0 +1,12 @@
+"""本地交易所模擬器。"""
+from .book import BookDynamicsConfig, SimulatedBook
+from .server import BithumbSimulator, ExchangeSimulator, SimulatorConfig, UpbitSimulator
+
+__all__ = [
+    "BookDynamicsConfig",
+    "SimulatedBook",
+    "ExchangeSimulator",
+    "SimulatorConfig",
+    "UpbitSimulator",
+    "BithumbSimulator",
+]
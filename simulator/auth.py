@@ -0,0 +1,91 @@
+"""模擬器端的簽名驗證（與 core.gateway.auth 的產生邏輯對應）。"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+from collections import deque
+from typing import Deque, Mapping, Optional, Set
+
+
+class AuthError(Exception):
+    """簽名驗證失敗。"""
+
+
+class NonceRegistry:
+    """記錄近期 nonce 以拒絕重放。"""
+
+    def __init__(self, capacity: int = 100_000) -> None:
+        self._order: Deque[str] = deque()
+        self._seen: Set[str] = set()
+        self._capacity = capacity
+
+    def check(self, nonce: str) -> None:
+        if nonce in self._seen:
+            raise AuthError("nonce 重複")
+        self._seen.add(nonce)
+        self._order.append(nonce)
+        if len(self._order) > self._capacity:
+            self._seen.discard(self._order.popleft())
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def verify_upbit_jwt(
+    authorization: Optional[str],
+    query: str,
+    credentials: Mapping[str, str],
+    nonces: NonceRegistry,
+) -> str:
+    """驗證 Upbit Bearer JWT 與 query_hash，回傳 access_key。"""
+    if not authorization or not authorization.startswith("Bearer "):
+        raise AuthError("缺少 Bearer token")
+    try:
+        header_seg, payload_seg, signature_seg = authorization[7:].split(".")
+        header = json.loads(_b64decode(header_seg))
+        payload = json.loads(_b64decode(payload_seg))
+    except (ValueError, TypeError) as exc:
+        raise AuthError(f"token 格式錯誤: {exc}") from exc
+    if header.get("alg") != "HS256":
+        raise AuthError("不支援的 alg")
+    access_key = payload.get("access_key")
+    secret = credentials.get(access_key or "")
+    if secret is None:
+        raise AuthError("未知的 access_key")
+    expected = hmac.new(secret.encode(), f"{header_seg}.{payload_seg}".encode(), hashlib.sha256).digest()
+    if not hmac.compare_digest(expected, _b64decode(signature_seg)):
+        raise AuthError("簽名不符")
+    nonces.check(str(payload.get("nonce", "")))
+    if query:
+        if payload.get("query_hash_alg", "SHA512") != "SHA512":
+            raise AuthError("不支援的 query_hash_alg")
+        if payload.get("query_hash") != hashlib.sha512(query.encode()).hexdigest():
+            raise AuthError("query_hash 不符")
+    return access_key
+
+
+def verify_bithumb_signature(
+    headers: Mapping[str, str],
+    endpoint: str,
+    body: str,
+    credentials: Mapping[str, str],
+    nonces: NonceRegistry,
+) -> str:
+    """驗證 Bithumb Api-Sign，回傳 access_key。"""
+    access_key = headers.get("Api-Key", "")
+    signature = headers.get("Api-Sign", "")
+    nonce = headers.get("Api-Nonce", "")
+    secret = credentials.get(access_key)
+    if secret is None:
+        raise AuthError("未知的 Api-Key")
+    if not signature or not nonce:
+        raise AuthError("缺少 Api-Sign/Api-Nonce")
+    digest = hmac.new(secret.encode(), f"{endpoint}\0{body}\0{nonce}".encode(), hashlib.sha512).hexdigest()
+    expected = base64.b64encode(digest.encode()).decode()
+    if not hmac.compare_digest(expected, signature):
+        raise AuthError("簽名不符")
+    nonces.check(f"{access_key}:{nonce}:{signature}")
+    return access_key
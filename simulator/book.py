@@ -0,0 +1,116 @@
+"""模擬訂單簿動態：幾何隨機漫步的中間價與隨機深度。"""
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+Level = Tuple[float, float]
+
+
+@dataclass(slots=True)
+class BookDynamicsConfig:
+    """訂單簿生成參數。"""
+
+    depth: int = 15
+    spread_bps: float = 4.0
+    volatility_bps: float = 3.0  # 每步中間價對數收益的標準差
+    level_step_bps: float = 2.0
+    min_quantity: float = 0.01
+    max_quantity: float = 2.0
+
+
+def krw_tick_size(price: float) -> float:
+    """KRW 市場的價格檔位（依價格區間遞增）。"""
+    for threshold, tick in (
+        (2_000_000, 1000.0),
+        (1_000_000, 500.0),
+        (500_000, 100.0),
+        (100_000, 50.0),
+        (10_000, 10.0),
+        (1_000, 1.0),
+        (100, 0.1),
+        (10, 0.01),
+        (1, 0.001),
+    ):
+        if price >= threshold:
+            return tick
+    return 0.0001
+
+
+def format_price(price: float) -> str:
+    tick = krw_tick_size(price)
+    decimals = max(0, -int(math.floor(math.log10(tick))))
+    return f"{price:.{decimals}f}"
+
+
+class SimulatedBook:
+    """單一交易對的模擬訂單簿，價格按檔位取整。"""
+
+    def __init__(
+        self,
+        base: str,
+        initial_price: float,
+        config: Optional[BookDynamicsConfig] = None,
+        *,
+        rng: Optional[random.Random] = None,
+        bias_bps: float = 0.0,
+    ) -> None:
+        self.base = base
+        self._config = config or BookDynamicsConfig()
+        self._rng = rng or random.Random()
+        self._mid = initial_price * (1 + bias_bps / 10_000)
+        self.bids: List[Level] = []
+        self.asks: List[Level] = []
+        self.timestamp = 0
+        self.version = 0
+        self._rebuild()
+
+    @property
+    def mid(self) -> float:
+        return self._mid
+
+    def step(self, now_ms: int) -> None:
+        shock = self._rng.gauss(0.0, self._config.volatility_bps / 10_000)
+        self._mid *= math.exp(shock)
+        self.timestamp = max(self.timestamp + 1, now_ms)
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        cfg = self._config
+        tick = krw_tick_size(self._mid)
+        half_spread = max(self._mid * cfg.spread_bps / 20_000, tick)
+        step = max(self._mid * cfg.level_step_bps / 10_000, tick)
+        best_bid = math.floor((self._mid - half_spread) / tick) * tick
+        best_ask = math.ceil((self._mid + half_spread) / tick) * tick
+        if best_ask <= best_bid:
+            best_ask = best_bid + tick
+        uniform = self._rng.uniform
+        self.bids = [
+            (round(best_bid - i * step, 8), round(uniform(cfg.min_quantity, cfg.max_quantity), 4))
+            for i in range(cfg.depth)
+        ]
+        self.asks = [
+            (round(best_ask + i * step, 8), round(uniform(cfg.min_quantity, cfg.max_quantity), 4))
+            for i in range(cfg.depth)
+        ]
+        self.version += 1
+
+    def walk(self, side: str, *, quantity: float = 0.0, notional: float = 0.0) -> Tuple[float, float]:
+        """以市價吃單：side="buy" 吃 asks、"sell" 吃 bids；回傳（成交量, 成交金額）。"""
+        levels = self.asks if side == "buy" else self.bids
+        filled = 0.0
+        cost = 0.0
+        for price, size in levels:
+            if quantity:
+                take = min(size, quantity - filled)
+            else:
+                take = min(size, (notional - cost) / price)
+            if take <= 0:
+                break
+            filled += take
+            cost += take * price
+            if (quantity and filled >= quantity) or (notional and cost >= notional - 1e-9):
+                break
+        return filled, cost
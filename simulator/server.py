@@ -0,0 +1,741 @@
+"""本地 Upbit/Bithumb 交易所模擬器（aiohttp），供離線壓測整條鏈路。
+
+回應格式以本倉庫 Parser 所解析的欄位為準；私有端點會驗證 JWT/HMAC 簽名，
+並可配置延遲、推送頻率、訂單簿動態與限流（超額回應 429）。
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+from urllib.parse import parse_qsl, unquote
+
+import msgspec
+from aiohttp import WSMsgType, web
+
+from core.gateway.auth.jwt_native import encode_upbit_query
+from simulator.auth import AuthError, NonceRegistry, verify_bithumb_signature, verify_upbit_jwt
+from simulator.book import BookDynamicsConfig, SimulatedBook, format_price
+from utils.logger import setup_logger
+
+logger = setup_logger("simulator")
+
+
+@dataclass
+class SimulatorConfig:
+    """單一模擬交易所的配置；markets 為 {幣種: 初始 KRW 價格}。"""
+
+    markets: Dict[str, float]
+    credentials: Dict[str, str] = field(default_factory=dict)
+    balances: Dict[str, float] = field(default_factory=lambda: {"KRW": 1_000_000_000.0})
+    rest_latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    ws_interval_ms: float = 100.0
+    public_capacity: Optional[int] = None  # None 表示不限流
+    public_rate: float = 10.0
+    private_capacity: Optional[int] = None
+    private_rate: float = 8.0
+    fee_rate: float = 0.0005
+    bias_bps: float = 0.0
+    book: BookDynamicsConfig = field(default_factory=BookDynamicsConfig)
+    seed: Optional[int] = None
+
+
+@dataclass
+class SimulatorStats:
+    requests: int = 0
+    rejected_429: int = 0
+    auth_failures: int = 0
+    orders: int = 0
+    ws_connections: int = 0
+    ws_messages: int = 0
+
+
+class _Bucket:
+    """同步令牌桶，拿不到令牌即拒絕（模擬交易所行為）。"""
+
+    def __init__(self, capacity: int, rate: float) -> None:
+        self._capacity = float(capacity)
+        self._rate = rate
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+
+    def try_acquire(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._last) * self._rate)
+        self._last = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+
+class SimulatorRejection(Exception):
+    """業務層拒絕（餘額不足、訂單不存在等）。"""
+
+    def __init__(self, status: int, name: str, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.name = name
+        self.message = message
+
+
+class ExchangeSimulator:
+    """模擬交易所共用邏輯：訂單簿、帳戶、限流與延遲。"""
+
+    name = "base"
+
+    def __init__(self, config: SimulatorConfig) -> None:
+        self._config = config
+        self._rng = random.Random(config.seed)
+        self.books: Dict[str, SimulatedBook] = {
+            base: SimulatedBook(base, price, config.book, rng=self._rng, bias_bps=config.bias_bps)
+            for base, price in config.markets.items()
+        }
+        self._last_step: Dict[str, float] = {base: 0.0 for base in self.books}
+        self._frames: Dict[str, tuple[int, bytes]] = {}
+        self._balances: Dict[str, List[float]] = {
+            currency: [amount, 0.0] for currency, amount in config.balances.items()
+        }
+        self._orders: Dict[str, Dict[str, Any]] = {}
+        self._nonces = NonceRegistry()
+        self._public_bucket = (
+            _Bucket(config.public_capacity, config.public_rate) if config.public_capacity else None
+        )
+        self._private_bucket = (
+            _Bucket(config.private_capacity, config.private_rate) if config.private_capacity else None
+        )
+        self._order_seq = itertools.count(1)
+        self._websockets: Set[web.WebSocketResponse] = set()
+        self.stats = SimulatorStats()
+        self.app = web.Application()
+        self._register_routes(self.app.router)
+        self.app.on_shutdown.append(self._close_websockets)
+        self._runner: Optional[web.AppRunner] = None
+        self._base_url = ""
+
+    # ---- 生命週期 ----
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        sockets = site._server.sockets  # type: ignore[union-attr]
+        bound_port = sockets[0].getsockname()[1]
+        self._base_url = f"http://{host}:{bound_port}"
+        logger.info("模擬交易所啟動", extra={"exchange": self.name, "url": self._base_url})
+        return self._base_url
+
+    async def close(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _close_websockets(self, _app: web.Application) -> None:
+        for ws in list(self._websockets):
+            await ws.close()
+
+    @property
+    def rest_base(self) -> str:
+        return self._base_url
+
+    @property
+    def websocket_url(self) -> str:
+        return self._base_url.replace("http", "ws", 1) + self.websocket_path
+
+    websocket_path = "/ws"
+
+    def _register_routes(self, router: web.UrlDispatcher) -> None:
+        raise NotImplementedError
+
+    # ---- 共用工具 ----
+    def balance(self, currency: str) -> tuple[float, float]:
+        available, locked = self._balances.get(currency.upper(), [0.0, 0.0])
+        return available, locked
+
+    def advance(self, base: str) -> SimulatedBook:
+        """距離上次推進超過推送間隔才走一步，REST 與 WS 共享同一份動態。"""
+        book = self.books[base]
+        now = time.monotonic()
+        if now - self._last_step[base] >= self._config.ws_interval_ms / 1000:
+            self._last_step[base] = now
+            book.step(int(time.time() * 1000))
+        return book
+
+    async def _guard(self, private: bool) -> None:
+        self.stats.requests += 1
+        bucket = self._private_bucket if private else self._public_bucket
+        if bucket and not bucket.try_acquire():
+            self.stats.rejected_429 += 1
+            raise SimulatorRejection(429, "too_many_requests", "Too many requests")
+        delay = self._config.rest_latency_ms
+        if self._config.latency_jitter_ms:
+            delay += self._rng.uniform(0, self._config.latency_jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    def _frame(self, base: str, build: Callable[[SimulatedBook], bytes]) -> tuple[int, bytes]:
+        book = self.advance(base)
+        cached = self._frames.get(base)
+        if cached and cached[0] == book.version:
+            return cached
+        frame = (book.version, build(book))
+        self._frames[base] = frame
+        return frame
+
+    def _fill_market(self, base: str, side: str, *, quantity: float = 0.0, notional: float = 0.0) -> Dict[str, Any]:
+        book = self.advance(base)
+        filled, cost = book.walk(side, quantity=quantity, notional=notional)
+        fee = cost * self._config.fee_rate
+        base_balance = self._balances.setdefault(base, [0.0, 0.0])
+        krw_balance = self._balances.setdefault("KRW", [0.0, 0.0])
+        if side == "buy":
+            if krw_balance[0] < cost + fee:
+                raise SimulatorRejection(400, "insufficient_funds_bid", "KRW 餘額不足")
+            krw_balance[0] -= cost + fee
+            base_balance[0] += filled
+        else:
+            if base_balance[0] < filled:
+                raise SimulatorRejection(400, "insufficient_funds_ask", f"{base} 餘額不足")
+            base_balance[0] -= filled
+            krw_balance[0] += cost - fee
+        self.stats.orders += 1
+        order = {
+            "id": self._new_order_id(),
+            "base": base,
+            "side": side,
+            "requested": quantity or notional,
+            "filled": filled,
+            "avg_price": cost / filled if filled else 0.0,
+            "fee": fee,
+            "state": "done",
+            "price": 0.0,
+            "created_at": time.time(),
+        }
+        self._orders[order["id"]] = order
+        return order
+
+    def _place_limit(self, base: str, side: str, quantity: float, price: float) -> Dict[str, Any]:
+        book = self.advance(base)
+        crosses = (side == "buy" and book.asks and price >= book.asks[0][0]) or (
+            side == "sell" and book.bids and price <= book.bids[0][0]
+        )
+        if crosses:
+            order = self._fill_market(base, side, quantity=quantity)
+            order["price"] = price
+            return order
+        lock_currency, lock_amount = ("KRW", quantity * price) if side == "buy" else (base, quantity)
+        balance = self._balances.setdefault(lock_currency, [0.0, 0.0])
+        if balance[0] < lock_amount:
+            raise SimulatorRejection(400, f"insufficient_funds_{'bid' if side == 'buy' else 'ask'}", "餘額不足")
+        balance[0] -= lock_amount
+        balance[1] += lock_amount
+        self.stats.orders += 1
+        order = {
+            "id": self._new_order_id(),
+            "base": base,
+            "side": side,
+            "requested": quantity,
+            "filled": 0.0,
+            "avg_price": 0.0,
+            "fee": 0.0,
+            "state": "wait",
+            "price": price,
+            "lock": (lock_currency, lock_amount),
+            "created_at": time.time(),
+        }
+        self._orders[order["id"]] = order
+        return order
+
+    def _cancel(self, order_id: str) -> Dict[str, Any]:
+        order = self._orders.get(order_id)
+        if order is None:
+            raise SimulatorRejection(404, "order_not_found", "訂單不存在")
+        if order["state"] != "wait":
+            raise SimulatorRejection(400, "order_not_cancellable", "訂單不可取消")
+        currency, amount = order["lock"]
+        balance = self._balances[currency]
+        balance[1] -= amount
+        balance[0] += amount
+        order["state"] = "cancel"
+        return order
+
+    def _order(self, order_id: str) -> Dict[str, Any]:
+        order = self._orders.get(order_id)
+        if order is None:
+            raise SimulatorRejection(404, "order_not_found", "訂單不存在")
+        return order
+
+    def _new_order_id(self) -> str:
+        return str(uuid.uuid4())
+
+    async def _serve_ws(
+        self,
+        request: web.Request,
+        parse_subscription: Callable[[Any], List[str]],
+        build: Callable[[SimulatedBook], bytes],
+        binary: bool,
+    ) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.stats.ws_connections += 1
+        self._websockets.add(ws)
+        subscribed: List[str] = []
+        sent_versions: Dict[str, int] = {}
+        interval = self._config.ws_interval_ms / 1000
+
+        async def pump() -> None:
+            while not ws.closed:
+                for base in subscribed:
+                    version, frame = self._frame(base, build)
+                    if sent_versions.get(base) == version:
+                        continue
+                    sent_versions[base] = version
+                    if binary:
+                        await ws.send_bytes(frame)
+                    else:
+                        await ws.send_str(frame.decode())
+                    self.stats.ws_messages += 1
+                await asyncio.sleep(interval)
+
+        pump_task: Optional[asyncio.Task[None]] = None
+        try:
+            async for msg in ws:
+                if msg.type not in (WSMsgType.TEXT, WSMsgType.BINARY):
+                    break
+                try:
+                    bases = parse_subscription(msgspec.json.decode(msg.data))
+                except (msgspec.DecodeError, KeyError, TypeError, ValueError):
+                    continue
+                subscribed[:] = [base for base in bases if base in self.books]
+                if pump_task is None:
+                    pump_task = asyncio.create_task(pump())
+        finally:
+            if pump_task:
+                pump_task.cancel()
+                try:
+                    await pump_task
+                except (asyncio.CancelledError, ConnectionResetError):
+                    pass
+            self._websockets.discard(ws)
+        return ws
+
+
+class UpbitSimulator(ExchangeSimulator):
+    """模擬 Upbit REST（/v1/*）與公開/私有 WebSocket（/websocket/v1[/private]）。"""
+
+    name = "upbit"
+    websocket_path = "/websocket/v1"
+    private_websocket_path = "/websocket/v1/private"
+
+    def __init__(self, config: SimulatorConfig) -> None:
+        self._private_queues: Set[asyncio.Queue[bytes]] = set()
+        super().__init__(config)
+
+    @property
+    def private_websocket_url(self) -> str:
+        return self._base_url.replace("http", "ws", 1) + self.private_websocket_path
+
+    def _register_routes(self, router: web.UrlDispatcher) -> None:
+        router.add_get(self.private_websocket_path, self._private_websocket)
+        router.add_get("/v1/orderbook", self._orderbook)
+        router.add_get("/v1/market/all", self._market_all)
+        router.add_get("/v1/accounts", self._accounts)
+        router.add_post("/v1/orders", self._create_order)
+        router.add_get("/v1/order", self._get_order)
+        router.add_get("/v1/orders/uuids", self._get_orders)
+        router.add_get("/v1/orders/open", self._open_orders)
+        router.add_delete("/v1/order", self._cancel_order)
+        router.add_get(self.websocket_path, self._websocket)
+
+    @staticmethod
+    def _error(exc: SimulatorRejection) -> web.Response:
+        body = msgspec.json.encode({"error": {"name": exc.name, "message": exc.message}})
+        headers = {"Remaining-Req": "group=default; min=0; sec=0"} if exc.status == 429 else None
+        return web.Response(status=exc.status, body=body, content_type="application/json", headers=headers)
+
+    async def _handle(
+        self,
+        request: web.Request,
+        *,
+        private: bool,
+        action: Callable[[Dict[str, Any]], Any],
+    ) -> web.Response:
+        try:
+            await self._guard(private)
+            if request.method == "POST":
+                params = msgspec.json.decode(await request.read()) if request.can_read_body else {}
+                query = encode_upbit_query(params) if params else ""
+            else:
+                params = dict(request.query)
+                query = request.raw_path.partition("?")[2]
+            if private:
+                try:
+                    verify_upbit_jwt(
+                        request.headers.get("Authorization"),
+                        unquote(query),
+                        self._config.credentials,
+                        self._nonces,
+                    )
+                except AuthError as exc:
+                    self.stats.auth_failures += 1
+                    raise SimulatorRejection(401, "invalid_access_key", str(exc)) from exc
+            payload = action(params)
+        except SimulatorRejection as exc:
+            return self._error(exc)
+        return web.Response(body=msgspec.json.encode(payload), content_type="application/json")
+
+    def _book_payload(self, book: SimulatedBook) -> Dict[str, Any]:
+        return {
+            "market": f"KRW-{book.base}",
+            "timestamp": book.timestamp,
+            "total_ask_size": round(sum(size for _, size in book.asks), 4),
+            "total_bid_size": round(sum(size for _, size in book.bids), 4),
+            "orderbook_units": [
+                {"ask_price": ask[0], "bid_price": bid[0], "ask_size": ask[1], "bid_size": bid[1]}
+                for ask, bid in zip(book.asks, book.bids)
+            ],
+        }
+
+    def _ws_frame(self, book: SimulatedBook) -> bytes:
+        payload = self._book_payload(book)
+        payload["type"] = "orderbook"
+        payload["code"] = payload.pop("market")
+        payload["stream_type"] = "REALTIME"
+        return msgspec.json.encode(payload)
+
+    def _order_payload(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "uuid": order["id"],
+            "side": "bid" if order["side"] == "buy" else "ask",
+            "ord_type": order.get("ord_type", "market"),
+            "price": format_price(order["price"]) if order["price"] else None,
+            "state": order["state"],
+            "market": f"KRW-{order['base']}",
+            "volume": str(order["requested"]),
+            "remaining_volume": str(max(order["requested"] - order["filled"], 0.0)),
+            "paid_fee": str(order["fee"]),
+            "executed_volume": str(order["filled"]),
+            "avg_price": str(order["avg_price"]) if order["filled"] else None,
+            "trades_count": 1 if order["filled"] else 0,
+        }
+
+    def _base_of(self, market: str) -> str:
+        quote, _, base = market.partition("-")
+        if quote != "KRW" or base not in self.books:
+            raise SimulatorRejection(404, "market_does_not_exist", f"未知市場 {market}")
+        return base
+
+    async def _orderbook(self, request: web.Request) -> web.Response:
+        def action(params: Dict[str, Any]) -> Any:
+            markets = [m for m in str(params.get("markets", "")).split(",") if m]
+            return [self._book_payload(self.advance(self._base_of(m))) for m in markets]
+
+        return await self._handle(request, private=False, action=action)
+
+    async def _market_all(self, request: web.Request) -> web.Response:
+        def action(_params: Dict[str, Any]) -> Any:
+            return [{"market": f"KRW-{base}", "korean_name": base, "english_name": base} for base in self.books]
+
+        return await self._handle(request, private=False, action=action)
+
+    async def _accounts(self, request: web.Request) -> web.Response:
+        def action(_params: Dict[str, Any]) -> Any:
+            return [
+                {
+                    "currency": currency,
+                    "balance": str(available),
+                    "locked": str(locked),
+                    "avg_buy_price": "0",
+                    "unit_currency": "KRW",
+                }
+                for currency, (available, locked) in self._balances.items()
+            ]
+
+        return await self._handle(request, private=True, action=action)
+
+    async def _create_order(self, request: web.Request) -> web.Response:
+        def action(params: Dict[str, Any]) -> Any:
+            base = self._base_of(str(params.get("market", "")))
+            side = "buy" if params.get("side") == "bid" else "sell"
+            ord_type = params.get("ord_type")
+            if ord_type == "price" and side == "buy":
+                order = self._fill_market(base, side, notional=float(params["price"]))
+            elif ord_type == "market" and side == "sell":
+                order = self._fill_market(base, side, quantity=float(params["volume"]))
+            elif ord_type == "limit":
+                order = self._place_limit(base, side, float(params["volume"]), float(params["price"]))
+            else:
+                raise SimulatorRejection(400, "invalid_parameter", f"不支援的 ord_type {ord_type}")
+            order["ord_type"] = ord_type
+            self._notify_private(order)
+            return self._order_payload(order)
+
+        return await self._handle(request, private=True, action=action)
+
+    async def _get_order(self, request: web.Request) -> web.Response:
+        return await self._handle(
+            request,
+            private=True,
+            action=lambda params: self._order_payload(self._order(str(params.get("uuid", "")))),
+        )
+
+    async def _get_orders(self, request: web.Request) -> web.Response:
+        def action(_params: Dict[str, Any]) -> Any:
+            uuids = request.query.getall("uuids[]", [])
+            return [self._order_payload(self._orders[uid]) for uid in uuids if uid in self._orders]
+
+        return await self._handle(request, private=True, action=action)
+
+    async def _open_orders(self, request: web.Request) -> web.Response:
+        def action(params: Dict[str, Any]) -> Any:
+            base = self._base_of(str(params.get("market", "")))
+            states = set(request.query.getall("states[]", ["wait"]))
+            return [
+                self._order_payload(order)
+                for order in self._orders.values()
+                if order["base"] == base and order["state"] in states
+            ]
+
+        return await self._handle(request, private=True, action=action)
+
+    async def _cancel_order(self, request: web.Request) -> web.Response:
+        def action(params: Dict[str, Any]) -> Any:
+            order = self._cancel(str(params.get("uuid", "")))
+            self._notify_private(order)
+            return self._order_payload(order)
+
+        return await self._handle(request, private=True, action=action)
+
+    def _notify_private(self, order: Dict[str, Any]) -> None:
+        """訂單或餘額變動後向私有 WS 推送 myOrder 與 myAsset。"""
+        if not self._private_queues:
+            return
+        my_order = self._order_payload(order)
+        my_order.update({"type": "myOrder", "code": my_order.pop("market"), "stream_type": "REALTIME"})
+        currencies = {"KRW", order["base"]}
+        my_asset = {
+            "type": "myAsset",
+            "assets": [
+                {"currency": currency, "balance": str(available), "locked": str(locked)}
+                for currency, (available, locked) in self._balances.items()
+                if currency in currencies
+            ],
+            "stream_type": "REALTIME",
+        }
+        frames = (msgspec.json.encode(my_order), msgspec.json.encode(my_asset))
+        for queue in self._private_queues:
+            for frame in frames:
+                queue.put_nowait(frame)
+
+    async def _private_websocket(self, request: web.Request) -> web.StreamResponse:
+        try:
+            verify_upbit_jwt(request.headers.get("Authorization"), "", self._config.credentials, self._nonces)
+        except AuthError as exc:
+            self.stats.auth_failures += 1
+            return self._error(SimulatorRejection(401, "invalid_access_key", str(exc)))
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.stats.ws_connections += 1
+        self._websockets.add(ws)
+        queue: asyncio.Queue[bytes] = asyncio.Queue()
+
+        async def pump() -> None:
+            while not ws.closed:
+                await ws.send_bytes(await queue.get())
+                self.stats.ws_messages += 1
+
+        pump_task: Optional[asyncio.Task[None]] = None
+        try:
+            async for msg in ws:
+                if msg.type not in (WSMsgType.TEXT, WSMsgType.BINARY):
+                    break
+                if pump_task is None:
+                    self._private_queues.add(queue)
+                    pump_task = asyncio.create_task(pump())
+        finally:
+            self._private_queues.discard(queue)
+            if pump_task:
+                pump_task.cancel()
+                try:
+                    await pump_task
+                except (asyncio.CancelledError, ConnectionResetError):
+                    pass
+            self._websockets.discard(ws)
+        return ws
+
+    async def _websocket(self, request: web.Request) -> web.WebSocketResponse:
+        def parse(message: Any) -> List[str]:
+            bases: List[str] = []
+            for item in message:
+                if isinstance(item, dict) and item.get("type") == "orderbook":
+                    bases.extend(code.partition("-")[2] for code in item.get("codes", []))
+            return bases
+
+        return await self._serve_ws(request, parse, self._ws_frame, binary=True)
+
+
+class BithumbSimulator(ExchangeSimulator):
+    """模擬 Bithumb REST（/public, /info, /trade）與 WebSocket（/pub/ws）。"""
+
+    name = "bithumb"
+    websocket_path = "/pub/ws"
+
+    def _register_routes(self, router: web.UrlDispatcher) -> None:
+        router.add_get("/public/orderbook/{symbol}", self._orderbook)
+        router.add_get("/public/ticker/ALL_KRW", self._ticker_all)
+        router.add_post("/info/balance", self._private(self._balance_action))
+        router.add_post("/info/order_detail", self._private(self._order_detail_action))
+        router.add_post("/info/orders", self._private(self._open_orders_action))
+        router.add_post("/trade/place", self._private(self._place_action))
+        router.add_post("/trade/market_buy", self._private(self._market_action("buy")))
+        router.add_post("/trade/market_sell", self._private(self._market_action("sell")))
+        router.add_post("/trade/cancel", self._private(self._cancel_action))
+        router.add_get(self.websocket_path, self._websocket)
+
+    @staticmethod
+    def _error(exc: SimulatorRejection) -> web.Response:
+        codes = {401: "5100", 404: "5600", 429: "5900"}
+        body = msgspec.json.encode({"status": codes.get(exc.status, "5600"), "message": exc.message})
+        return web.Response(status=exc.status, body=body, content_type="application/json")
+
+    @staticmethod
+    def _ok(data: Any) -> web.Response:
+        return web.Response(body=msgspec.json.encode({"status": "0000", "data": data}), content_type="application/json")
+
+    def _private(
+        self,
+        action: Callable[[Dict[str, str]], Any],
+    ) -> Callable[[web.Request], Any]:
+        async def handler(request: web.Request) -> web.Response:
+            try:
+                await self._guard(True)
+                body = await request.text()
+                try:
+                    verify_bithumb_signature(
+                        request.headers,
+                        request.path,
+                        body,
+                        self._config.credentials,
+                        self._nonces,
+                    )
+                except AuthError as exc:
+                    self.stats.auth_failures += 1
+                    raise SimulatorRejection(401, "auth", str(exc)) from exc
+                return self._ok(action(dict(parse_qsl(body))))
+            except SimulatorRejection as exc:
+                return self._error(exc)
+
+        return handler
+
+    def _book_payload(self, book: SimulatedBook) -> Dict[str, Any]:
+        return {
+            "timestamp": str(book.timestamp),
+            "order_currency": book.base,
+            "payment_currency": "KRW",
+            "bids": [{"price": format_price(price), "quantity": str(size)} for price, size in book.bids],
+            "asks": [{"price": format_price(price), "quantity": str(size)} for price, size in book.asks],
+        }
+
+    def _ws_frame(self, book: SimulatedBook) -> bytes:
+        return msgspec.json.encode({"type": "orderbookdepth", "content": self._book_payload(book)})
+
+    def _order_payload(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        status = {"done": "Completed", "wait": "Pending", "cancel": "Cancel"}[order["state"]]
+        return {
+            "order_id": order["id"],
+            "order_currency": order["base"],
+            "payment_currency": "KRW",
+            "type": "bid" if order["side"] == "buy" else "ask",
+            "status": status,
+            "units": str(order["requested"]),
+            "contract_amount": str(order["filled"]),
+            "contract_price": str(order["avg_price"]) if order["filled"] else "",
+            "fee": str(order["fee"]),
+        }
+
+    def _new_order_id(self) -> str:
+        return f"C{next(self._order_seq):016d}"
+
+    def _base_of(self, symbol: str) -> str:
+        base = symbol.split("_")[0].upper()
+        if base not in self.books:
+            raise SimulatorRejection(404, "unknown", f"未知幣種 {symbol}")
+        return base
+
+    async def _orderbook(self, request: web.Request) -> web.Response:
+        try:
+            await self._guard(False)
+            base = self._base_of(request.match_info["symbol"])
+        except SimulatorRejection as exc:
+            return self._error(exc)
+        return self._ok(self._book_payload(self.advance(base)))
+
+    async def _ticker_all(self, request: web.Request) -> web.Response:
+        try:
+            await self._guard(False)
+        except SimulatorRejection as exc:
+            return self._error(exc)
+        data: Dict[str, Any] = {
+            base: {"closing_price": format_price(book.mid), "units_traded_24H": "0"}
+            for base, book in self.books.items()
+        }
+        data["date"] = str(int(time.time() * 1000))
+        return self._ok(data)
+
+    def _balance_action(self, _params: Dict[str, str]) -> Any:
+        data: Dict[str, str] = {}
+        for currency, (available, locked) in self._balances.items():
+            key = currency.lower()
+            data[f"total_{key}"] = str(available + locked)
+            data[f"in_use_{key}"] = str(locked)
+            data[f"available_{key}"] = str(available)
+        return data
+
+    def _order_detail_action(self, params: Dict[str, str]) -> Any:
+        return self._order_payload(self._order(params.get("order_id", "")))
+
+    def _open_orders_action(self, params: Dict[str, str]) -> Any:
+        base = self._base_of(params.get("order_currency", ""))
+        return [
+            {
+                "order_id": order["id"],
+                "order_currency": base,
+                "payment_currency": "KRW",
+                "type": "bid" if order["side"] == "buy" else "ask",
+                "units": str(order["requested"]),
+                "units_remaining": str(order["requested"] - order["filled"]),
+                "price": format_price(order["price"]),
+                "order_date": str(int(order["created_at"] * 1_000_000)),
+            }
+            for order in self._orders.values()
+            if order["base"] == base and order["state"] == "wait"
+        ]
+
+    def _place_action(self, params: Dict[str, str]) -> Any:
+        base = self._base_of(params.get("order_currency", ""))
+        side = "buy" if params.get("type") == "bid" else "sell"
+        order = self._place_limit(base, side, float(params["units"]), float(params["price"]))
+        return self._order_payload(order)
+
+    def _market_action(self, side: str) -> Callable[[Dict[str, str]], Any]:
+        def action(params: Dict[str, str]) -> Any:
+            base = self._base_of(params.get("order_currency", ""))
+            return self._order_payload(self._fill_market(base, side, quantity=float(params["units"])))
+
+        return action
+
+    def _cancel_action(self, params: Dict[str, str]) -> Any:
+        return self._order_payload(self._cancel(params.get("order_id", "")))
+
+    async def _websocket(self, request: web.Request) -> web.WebSocketResponse:
+        def parse(message: Any) -> List[str]:
+            if not isinstance(message, dict) or message.get("type") != "orderbookdepth":
+                return []
+            return [symbol.split("_")[0].upper() for symbol in message.get("symbols", [])]
+
+        return await self._serve_ws(request, parse, self._ws_frame, binary=False)
@@ -0,0 +1,319 @@
+"""以本地模擬器驗證 Gateway/Parser/Wrapper 全鏈路。"""
+from __future__ import annotations
+
+import asyncio
+import json
+from decimal import Decimal
+from pathlib import Path
+
+from business.account import BalanceTable, OrderTable, UpbitPrivateStream
+from business.engine import ControlServer, DryRunEngine
+from business.engine.dryrun import PairContext
+from business.execution.order_tracker import OrderTracker, TrackerConfig
+from business.market import MarketRegistry
+from business.orderbook.feed import OrderBookFeed
+from business.orderbook.manager import OrderBookManager
+from core.exceptions import GatewayError
+from core.gateway.base import GatewaySettings
+from core.gateway.bithumb import BithumbGateway
+from core.gateway.ratelimit.token_bucket import TokenBucket
+from core.gateway.upbit import UpbitGateway
+from core.parser.bithumb import BithumbParser
+from core.datatypes import OrderRequest
+from core.parser.upbit import UpbitParser
+from core.wrapper.bithumb import BithumbWrapper
+from core.wrapper.upbit import UpbitWrapper
+from simulator import BithumbSimulator, SimulatorConfig, UpbitSimulator
+
+CREDENTIALS = {"ak": "sk"}
+
+
+def _config(**overrides) -> SimulatorConfig:
+    params = dict(
+        markets={"BTC": 95_000_000.0, "XRP": 800.0},
+        credentials=CREDENTIALS,
+        balances={"KRW": 1_000_000_000.0, "BTC": 1.0, "XRP": 10_000.0},
+        ws_interval_ms=5.0,
+        seed=7,
+    )
+    params.update(overrides)
+    return SimulatorConfig(**params)
+
+
+def _settings(name: str, sim, *, secret: str = "sk") -> GatewaySettings:
+    return GatewaySettings(
+        name=name,
+        rest_base=sim.rest_base,
+        websocket_url=sim.websocket_url,
+        access_key="ak",
+        secret_key=secret,
+    )
+
+
+def test_upbit_wrapper_against_simulator() -> None:
+    async def run() -> None:
+        sim = UpbitSimulator(_config())
+        await sim.start()
+        wrapper = UpbitWrapper(UpbitGateway(_settings("upbit", sim)), UpbitParser())
+        try:
+            book = await wrapper.get_orderbook("KRW-BTC")
+            assert book.symbol == "KRW-BTC"
+            assert book.bids[0].price < book.asks[0].price
+            sold = await wrapper.sell_market_order("KRW-BTC", Decimal("0.01"))
+            assert sold.status == "done"
+            assert sold.filled_quantity == Decimal("0.01")
+            assert sold.average_price is not None
+            bought = await wrapper.buy_market_order("KRW-XRP", Decimal("10000"))
+            assert bought.filled_quantity > 0
+            status = await wrapper.get_order_status(sold.order_id)
+            assert status.order_id == sold.order_id
+            balances = {b.currency: b for b in await wrapper.get_balance()}
+            assert balances["BTC"].available == Decimal("0.99")
+
+            manager = OrderBookManager()
+            feed = OrderBookFeed(wrapper, "KRW-BTC", manager)
+            await feed.start()
+            first = manager.snapshot.sequence
+            await asyncio.sleep(0.1)
+            assert manager.snapshot.sequence > first
+            await feed.stop()
+        finally:
+            await wrapper.close()
+            await sim.close()
+
+    asyncio.run(run())
+
+
+def test_upbit_private_stream_against_simulator() -> None:
+    async def run() -> None:
+        sim = UpbitSimulator(_config())
+        await sim.start()
+        settings = _settings("upbit", sim)
+        settings.private_websocket_url = sim.private_websocket_url
+        wrapper = UpbitWrapper(UpbitGateway(settings), UpbitParser())
+        orders = OrderTable()
+        balances = BalanceTable()
+        stream = UpbitPrivateStream(wrapper, orders, balances)
+        try:
+            # 連線前已掛出的限價單，應於連線後的 REST 對帳中登記
+            book = await wrapper.get_orderbook("KRW-BTC")
+            far_price = book.bids[-1].price - Decimal("1000000")
+            resting = await wrapper.place_order(
+                OrderRequest("upbit", "KRW-BTC", "bid", "limit", Decimal("0.01"), far_price)
+            )
+            orders.update(resting)
+            await stream.start()
+            for _ in range(100):
+                if stream.connected:
+                    break
+                await asyncio.sleep(0.01)
+            assert stream.connected and balances.is_live("upbit")
+            assert balances.get("upbit", "BTC").available == Decimal("1.0")
+
+            await wrapper.cancel_order(resting.order_id)
+            cancelled = await orders.wait_final(resting.order_id, timeout=1.0)
+            assert cancelled.status == "cancel"
+
+            sold = await wrapper.sell_market_order("KRW-BTC", Decimal("0.01"))
+            pushed = await orders.wait_final(sold.order_id, timeout=1.0)
+            assert pushed.filled_quantity == Decimal("0.01")
+            for _ in range(100):
+                if balances.get("upbit", "BTC").available == Decimal("0.99"):
+                    break
+                await asyncio.sleep(0.01)
+            assert balances.get("upbit", "BTC").available == Decimal("0.99")
+            await stream.stop()
+            assert not balances.is_live("upbit")
+        finally:
+            await stream.stop()
+            await wrapper.close()
+            await sim.close()
+
+    asyncio.run(run())
+
+
+def test_bithumb_wrapper_against_simulator() -> None:
+    async def run() -> None:
+        sim = BithumbSimulator(_config())
+        await sim.start()
+        wrapper = BithumbWrapper(BithumbGateway(_settings("bithumb", sim)), BithumbParser())
+        try:
+            book = await wrapper.get_orderbook("BTC_KRW")
+            assert book.exchange == "bithumb"
+            bought = await wrapper.buy_market_order("XRP_KRW", Decimal("5"))
+            assert bought.filled_quantity == Decimal("5")
+            balances = {b.currency: b for b in await wrapper.get_balance()}
+            assert balances["XRP"].available == Decimal("10005.0")
+
+            manager = OrderBookManager()
+            feed = OrderBookFeed(wrapper, "BTC_KRW", manager)
+            await feed.start()
+            first = manager.snapshot.sequence
+            await asyncio.sleep(0.1)
+            assert manager.snapshot.sequence > first
+            await feed.stop()
+        finally:
+            await wrapper.close()
+            await sim.close()
+
+    asyncio.run(run())
+
+
+def test_simulator_rejects_bad_signature_and_rate_limits() -> None:
+    async def run() -> None:
+        sim = UpbitSimulator(_config(private_capacity=2, private_rate=0.5))
+        await sim.start()
+        bad = UpbitWrapper(UpbitGateway(_settings("upbit", sim, secret="wrong")), UpbitParser())
+        good = UpbitWrapper(UpbitGateway(_settings("upbit", sim)), UpbitParser())
+        try:
+            try:
+                await bad.get_balance()
+            except GatewayError as exc:
+                assert "401" in str(exc)
+            else:  # pragma: no cover
+                raise AssertionError("錯誤簽名應被拒絕")
+            await good.get_balance()
+            try:
+                await good.get_balance()
+            except GatewayError as exc:
+                assert "429" in str(exc)
+            else:  # pragma: no cover
+                raise AssertionError("超出限流應回應 429")
+            assert sim.stats.auth_failures == 1
+            assert sim.stats.rejected_429 == 1
+        finally:
+            await bad.close()
+            await good.close()
+            await sim.close()
+
+    asyncio.run(run())
+
+
+def test_order_tracker_against_simulators() -> None:
+    async def run() -> None:
+        upbit_sim = UpbitSimulator(_config())
+        bithumb_sim = BithumbSimulator(_config())
+        await upbit_sim.start()
+        await bithumb_sim.start()
+        upbit = UpbitWrapper(UpbitGateway(_settings("upbit", upbit_sim)), UpbitParser())
+        bithumb = BithumbWrapper(BithumbGateway(_settings("bithumb", bithumb_sim)), BithumbParser())
+        tracker = OrderTracker(upbit, bithumb, config=TrackerConfig(min_interval=0.01, max_interval=0.05))
+        try:
+            upbit_futures = {}
+            for _ in range(3):
+                placed = await upbit.place_order(
+                    OrderRequest("upbit", "KRW-BTC", "bid", "limit", Decimal("0.01"), Decimal("1000000"))
+                )
+                upbit_futures[placed.order_id] = tracker.track("upbit", placed.order_id, "KRW-BTC")
+            resting = await bithumb.place_order(
+                OrderRequest("bithumb", "BTC_KRW", "bid", "limit", Decimal("0.01"), Decimal("1000000"))
+            )
+            resting_future = tracker.track("bithumb", resting.order_id, "BTC_KRW")
+            sold = await bithumb.sell_market_order("BTC_KRW", Decimal("0.01"))
+            tracker.track("bithumb", sold.order_id, "BTC_KRW")
+            assert len(await bithumb.get_open_orders("BTC_KRW")) == 1
+
+            await tracker.start()
+            done = await tracker.wait(sold.order_id, timeout=1.0)
+            assert done.status == "Completed"
+            for order_id in upbit_futures:
+                await upbit.cancel_order(order_id)
+            await bithumb.cancel_order(resting.order_id)
+            results = await asyncio.wait_for(asyncio.gather(*upbit_futures.values()), 1.0)
+            assert {r.status for r in results} == {"cancel"}
+            assert (await asyncio.wait_for(resting_future, 1.0)).status == "Cancel"
+            assert len(tracker) == 0
+        finally:
+            await tracker.stop()
+            await upbit.close()
+            await bithumb.close()
+            await upbit_sim.close()
+            await bithumb_sim.close()
+
+    asyncio.run(run())
+
+
+def test_market_registry_against_simulators() -> None:
+    async def run() -> None:
+        upbit_sim = UpbitSimulator(_config())
+        bithumb_sim = BithumbSimulator(_config(markets={"BTC": 95_000_000.0, "SOL": 250_000.0}))
+        await upbit_sim.start()
+        await bithumb_sim.start()
+        upbit = UpbitWrapper(UpbitGateway(_settings("upbit", upbit_sim)), UpbitParser())
+        bithumb = BithumbWrapper(BithumbGateway(_settings("bithumb", bithumb_sim)), BithumbParser())
+        try:
+            registry = await MarketRegistry.fetch(upbit, bithumb)
+            assert registry.bases == ["BTC"]
+            assert registry.upbit_only == ["XRP"] and registry.bithumb_only == ["SOL"]
+        finally:
+            await upbit.close()
+            await bithumb.close()
+            await upbit_sim.close()
+            await bithumb_sim.close()
+
+    asyncio.run(run())
+
+
+def test_kill_switch_flattens_both_exchanges(tmp_path: Path) -> None:
+    async def run() -> None:
+        upbit_sim = UpbitSimulator(_config())
+        bithumb_sim = BithumbSimulator(_config())
+        await upbit_sim.start()
+        await bithumb_sim.start()
+        upbit = UpbitWrapper(
+            UpbitGateway(_settings("upbit", upbit_sim), private_limiter=TokenBucket(8, 8)), UpbitParser()
+        )
+        bithumb = BithumbWrapper(BithumbGateway(_settings("bithumb", bithumb_sim)), BithumbParser())
+        managers = [OrderBookManager() for _ in range(4)]
+        pairs = [
+            PairContext(
+                name=base,
+                upbit_symbol=f"KRW-{base}",
+                bithumb_symbol=f"{base}_KRW",
+                upbit_manager=managers[i * 2],
+                bithumb_manager=managers[i * 2 + 1],
+                upbit_feed=OrderBookFeed(upbit, f"KRW-{base}", managers[i * 2]),
+                bithumb_feed=OrderBookFeed(bithumb, f"{base}_KRW", managers[i * 2 + 1]),
+            )
+            for i, base in enumerate(("BTC", "XRP"))
+        ]
+        engine = DryRunEngine(
+            upbit_wrapper=upbit,
+            bithumb_wrapper=bithumb,
+            strategy=None,
+            risk_manager=None,
+            executor=None,
+            pairs=pairs,
+        )
+        control = ControlServer(engine, tmp_path / "control.sock")
+        await control.start()
+        try:
+            for _ in range(5):
+                await upbit.place_order(
+                    OrderRequest("upbit", "KRW-BTC", "bid", "limit", Decimal("0.01"), Decimal("1000000"))
+                )
+            await upbit.place_order(OrderRequest("upbit", "KRW-XRP", "bid", "limit", Decimal("10"), Decimal("500")))
+            await bithumb.place_order(
+                OrderRequest("bithumb", "BTC_KRW", "bid", "limit", Decimal("0.01"), Decimal("1000000"))
+            )
+
+            reader, writer = await asyncio.open_unix_connection(str(tmp_path / "control.sock"))
+            writer.write(b"kill test\n")
+            report = json.loads(await asyncio.wait_for(reader.readline(), 5.0))
+            writer.write(b"status\n")
+            status = json.loads(await reader.readline())
+            writer.close()
+
+            assert report["ok"] and report["cancelled"] == 7 and report["remaining"] == []
+            assert report["reason"] == "control:test" and report["time_to_flat_ms"] > 0
+            assert status["halted"] is True
+            assert await upbit.get_open_orders("KRW-BTC") == []
+            assert await bithumb.get_open_orders("BTC_KRW") == []
+        finally:
+            await control.stop()
+            await upbit.close()
+            await bithumb.close()
+            await upbit_sim.close()
+            await bithumb_sim.close()
+
+    asyncio.run(run())
@@ -0,0 +1,96 @@
+"""OrderTable / BalanceTable / BalanceLedger 測試。"""
+from __future__ import annotations
+
+import asyncio
+import time
+from decimal import Decimal
+
+from business.account import BalanceLedger, BalanceTable, OrderTable
+from core.datatypes import Balance, OrderResult
+
+
+def _order(order_id: str, status: str, filled: str = "0") -> OrderResult:
+    return OrderResult(
+        order_id=order_id,
+        exchange="upbit",
+        symbol="KRW-BTC",
+        status=status,
+        filled_quantity=Decimal(filled),
+        average_price=None,
+        raw=None,
+    )
+
+
+def _balance(currency: str, available: str) -> Balance:
+    amount = Decimal(available)
+    return Balance(exchange="upbit", currency=currency, available=amount, locked=Decimal("0"), total=amount)
+
+
+def test_order_table_keeps_final_state_and_wakes_waiters() -> None:
+    async def run() -> None:
+        table = OrderTable()
+        table.update(_order("a", "wait"))
+        waiter = asyncio.create_task(table.wait_final("a", timeout=1.0))
+        await asyncio.sleep(0)
+        table.update(_order("a", "done", "0.1"))
+        result = await waiter
+        assert result.filled_quantity == Decimal("0.1")
+        # 晚到的 REST 對帳結果不可把終態改回 wait
+        table.update(_order("a", "wait"))
+        assert table.get("a").status == "done"
+        assert table.open_orders() == []
+        table.discard_final()
+        assert len(table) == 0
+
+    asyncio.run(run())
+
+
+def test_balance_table_incremental_and_replace() -> None:
+    table = BalanceTable()
+    assert not table.has("upbit")
+    table.replace("upbit", [_balance("KRW", "1000"), _balance("BTC", "1")])
+    table.update([_balance("btc", "0.5")])
+    assert table.has("upbit")
+    assert table.get("upbit", "BTC").available == Decimal("0.5")
+    assert len(table.balances("upbit")) == 2
+    table.replace("upbit", [_balance("KRW", "2000")])
+    assert table.get("upbit", "BTC") is None
+    assert table.get("upbit", "krw").available == Decimal("2000")
+    # 推送斷線後不再視為即時，即使表內仍有資料
+    assert not table.is_live("upbit")
+    table.set_live("upbit", True)
+    assert table.is_live("upbit")
+    table.set_live("upbit", False)
+    assert table.has("upbit") and not table.is_live("upbit")
+
+
+def test_ledger_reservations_and_settle() -> None:
+    ledger = BalanceLedger()
+    ledger.replace("upbit", [_balance("KRW", "1000"), _balance("XRP", "10")])
+    first = ledger.reserve([("upbit", "krw", Decimal("600"))])
+    assert first is not None
+    assert ledger.available("upbit", "KRW") == Decimal("400")
+    # 全部或全不預留：XRP 足夠但 KRW 不足時不留下任何預留
+    assert ledger.reserve([("upbit", "XRP", Decimal("1")), ("upbit", "KRW", Decimal("500"))]) is None
+    assert ledger.reserved("upbit", "XRP") == Decimal("0")
+    ledger.settle(first, {("upbit", "KRW"): Decimal("-590"), ("upbit", "XRP"): Decimal("1")})
+    ledger.release(first)  # 重複釋放無作用
+    assert ledger.open_reservations == 0
+    assert ledger.available("upbit", "KRW") == Decimal("410")
+    assert ledger.available("upbit", "XRP") == Decimal("11")
+    # 預留後、成交前的同步不含本次成交，仍須套用
+    second = ledger.reserve([("upbit", "KRW", Decimal("100"))])
+    ledger.replace("upbit", [_balance("KRW", "300")])
+    ledger.settle(second, {("upbit", "KRW"): Decimal("-100")})
+    assert ledger.available("upbit", "KRW") == Decimal("200")
+    # 下單後才同步的交易所可能已含本次成交，不再套用
+    third = ledger.reserve([("upbit", "KRW", Decimal("50"))])
+    sent_at = time.monotonic()
+    ledger.replace("upbit", [_balance("KRW", "150")])
+    ledger.settle(third, {("upbit", "KRW"): Decimal("-50")}, sent_at=sent_at)
+    assert ledger.available("upbit", "KRW") == Decimal("150")
+    # 推送即時維護的交易所以推送為準，不套用成交增量
+    ledger.table.set_live("upbit", True)
+    fourth = ledger.reserve([("upbit", "KRW", Decimal("50"))])
+    ledger.settle(fourth, {("upbit", "KRW"): Decimal("-50")})
+    assert ledger.available("upbit", "KRW") == Decimal("150")
@@ -5,6 +5,7 @@ import asyncio
 from decimal import Decimal
 from typing import Optional
 
+from business.account.tables import BalanceTable
 from business.engine.dryrun import DryRunEngine, PairContext
 from business.execution.executor import OrderExecutor
 from business.orderbook.manager import OrderBookManager
@@ -12,11 +13,13 @@ from business.risk.circuit_breaker import CircuitBreakerConfig
 from business.risk.manager import RiskConfig, RiskManager
 from business.risk.position_limiter import PositionLimit
 from business.strategy.base import StrategyConfig
+from business.strategy.dedup import SignalDeduplicator
 from business.strategy.spread_arbitrage import SpreadArbitrageStrategy
 from core.datatypes import Balance, OrderBook, OrderResult, PriceLevel
 from core.interface import BaseGateway
 from core.parser.base import JsonParser
 from core.wrapper.base import BaseExchangeWrapper
+from utils.tracing import Tracer
 
 
 class DummyParser(JsonParser):
@@ -31,7 +34,9 @@ class DummyParser(JsonParser):
 
 
 class DummyGateway(BaseGateway):
-    async def request(self, method: str, endpoint: str, *, params=None, signed=False, headers=None) -> bytes:  # pragma: no cover
+    async def request(
+        self, method: str, endpoint: str, *, params=None, signed=False, headers=None, priority=False
+    ) -> bytes:  # pragma: no cover
         raise NotImplementedError
 
     async def ws_connect(self, url: Optional[str] = None, *, headers=None):  # pragma: no cover
@@ -163,6 +168,7 @@ def test_dryrun_engine_executes_signal() -> None:
         bithumb_feed=DummyFeed(bithumb_manager),
     )
 
+    tracer = Tracer(sample_every=1)
     engine = DryRunEngine(
         upbit_wrapper=upbit_wrapper,
         bithumb_wrapper=bithumb_wrapper,
@@ -171,8 +177,108 @@ def test_dryrun_engine_executes_signal() -> None:
         executor=executor,
         pairs=[pair],
         poll_interval=0.1,
+        tracer=tracer,
+        dedup=SignalDeduplicator(cooldown=60.0),
     )
 
     asyncio.run(engine.run_once())
     assert upbit_wrapper.market_orders[0].startswith("sell")
     assert bithumb_wrapper.market_orders[0].startswith("buy")
+    # 測試直接寫入 manager，無 WS 幀到達時間，trace 從 book 階段開始
+    assert set(tracer.snapshot()["BTC"]) == {"strategy", "risk", "dispatch", "ack", "total"}
+    # 盤口未變動：同一信號在冷卻期內不再下單；盤口一動即重新放行
+    asyncio.run(engine.run_once())
+    assert len(upbit_wrapper.market_orders) == 1
+    asyncio.run(upbit_manager.update_full(_orderbook("KRW-BTC", Decimal("95010000"), Decimal("95100000"))))
+    asyncio.run(engine.run_once())
+    assert len(upbit_wrapper.market_orders) == 2
+
+
+class PushingWrapper(FakeWrapper):
+    """市價賣成交後、回應前，私有推送已送達含本次成交的新餘額。"""
+
+    def __init__(self, name: str, orderbook: OrderBook, balances: dict[str, Decimal], table: BalanceTable):
+        super().__init__(name, orderbook, balances)
+        self._table = table
+
+    async def sell_market_order(self, symbol: str, volume: Decimal) -> OrderResult:
+        self.market_orders.append(f"sell:{volume}")
+        price = self._orderbook.bids[0].price
+        self._table.update(
+            [
+                Balance("upbit", "BTC", Decimal("1") - volume, Decimal("0"), Decimal("1") - volume),
+                Balance("upbit", "KRW", Decimal("100000000") + volume * price, Decimal("0"), Decimal("0")),
+            ]
+        )
+        return OrderResult("u-1", "upbit", symbol, "done", volume, price)
+
+
+class FilledWrapper(FakeWrapper):
+    async def buy_market_order(self, symbol: str, amount: Decimal) -> OrderResult:
+        self.market_orders.append(f"buy:{amount}")
+        return OrderResult("b-1", "bithumb", symbol, "done", amount, self._orderbook.asks[0].price)
+
+
+def test_push_during_execution_is_not_double_counted() -> None:
+    upbit_ob = _orderbook("KRW-BTC", Decimal("95000000"), Decimal("95100000"))
+    bithumb_ob = _orderbook("BTC_KRW", Decimal("93000000"), Decimal("93100000"))
+    table = BalanceTable()
+    table.update(
+        [
+            Balance("upbit", "BTC", Decimal("1"), Decimal("0"), Decimal("1")),
+            Balance("upbit", "KRW", Decimal("100000000"), Decimal("0"), Decimal("100000000")),
+        ]
+    )
+    table.set_live("upbit", True)
+    upbit_wrapper = PushingWrapper("upbit", upbit_ob, {}, table)
+    bithumb_wrapper = FilledWrapper("bithumb", bithumb_ob, {"BTC": Decimal("1"), "KRW": Decimal("100000000")})
+    upbit_manager = OrderBookManager()
+    bithumb_manager = OrderBookManager()
+
+    async def init_managers() -> None:
+        await upbit_manager.update_full(upbit_ob)
+        await bithumb_manager.update_full(bithumb_ob)
+
+    asyncio.run(init_managers())
+    engine = DryRunEngine(
+        upbit_wrapper=upbit_wrapper,
+        bithumb_wrapper=bithumb_wrapper,
+        strategy=SpreadArbitrageStrategy(
+            StrategyConfig(
+                min_profit_rate=Decimal("0.005"),
+                max_volume=Decimal("0.1"),
+                upbit_fee=Decimal("0.001"),
+                bithumb_fee=Decimal("0.0025"),
+            )
+        ),
+        risk_manager=RiskManager(
+            RiskConfig(
+                reserve_ratio=Decimal("0.1"),
+                position_limit=PositionLimit(max_volume=Decimal("0.5"), max_notional=Decimal("100000000")),
+                circuit_breaker=CircuitBreakerConfig(failure_threshold=3, cool_down=1),
+            )
+        ),
+        executor=OrderExecutor(upbit_wrapper, bithumb_wrapper, dry_run=False),
+        pairs=[
+            PairContext(
+                name="BTC",
+                upbit_symbol="KRW-BTC",
+                bithumb_symbol="BTC_KRW",
+                upbit_manager=upbit_manager,
+                bithumb_manager=bithumb_manager,
+                upbit_feed=DummyFeed(upbit_manager),
+                bithumb_feed=DummyFeed(bithumb_manager),
+            )
+        ],
+        poll_interval=0.1,
+        balance_table=table,
+    )
+
+    asyncio.run(engine.run_once())
+    assert upbit_wrapper.market_orders == ["sell:0.1"]
+    # Upbit 以推送為準：賣出所得只計一次
+    assert table.get("upbit", "KRW").available == Decimal("109500000")
+    assert table.get("upbit", "BTC").available == Decimal("0.9")
+    # Bithumb 在下單前同步，成交增量仍須套用
+    assert table.get("bithumb", "BTC").available == Decimal("1.1")
+    assert table.get("bithumb", "KRW").available == Decimal("100000000") - Decimal("0.1") * Decimal("93100000")
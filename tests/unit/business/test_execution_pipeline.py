@@ -0,0 +1,89 @@
+"""ExecutionPipeline 測試。"""
+from __future__ import annotations
+
+import asyncio
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+from business.execution.pipeline import ExecutionPipeline, PipelineConfig
+from business.strategy.signal import ArbitrageDirection, StrategySignal
+
+
+def _signal(volume: str) -> StrategySignal:
+    return StrategySignal(
+        direction=ArbitrageDirection.UPBIT_SELL,
+        expected_profit=Decimal("1"),
+        volume=Decimal(volume),
+        upbit_price=Decimal("100"),
+        bithumb_price=Decimal("99"),
+        spread=Decimal("1"),
+    )
+
+
+class SlowExecutor:
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.calls: List[Tuple[str, Decimal]] = []
+        self.active: Dict[str, int] = {}
+        self.max_active = 0
+        self.overlap = False
+
+    async def __call__(self, key: str, signal: StrategySignal) -> None:
+        if self.active.get(key):
+            self.overlap = True
+        self.active[key] = self.active.get(key, 0) + 1
+        self.max_active = max(self.max_active, sum(self.active.values()))
+        self.calls.append((key, signal.volume))
+        await asyncio.sleep(self.delay)
+        self.active[key] -= 1
+
+
+def test_single_flight_keeps_latest_signal_per_pair() -> None:
+    async def run() -> None:
+        executor = SlowExecutor(0.02)
+        pipeline = ExecutionPipeline(executor, PipelineConfig(max_concurrency=4))
+        for volume in ("1", "2", "3"):
+            assert pipeline.submit("BTC", _signal(volume))
+        pipeline.submit("XRP", _signal("9"))
+        assert pipeline.in_flight("BTC") and pipeline.in_flight("XRP")
+        await pipeline.drain(timeout=1.0)
+        # 第一筆立即執行，第二筆被第三筆取代
+        assert [v for k, v in executor.calls if k == "BTC"] == [Decimal("1"), Decimal("3")]
+        assert not executor.overlap
+        assert pipeline.stats.superseded == 1
+        assert pipeline.stats.executed == 3
+
+    asyncio.run(run())
+
+
+def test_global_cap_and_drop_oldest() -> None:
+    async def run() -> None:
+        executor = SlowExecutor(0.02)
+        pipeline = ExecutionPipeline(executor, PipelineConfig(max_concurrency=2, max_pending=2))
+        for i in range(5):
+            pipeline.submit(f"P{i}", _signal(str(i + 1)))
+        assert pipeline.running == 2 and pipeline.pending == 2
+        await pipeline.drain(timeout=1.0)
+        assert executor.max_active == 2
+        assert pipeline.stats.dropped_overflow == 1
+        assert [k for k, _ in executor.calls] == ["P0", "P1", "P3", "P4"]
+
+    asyncio.run(run())
+
+
+def test_stale_signals_are_dropped_and_failures_counted() -> None:
+    async def run() -> None:
+        async def failing(key: str, signal: StrategySignal) -> None:
+            await asyncio.sleep(0.03)
+            raise RuntimeError("boom")
+
+        pipeline = ExecutionPipeline(failing, PipelineConfig(max_concurrency=1, max_signal_age=0.01))
+        pipeline.submit("BTC", _signal("1"))
+        pipeline.submit("XRP", _signal("1"))
+        await pipeline.drain(timeout=1.0)
+        assert pipeline.stats.failed == 1
+        assert pipeline.stats.dropped_stale == 1
+        await pipeline.close()
+        assert not pipeline.submit("BTC", _signal("1"))
+
+    asyncio.run(run())
@@ -0,0 +1,106 @@
+"""FillSimulator 測試。"""
+from __future__ import annotations
+
+import asyncio
+from decimal import Decimal
+from typing import List, Tuple
+
+from business.execution.fill_simulator import BookHistory, FillConfig, FillSimulator
+from business.orderbook.manager import OrderBookManager
+from business.orderbook.snapshot import OrderBookSnapshot
+from core.datatypes import OrderBook, PriceLevel
+from utils.event_bus import EventBus
+
+
+def _levels(pairs: List[Tuple[str, str]]) -> List[PriceLevel]:
+    return [PriceLevel(price=Decimal(p), quantity=Decimal(q), timestamp=0) for p, q in pairs]
+
+
+def _book(exchange: str, symbol: str, asks, bids, received_at: float = 0.0) -> OrderBook:
+    return OrderBook(
+        symbol=symbol,
+        exchange=exchange,
+        asks=_levels(asks),
+        bids=_levels(bids),
+        received_at=received_at,
+    )
+
+
+def _config(**kwargs) -> FillConfig:
+    return FillConfig(fee_rates={"upbit": Decimal("0.001"), "bithumb": Decimal("0.002")}, **kwargs)
+
+
+def test_walks_levels_with_fee_and_partial_fill() -> None:
+    async def scenario() -> None:
+        manager = OrderBookManager()
+        await manager.update_full(
+            _book("bithumb", "XRP_KRW", asks=[("101", "2"), ("100", "1")], bids=[("99", "1"), ("98", "1")])
+        )
+        sim = FillSimulator(_config())
+        sim.register("bithumb", "XRP_KRW", manager)
+
+        buy = await sim.market_order("bithumb", "XRP_KRW", "bid", volume=Decimal("2"))
+        assert buy.status == "done"
+        assert buy.filled_quantity == Decimal("2")
+        assert buy.average_price == Decimal("100.5")
+        assert buy.raw["fee"] == Decimal("0.402")
+        assert buy.raw["levels"] == 2
+
+        sell = await sim.market_order("bithumb", "XRP_KRW", "ask", volume=Decimal("5"))
+        assert sell.status == "cancel"
+        assert sell.filled_quantity == Decimal("2")
+        assert sell.average_price == Decimal("98.5")
+
+    asyncio.run(scenario())
+
+
+def test_notional_buy_and_depth_share() -> None:
+    async def scenario() -> None:
+        manager = OrderBookManager()
+        await manager.update_full(_book("upbit", "KRW-XRP", asks=[("100", "1"), ("200", "10")], bids=[]))
+        sim = FillSimulator(_config(depth_share=Decimal("0.5")))
+        sim.register("upbit", "KRW-XRP", manager)
+        result = await sim.market_order("upbit", "KRW-XRP", "bid", notional=Decimal("250"))
+        # 第一檔只可取 0.5（50 KRW），剩下 200 KRW 在 200 價位買 1
+        assert result.status == "done"
+        assert result.filled_quantity == Decimal("1.5")
+        assert result.raw["notional"] == Decimal("250")
+
+        missing = await sim.market_order("upbit", "KRW-BTC", "bid", notional=Decimal("250"))
+        assert missing.status == "cancel"
+        assert missing.filled_quantity == 0
+        assert missing.average_price is None
+
+    asyncio.run(scenario())
+
+
+def test_history_applies_latency() -> None:
+    history = BookHistory()
+    for ts, price in ((1000.0, "100"), (1020.0, "105"), (1100.0, "110")):
+        book = _book("upbit", "KRW-XRP", asks=[(price, "10")], bids=[], received_at=ts)
+        history.record(OrderBookSnapshot.from_orderbook(book))
+    sim = FillSimulator(_config(latency_ms={"upbit": 15.0}), history=history)
+    result = asyncio.run(
+        sim.market_order("upbit", "KRW-XRP", "bid", volume=Decimal("1"), at_ms=1000.0)
+    )
+    assert result.average_price == Decimal("105")
+
+
+def test_history_ring_wraps_and_records_from_bus() -> None:
+    history = BookHistory(maxlen=3)
+    manager = OrderBookManager()
+    bus = EventBus()
+    bus.subscribe(OrderBook, history.mirror(lambda: manager.snapshot), symbol="KRW-XRP")
+
+    async def scenario() -> None:
+        for ts, price in ((1000.0, "100"), (1010.0, "101"), (1020.0, "102"), (1030.0, "103"), (1040.0, "104")):
+            book = _book("upbit", "KRW-XRP", asks=[(price, "10")], bids=[], received_at=ts)
+            await manager.update_full(book)
+            bus.publish(OrderBook, "KRW-XRP", book)
+
+    asyncio.run(scenario())
+    # 容量 3：最舊的兩筆已被覆蓋，早於錄製範圍時取最舊的一筆
+    assert history.at("upbit", "KRW-XRP", 0.0).asks[0].price == Decimal("102")
+    assert history.at("upbit", "KRW-XRP", 1025.0).asks[0].price == Decimal("103")
+    assert history.at("upbit", "KRW-XRP", 9999.0).asks[0].price == Decimal("104")
+    assert history.at("bithumb", "XRP_KRW", 1000.0) is None
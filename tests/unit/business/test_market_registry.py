@@ -0,0 +1,63 @@
+"""MarketRegistry 測試。"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from decimal import Decimal
+from pathlib import Path
+from typing import List
+
+from business.market import MarketRegistry, round_price
+
+
+class FakeMarkets:
+    def __init__(self, markets: List[str]) -> None:
+        self.markets = markets
+        self.calls = 0
+
+    async def get_markets(self) -> List[str]:
+        self.calls += 1
+        return self.markets
+
+
+def test_registry_keeps_only_common_markets() -> None:
+    registry = MarketRegistry(["KRW-BTC", "KRW-XRP", "KRW-ONLYUP", "BTC-ETH"], ["BTC_KRW", "XRP_KRW", "ONLYBT_KRW"])
+    assert registry.bases == ["BTC", "XRP"]
+    assert registry.upbit_only == ["ONLYUP"] and registry.bithumb_only == ["ONLYBT"]
+    info = registry.by_symbol("XRP_KRW")
+    assert info is registry.get("xrp")
+    assert info.upbit_symbol == "KRW-XRP"
+    assert dict(info.bithumb_template) == {"order_currency": "XRP", "payment_currency": "KRW"}
+    resolved, missing = registry.resolve(["XRP/KRW", "ONLYUP/KRW", "BTC/KRW", "XRP/KRW"])
+    assert [m.base for m in resolved] == ["XRP", "BTC"]
+    assert missing == ["ONLYUP/KRW"]
+
+
+def test_precision_helpers() -> None:
+    info = MarketRegistry(["KRW-BTC"], ["BTC_KRW"]).get("BTC")
+    assert info.tick_size(Decimal("95000000")) == Decimal("1000")
+    assert info.round_price(Decimal("95123456"), "bid") == Decimal("95123000")
+    assert info.round_price(Decimal("95123456"), "ask") == Decimal("95124000")
+    assert round_price(Decimal("812.34"), "bid") == Decimal("812.3")
+    assert info.round_quantity("bithumb", Decimal("0.123456789")) == Decimal("0.1234")
+    assert info.round_quantity("upbit", Decimal("0.123456789")) == Decimal("0.12345678")
+    assert not info.meets_minimum("upbit", Decimal("0.00001"), Decimal("95000000"))
+
+
+def test_registry_disk_cache_respects_ttl(tmp_path: Path) -> None:
+    async def run() -> None:
+        upbit, bithumb = FakeMarkets(["KRW-BTC"]), FakeMarkets(["BTC_KRW"])
+        cache = tmp_path / "markets.json"
+        first = await MarketRegistry.load(upbit, bithumb, cache_path=cache, ttl=60)
+        second = await MarketRegistry.load(upbit, bithumb, cache_path=cache, ttl=60)
+        assert upbit.calls == bithumb.calls == 1
+        assert second.bases == first.bases == ["BTC"]
+
+        data = json.loads(cache.read_text())
+        data["fetched_at"] = time.time() - 120
+        cache.write_text(json.dumps(data))
+        await MarketRegistry.load(upbit, bithumb, cache_path=cache, ttl=60)
+        assert upbit.calls == 2
+
+    asyncio.run(run())
@@ -5,10 +5,13 @@ import asyncio
 from decimal import Decimal
 from typing import Any, Mapping, Optional
 
+import pytest
 
 from business.execution.executor import OrderExecutor
+from business.market.registry import MarketRegistry
 from business.strategy.signal import ArbitrageDirection, StrategySignal
 from core.datatypes import OrderRequest, OrderResult
+from core.exceptions import OrderExecutionError
 from core.interface import BaseGateway
 from core.parser.base import JsonParser
 from core.wrapper.base import BaseExchangeWrapper
@@ -26,7 +29,9 @@ class DummyParser(JsonParser):
 
 
 class DummyGateway(BaseGateway):
-    async def request(self, method: str, endpoint: str, *, params=None, signed=False, headers=None) -> bytes:  # pragma: no cover
+    async def request(
+        self, method: str, endpoint: str, *, params=None, signed=False, headers=None, priority=False
+    ) -> bytes:  # pragma: no cover
         raise NotImplementedError
 
     async def ws_connect(self, url: Optional[str] = None, *, headers=None):  # pragma: no cover
@@ -41,6 +46,7 @@ class DummyWrapper(BaseExchangeWrapper):
         super().__init__(DummyGateway(), DummyParser())
         self.name = name
         self.last_action: Optional[str] = None
+        self.last_symbol: Optional[str] = None
 
     async def get_orderbook(self, symbol: str):  # pragma: no cover
         raise NotImplementedError
@@ -70,6 +76,7 @@ class DummyWrapper(BaseExchangeWrapper):
 
     async def buy_market_order(self, symbol: str, amount: Decimal) -> OrderResult:
         self.last_action = f"{self.name}-buy:{amount}"
+        self.last_symbol = symbol
         return OrderResult(
             order_id="test",
             exchange=self.name,
@@ -82,6 +89,7 @@ class DummyWrapper(BaseExchangeWrapper):
 
     async def sell_market_order(self, symbol: str, volume: Decimal) -> OrderResult:
         self.last_action = f"{self.name}-sell:{volume}"
+        self.last_symbol = symbol
         return OrderResult(
             order_id="test",
             exchange=self.name,
@@ -125,3 +133,39 @@ def test_executor_place_orders() -> None:
     assert result.upbit_result.order_id == "test"
     assert upbit.last_action.startswith("upbit-sell")
     assert bithumb.last_action.startswith("bithumb-buy")
+
+
+def test_executor_routes_by_pair() -> None:
+    upbit = DummyWrapper("upbit")
+    bithumb = DummyWrapper("bithumb")
+    registry = MarketRegistry(["KRW-BTC", "KRW-XRP"], ["BTC_KRW", "XRP_KRW"])
+    executor = OrderExecutor(upbit, bithumb, dry_run=False, registry=registry)
+    signal = StrategySignal(
+        direction=ArbitrageDirection.BITHUMB_SELL,
+        expected_profit=Decimal("0.01"),
+        volume=Decimal("12.345678"),
+        upbit_price=Decimal("812.3"),
+        bithumb_price=Decimal("820"),
+        spread=Decimal("0.01"),
+        pair="XRP",
+    )
+    asyncio.run(executor.execute(signal))
+    assert upbit.last_symbol == "KRW-XRP"
+    assert bithumb.last_symbol == "XRP_KRW"
+    # 數量截至兩邊共同精度（Bithumb 4 位），Upbit 買入金額取整
+    assert bithumb.last_action == "bithumb-sell:12.3456"
+    assert upbit.last_action == "upbit-buy:10028"
+
+    # 無註冊表時沿用信號自帶的符號
+    plain = OrderExecutor(upbit, bithumb, dry_run=True)
+    signal.pair = "ETH"
+    signal.upbit_symbol, signal.bithumb_symbol = "KRW-ETH", "ETH_KRW"
+    result = asyncio.run(plain.execute(signal))
+    assert result.upbit_result.symbol == "KRW-ETH"
+
+    # 交易對無法解析時拒絕，不可退回 BTC 市場
+    signal.pair, signal.upbit_symbol, signal.bithumb_symbol = "DOGE", "", ""
+    upbit.last_symbol = bithumb.last_symbol = None
+    with pytest.raises(OrderExecutionError):
+        asyncio.run(executor.execute(signal))
+    assert upbit.last_symbol is None and bithumb.last_symbol is None
@@ -0,0 +1,105 @@
+"""OrderTracker 測試。"""
+from __future__ import annotations
+
+import asyncio
+from decimal import Decimal
+from typing import Dict, List, Sequence
+
+from business.account import OrderTable
+from business.execution.order_tracker import OrderTracker, TrackerConfig
+from core.datatypes import OrderResult
+
+
+def _result(exchange: str, order_id: str, status: str, filled: str = "0") -> OrderResult:
+    return OrderResult(
+        order_id=order_id,
+        exchange=exchange,
+        symbol="BTC",
+        status=status,
+        filled_quantity=Decimal(filled),
+        average_price=None,
+        raw=None,
+    )
+
+
+class FakeUpbit:
+    def __init__(self) -> None:
+        self.states: Dict[str, str] = {}
+        self.calls: List[List[str]] = []
+
+    async def get_orders_status(self, order_ids: Sequence[str]) -> List[OrderResult]:
+        self.calls.append(list(order_ids))
+        return [_result("upbit", oid, self.states[oid]) for oid in order_ids if oid in self.states]
+
+
+class FakeBithumb:
+    def __init__(self) -> None:
+        self.open: Dict[str, List[str]] = {}
+        self.list_calls = 0
+        self.detail_calls: List[str] = []
+
+    async def get_open_orders(self, symbol: str) -> List[OrderResult]:
+        self.list_calls += 1
+        return [_result("bithumb", oid, "Pending") for oid in self.open.get(symbol, [])]
+
+    async def get_order_status(self, order_id: str) -> OrderResult:
+        self.detail_calls.append(order_id)
+        return _result("bithumb", order_id, "Completed", "0.1")
+
+
+def test_tracker_batches_requests_per_exchange() -> None:
+    async def run() -> None:
+        upbit, bithumb = FakeUpbit(), FakeBithumb()
+        tracker = OrderTracker(upbit, bithumb, config=TrackerConfig(batch_size=3))
+        upbit_futures = [tracker.track("upbit", f"u{i}", "KRW-BTC") for i in range(5)]
+        bithumb_futures = [tracker.track("bithumb", f"b{i}", "BTC_KRW") for i in range(4)]
+        upbit.states = {f"u{i}": "wait" for i in range(5)}
+        bithumb.open = {"BTC_KRW": ["b0", "b1", "b2", "b3"]}
+
+        await tracker.poll_once(now=float("inf"))
+        # 5 筆 Upbit 分兩批，4 筆 Bithumb 一次清單查詢
+        assert [len(call) for call in upbit.calls] == [3, 2]
+        assert bithumb.list_calls == 1 and bithumb.detail_calls == []
+        assert len(tracker) == 9
+
+        upbit.states = {f"u{i}": ("done" if i < 4 else "wait") for i in range(5)}
+        bithumb.open = {"BTC_KRW": ["b3"]}
+        await tracker.poll_once(now=float("inf"))
+        assert sorted(bithumb.detail_calls) == ["b0", "b1", "b2"]
+        assert all(f.done() for f in upbit_futures[:4]) and not upbit_futures[4].done()
+        assert [f.done() for f in bithumb_futures] == [True, True, True, False]
+        assert bithumb_futures[0].result().filled_quantity == Decimal("0.1")
+        assert tracker.stats.resolved == 7
+
+    asyncio.run(run())
+
+
+def test_tracker_skips_orders_already_final_in_table() -> None:
+    async def run() -> None:
+        upbit, bithumb = FakeUpbit(), FakeBithumb()
+        table = OrderTable()
+        tracker = OrderTracker(upbit, bithumb, order_table=table)
+        future = tracker.track("upbit", "u1", "KRW-BTC")
+        table.update(_result("upbit", "u1", "done", "1"))
+        await tracker.poll_once(now=float("inf"))
+        assert upbit.calls == []
+        assert future.result().status == "done"
+
+    asyncio.run(run())
+
+
+def test_tracker_background_loop_resolves_futures() -> None:
+    async def run() -> None:
+        upbit, bithumb = FakeUpbit(), FakeBithumb()
+        upbit.states = {"u1": "wait"}
+        tracker = OrderTracker(upbit, bithumb, config=TrackerConfig(min_interval=0.01, max_interval=0.02))
+        await tracker.start()
+        tracker.track("upbit", "u1", "KRW-BTC")
+        await asyncio.sleep(0.05)
+        assert upbit.calls
+        upbit.states["u1"] = "cancel"
+        result = await tracker.wait("u1", timeout=1.0)
+        assert result.status == "cancel"
+        await tracker.stop()
+
+    asyncio.run(run())
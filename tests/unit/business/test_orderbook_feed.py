@@ -5,12 +5,15 @@ import asyncio
 from decimal import Decimal
 from typing import Any, Mapping, Optional
 
-from business.orderbook.feed import OrderBookFeed
+from business.orderbook.feed import FeedConfig, OrderBookFeed
+from business.orderbook.freshness import FreshnessMonitor
+from business.orderbook.mailbox import BookMailbox
 from business.orderbook.manager import OrderBookManager
 from core.datatypes import OrderBook, PriceLevel
 from core.interface import BaseGateway
 from core.parser.base import JsonParser
 from core.wrapper.base import BaseExchangeWrapper
+from utils.backoff import ExponentialBackoff
 
 
 def _orderbook(price: Decimal, sequence: int) -> OrderBook:
@@ -36,7 +39,9 @@ class DummyParser(JsonParser):
 
 
 class DummyGateway(BaseGateway):
-    async def request(self, method: str, endpoint: str, *, params=None, signed=False, headers=None) -> bytes:  # pragma: no cover
+    async def request(
+        self, method: str, endpoint: str, *, params=None, signed=False, headers=None, priority=False
+    ) -> bytes:  # pragma: no cover
         raise NotImplementedError
 
     async def ws_connect(self, url: Optional[str] = None, *, headers=None):  # pragma: no cover
@@ -87,3 +92,239 @@ def test_feed_updates_manager() -> None:
         await feed.stop()
 
     asyncio.run(run())
+
+
+class ScriptedFeedWrapper(DummyFeedWrapper):
+    """每次訂閱依序取用一段腳本；腳本用完後保持連線但不再送幀。"""
+
+    def __init__(self, initial: OrderBook, scripts: list[tuple[list[OrderBook], bool, float]]):
+        super().__init__([initial])
+        self._scripts = scripts
+
+    async def subscribe_orderbook(self, symbol: str, callback):
+        self._subscriptions += 1
+        if not self._scripts:
+            await asyncio.Event().wait()
+        frames, drop, delay = self._scripts.pop(0)
+        await asyncio.sleep(delay)
+        for ob in frames:
+            await callback(ob)
+            await asyncio.sleep(0.001)
+        if drop:
+            raise ConnectionError("socket closed")
+        await asyncio.Event().wait()
+
+
+def test_hot_standby_takes_over_on_disconnect() -> None:
+    initial = _orderbook(Decimal("10"), 1)
+    primary = ([_orderbook(Decimal("11"), 2)], True, 0.0)
+    # 熱備稍慢一步，斷線後首幀與主連線已處理的序號重複
+    standby = ([_orderbook(Decimal("11"), 2), _orderbook(Decimal("12"), 3), _orderbook(Decimal("13"), 4)], False, 0.01)
+    wrapper = ScriptedFeedWrapper(initial, [primary, standby])
+    manager = OrderBookManager()
+    feed = OrderBookFeed(
+        wrapper,
+        "KRW-BTC",
+        manager,
+        config=FeedConfig(hot_standby=True, backoff_base=5.0, backoff_cap=5.0),
+    )
+
+    async def run() -> None:
+        await feed.start()
+        await asyncio.sleep(0.05)
+        # 主連線斷線後熱備立即接手，不需等待退避重連
+        assert manager.snapshot.sequence == 4
+        assert feed.active_role == "standby"
+        assert feed.stats.failovers == 1
+        assert feed.stats.duplicates == 1
+        assert 0 < feed.stats.last_gap_ms < 1000
+        await feed.stop()
+
+    asyncio.run(run())
+
+
+def test_backoff_grows_and_resets() -> None:
+    import random
+
+    backoff = ExponentialBackoff(0.1, 1.0, rng=random.Random(7))
+    ceilings = [0.1, 0.2, 0.4, 0.8, 1.0, 1.0]
+    for ceiling in ceilings:
+        assert 0 <= backoff.next_delay() <= ceiling
+    backoff.reset()
+    assert backoff.attempts == 0
+
+
+def test_hot_standby_takes_over_on_silence() -> None:
+    initial = _orderbook(Decimal("10"), 1)
+    primary = ([_orderbook(Decimal("11"), 2)], False, 0.0)
+    standby = ([_orderbook(Decimal("12"), 3)], False, 0.03)
+    wrapper = ScriptedFeedWrapper(initial, [primary, standby])
+    manager = OrderBookManager()
+    feed = OrderBookFeed(
+        wrapper,
+        "KRW-BTC",
+        manager,
+        config=FeedConfig(hot_standby=True, silence_timeout=0.02),
+    )
+
+    async def run() -> None:
+        await feed.start()
+        await asyncio.sleep(0.06)
+        assert manager.snapshot.sequence == 3
+        assert feed.active_role == "standby"
+        # 靜默的主連線被強制重建
+        assert wrapper._subscriptions == 3
+        await feed.stop()
+
+    asyncio.run(run())
+
+
+def test_freshness_marks_stale_and_recovers() -> None:
+    stale_keys = []
+    monitor = FreshnessMonitor(stale_after=1.0, tick=0.1, start=0.0)
+    monitor.watch("upbit", stale_keys.append, now=0.0)
+    monitor.watch("bithumb", now=0.0)
+    monitor.touch("upbit", now=0.8)
+    assert monitor.advance(1.05) == ["bithumb"]
+    assert monitor.is_fresh("upbit") and not monitor.is_fresh("bithumb")
+    assert monitor.advance(1.85) == ["upbit"]
+    assert stale_keys == ["upbit"]
+    assert monitor.advance(3.0) == []  # 已過期者每隔 stale_after 再通知一次
+    assert stale_keys == ["upbit", "upbit"]
+    monitor.touch("bithumb", now=3.1)
+    assert monitor.is_fresh("bithumb") and monitor.stale_count == 1
+
+
+def test_rewatch_drops_outdated_checkpoints() -> None:
+    stale_keys = []
+    monitor = FreshnessMonitor(stale_after=1.0, tick=0.1, start=0.0)
+    for _ in range(3):
+        monitor.watch("upbit", stale_keys.append, now=0.0)
+        monitor.unwatch("upbit")
+    monitor.watch("upbit", stale_keys.append, now=0.0)
+    # 舊世代的檢查點到期即丟棄，之後時間輪上只剩一個
+    monitor.advance(1.05)
+    assert stale_keys == ["upbit"]
+    assert len(monitor._wheel) == 1
+    monitor.advance(2.1)
+    assert stale_keys == ["upbit", "upbit"]
+
+
+def test_silent_feed_is_resubscribed_when_stale() -> None:
+    initial = _orderbook(Decimal("10"), 1)
+    first = ([_orderbook(Decimal("11"), 2)], False, 0.0)  # 收一幀後靜默，不斷線
+    second = ([_orderbook(Decimal("12"), 3)], False, 0.0)
+    wrapper = ScriptedFeedWrapper(initial, [first, second])
+    manager = OrderBookManager()
+    monitor = FreshnessMonitor(stale_after=0.02, tick=0.005)
+    feed = OrderBookFeed(wrapper, "KRW-BTC", manager, freshness=monitor)
+
+    async def run() -> None:
+        await feed.start()
+        await asyncio.sleep(0.04)
+        assert monitor.advance() == [manager]
+        assert not monitor.is_fresh(manager)
+        await asyncio.sleep(0.01)
+        assert wrapper._subscriptions == 2
+        assert manager.snapshot.sequence == 3
+        assert monitor.is_fresh(manager)
+        await feed.stop()
+
+    asyncio.run(run())
+
+
+def test_mailbox_conflates_snapshots_and_bounds_deltas() -> None:
+    async def run() -> None:
+        snapshots = BookMailbox(conflate=True)
+        for sequence in (1, 2, 3):
+            snapshots.put(_orderbook(Decimal("10"), sequence))
+        assert snapshots.depth == 1
+        assert (await snapshots.get()).sequence == 3
+        assert snapshots.stats.conflated == 2
+
+        deltas = BookMailbox(conflate=False, maxsize=2)
+        for sequence in (1, 2):
+            deltas.put(_orderbook(Decimal("10"), sequence))
+        assert [(await deltas.get()).sequence for _ in range(2)] == [1, 2]
+        assert not deltas.take_resync()
+        for sequence in (3, 4, 5):
+            deltas.put(_orderbook(Decimal("10"), sequence))
+        # 溢出：丟棄已排隊的增量並要求重建
+        assert deltas.stats.overflows == 1 and deltas.depth == 1
+        assert (await deltas.get()).sequence == 5
+        assert deltas.take_resync() and not deltas.take_resync()
+        assert deltas.stats.max_depth == 2
+
+    asyncio.run(run())
+
+
+class SlowManager(OrderBookManager):
+    def __init__(self) -> None:
+        super().__init__()
+        self.applied: list[int] = []
+
+    async def handle_orderbook_event(self, orderbook: OrderBook):
+        self.applied.append(orderbook.sequence)
+        await asyncio.sleep(0.02)
+        return await super().handle_orderbook_event(orderbook)
+
+
+def test_slow_consumer_does_not_block_reader() -> None:
+    updates = [_orderbook(Decimal("10"), sequence) for sequence in range(1, 7)]
+    wrapper = DummyFeedWrapper(updates)
+    manager = SlowManager()
+    feed = OrderBookFeed(wrapper, "KRW-BTC", manager)
+
+    async def run() -> None:
+        await feed.start()
+        await asyncio.sleep(0.08)
+        # 讀取端不等待消費者，連續送完 5 幀；消費者只處理最新一幀
+        assert manager.applied == [6]
+        assert manager.snapshot.sequence == 6
+        assert feed.mailbox_stats.conflated == 4
+        assert feed.queue_depth == 0
+        await feed.stop()
+
+    asyncio.run(run())
+
+
+class FlakyManager(OrderBookManager):
+    """指定序號套用時拋錯。"""
+
+    def __init__(self, fail_on: int) -> None:
+        super().__init__()
+        self._fail_on = fail_on
+
+    async def handle_orderbook_event(self, orderbook: OrderBook):
+        if orderbook.sequence == self._fail_on:
+            raise ValueError("bad frame")
+        return await super().handle_orderbook_event(orderbook)
+
+
+class RecordingMonitor(FreshnessMonitor):
+    def __init__(self) -> None:
+        super().__init__(stale_after=5.0)
+        self.touched: list[int] = []
+
+    def touch(self, key, now=None) -> None:
+        self.touched.append(key.snapshot.sequence)
+        super().touch(key, now)
+
+
+def test_consumer_survives_apply_error_and_touches_after_apply() -> None:
+    initial = _orderbook(Decimal("10"), 1)
+    script = ([_orderbook(Decimal("11"), 2), _orderbook(Decimal("12"), 3)], False, 0.0)
+    wrapper = ScriptedFeedWrapper(initial, [script])
+    manager = FlakyManager(fail_on=2)
+    monitor = RecordingMonitor()
+    feed = OrderBookFeed(wrapper, "KRW-BTC", manager, freshness=monitor)
+
+    async def run() -> None:
+        await feed.start()
+        await asyncio.sleep(0.02)
+        # 失敗的一幀不更新新鮮度；消費者以快照重建後繼續套用
+        assert manager.snapshot.sequence == 3
+        assert monitor.touched == [3]
+        await feed.stop()
+
+    asyncio.run(run())
@@ -53,7 +53,9 @@ class DummyWrapper(BaseExchangeWrapper):
 
 
 class DummyGateway(BaseGateway):
-    async def request(self, method: str, endpoint: str, *, params=None, signed=False, headers=None) -> bytes:  # pragma: no cover
+    async def request(
+        self, method: str, endpoint: str, *, params=None, signed=False, headers=None, priority=False
+    ) -> bytes:  # pragma: no cover
         raise NotImplementedError
 
     async def ws_connect(self, url: Optional[str] = None, *, headers=None):  # pragma: no cover
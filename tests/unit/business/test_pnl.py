@@ -0,0 +1,111 @@
+"""PnLTracker 測試。"""
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Optional
+
+from business.account.pnl import PnLTracker
+from business.account.tables import OrderTable
+from business.risk.balance_checker import BalanceState
+from business.risk.circuit_breaker import CircuitBreakerConfig
+from business.risk.manager import RiskConfig, RiskManager
+from business.risk.position_limiter import PositionLimit
+from business.strategy.signal import ArbitrageDirection, StrategySignal
+from core.datatypes import OrderResult
+
+
+def _result(exchange: str, filled: str, price: str, fee: str) -> OrderResult:
+    return OrderResult(
+        order_id=f"{exchange}-1",
+        exchange=exchange,
+        symbol="",
+        status="done",
+        filled_quantity=Decimal(filled),
+        average_price=Decimal(price),
+        raw={"fee": fee},
+    )
+
+
+def test_arbitrage_round_trip_realizes_at_pair_level() -> None:
+    pnl = PnLTracker(fee_rates={"bithumb": Decimal("0.001")})
+    pnl.on_result("XRP", "ask", _result("upbit", "10", "820", "4.1"))
+    pnl.on_fill("bithumb", "XRP", "bid", Decimal("10"), Decimal("810"))  # 費率估算 8.1
+    pair = pnl.pair("XRP")
+    assert pair.position == 0 and pair.exposure == 0
+    assert pair.realized == Decimal("100")
+    assert pnl.net_realized == Decimal("100") - Decimal("4.1") - Decimal("8.10")
+    # 交易所層各自持有反向庫存，尚未實現
+    pnl.mark("XRP", Decimal("830"))
+    upbit = pnl.exchange("upbit")
+    assert upbit.realized == 0 and upbit.fees == Decimal("4.1")
+    assert upbit.unrealized == Decimal("-100") and upbit.exposure == Decimal("8300")
+    assert pnl.leg("bithumb", "XRP").unrealized == Decimal("200")
+
+
+def test_partial_close_and_flip_use_average_cost() -> None:
+    pnl = PnLTracker()
+    pnl.on_fill("upbit", "SOL", "bid", Decimal("2"), Decimal("100"), Decimal("0"))
+    pnl.on_fill("upbit", "SOL", "bid", Decimal("2"), Decimal("200"), Decimal("0"))
+    pnl.on_fill("upbit", "SOL", "ask", Decimal("1"), Decimal("180"), Decimal("0"))
+    snap = pnl.pair("SOL")
+    assert (snap.position, snap.avg_cost, snap.realized) == (Decimal("3"), Decimal("150"), Decimal("30"))
+    pnl.on_fill("upbit", "SOL", "ask", Decimal("5"), Decimal("160"), Decimal("0"))
+    snap = pnl.pair("SOL")
+    assert (snap.position, snap.avg_cost, snap.realized) == (Decimal("-2"), Decimal("160"), Decimal("60"))
+
+
+def test_risk_manager_stops_after_realized_loss_limit() -> None:
+    pnl = PnLTracker()
+    manager = RiskManager(
+        RiskConfig(
+            reserve_ratio=Decimal("0"),
+            position_limit=PositionLimit(max_volume=Decimal("100"), max_notional=Decimal("1000000")),
+            circuit_breaker=CircuitBreakerConfig(failure_threshold=3, cool_down=60),
+            max_realized_loss=Decimal("50"),
+        ),
+        pnl=pnl,
+    )
+    balances = BalanceState(Decimal("100"), Decimal("1000000"), Decimal("100"), Decimal("1000000"))
+    signal = StrategySignal(
+        direction=ArbitrageDirection.UPBIT_SELL,
+        expected_profit=Decimal("0.01"),
+        volume=Decimal("1"),
+        upbit_price=Decimal("820"),
+        bithumb_price=Decimal("810"),
+        spread=Decimal("0.01"),
+        pair="XRP",
+    )
+    assert manager.check(signal, balances) is True
+    pnl.on_fill("upbit", "XRP", "bid", Decimal("1"), Decimal("850"), Decimal("0"))
+    pnl.on_fill("bithumb", "XRP", "ask", Decimal("1"), Decimal("800"), Decimal("0"))
+    assert manager.check(signal, balances) is False
+
+
+def test_live_order_fills_are_recorded_incrementally() -> None:
+    pnl = PnLTracker()
+    order_table = OrderTable()
+    order_table.add_listener(pnl.on_order)
+
+    def update(status: str, filled: str, price: Optional[str], fee: str) -> OrderResult:
+        return OrderResult(
+            order_id="u-1",
+            exchange="upbit",
+            symbol="KRW-XRP",
+            status=status,
+            filled_quantity=Decimal(filled),
+            average_price=Decimal(price) if price else None,
+            raw={"paid_fee": fee},
+        )
+
+    # 下單回應尚未成交：只登記
+    pnl.on_result("XRP", "bid", update("wait", "0", None, "0"))
+    assert pnl.pair("XRP").fills == 0
+    order_table.update(update("wait", "4", "800", "1"))
+    order_table.update(update("wait", "4", "800", "1"))  # 重複回報不重複入帳
+    order_table.update(update("done", "10", "812", "3"))
+    snap = pnl.pair("XRP")
+    assert (snap.position, snap.fills, snap.fees) == (Decimal("10"), 2, Decimal("3"))
+    assert snap.avg_cost == Decimal("812")
+    # 終態後不再追蹤，之後的回報（或其他訂單）不影響
+    order_table.update(update("done", "10", "812", "3"))
+    assert pnl.pair("XRP").fills == 2
@@ -0,0 +1,241 @@
+"""LegReconciler 測試。"""
+from __future__ import annotations
+
+import asyncio
+from decimal import Decimal
+from typing import List, Optional
+
+import pytest
+
+from business.execution.executor import OrderExecutor
+from business.execution.reconciler import ArbState, Leg, LegReconciler
+from business.market.registry import MarketInfo
+from business.strategy.signal import ArbitrageDirection, StrategySignal
+from core.datatypes import OrderResult
+from core.exceptions import ExchangeRejectedError, OrderExecutionError
+from core.interface import BaseGateway
+from core.parser.base import JsonParser
+from core.wrapper.base import BaseExchangeWrapper
+from utils.tracing import Tracer
+
+
+class DummyParser(JsonParser):
+    def parse_orderbook(self, raw: bytes):  # pragma: no cover
+        raise NotImplementedError
+
+    def parse_balance(self, raw: bytes):  # pragma: no cover
+        raise NotImplementedError
+
+    def parse_order_result(self, raw: bytes):  # pragma: no cover
+        raise NotImplementedError
+
+
+class DummyGateway(BaseGateway):
+    async def request(
+        self, method: str, endpoint: str, *, params=None, signed=False, headers=None, priority=False
+    ) -> bytes:  # pragma: no cover
+        raise NotImplementedError
+
+    async def ws_connect(self, url: Optional[str] = None, *, headers=None):  # pragma: no cover
+        raise NotImplementedError
+
+    async def close(self) -> None:  # pragma: no cover
+        return
+
+
+class ScriptedWrapper(BaseExchangeWrapper):
+    """依序回應市價單：Exception 物件會被拋出，Decimal 代表終態成交量。"""
+
+    def __init__(self, name: str, script: List[object]) -> None:
+        super().__init__(DummyGateway(), DummyParser())
+        self.name = name
+        self.script = list(script)
+        self.orders: List[str] = []
+        self.priorities: List[bool] = []
+
+    async def _respond(self, symbol: str, action: str, priority: bool) -> OrderResult:
+        self.orders.append(action)
+        self.priorities.append(priority)
+        outcome = self.script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return OrderResult(
+            order_id=f"{self.name}-{len(self.orders)}",
+            exchange=self.name,
+            symbol=symbol,
+            status="done",
+            filled_quantity=outcome,
+            average_price=None,
+        )
+
+    async def buy_market_order(self, symbol: str, amount: Decimal, *, priority: bool = False) -> OrderResult:
+        return await self._respond(symbol, f"buy:{amount}", priority)
+
+    async def sell_market_order(self, symbol: str, volume: Decimal, *, priority: bool = False) -> OrderResult:
+        return await self._respond(symbol, f"sell:{volume}", priority)
+
+    async def get_orderbook(self, symbol: str):  # pragma: no cover
+        raise NotImplementedError
+
+    async def get_balance(self):  # pragma: no cover
+        raise NotImplementedError
+
+    async def place_order(self, order):  # pragma: no cover
+        raise NotImplementedError
+
+    async def cancel_order(self, order_id: str):  # pragma: no cover
+        raise NotImplementedError
+
+    async def get_order_status(self, order_id: str):  # pragma: no cover
+        raise NotImplementedError
+
+    async def subscribe_orderbook(self, symbol: str, callback):  # pragma: no cover
+        raise NotImplementedError
+
+
+def _signal() -> StrategySignal:
+    return StrategySignal(
+        direction=ArbitrageDirection.UPBIT_SELL,
+        expected_profit=Decimal("0.01"),
+        volume=Decimal("10"),
+        upbit_price=Decimal("820"),
+        bithumb_price=Decimal("810"),
+        spread=Decimal("0.01"),
+        pair="XRP",
+        upbit_symbol="KRW-XRP",
+        bithumb_symbol="XRP_KRW",
+    )
+
+
+def test_failed_leg_is_hedged_then_executor_raises() -> None:
+    # Upbit 賣出成交，Bithumb 買入失敗 → 在 Bithumb 補買
+    upbit = ScriptedWrapper("upbit", [Decimal("10")])
+    bithumb = ScriptedWrapper("bithumb", [ExchangeRejectedError("rejected", "400"), Decimal("10")])
+    reconciler = LegReconciler(upbit, bithumb)
+    executor = OrderExecutor(upbit, bithumb, dry_run=False, reconciler=reconciler)
+    with pytest.raises(OrderExecutionError) as excinfo:
+        asyncio.run(executor.execute(_signal()))
+    assert excinfo.value.exchanges == ("bithumb",)
+    assert isinstance(excinfo.value.__cause__, ExchangeRejectedError)
+    assert bithumb.orders == ["buy:10", "buy:10"]
+    assert bithumb.priorities == [False, True]  # 補單走限流優先通道
+    assert reconciler.exposure == {}
+
+
+def test_reconciliation_is_traced_after_ack() -> None:
+    upbit = ScriptedWrapper("upbit", [Decimal("10")])
+    bithumb = ScriptedWrapper("bithumb", [Decimal("10")])
+    tracer = Tracer(sample_every=1)
+    signal = _signal()
+    signal.trace = tracer.start("XRP")
+    signal.trace.mark("risk")
+    executor = OrderExecutor(upbit, bithumb, dry_run=False, reconciler=LegReconciler(upbit, bithumb))
+    asyncio.run(executor.execute(signal))
+    # ack 只涵蓋兩腿下單回應；確認成交與補單另記為 reconcile
+    assert [stage for stage, _ in signal.trace.marks] == ["risk", "dispatch", "ack", "reconcile"]
+
+
+def test_leg_and_correction_fills_are_reported() -> None:
+    upbit = ScriptedWrapper("upbit", [Decimal("10")])
+    bithumb = ScriptedWrapper("bithumb", [ExchangeRejectedError("rejected", "400"), Decimal("10")])
+    reported: List[tuple] = []
+    reconciler = LegReconciler(
+        upbit, bithumb, on_fill=lambda pair, side, result: reported.append((pair, side, result.order_id))
+    )
+    executor = OrderExecutor(upbit, bithumb, dry_run=False, reconciler=reconciler)
+    with pytest.raises(OrderExecutionError):
+        asyncio.run(executor.execute(_signal()))
+    # 被拒的腿沒有結果可回報；補單先登記、終態後再回報一次
+    assert set(reported) == {("XRP", "ask", "upbit-1"), ("XRP", "bid", "bithumb-2")}
+
+
+def test_unwind_after_hedge_fails_and_residual_recorded() -> None:
+    async def scenario() -> None:
+        # Upbit 只賣出 4（部分成交），Bithumb 買入 10 → 多頭 6
+        upbit = ScriptedWrapper("upbit", [ExchangeRejectedError("insufficient funds", "400")])
+        bithumb = ScriptedWrapper("bithumb", [Decimal("5")])
+        reconciler = LegReconciler(upbit, bithumb)
+        legs = (
+            Leg("upbit", "KRW-XRP", "ask", Decimal("10"), Decimal("820")),
+            Leg("bithumb", "XRP_KRW", "bid", Decimal("10"), Decimal("810")),
+        )
+        outcomes = (_result("upbit", "4"), _result("bithumb", "10"))
+        rec = await reconciler.reconcile("XRP", legs, outcomes)
+        # hedge（Upbit 補賣）失敗 → unwind（Bithumb 賣回）只成交 5
+        assert upbit.orders == ["sell:6"]
+        assert bithumb.orders == ["sell:6"]
+        assert rec.state == ArbState.EXPOSED
+        assert rec.residual == Decimal("1")
+        assert reconciler.exposure == {"XRP": Decimal("1")}
+
+    asyncio.run(scenario())
+
+
+def test_ambiguous_leg_failure_is_not_hedged() -> None:
+    # Bithumb 逾時：訂單可能已成交，不可視為零成交而在 Bithumb 再買一次
+    upbit = ScriptedWrapper("upbit", [Decimal("10")])
+    bithumb = ScriptedWrapper("bithumb", [asyncio.TimeoutError(), Decimal("10")])
+    reconciler = LegReconciler(upbit, bithumb)
+
+    async def scenario() -> None:
+        legs = (
+            Leg("upbit", "KRW-XRP", "ask", Decimal("10"), Decimal("820")),
+            Leg("bithumb", "XRP_KRW", "bid", Decimal("10"), Decimal("810")),
+        )
+        rec = await reconciler.reconcile("XRP", legs, (_result("upbit", "10"), asyncio.TimeoutError()))
+        assert rec.state == ArbState.UNKNOWN
+        assert rec.corrections == []
+
+    asyncio.run(scenario())
+    assert bithumb.orders == []
+    assert reconciler.exposure == {}
+
+
+def test_net_below_min_notional_is_balanced() -> None:
+    async def scenario() -> None:
+        # Upbit 以金額市價買只成交 999（正常滑價）→ 缺 1 XRP，補買金額 1000 KRW 低於 Upbit 下限
+        upbit = ScriptedWrapper("upbit", [])
+        bithumb = ScriptedWrapper("bithumb", [])
+        reconciler = LegReconciler(upbit, bithumb)
+        legs = (
+            Leg("upbit", "KRW-XRP", "bid", Decimal("1000"), Decimal("1000")),
+            Leg("bithumb", "XRP_KRW", "ask", Decimal("1000"), Decimal("1000")),
+        )
+        outcomes = (_result("upbit", "999"), _result("bithumb", "1000"))
+        rec = await reconciler.reconcile("XRP", legs, outcomes, MarketInfo.build("XRP"))
+        assert rec.state == ArbState.BALANCED
+        assert rec.residual == 0
+        assert upbit.orders == [] and bithumb.orders == []
+        assert reconciler.exposure == {}
+
+    asyncio.run(scenario())
+
+
+def test_correction_is_rounded_to_exchange_precision() -> None:
+    async def scenario() -> None:
+        # Bithumb 數量精度 4 位：補買 0.123456 → 0.1234，剩餘不足一個最小單位視為平衡
+        upbit = ScriptedWrapper("upbit", [])
+        bithumb = ScriptedWrapper("bithumb", [Decimal("0.1234")])
+        reconciler = LegReconciler(upbit, bithumb)
+        legs = (
+            Leg("upbit", "KRW-BTC", "ask", Decimal("1.123456"), Decimal("100000000")),
+            Leg("bithumb", "BTC_KRW", "bid", Decimal("1.123456"), Decimal("99000000")),
+        )
+        outcomes = (_result("upbit", "1.123456"), _result("bithumb", "1"))
+        rec = await reconciler.reconcile("BTC", legs, outcomes, MarketInfo.build("BTC"))
+        assert bithumb.orders == ["buy:0.1234"]
+        assert rec.state == ArbState.BALANCED
+        assert reconciler.exposure == {}
+
+    asyncio.run(scenario())
+
+
+def _result(exchange: str, filled: str) -> OrderResult:
+    return OrderResult(
+        order_id=f"{exchange}-leg",
+        exchange=exchange,
+        symbol="",
+        status="done",
+        filled_quantity=Decimal(filled),
+        average_price=None,
+    )
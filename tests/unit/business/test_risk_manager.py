@@ -4,11 +4,14 @@ from __future__ import annotations
 import asyncio
 from decimal import Decimal
 
+from business.account.ledger import BalanceLedger
 from business.risk.balance_checker import BalanceChecker, BalanceState
-from business.risk.circuit_breaker import CircuitBreaker, CircuitBreakerConfig
+from business.risk.circuit_breaker import BreakerState, CircuitBreaker, CircuitBreakerConfig
 from business.risk.manager import RiskConfig, RiskManager
 from business.risk.position_limiter import PositionLimit, PositionLimiter
+from business.risk.rate_limiter import RollingWindow, TradeRateLimiter, WindowLimit
 from business.strategy.signal import ArbitrageDirection, StrategySignal
+from core.datatypes import Balance
 
 
 def _signal(direction: ArbitrageDirection, volume: Decimal, upbit_price: Decimal, bithumb_price: Decimal) -> StrategySignal:
@@ -60,3 +63,125 @@ def test_risk_manager_circuit_breaker() -> None:
     assert result is True
     asyncio.run(manager.record_failure())
     assert asyncio.run(manager.evaluate(sig, balances)) is False
+
+
+def test_circuit_breaker_half_open_probe() -> None:
+    breaker = CircuitBreaker(CircuitBreakerConfig(failure_threshold=2, cool_down=5))
+    breaker.record_failure(now=100.0)
+    assert breaker.allow(now=100.0)
+    breaker.record_failure(now=100.0)
+    assert breaker.state == BreakerState.OPEN
+    assert breaker.allow(now=104.9) is False
+    assert breaker.allow(now=105.0) is True  # 冷卻結束，放行一筆探測
+    assert breaker.allow(now=105.1) is False
+    breaker.record_failure(now=105.2)  # 探測失敗重新熔斷
+    breaker.record_success()  # 熔斷前送出的單晚到的成功回報不縮短冷卻
+    assert breaker.state == BreakerState.OPEN and breaker.allow(now=106.0) is False
+    assert breaker.allow(now=110.1) is False
+    assert breaker.allow(now=110.2) is True
+    breaker.record_success()
+    assert breaker.state == BreakerState.CLOSED and breaker.allow(now=110.3)
+
+
+def test_breakers_are_isolated_per_pair_and_exchange() -> None:
+    manager = RiskManager(
+        RiskConfig(
+            reserve_ratio=Decimal("0.1"),
+            position_limit=PositionLimit(max_volume=Decimal("0.5"), max_notional=Decimal("50000000")),
+            circuit_breaker=CircuitBreakerConfig(failure_threshold=1, cool_down=60),
+        )
+    )
+    balances = BalanceState(
+        upbit_btc=Decimal("1"),
+        upbit_krw=Decimal("100000000"),
+        bithumb_btc=Decimal("1"),
+        bithumb_krw=Decimal("100000000"),
+    )
+    xrp = _signal(ArbitrageDirection.UPBIT_SELL, Decimal("0.1"), Decimal("900"), Decimal("890"))
+    xrp.pair = "XRP"
+    sol = _signal(ArbitrageDirection.UPBIT_SELL, Decimal("0.1"), Decimal("900"), Decimal("890"))
+    sol.pair = "SOL"
+    manager.on_failure("XRP")
+    assert manager.check(xrp, balances) is False
+    assert manager.check(sol, balances) is True
+    manager.on_failure("SOL", exchanges=("bithumb",))
+    assert manager.check(sol, balances) is False
+    assert manager.breaker_states()["exchange:bithumb"] == BreakerState.OPEN
+    # 只有參與的交易所記錄成功；OPEN 中的 bithumb 不因 upbit 的成功解除
+    manager.on_success("SOL", exchanges=("upbit",))
+    assert manager.breaker_states()["exchange:bithumb"] == BreakerState.OPEN
+
+
+def test_ledger_reservation_blocks_double_spend() -> None:
+    manager = RiskManager(
+        RiskConfig(
+            reserve_ratio=Decimal("0.1"),
+            position_limit=PositionLimit(max_volume=Decimal("1000"), max_notional=Decimal("1000000")),
+            circuit_breaker=CircuitBreakerConfig(failure_threshold=3, cool_down=60),
+        )
+    )
+    ledger = BalanceLedger()
+    krw = Decimal("1000000")
+    holdings = (("XRP", Decimal("1000")), ("SOL", Decimal("10")))
+    ledger.replace("upbit", [Balance("upbit", c, amount, Decimal("0"), amount) for c, amount in holdings])
+    ledger.replace("bithumb", [Balance("bithumb", "KRW", krw, Decimal("0"), krw)])
+    xrp = _signal(ArbitrageDirection.UPBIT_SELL, Decimal("700"), Decimal("820"), Decimal("810"))
+    xrp.upbit_symbol = "KRW-XRP"
+    sol = _signal(ArbitrageDirection.UPBIT_SELL, Decimal("4"), Decimal("200000"), Decimal("199000"))
+    sol.upbit_symbol = "KRW-SOL"
+    # 兩筆各自都付得起 Bithumb KRW，但同時執行會超額花用
+    assert manager.check(xrp, ledger) is True
+    assert xrp.reservation is not None
+    assert ledger.available("bithumb", "KRW") == krw - Decimal("700") * Decimal("810")
+    assert manager.check(sol, ledger) is False
+    ledger.release(xrp.reservation)
+    assert manager.check(sol, ledger) is True
+    assert ledger.reserved("upbit", "SOL") == Decimal("4")
+
+
+def test_rolling_window_expires_buckets() -> None:
+    window = RollingWindow(1.0, buckets=10)
+    window.add(100.00, 5.0)
+    window.add(100.55, 7.0)
+    window.advance(100.95)
+    assert (window.count, window.notional) == (2, 12.0)
+    window.advance(101.05)  # 第一筆所在的格子滑出視窗
+    assert (window.count, window.notional) == (1, 7.0)
+    window.advance(500.0)
+    assert (window.count, window.notional) == (0, 0.0)
+
+
+def test_rate_limits_per_pair_and_global() -> None:
+    limiter = TradeRateLimiter(
+        [
+            WindowLimit(window=1.0, max_count=3),
+            WindowLimit(window=60.0, max_count=2, per_pair=True),
+            WindowLimit(window=60.0, max_notional=Decimal("1000")),
+        ]
+    )
+    limiter.record("XRP", Decimal("100"), now=0.0)
+    limiter.record("XRP", Decimal("100"), now=0.1)
+    assert limiter.allow("XRP", Decimal("1"), now=0.2) is False  # 交易對每分鐘 2 筆
+    assert limiter.allow("SOL", Decimal("1"), now=0.2) is True
+    limiter.record("SOL", Decimal("1"), now=0.2)
+    assert limiter.allow("ETH", Decimal("1"), now=0.3) is False  # 全局每秒 3 筆
+    assert limiter.allow("ETH", Decimal("1"), now=1.3) is True
+    assert limiter.allow("ETH", Decimal("900"), now=1.3) is False  # 全局每分鐘金額
+    assert limiter.usage() == [(1.0, 0, 0.0), (60.0, 3, 201.0)]
+
+
+def test_risk_manager_counts_only_accepted_signals() -> None:
+    manager = RiskManager(
+        RiskConfig(
+            reserve_ratio=Decimal("0.1"),
+            position_limit=PositionLimit(max_volume=Decimal("0.5"), max_notional=Decimal("50000000")),
+            circuit_breaker=CircuitBreakerConfig(failure_threshold=3, cool_down=60),
+            rate_limits=[WindowLimit(window=60.0, max_count=1)],
+        )
+    )
+    poor = BalanceState(Decimal("0"), Decimal("0"), Decimal("0"), Decimal("0"))
+    rich = BalanceState(Decimal("1"), Decimal("100000000"), Decimal("1"), Decimal("100000000"))
+    sig = _signal(ArbitrageDirection.UPBIT_SELL, Decimal("0.1"), Decimal("90000000"), Decimal("89000000"))
+    assert manager.check(sig, poor) is False  # 餘額拒絕不占用限額
+    assert manager.check(sig, rich) is True
+    assert manager.check(sig, rich) is False
@@ -0,0 +1,84 @@
+"""SharedBookRegion 與分片工具測試。"""
+from __future__ import annotations
+
+import multiprocessing
+from decimal import Decimal
+
+import pytest
+
+from business.engine.sharded import partition
+from business.orderbook.shared_book import SharedBookRegion
+from business.orderbook.snapshot import OrderBookSnapshot
+from core.datatypes import PriceLevel
+
+
+def _snapshot(bid: str, ask: str, sequence: int = 1) -> OrderBookSnapshot:
+    return OrderBookSnapshot(
+        symbol="KRW-XRP",
+        exchange="upbit",
+        bids=[PriceLevel(Decimal(bid), Decimal("1.23456789"), 0), PriceLevel(Decimal("799"), Decimal("2"), 0)],
+        asks=[PriceLevel(Decimal(ask), Decimal("0.5"), 0)],
+        sequence=sequence,
+        timestamp=1_700_000_000_000,
+        received_ns=11,
+        parsed_ns=12,
+        applied_ns=13,
+    )
+
+
+def _write_from_child(spec, slot: int) -> None:
+    region = SharedBookRegion.attach(spec)
+    region.writer(slot).write(_snapshot("801.5", "802", sequence=7))
+    region.close()
+
+
+def test_round_trip_and_uninitialized_slot() -> None:
+    region = SharedBookRegion.create(slots=2, depth=1)
+    try:
+        view = region.view(0, "upbit", "KRW-XRP")
+        with pytest.raises(RuntimeError):
+            view.snapshot
+        region.writer(0).write(_snapshot("800.12345678", "801"))
+        snap = view.snapshot
+        # 只保留前 depth 檔，8 位小數內無誤差
+        assert [(level.price, level.quantity) for level in snap.bids] == [
+            (Decimal("800.12345678"), Decimal("1.23456789"))
+        ]
+        assert snap.asks[0].price == Decimal("801")
+        assert (snap.sequence, snap.received_ns, snap.applied_ns) == (1, 11, 13)
+        with pytest.raises(RuntimeError):
+            region.view(1, "bithumb", "XRP_KRW").snapshot
+    finally:
+        region.close()
+
+
+def test_reader_retries_while_writer_holds_slot() -> None:
+    region = SharedBookRegion.create(slots=1, depth=2)
+    try:
+        region.writer(0).write(_snapshot("800", "801"))
+        # 模擬寫入中途：序號為奇數時讀取端放棄而不回傳半寫入的資料
+        region._shm.buf[0] = 3
+        with pytest.raises(RuntimeError):
+            region.view(0, "upbit", "KRW-XRP").snapshot
+    finally:
+        region.close()
+
+
+def test_worker_process_writes_visible_to_parent() -> None:
+    region = SharedBookRegion.create(slots=2, depth=3)
+    try:
+        process = multiprocessing.get_context("spawn").Process(target=_write_from_child, args=(region.spec, 1))
+        process.start()
+        process.join(30)
+        assert process.exitcode == 0
+        snap = region.view(1, "upbit", "KRW-XRP").snapshot
+        assert snap.sequence == 7
+        assert [level.price for level in snap.bids] == [Decimal("801.5"), Decimal("799")]
+    finally:
+        region.close()
+
+
+def test_partition_round_robin() -> None:
+    assert partition(list(range(5)), 2) == [[0, 2, 4], [1, 3]]
+    assert partition([1, 2], 4) == [[1], [2]]
+    assert partition([], 3) == []
@@ -0,0 +1,44 @@
+"""SignalDeduplicator 測試。"""
+from __future__ import annotations
+
+from decimal import Decimal
+
+from business.strategy.dedup import SignalDeduplicator
+from business.strategy.signal import ArbitrageDirection, StrategySignal
+
+
+def _signal(upbit_price: str, pair: str = "BTC") -> StrategySignal:
+    return StrategySignal(
+        direction=ArbitrageDirection.UPBIT_SELL,
+        expected_profit=Decimal("1000"),
+        volume=Decimal("0.1"),
+        upbit_price=Decimal(upbit_price),
+        bithumb_price=Decimal("89500000"),
+        spread=Decimal("0.05"),
+        pair=pair,
+    )
+
+
+def test_deduplicator_cooldown_and_book_move() -> None:
+    dedup = SignalDeduplicator(cooldown=2.0)
+    assert dedup.admit(_signal("95000000"), now=10.0)
+    dedup.record(_signal("95000000"), now=10.0)
+    assert dedup.admit(_signal("95000000"), now=11.0) is False
+    # 盤口變動：指紋不同，立即放行
+    assert dedup.admit(_signal("94900000"), now=11.5)
+    dedup.record(_signal("94900000"), now=11.5)
+    assert dedup.admit(_signal("94900000"), now=13.6)  # 冷卻已過
+    dedup.record(_signal("94900000"), now=13.6)
+    dedup.invalidate("BTC")
+    assert dedup.admit(_signal("94900000"), now=13.7)
+    assert (dedup.stats.admitted, dedup.stats.suppressed) == (3, 1)
+
+
+def test_unrecorded_signal_is_not_suppressed() -> None:
+    dedup = SignalDeduplicator(cooldown=2.0)
+    # 風控拒絕時不呼叫 record，下一輪同一信號仍可送審
+    assert dedup.admit(_signal("95000000"), now=10.0)
+    assert dedup.admit(_signal("95000000"), now=10.5)
+    dedup.record(_signal("95000000", pair="ETH"), now=10.5)
+    assert dedup.admit(_signal("95000000"), now=11.0)
+    assert dedup.stats.suppressed == 0
@@ -48,3 +48,4 @@ def test_strategy_returns_none_when_spread_low() -> None:
     bithumb = _orderbook(Decimal("94980000"), Decimal("0.1"), Decimal("94880000"), Decimal("0.1"), "bithumb", "BTC_KRW")
     signal = strategy.calculate(upbit, bithumb)
     assert signal is None
+
@@ -0,0 +1,100 @@
+"""時鐘偏移估計測試。"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Mapping, Optional
+
+from core.gateway.clock import ClockOffsetEstimator, ClockSync, ServerTime, wall_ms
+from core.interface import BaseGateway
+from core.parser.upbit import UpbitParser
+from core.wrapper.upbit import UpbitWrapper
+
+
+def test_estimator_prefers_lowest_rtt_sample() -> None:
+    clock = ClockOffsetEstimator()
+    assert not clock.synced
+    # 真實 offset 為 +250ms；高 RTT 樣本因非對稱延遲而偏離
+    clock.add_sample(1000.0, 1200.0, 1000.0 + 180 + 250)
+    clock.add_sample(2000.0, 2010.0, 2000.0 + 5 + 250)
+    clock.add_sample(3000.0, 3080.0, 3000.0 + 10 + 250)
+    assert clock.synced
+    assert clock.rtt_ms == 10.0
+    assert clock.offset_ms == 250.0
+    assert clock.to_local_ms(10_250.0) == 10_000.0
+    assert clock.age_ms(10_250.0, now_ms=10_040.0) == 40.0
+
+
+def test_http_date_has_second_resolution() -> None:
+    clock = ClockOffsetEstimator()
+    clock.add_http_date(0.0, 20.0, "Thu, 01 Jan 1970 00:00:01 GMT")
+    assert clock.uncertainty_ms == 1020.0
+    assert clock.offset_ms == 1000.0 + 500.0 - 10.0
+    # 毫秒級樣本出現後取代秒級樣本
+    clock.add_sample(100.0, 140.0, 1620.0)
+    assert clock.offset_ms == 1500.0
+
+
+class ClockedGateway(BaseGateway):
+    def __init__(self, body: bytes, clock: ClockOffsetEstimator):
+        self._body = body
+        self._clock = clock
+
+    @property
+    def clock(self) -> ClockOffsetEstimator:
+        return self._clock
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        signed: bool = False,
+        headers: Optional[Mapping[str, str]] = None,
+        priority: bool = False,
+    ) -> bytes:
+        return self._body
+
+    async def ws_connect(self, url: Optional[str] = None, *, headers=None):  # pragma: no cover
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        return
+
+
+def test_orderbook_tagged_with_corrected_age() -> None:
+    clock = ClockOffsetEstimator()
+    # 交易所時鐘比本地快 5 秒
+    clock.add_sample(0.0, 0.0, 5000.0)
+    server_ts = int(clock.server_now_ms()) - 30
+    body = (
+        b'[{"market":"KRW-BTC","timestamp":' + str(server_ts).encode()
+        + b',"orderbook_units":[{"ask_price":2,"ask_size":1,"bid_price":1,"bid_size":1}]}]'
+    )
+    wrapper = UpbitWrapper(ClockedGateway(body, clock), UpbitParser())
+    orderbook = asyncio.run(wrapper.get_orderbook("KRW-BTC"))
+    assert orderbook.received_at > 0
+    assert 25 <= orderbook.age_ms < 1000
+
+    sync = ClockSync()
+    fresh = ClockOffsetEstimator()
+    sync.register("upbit", fresh, wrapper.fetch_server_time)
+    asyncio.run(sync.sync_once())
+    assert fresh.synced
+    assert abs(fresh.offset_ms - 5000.0) < 1000
+    # 訂單簿 timestamp 只是下界，樣本不確定度須涵蓋其可能的落後量
+    assert fresh.uncertainty_ms >= UpbitWrapper.BOOK_STALENESS_MS
+
+
+def test_lower_bound_sample_is_centered_in_its_range() -> None:
+    sync = ClockSync()
+    clock = ClockOffsetEstimator()
+
+    async def probe() -> ServerTime:
+        return ServerTime(10_000, resolution_ms=400.0)
+
+    sync.register("upbit", clock, probe)
+    asyncio.run(sync.sync_once())
+    assert clock.uncertainty_ms >= 400.0
+    # 真實時間落在 [10000, 10400]，取中點
+    assert abs(clock.to_local_ms(10_200.0) - wall_ms()) < 100
@@ -0,0 +1,85 @@
+"""EventBus 測試。"""
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+from utils.event_bus import EventBus
+
+
+class Quote:
+    def __init__(self, price: int) -> None:
+        self.price = price
+
+
+class Fill:
+    pass
+
+
+def test_sync_fanout_by_type_and_symbol() -> None:
+    bus = EventBus()
+    btc: List[int] = []
+    every: List[int] = []
+    fills: List[Fill] = []
+
+    def broken(_event: Quote) -> None:
+        raise RuntimeError("boom")
+
+    bus.subscribe(Quote, lambda event: btc.append(event.price), symbol="KRW-BTC")
+    bus.subscribe(Quote, broken)
+    channel = bus.channel(Quote, "KRW-BTC")
+    # channel 建立後才加入的訂閱者也會收到事件
+    subscription = bus.subscribe(Quote, lambda event: every.append(event.price))
+    bus.subscribe(Fill, fills.append)
+    channel.publish(Quote(1))
+    bus.publish(Quote, "KRW-XRP", Quote(2))
+    subscription.cancel()
+    channel.publish(Quote(3))
+    assert btc == [1, 3]
+    assert every == [1, 2]
+    assert fills == []
+    assert bus.stats.handler_errors == 3  # 例外不影響其他訂閱者
+
+
+def test_async_subscriber_bounded_queue() -> None:
+    async def run() -> None:
+        bus = EventBus()
+        seen: List[int] = []
+
+        async def handler(event: Quote) -> None:
+            await asyncio.sleep(0)
+            seen.append(event.price)
+
+        subscription = bus.subscribe_async(Quote, handler, symbol="KRW-BTC", maxsize=2)
+        for price in range(5):
+            bus.publish(Quote, "KRW-BTC", Quote(price))  # 發佈端不等待
+        assert subscription.depth == 2 and subscription.dropped == 3
+        await bus.drain()
+        assert seen == [3, 4]
+        await bus.close()
+
+    asyncio.run(run())
+
+
+def test_drain_waits_for_in_flight_event() -> None:
+    async def run() -> None:
+        bus = EventBus()
+        release = asyncio.Event()
+        seen: List[int] = []
+
+        async def handler(event: Quote) -> None:
+            await release.wait()
+            seen.append(event.price)
+
+        bus.subscribe_async(Quote, handler, symbol="KRW-BTC")
+        bus.publish(Quote, "KRW-BTC", Quote(1))
+        drain = asyncio.create_task(bus.drain())
+        await asyncio.sleep(0.01)
+        # 佇列已取空但事件仍在處理中
+        assert not drain.done()
+        release.set()
+        await asyncio.wait_for(drain, 1.0)
+        assert seen == [1]
+        await bus.close()
+
+    asyncio.run(run())
@@ -0,0 +1,32 @@
+"""事件迴圈選擇測試。"""
+from __future__ import annotations
+
+import asyncio
+import sys
+
+import pytest
+
+from utils import event_loop
+
+
+def test_falls_back_to_asyncio_without_uvloop(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv(event_loop.LOOP_ENV, raising=False)
+    monkeypatch.setitem(sys.modules, "uvloop", None)  # 匯入時拋出 ImportError
+    assert event_loop.resolve_loop("uvloop") == "asyncio"
+    assert event_loop.resolve_loop("auto") == "asyncio"
+
+    async def loop_module() -> str:
+        return type(asyncio.get_running_loop()).__module__
+
+    assert event_loop.run(loop_module(), "uvloop").startswith("asyncio")
+
+
+def test_env_overrides_config_and_rejects_unknown(monkeypatch: pytest.MonkeyPatch) -> None:
+    config = {"runtime": {"event_loop": "auto"}}
+    assert event_loop.configured_loop(config) == "auto"
+    assert event_loop.configured_loop({}) is None
+    monkeypatch.setenv(event_loop.LOOP_ENV, "asyncio")
+    assert event_loop.resolve_loop(event_loop.configured_loop(config)) == "asyncio"
+    monkeypatch.setenv(event_loop.LOOP_ENV, "trio")
+    with pytest.raises(ValueError):
+        event_loop.resolve_loop()
@@ -9,8 +9,8 @@ import uuid
 from unittest import mock
 from urllib.parse import urlencode
 
-from core.gateway.auth.hmac_signer import sign_bithumb_request
-from core.gateway.auth.jwt_native import generate_upbit_jwt
+from core.gateway.auth.hmac_signer import BithumbHmacSigner, sign_bithumb_request
+from core.gateway.auth.jwt_native import UpbitJwtSigner, encode_upbit_query, generate_upbit_jwt
 
 
 def _decode_payload(token: str) -> dict[str, object]:
@@ -49,3 +49,50 @@ def test_sign_bithumb_request(_: mock.MagicMock) -> None:
     expected_hash = hmac.new(b"secret", signing_str, hashlib.sha512).hexdigest()
     expected = base64.b64encode(expected_hash.encode()).decode()
     assert headers["Api-Sign"] == expected
+
+
+def _reference_upbit_jwt(access_key: str, secret_key: str, nonce: str, query: str) -> str:
+    def b64(data: bytes) -> str:
+        return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+    header = b64(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+    payload = {"access_key": access_key, "nonce": nonce}
+    if query:
+        payload["query_hash"] = hashlib.sha512(query.encode()).hexdigest()
+        payload["query_hash_alg"] = "SHA512"
+    signing_input = f"{header}.{b64(json.dumps(payload, separators=(',', ':')).encode())}"
+    signature = hmac.new(secret_key.encode(), signing_input.encode(), hashlib.sha256).digest()
+    return f"Bearer {signing_input}.{b64(signature)}"
+
+
+@mock.patch("core.gateway.auth.jwt_native.uuid.uuid4", return_value=uuid.UUID(int=0))
+def test_upbit_signer_matches_reference_encoding(_: mock.MagicMock) -> None:
+    signer = UpbitJwtSigner("test-access", "secret")
+    query = encode_upbit_query({"state": "done", "market": "KRW-BTC"})
+    assert query == "market=KRW-BTC&state=done"
+    nonce = str(uuid.UUID(int=0))
+    # 重複簽名驗證 HMAC 狀態 copy() 後不被污染
+    for _ in range(2):
+        assert signer.sign(query) == _reference_upbit_jwt("test-access", "secret", nonce, query)
+    assert signer.sign() == _reference_upbit_jwt("test-access", "secret", nonce, "")
+
+
+@mock.patch("core.gateway.auth.jwt_native.uuid.uuid4", return_value=uuid.UUID(int=0))
+def test_upbit_query_hash_uses_unquoted_query(_: mock.MagicMock) -> None:
+    params = {"uuids[]": ["a", "b"]}
+    assert encode_upbit_query(params) == "uuids%5B%5D=a&uuids%5B%5D=b"
+    expected_hash = hashlib.sha512("uuids[]=a&uuids[]=b".encode()).hexdigest()
+    assert _decode_payload(generate_upbit_jwt("test-access", "secret", params))["query_hash"] == expected_hash
+    signer = UpbitJwtSigner("test-access", "secret")
+    assert signer.sign(encode_upbit_query(params)) == signer.sign_params(params)
+
+
+def test_bithumb_signer_reuses_keyed_state() -> None:
+    signer = BithumbHmacSigner("key", "secret")
+    endpoint = "/info/balance"
+    query = urlencode({"currency": "ALL", "endpoint": endpoint})
+    first = signer.sign(endpoint, query, nonce="1")
+    second = signer.sign(endpoint, query, nonce="1")
+    assert first == second
+    expected_hash = hmac.new(b"secret", f"{endpoint}\0{query}\0" "1".encode(), hashlib.sha512).hexdigest()
+    assert first["Api-Sign"] == base64.b64encode(expected_hash.encode()).decode()
@@ -0,0 +1,112 @@
+"""Gateway 分段延遲量測測試。"""
+from __future__ import annotations
+
+import asyncio
+import random
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from core.gateway.base import GatewaySettings
+from core.gateway.ratelimit.token_bucket import TokenBucket
+from core.gateway.upbit import UpbitGateway
+from utils.histogram import LatencyHistogram
+
+
+def test_histogram_percentiles_within_bucket_precision() -> None:
+    hist = LatencyHistogram()
+    values = list(range(1, 10001))
+    random.Random(1).shuffle(values)
+    for value in values:
+        hist.record(value)
+    assert hist.count == 10000
+    assert hist.min == 1
+    assert hist.max == 10000
+    for q, exact in ((50, 5000), (90, 9000), (99, 9900)):
+        assert abs(hist.percentile(q) - exact) / exact <= 1 / 32
+
+
+def test_histogram_clamps_and_merges() -> None:
+    left = LatencyHistogram(max_value=1000)
+    right = LatencyHistogram(max_value=1000)
+    left.record(5)
+    right.record(50_000)
+    left.merge(right)
+    assert left.count == 2
+    assert left.max == 1000
+    assert left.percentile(100) == 1000
+
+
+def test_gateway_records_request_phases() -> None:
+    async def handler(request: web.Request) -> web.Response:
+        await asyncio.sleep(0.005)
+        return web.Response(body=b"[]")
+
+    async def run() -> dict:
+        app = web.Application()
+        app.router.add_get("/v1/accounts", handler)
+        server = TestServer(app)
+        await server.start_server()
+        gateway = UpbitGateway(
+            GatewaySettings(
+                name="upbit",
+                rest_base=str(server.make_url("/")),
+                websocket_url="",
+                access_key="ak",
+                secret_key="sk",
+            ),
+            private_limiter=TokenBucket(5, 5),
+        )
+        try:
+            for _ in range(3):
+                await gateway.request("GET", "/v1/accounts", signed=True)
+            return gateway.latency_stats()
+        finally:
+            await gateway.close()
+            await server.close()
+
+    stats = asyncio.run(run())["/v1/accounts"]
+    for phase in ("limiter_wait", "sign", "connect", "request_sent", "first_byte", "body_read", "total"):
+        assert phase in stats, phase
+    assert stats["total"]["count"] == 3
+    assert stats["connect"]["count"] == 1  # 後續請求複用連線
+    assert stats["first_byte"]["p50"] >= 5000
+
+
+
+def test_limiter_wait_excludes_session_setup() -> None:
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(body=b"[]")
+
+    async def run() -> dict:
+        app = web.Application()
+        app.router.add_get("/v1/accounts", handler)
+        server = TestServer(app)
+        await server.start_server()
+        gateway = UpbitGateway(
+            GatewaySettings(
+                name="upbit",
+                rest_base=str(server.make_url("/")),
+                websocket_url="",
+                access_key="ak",
+                secret_key="sk",
+            ),
+            private_limiter=TokenBucket(5, 5),
+        )
+        ensure_session = gateway._ensure_session
+
+        async def slow_session():
+            await asyncio.sleep(0.05)
+            return await ensure_session()
+
+        gateway._ensure_session = slow_session
+        try:
+            await gateway.request("GET", "/v1/accounts", signed=True)
+            return gateway.latency_stats()
+        finally:
+            await gateway.close()
+            await server.close()
+
+    stats = asyncio.run(run())["/v1/accounts"]
+    # 令牌充足，limiter_wait 不應包含建立連線池的 50ms
+    assert stats["limiter_wait"]["max"] < 50_000
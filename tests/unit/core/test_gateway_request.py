@@ -0,0 +1,133 @@
+"""Gateway 請求組裝測試（本地 aiohttp 伺服器）。"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+from typing import Awaitable, Callable
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from core.gateway.base import GatewaySettings
+from core.gateway.bithumb import BithumbGateway
+from core.gateway.prepared import OrderTemplate
+from core.gateway.upbit import UpbitGateway
+
+
+async def _serve(handler: Callable[[web.Request], Awaitable[web.Response]]) -> TestServer:
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+def test_bithumb_body_matches_signed_query() -> None:
+    captured: dict[str, object] = {}
+
+    async def handler(request: web.Request) -> web.Response:
+        captured["body"] = await request.text()
+        captured["headers"] = dict(request.headers)
+        return web.Response(body=b"{}")
+
+    async def run() -> None:
+        server = await _serve(handler)
+        gateway = BithumbGateway(
+            GatewaySettings(
+                name="bithumb",
+                rest_base=str(server.make_url("/")),
+                websocket_url="",
+                access_key="key",
+                secret_key="secret",
+            )
+        )
+        try:
+            await gateway.request("POST", "/info/balance", params={"currency": "ALL"}, signed=True)
+        finally:
+            await gateway.close()
+            await server.close()
+
+    asyncio.run(run())
+    body = captured["body"]
+    headers = captured["headers"]
+    assert body == "currency=ALL&endpoint=%2Finfo%2Fbalance"
+    signing_str = f"/info/balance\0{body}\0{headers['Api-Nonce']}".encode()
+    digest = hmac.new(b"secret", signing_str, hashlib.sha512).hexdigest()
+    assert headers["Api-Sign"] == base64.b64encode(digest.encode()).decode()
+
+
+def test_upbit_get_query_is_sorted_and_not_reencoded() -> None:
+    captured: dict[str, str] = {}
+
+    async def handler(request: web.Request) -> web.Response:
+        captured["query"] = request.raw_path.split("?", 1)[1]
+        captured["auth"] = request.headers["Authorization"]
+        return web.Response(body=b"{}")
+
+    async def run() -> None:
+        server = await _serve(handler)
+        gateway = UpbitGateway(
+            GatewaySettings(
+                name="upbit",
+                rest_base=str(server.make_url("/")),
+                websocket_url="",
+                access_key="ak",
+                secret_key="sk",
+            )
+        )
+        try:
+            await gateway.request("GET", "/v1/orders", params={"uuids[]": ["a", "b"], "market": "KRW-BTC"}, signed=True)
+        finally:
+            await gateway.close()
+            await server.close()
+
+    asyncio.run(run())
+    assert captured["query"] == "market=KRW-BTC&uuids%5B%5D=a&uuids%5B%5D=b"
+    assert captured["auth"].startswith("Bearer ")
+
+
+def test_order_templates_match_regular_request_encoding() -> None:
+    captured: list[dict[str, object]] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        captured.append({"body": await request.text(), "headers": dict(request.headers)})
+        return web.Response(body=b"{}")
+
+    async def run() -> None:
+        server = await _serve(handler)
+        settings = dict(rest_base=str(server.make_url("/")), websocket_url="", access_key="ak", secret_key="sk")
+        upbit = UpbitGateway(GatewaySettings(name="upbit", **settings))
+        bithumb = BithumbGateway(GatewaySettings(name="bithumb", **settings))
+        upbit_template = OrderTemplate("POST", "/v1/orders", (("market", "KRW-BTC"), ("side", "ask")), ("volume",))
+        bithumb_template = OrderTemplate(
+            "POST",
+            "/trade/market_sell",
+            (("order_currency", "BTC"), ("payment_currency", "KRW")),
+            ("units",),
+        )
+        try:
+            await upbit.send_order(upbit_template, ("0.05",))
+            await bithumb.send_order(bithumb_template, ("0.05",))
+        finally:
+            await upbit.close()
+            await bithumb.close()
+            await server.close()
+
+    asyncio.run(run())
+    upbit_call, bithumb_call = captured
+    assert json.loads(upbit_call["body"]) == {"market": "KRW-BTC", "side": "ask", "volume": "0.05"}
+    assert upbit_call["headers"]["Content-Type"] == "application/json"
+    token = upbit_call["headers"]["Authorization"][7:]
+    payload = json.loads(base64.urlsafe_b64decode(token.split(".")[1] + "=="))
+    expected_query = "market=KRW-BTC&side=ask&volume=0.05"
+    assert payload["query_hash"] == hashlib.sha512(expected_query.encode()).hexdigest()
+
+    body = bithumb_call["body"]
+    headers = bithumb_call["headers"]
+    assert body == "order_currency=BTC&payment_currency=KRW&units=0.05&endpoint=%2Ftrade%2Fmarket_sell"
+    signing_str = f"/trade/market_sell\0{body}\0{headers['Api-Nonce']}".encode()
+    digest = hmac.new(b"sk", signing_str, hashlib.sha512).hexdigest()
+    assert headers["Api-Sign"] == base64.b64encode(digest.encode()).decode()
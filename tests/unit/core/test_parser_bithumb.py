@@ -5,6 +5,7 @@ from decimal import Decimal
 
 import pytest
 
+from core.exceptions import ExchangeRejectedError
 from core.parser.bithumb import BithumbParser
 
 
@@ -37,5 +38,5 @@ def test_parse_order_result() -> None:
 def test_parse_error_status() -> None:
     raw = b"""{\"status\":\"5100\",\"data\":{}}"""
     parser = BithumbParser()
-    with pytest.raises(ValueError):
+    with pytest.raises(ExchangeRejectedError):
         parser.parse_orderbook(raw)
@@ -0,0 +1,17 @@
+"""TimerWheel 測試。"""
+from __future__ import annotations
+
+from utils.timer_wheel import TimerWheel
+
+
+def test_timer_wheel_expires_across_laps() -> None:
+    wheel: TimerWheel[str] = TimerWheel(tick=1.0, slots=4)
+    wheel.schedule("a", 2.0)
+    wheel.schedule("b", 6.0)  # 與 a 落在同一槽，但在下一圈
+    wheel.schedule("late", -1.0)  # 已過期：排到下一個 tick
+    assert wheel.advance(1.0) == ["late"]
+    assert wheel.advance(2.0) == ["a"]
+    assert wheel.advance(5.9) == []
+    wheel.schedule("c", 7.0)
+    assert sorted(wheel.advance(100.0)) == ["b", "c"]
+    assert len(wheel) == 0
@@ -0,0 +1,24 @@
+"""TokenBucket 限流器測試。"""
+from __future__ import annotations
+
+import asyncio
+
+from core.gateway.ratelimit.token_bucket import TokenBucket
+
+
+def test_token_bucket_priority_lane_goes_first() -> None:
+    async def run() -> list:
+        bucket = TokenBucket(1, 50)
+        await bucket.acquire()  # 清空令牌
+        order: list = []
+
+        async def take(name: str, priority: bool) -> None:
+            await bucket.acquire(priority=priority)
+            order.append(name)
+
+        normal = asyncio.create_task(take("order", False))
+        await asyncio.sleep(0)
+        await asyncio.gather(normal, take("cancel", True))
+        return order
+
+    assert asyncio.run(run()) == ["cancel", "order"]
@@ -0,0 +1,33 @@
+"""Tracer 測試。"""
+from __future__ import annotations
+
+from utils.tracing import Tracer
+
+
+def test_tracer_aggregates_stages_and_exports_samples() -> None:
+    tracer = Tracer(sample_every=2)
+    for offset in range(4):
+        base = (offset + 1) * 1_000_000
+        ctx = tracer.start("XRP", received_ns=base, parsed_ns=base + 20_000, applied_ns=base + 30_000)
+        ctx.mark("strategy", base + 80_000)
+        ctx.mark("risk", base + 90_000)
+        ctx.finish()
+
+    stages = tracer.snapshot()["XRP"]
+    assert set(stages) == {"parse", "book", "strategy", "risk", "total"}
+    assert stages["parse"]["count"] == 4
+    assert tracer.histogram("XRP", "strategy").max == 50
+    assert stages["total"]["max"] == 90
+
+    events = tracer.chrome_trace()["traceEvents"]
+    spans = [event for event in events if event["ph"] == "X"]
+    assert len(spans) == 2 * 4  # 兩筆抽樣，各 4 個階段
+    assert {event["args"]["trace_id"] for event in spans} == {2, 4}
+    assert spans[0]["name"] == "parse" and spans[0]["dur"] == 20.0
+    assert any(event["ph"] == "M" and event["args"]["name"] == "XRP" for event in events)
+
+
+def test_single_mark_trace_is_ignored() -> None:
+    tracer = Tracer()
+    tracer.start("BTC", received_ns=1).finish()
+    assert tracer.snapshot() == {}
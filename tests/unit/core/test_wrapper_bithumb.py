@@ -24,8 +24,11 @@ class FakeGateway(BaseGateway):
         params: Optional[Mapping[str, Any]] = None,
         signed: bool = False,
         headers: Optional[Mapping[str, str]] = None,
+        priority: bool = False,
     ) -> bytes:
-        self.calls.append({"method": method, "endpoint": endpoint, "params": params, "signed": signed})
+        self.calls.append(
+            {"method": method, "endpoint": endpoint, "params": params, "signed": signed, "priority": priority}
+        )
         return self._responses[(method, endpoint)]
 
     async def ws_connect(self, url: Optional[str] = None, *, headers: Optional[Mapping[str, str]] = None):
@@ -24,8 +24,11 @@ class FakeGateway(BaseGateway):
         params: Optional[Mapping[str, Any]] = None,
         signed: bool = False,
         headers: Optional[Mapping[str, str]] = None,
+        priority: bool = False,
     ) -> bytes:
-        self.calls.append({"method": method, "endpoint": endpoint, "params": params, "signed": signed})
+        self.calls.append(
+            {"method": method, "endpoint": endpoint, "params": params, "signed": signed, "priority": priority}
+        )
         return self._responses[(method, endpoint)]
 
     async def ws_connect(self, url: Optional[str] = None, *, headers: Optional[Mapping[str, str]] = None):
@@ -78,3 +81,37 @@ def test_market_order_helpers() -> None:
     assert first_call["params"]["ord_type"] == "market"
     assert second_call["params"]["ord_type"] == "price"
     assert second_call["params"]["price"] == "10000"
+
+
+def test_market_order_uses_fixed_point_and_priority() -> None:
+    responses = {
+        ("POST", "/v1/orders"): b"{\"uuid\":\"abc\",\"market\":\"KRW-BTC\",\"state\":\"done\",\"executed_volume\":\"0.1\"}"
+    }
+    gateway = FakeGateway(responses)
+    wrapper = UpbitWrapper(gateway, UpbitParser())
+    # 運算後的 Decimal 可能帶指數；送出時不可出現 "1E+4"
+    asyncio.run(wrapper.buy_market_order("KRW-BTC", Decimal("1E+4"), priority=True))
+    asyncio.run(wrapper.sell_market_order("KRW-BTC", Decimal("5E-7")))
+    buy, sell = gateway.calls
+    assert (buy["params"]["price"], buy["priority"]) == ("10000", True)
+    assert (sell["params"]["volume"], sell["priority"]) == ("0.0000005", False)
+
+
+def test_cancel_order_uses_priority_lane() -> None:
+    responses = {
+        ("DELETE", "/v1/order"): b"{\"uuid\":\"abc\",\"market\":\"KRW-BTC\",\"state\":\"cancel\",\"executed_volume\":\"0\"}",
+        ("GET", "/v1/order"): b"{\"uuid\":\"abc\",\"market\":\"KRW-BTC\",\"state\":\"cancel\",\"executed_volume\":\"0\"}",
+    }
+    gateway = FakeGateway(responses)
+    wrapper = UpbitWrapper(gateway, UpbitParser())
+    asyncio.run(wrapper.cancel_order("abc"))
+    asyncio.run(wrapper.get_order_status("abc"))
+    assert [call["priority"] for call in gateway.calls] == [True, False]
+
+
+def test_open_orders_query_can_use_priority_lane() -> None:
+    gateway = FakeGateway({("GET", "/v1/orders/open"): b"[]"})
+    wrapper = UpbitWrapper(gateway, UpbitParser())
+    assert asyncio.run(wrapper.get_open_orders("KRW-BTC", priority=True)) == []
+    asyncio.run(wrapper.get_open_orders("KRW-BTC"))
+    assert [call["priority"] for call in gateway.calls] == [True, False]
@@ -0,0 +1,35 @@
+"""帶抖動的指數退避。"""
+from __future__ import annotations
+
+import random
+from typing import Optional
+
+
+class ExponentialBackoff:
+    """Full-jitter 指數退避：第 n 次延遲在 [0, min(cap, base * 2^n)] 間均勻取值。"""
+
+    def __init__(
+        self,
+        base: float = 0.2,
+        cap: float = 10.0,
+        *,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        if base <= 0 or cap < base:
+            raise ValueError("base 必須為正數且 cap >= base")
+        self._base = base
+        self._cap = cap
+        self._attempts = 0
+        self._rng = rng or random.Random()
+
+    @property
+    def attempts(self) -> int:
+        return self._attempts
+
+    def next_delay(self) -> float:
+        ceiling = min(self._cap, self._base * (2 ** min(self._attempts, 32)))
+        self._attempts += 1
+        return self._rng.uniform(0, ceiling)
+
+    def reset(self) -> None:
+        self._attempts = 0
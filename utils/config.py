@@ -1,6 +1,7 @@
 """配置讀取工具，封裝 YAML 解析與驗證。"""
 from __future__ import annotations
 
+import os
 from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
@@ -9,7 +10,7 @@ import yaml
 
 from core.exceptions import ConfigError
 
-DEFAULT_CONFIG_PATH = Path("config/development.yaml")
+DEFAULT_CONFIG_PATH = Path(os.getenv("KARB_CONFIG", "config/development.yaml"))
 
 
 class ConfigLoader:
@@ -0,0 +1,223 @@
+"""進程內事件匯流排：以（事件型別, 交易對）為主題的發佈 / 訂閱。
+
+- 同步訂閱者在 publish 內依序呼叫；每個主題的訂閱者預先展開為 tuple（含萬用
+  訂閱），發佈時只做兩次 dict 查詢與迭代，不產生事件以外的物件。熱路徑可先以
+  channel() 取得主題控制代碼，省去查詢。
+- 非同步訂閱者各自擁有有界佇列與消費 task；佇列滿時丟棄最舊事件，發佈端永不等待。
+- 訂閱者拋出的例外只記錄，不影響其他訂閱者與發佈端。
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Generic, List, Optional, Tuple, Type, TypeVar
+
+from utils.logger import setup_logger
+
+logger = setup_logger("event_bus")
+
+E = TypeVar("E")
+Handler = Callable[[E], None]
+AsyncHandler = Callable[[E], Awaitable[None]]
+
+ANY_SYMBOL = "*"
+
+
+@dataclass(slots=True)
+class BusStats:
+    handler_errors: int = 0
+
+
+class Channel(Generic[E]):
+    """單一主題的發佈端；訂閱變動時由匯流排更新 handlers。"""
+
+    __slots__ = ("event_type", "symbol", "handlers", "_bus")
+
+    def __init__(self, bus: "EventBus", event_type: Type[E], symbol: str) -> None:
+        self.event_type = event_type
+        self.symbol = symbol
+        self.handlers: Tuple[Handler[E], ...] = ()
+        self._bus = bus
+
+    def publish(self, event: E) -> None:
+        for handler in self.handlers:
+            try:
+                handler(event)
+            except Exception as exc:
+                self._bus._on_error(self, handler, exc)
+
+
+class Subscription:
+    __slots__ = ("event_type", "symbol", "handler", "_bus", "_async")
+
+    def __init__(
+        self,
+        bus: "EventBus",
+        event_type: type,
+        symbol: str,
+        handler: Handler[Any],
+        async_subscriber: Optional["AsyncSubscriber[Any]"] = None,
+    ) -> None:
+        self.event_type = event_type
+        self.symbol = symbol
+        self.handler = handler
+        self._bus = bus
+        self._async = async_subscriber
+
+    @property
+    def dropped(self) -> int:
+        return self._async.dropped if self._async is not None else 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._async.queue) if self._async is not None else 0
+
+    def cancel(self) -> None:
+        self._bus._unsubscribe(self)
+        if self._async is not None:
+            self._async.close()
+
+
+class AsyncSubscriber(Generic[E]):
+    """有界佇列 + 單一消費 task；put 為同步，滿時丟棄最舊事件。"""
+
+    __slots__ = ("queue", "dropped", "_handler", "_maxsize", "_ready", "_idle", "_task", "_name")
+
+    def __init__(self, handler: AsyncHandler[E], maxsize: int, name: str) -> None:
+        self.queue: Deque[E] = deque()
+        self.dropped = 0
+        self._handler = handler
+        self._maxsize = maxsize
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()  # 佇列已空且沒有處理中的事件
+        self._idle.set()
+        self._name = name
+        self._task = asyncio.get_running_loop().create_task(self._run(), name=f"bus-{name}")
+
+    def put(self, event: E) -> None:
+        if len(self.queue) >= self._maxsize:
+            self.queue.popleft()
+            self.dropped += 1
+        self.queue.append(event)
+        self._idle.clear()
+        self._ready.set()
+
+    async def _run(self) -> None:
+        queue = self.queue
+        while True:
+            if not queue:
+                self._idle.set()
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            event = queue.popleft()
+            try:
+                await self._handler(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("非同步訂閱者處理失敗", extra={"subscriber": self._name, "error": str(exc)})
+
+    async def drain(self) -> None:
+        """等待目前佇列中的事件處理完畢。"""
+        await self._idle.wait()
+
+    def close(self) -> None:
+        self._task.cancel()
+        self._idle.set()  # 已關閉：剩餘事件不會再處理，drain 不應永久等待
+
+
+class EventBus:
+    def __init__(self) -> None:
+        self._subscriptions: Dict[type, Dict[str, List[Subscription]]] = {}
+        self._channels: Dict[type, Dict[str, Channel[Any]]] = {}
+        self._async: List[AsyncSubscriber[Any]] = []
+        self.stats = BusStats()
+
+    def channel(self, event_type: Type[E], symbol: str) -> Channel[E]:
+        by_symbol = self._channels.setdefault(event_type, {})
+        channel = by_symbol.get(symbol)
+        if channel is None:
+            channel = by_symbol[symbol] = Channel(self, event_type, symbol)
+            channel.handlers = self._resolve(event_type, symbol)
+        return channel
+
+    def publish(self, event_type: Type[E], symbol: str, event: E) -> None:
+        by_symbol = self._channels.get(event_type)
+        channel = by_symbol.get(symbol) if by_symbol is not None else None
+        if channel is None:
+            channel = self.channel(event_type, symbol)
+        channel.publish(event)
+
+    def subscribe(self, event_type: Type[E], handler: Handler[E], symbol: str = ANY_SYMBOL) -> Subscription:
+        """同步訂閱；symbol 省略時接收該型別所有交易對的事件。"""
+        subscription = Subscription(self, event_type, symbol, handler)
+        self._add(subscription)
+        return subscription
+
+    def subscribe_async(
+        self,
+        event_type: Type[E],
+        handler: AsyncHandler[E],
+        symbol: str = ANY_SYMBOL,
+        *,
+        maxsize: int = 1024,
+    ) -> Subscription:
+        """需在事件迴圈中呼叫；事件先進有界佇列，由獨立 task 依序 await handler。"""
+        name = f"{event_type.__name__}:{symbol}:{getattr(handler, '__qualname__', 'handler')}"
+        subscriber: AsyncSubscriber[E] = AsyncSubscriber(handler, maxsize, name)
+        self._async.append(subscriber)
+        subscription = Subscription(self, event_type, symbol, subscriber.put, subscriber)
+        self._add(subscription)
+        return subscription
+
+    async def drain(self) -> None:
+        """等待所有非同步訂閱者清空佇列（測試與關閉時使用）。"""
+        for subscriber in list(self._async):
+            await subscriber.drain()
+
+    async def close(self) -> None:
+        subscribers, self._async = self._async, []
+        for subscriber in subscribers:
+            subscriber.close()
+        for subscriber in subscribers:
+            try:
+                await subscriber._task
+            except asyncio.CancelledError:
+                pass
+
+    def _add(self, subscription: Subscription) -> None:
+        self._subscriptions.setdefault(subscription.event_type, {}).setdefault(subscription.symbol, []).append(
+            subscription
+        )
+        self._refresh(subscription.event_type)
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.event_type, {}).get(subscription.symbol, [])
+        if subscription in subscriptions:
+            subscriptions.remove(subscription)
+            self._refresh(subscription.event_type)
+        if subscription._async is not None and subscription._async in self._async:
+            self._async.remove(subscription._async)
+
+    def _refresh(self, event_type: type) -> None:
+        for symbol, channel in self._channels.get(event_type, {}).items():
+            channel.handlers = self._resolve(event_type, symbol)
+
+    def _resolve(self, event_type: type, symbol: str) -> Tuple[Handler[Any], ...]:
+        by_symbol = self._subscriptions.get(event_type, {})
+        exact = by_symbol.get(symbol, []) if symbol != ANY_SYMBOL else []
+        return tuple(sub.handler for sub in exact + by_symbol.get(ANY_SYMBOL, []))
+
+    def _on_error(self, channel: Channel[Any], handler: Handler[Any], exc: Exception) -> None:
+        self.stats.handler_errors += 1
+        logger.warning(
+            "訂閱者處理失敗",
+            extra={
+                "event": channel.event_type.__name__,
+                "symbol": channel.symbol,
+                "handler": getattr(handler, "__qualname__", repr(handler)),
+                "error": str(exc),
+            },
+        )
@@ -0,0 +1,53 @@
+"""事件迴圈選擇：預設 asyncio，可選 uvloop；未安裝 uvloop 時退回 asyncio。
+
+優先序：環境變數 KARB_EVENT_LOOP > 配置 runtime.event_loop > "asyncio"。
+- asyncio：標準事件迴圈。
+- uvloop：要求 uvloop，未安裝時記錄警告並退回 asyncio。
+- auto：有 uvloop 就用，否則靜默退回。
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, Coroutine, Mapping, Optional, TypeVar
+
+from utils.logger import setup_logger
+
+logger = setup_logger("event_loop")
+
+T = TypeVar("T")
+
+LOOP_ENV = "KARB_EVENT_LOOP"
+LOOP_CHOICES = ("asyncio", "uvloop", "auto")
+
+
+def configured_loop(config: Optional[Mapping[str, Any]] = None) -> Optional[str]:
+    """讀取配置中的 runtime.event_loop（未設定時回傳 None）。"""
+    runtime = (config or {}).get("runtime", {}) or {}
+    return runtime.get("event_loop")
+
+
+def resolve_loop(preference: Optional[str] = None) -> str:
+    """回傳實際採用的事件迴圈名稱："asyncio" 或 "uvloop"。"""
+    choice = (os.getenv(LOOP_ENV) or preference or "asyncio").strip().lower()
+    if choice not in LOOP_CHOICES:
+        raise ValueError(f"未知的事件迴圈: {choice}（可選 {', '.join(LOOP_CHOICES)}）")
+    if choice == "asyncio":
+        return "asyncio"
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        if choice == "uvloop":
+            logger.warning("未安裝 uvloop，改用 asyncio 事件迴圈")
+        return "asyncio"
+    return "uvloop"
+
+
+def run(main: Coroutine[Any, Any, T], preference: Optional[str] = None) -> T:
+    """取代 asyncio.run；只替本次執行建立迴圈，不改動全域 event loop policy。"""
+    if resolve_loop(preference) == "uvloop":
+        import uvloop
+
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(main)
+    return asyncio.run(main)
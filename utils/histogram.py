@@ -0,0 +1,114 @@
+"""HDR 風格的定長延遲直方圖（對數-線性分桶，O(1) 記錄）。"""
+from __future__ import annotations
+
+from typing import Dict
+
+# 每個 2 倍區間分為 2^(_SUB_BITS-1) 個等寬桶，桶寬相對下界最多 1/32
+_SUB_BITS = 6
+_SUB_COUNT = 1 << _SUB_BITS
+_HALF_COUNT = _SUB_COUNT >> 1
+
+
+def _bucket_index(value: int) -> int:
+    if value < _SUB_COUNT:
+        return value
+    shift = value.bit_length() - _SUB_BITS
+    return shift * _HALF_COUNT + (value >> shift)
+
+
+def _bucket_bounds(index: int) -> tuple[int, int]:
+    if index < _SUB_COUNT:
+        return index, index
+    shift = index // _HALF_COUNT - 1
+    mantissa = index - shift * _HALF_COUNT
+    low = mantissa << shift
+    return low, low + (1 << shift) - 1
+
+
+class LatencyHistogram:
+    """以整數（預設微秒）記錄延遲，百分位相對誤差不超過 1/32（約 3.1%），記憶體固定。"""
+
+    __slots__ = ("_counts", "_max_value", "_count", "_sum", "_min", "_max")
+
+    def __init__(self, max_value: int = 60_000_000) -> None:
+        if max_value <= 0:
+            raise ValueError("max_value 必須為正數")
+        self._max_value = max_value
+        self._counts = [0] * (_bucket_index(max_value) + 1)
+        self._count = 0
+        self._sum = 0
+        self._min = 0
+        self._max = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def max(self) -> int:
+        return self._max
+
+    @property
+    def min(self) -> int:
+        return self._min
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self._count if self._count else 0.0
+
+    def record(self, value: int) -> None:
+        if value < 0:
+            value = 0
+        elif value > self._max_value:
+            value = self._max_value
+        self._counts[_bucket_index(value)] += 1
+        if not self._count or value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+        self._count += 1
+        self._sum += value
+
+    def percentile(self, q: float) -> int:
+        """回傳第 q 百分位（0-100）所在桶的上界。"""
+        if not self._count:
+            return 0
+        target = max(1, int(round(self._count * min(max(q, 0.0), 100.0) / 100.0)))
+        seen = 0
+        for index, bucket in enumerate(self._counts):
+            if not bucket:
+                continue
+            seen += bucket
+            if seen >= target:
+                return min(_bucket_bounds(index)[1], self._max)
+        return self._max
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if len(other._counts) != len(self._counts):
+            raise ValueError("僅能合併相同範圍的直方圖")
+        for index, bucket in enumerate(other._counts):
+            self._counts[index] += bucket
+        if other._count:
+            self._min = other._min if not self._count else min(self._min, other._min)
+            self._max = max(self._max, other._max)
+        self._count += other._count
+        self._sum += other._sum
+
+    def reset(self) -> None:
+        self._counts = [0] * len(self._counts)
+        self._count = 0
+        self._sum = 0
+        self._min = 0
+        self._max = 0
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self._count,
+            "min": self._min,
+            "mean": round(self.mean, 1),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+            "max": self._max,
+        }
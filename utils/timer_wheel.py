@@ -0,0 +1,56 @@
+"""雜湊時間輪（hashed timer wheel）。
+
+計時器依到期 tick 雜湊到固定數量的槽；推進時只檢查經過的槽，排程與每個 tick
+的推進皆為 O(1)（不計到期項目）。不支援取消：持有者在到期時自行判斷是否仍有效，
+需要延後時重新排程（lazy rescheduling），高頻更新因此不必動到時間輪。
+"""
+from __future__ import annotations
+
+import math
+from typing import Generic, Hashable, List, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+class TimerWheel(Generic[K]):
+    def __init__(self, tick: float, slots: int = 256, start: float = 0.0) -> None:
+        if tick <= 0 or slots <= 0:
+            raise ValueError("tick 與 slots 必須為正數")
+        self._tick = tick
+        self._size = slots
+        self._slots: List[List[Tuple[int, K]]] = [[] for _ in range(slots)]
+        self._current = int(start / tick)
+        self._pending = 0
+
+    @property
+    def tick(self) -> float:
+        return self._tick
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def schedule(self, key: K, deadline: float) -> None:
+        """deadline 已過時排到下一個 tick。"""
+        tick_no = max(math.ceil(deadline / self._tick), self._current + 1)
+        self._slots[tick_no % self._size].append((tick_no, key))
+        self._pending += 1
+
+    def advance(self, now: float) -> List[K]:
+        """推進到 now，回傳到期的 key；跨越整圈時每個槽最多檢查一次。"""
+        target = int(now / self._tick)
+        if target <= self._current:
+            return []
+        expired: List[K] = []
+        steps = min(target - self._current, self._size)
+        for step in range(1, steps + 1):
+            index = (self._current + step) % self._size
+            slot = self._slots[index]
+            if not slot:
+                continue
+            keep = [entry for entry in slot if entry[0] > target]
+            if len(keep) != len(slot):
+                expired.extend(key for tick_no, key in slot if tick_no <= target)
+                self._slots[index] = keep
+        self._current = target
+        self._pending -= len(expired)
+        return expired
@@ -0,0 +1,115 @@
+"""信號路徑分段延遲追蹤：WS 幀到達 → 解析 → 訂單簿 → 策略 → 風控 → 執行 → 回報 → 補單。
+
+每個 TraceContext 依序以 perf_counter_ns 打點；結束時相鄰兩點的差值按
+（交易對, 階段）記入延遲直方圖（微秒）。每 sample_every 筆保留完整 trace，
+可匯出為 Chrome trace-event JSON（chrome://tracing / Perfetto 開啟）。
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from utils.histogram import LatencyHistogram
+
+STAGES = ("recv", "parse", "book", "strategy", "risk", "dispatch", "ack", "reconcile")
+
+
+class TraceContext:
+    """單筆信號的打點序列。"""
+
+    __slots__ = ("pair", "trace_id", "marks", "_tracer")
+
+    def __init__(self, tracer: "Tracer", pair: str, trace_id: int) -> None:
+        self._tracer = tracer
+        self.pair = pair
+        self.trace_id = trace_id
+        self.marks: List[Tuple[str, int]] = []
+
+    def mark(self, stage: str, ns: Optional[int] = None) -> None:
+        self.marks.append((stage, time.perf_counter_ns() if ns is None else ns))
+
+    def finish(self) -> None:
+        self._tracer.record(self)
+
+
+class Tracer:
+    """按交易對聚合各階段延遲，並保留抽樣 trace。"""
+
+    def __init__(self, *, sample_every: int = 100, max_samples: int = 1000) -> None:
+        self._sample_every = max(1, sample_every)
+        self._ids = itertools.count(1)
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._samples: Deque[Tuple[str, int, Tuple[Tuple[str, int], ...]]] = deque(maxlen=max_samples)
+
+    def start(self, pair: str, *, received_ns: int = 0, parsed_ns: int = 0, applied_ns: int = 0) -> TraceContext:
+        """以訂單簿上已記錄的到達/解析/套用時間開始一筆 trace；缺少者略過。"""
+        ctx = TraceContext(self, pair, next(self._ids))
+        if received_ns:
+            ctx.marks.append(("recv", received_ns))
+        if parsed_ns:
+            ctx.marks.append(("parse", parsed_ns))
+        if applied_ns:
+            ctx.marks.append(("book", applied_ns))
+        return ctx
+
+    def record(self, ctx: TraceContext) -> None:
+        marks = ctx.marks
+        if len(marks) < 2:
+            return
+        stages = self._histograms.get(ctx.pair)
+        if stages is None:
+            stages = self._histograms[ctx.pair] = {}
+        for (_, prev_ns), (stage, ns) in zip(marks, marks[1:]):
+            histogram = stages.get(stage)
+            if histogram is None:
+                histogram = stages[stage] = LatencyHistogram()
+            histogram.record((ns - prev_ns) // 1000)
+        total = stages.get("total")
+        if total is None:
+            total = stages["total"] = LatencyHistogram()
+        total.record((marks[-1][1] - marks[0][1]) // 1000)
+        if ctx.trace_id % self._sample_every == 0:
+            self._samples.append((ctx.pair, ctx.trace_id, tuple(marks)))
+
+    def histogram(self, pair: str, stage: str) -> Optional[LatencyHistogram]:
+        return self._histograms.get(pair, {}).get(stage)
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """回傳 {pair: {stage: 統計摘要}}，單位微秒。"""
+        return {
+            pair: {stage: hist.summary() for stage, hist in stages.items()}
+            for pair, stages in self._histograms.items()
+        }
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """抽樣 trace 轉為 trace-event 格式；每個階段為一個 complete event，交易對為一條 thread。"""
+        events: List[Dict[str, Any]] = []
+        tids: Dict[str, int] = {}
+        for pair, trace_id, marks in self._samples:
+            tid = tids.setdefault(pair, len(tids) + 1)
+            for (_, prev_ns), (stage, ns) in zip(marks, marks[1:]):
+                events.append(
+                    {
+                        "name": stage,
+                        "cat": "signal",
+                        "ph": "X",
+                        "ts": prev_ns / 1000,
+                        "dur": (ns - prev_ns) / 1000,
+                        "pid": 1,
+                        "tid": tid,
+                        "args": {"trace_id": trace_id},
+                    }
+                )
+        for pair, tid in tids.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": pair}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump_chrome(self, path: Path) -> int:
+        """寫出抽樣 trace，回傳筆數。"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+        return len(self._samples)